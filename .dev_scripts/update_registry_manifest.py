@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# Copyright (c) OpenMMLab. All rights reserved.
+"""This tool is used to update mmedit/registry_manifest.json which is used by
+the registries to import the registered modules on demand. It imports mmedit,
+so it should be run in an environment where the dependencies are installed,
+and ``tests/test_utils/test_setup_env.py`` checks that the manifest is up to
+date. The entries of modules that cannot be imported here, e.g., those
+depending on optional packages that are not installed, are kept as they are.
+
+The manifest records the module registering each name in each registry, e.g.,
+
+.. code-block:: json
+
+    {"model": {"EDSRNet": "mmedit.models.editors.edsr.edsr_net"}}
+"""
+import importlib
+import json
+import os.path as osp
+import sys
+
+MMEditing_ROOT = osp.dirname(osp.dirname(osp.abspath(__file__)))
+sys.path.insert(0, MMEditing_ROOT)
+
+from mmedit.registry import MANIFEST_FILE  # noqa: E402
+from mmedit.utils.setup_env import generate_registry_manifest  # noqa: E402
+
+
+def is_importable(module: str) -> bool:
+    """Whether the module can be imported in the current environment."""
+    try:
+        importlib.import_module(module)
+    except ImportError:
+        return False
+    return True
+
+
+def update_registry_manifest():
+    """Update the registry manifest.
+
+    Returns:
+        bool: Whether the manifest is modified.
+    """
+    manifest = generate_registry_manifest()
+    old_content = None
+    if osp.exists(MANIFEST_FILE):
+        with open(MANIFEST_FILE) as f:
+            old_content = f.read()
+        # keep the modules missed because of the environment, so that the
+        # manifest does not depend on the installed optional packages
+        for registry, locations in json.loads(old_content).items():
+            new_locations = manifest.setdefault(registry, dict())
+            for name, location in locations.items():
+                if name not in new_locations and \
+                        not is_importable(location):
+                    new_locations[name] = location
+            manifest[registry] = dict(sorted(new_locations.items()))
+    content = json.dumps(manifest, indent=2) + '\n'
+    if content == old_content:
+        return False
+    with open(MANIFEST_FILE, 'w') as f:
+        f.write(content)
+    print(f'{MANIFEST_FILE} is updated.')
+    return True
+
+
+if __name__ == '__main__':
+    file_modified = update_registry_manifest()
+    sys.exit(1 if file_modified else 0)
@@ -21,6 +21,21 @@ def parse_args():
     parser.add_argument('--device', type=int, default=0, help='CUDA device id')
     parser.add_argument(
         '--ref-path', default=None, help='path to reference image file')
+    parser.add_argument(
+        '--tile-size',
+        type=int,
+        default=None,
+        help='restore the image tile by tile with the given tile size')
+    parser.add_argument(
+        '--tile-overlap',
+        type=int,
+        default=32,
+        help='overlap between adjacent tiles')
+    parser.add_argument(
+        '--tile-batch-size',
+        type=int,
+        default=1,
+        help='number of tiles forwarded at once')
     args = parser.parse_args()
     return args
 
@@ -49,7 +64,12 @@ def main():
     if args.ref_path:  # Ref-SR
         output = restoration_inference(model, args.img_path, args.ref_path)
     else:  # SISR
-        output = restoration_inference(model, args.img_path)
+        output = restoration_inference(
+            model,
+            args.img_path,
+            tile_size=args.tile_size,
+            tile_overlap=args.tile_overlap,
+            tile_batch_size=args.tile_batch_size)
     output = tensor2img(output)
 
     mmcv.imwrite(output, args.save_path)
@@ -9,6 +9,7 @@ from .inference_functions import (calculate_grid_size, colorization_inference,
                                   sample_conditional_model,
                                   sample_img2img_model,
                                   sample_unconditional_model, set_random_seed,
+                                  tile_inference,
                                   video_interpolation_inference)
 # yapf: enable
 from .mmedit_inferencer import MMEditInferencer
@@ -19,5 +20,5 @@ __all__ = [
     'restoration_video_inference', 'restoration_face_inference',
     'video_interpolation_inference', 'sample_conditional_model',
     'sample_unconditional_model', 'sample_img2img_model',
-    'colorization_inference', 'calculate_grid_size'
+    'colorization_inference', 'calculate_grid_size', 'tile_inference'
 ]
@@ -14,6 +14,7 @@ from torchvision import utils
 from mmedit.registry import MODELS
 from mmedit.utils import ConfigType, SampleList
 from .inference_functions import set_random_seed
+from .ort_wrapper import ORTWrapper
 
 InputType = Union[str, int, np.ndarray]
 InputsType = Union[InputType, Sequence[InputType]]
@@ -31,6 +32,13 @@ class BaseMMEditInferencer(BaseInferencer):
         device (str, optional): Device to run inference. If None, the best
             device will be automatically used.
         result_out_dir (str): Output directory of images. Defaults to ''.
+        backend (str): Backend to run the model, 'pytorch' or 'onnxruntime'.
+            With 'onnxruntime', ``ckpt`` is the path to the ONNX model
+            exported by ``tools/model_converters/pytorch2onnx.py``, which
+            replaces :attr:`onnx_target` of the model built from ``config``
+            and runs on CPU. Defaults to 'pytorch'.
+        backend_cfg (dict, optional): Config of the backend, e.g., the
+            threading settings of :class:`ORTWrapper`. Defaults to None.
     """
 
     func_kwargs = dict(
@@ -42,15 +50,28 @@ class BaseMMEditInferencer(BaseInferencer):
 
     extra_parameters = dict()
 
+    # the submodule or method of the model exported to ONNX, which is None if
+    # the inferencer does not support ONNX models
+    onnx_target = None
+
     def __init__(self,
                  config: Union[ConfigType, str],
                  ckpt: Optional[str],
                  device: Optional[str] = None,
                  extra_parameters: Optional[Dict] = None,
                  seed: int = 2022,
+                 backend: str = 'pytorch',
+                 backend_cfg: Optional[Dict] = None,
                  **kwargs) -> None:
+        assert backend in [
+            'pytorch', 'onnxruntime'
+        ], (f'backend should be "pytorch" or "onnxruntime", but got {backend}')
+        self.backend = backend
+        self.backend_cfg = dict() if backend_cfg is None else backend_cfg
         # Load config to cfg
-        if device is None:
+        if backend == 'onnxruntime':
+            device = torch.device('cpu')
+        elif device is None:
             device = torch.device(
                 'cuda' if torch.cuda.is_available() else 'cpu')
         self.device = device
@@ -66,7 +87,16 @@ class BaseMMEditInferencer(BaseInferencer):
         """Initialize the model with the given config and checkpoint on the
         specific device."""
         model = MODELS.build(cfg.model)
-        if ckpt is not None and ckpt != '':
+        if self.backend == 'onnxruntime':
+            if self.onnx_target is None:
+                raise NotImplementedError(
+                    f'{type(self).__name__} does not support ONNX models')
+            # a submodule could only be replaced by a module
+            if self.onnx_target in model._modules:
+                delattr(model, self.onnx_target)
+            setattr(model, self.onnx_target,
+                    ORTWrapper(ckpt, **self.backend_cfg))
+        elif ckpt is not None and ckpt != '':
             ckpt = load_checkpoint(model, ckpt, map_location='cpu')
         model.cfg = cfg
         model.to(device)
@@ -32,7 +32,20 @@ class EG3DInferencer(BaseMMEditInferencer):
         ],
         postprocess=[])
 
-    extra_parameters = dict(num_batches=4, sample_model='ema', add_noise=False)
+    # rays are rendered chunk by chunk within ``memory_budget`` bytes, see
+    # :class:`mmedit.models.editors.eg3d.EG3DRenderer`
+    extra_parameters = dict(
+        num_batches=4,
+        sample_model='ema',
+        add_noise=False,
+        ray_chunk_size='auto',
+        memory_budget=2**30)
+
+    def _get_render_kwargs(self) -> dict:
+        """Get the kwargs for the renderer."""
+        return dict(
+            ray_chunk_size=self.extra_parameters['ray_chunk_size'],
+            memory_budget=self.extra_parameters['memory_budget'])
 
     def preprocess(self, inputs: InputsType = None) -> ForwardInputs:
         """Process the inputs into a model-feedable format.
@@ -73,7 +86,8 @@ class EG3DInferencer(BaseMMEditInferencer):
         inputs = dict(
             num_batches=num_batches,
             sample_model=sample_model,
-            add_noise=add_noise)
+            add_noise=add_noise,
+            sample_kwargs=dict(render_kwargs=self._get_render_kwargs()))
         data_samples = data_sample_list
 
         return inputs, data_samples
@@ -122,8 +136,11 @@ class EG3DInferencer(BaseMMEditInferencer):
             return output_dict
 
         num_batches = inputs['num_batches']
-        output_list = self.model.interpolation(num_images, num_batches,
-                                               interpolation)
+        output_list = self.model.interpolation(
+            num_images,
+            num_batches,
+            interpolation,
+            render_kwargs=self._get_render_kwargs())
         return output_list
 
     def visualize(self,
@@ -19,6 +19,7 @@ from mmengine.utils import ProgressBar
 from torch.nn.parallel import scatter
 
 from mmedit.models.base_models import BaseTranslationModel
+from mmedit.models.utils.tiling_utils import feather_window, tile_starts
 from mmedit.registry import MODELS
 from mmedit.utils import register_all_modules
 
@@ -81,7 +82,7 @@ def init_model(config, checkpoint=None, device='cuda:0'):
     # config.test_cfg.metrics = None
     delete_cfg(config.model, 'init_cfg')
 
-    register_all_modules()
+    register_all_modules(lazy=True)
     model = MODELS.build(config.model)
 
     if checkpoint is not None:
@@ -363,13 +364,23 @@ def sample_img2img_model(model, image_path, target_domain=None, **kwargs):
     return output
 
 
-def restoration_inference(model, img, ref=None):
+def restoration_inference(model,
+                          img,
+                          ref=None,
+                          tile_size=None,
+                          tile_overlap=32,
+                          tile_batch_size=1):
     """Inference image with the model.
 
     Args:
         model (nn.Module): The loaded model.
         img (str): File path of input image.
         ref (str | None): File path of reference image. Default: None.
+        tile_size (int | None): If not None, the image is restored tile by
+            tile with :func:`tile_inference`. It is ignored for reference-based
+            models. Default: None.
+        tile_overlap (int): Overlap between adjacent tiles. Default: 32.
+        tile_batch_size (int): Number of tiles forwarded at once. Default: 1.
 
     Returns:
         Tensor: The predicted restoration result.
@@ -421,11 +432,82 @@ def restoration_inference(model, img, ref=None):
                 0].ref_img.data.to(device)
     # forward the model
     with torch.no_grad():
-        result = model(mode='tensor', **data)
+        if tile_size and not ref:
+            result = tile_inference(model, data['inputs'], tile_size,
+                                    tile_overlap, tile_batch_size)
+        else:
+            result = model(mode='tensor', **data)
     result = result[0]
     return result
 
 
+def tile_inference(model,
+                   inputs,
+                   tile_size,
+                   tile_overlap=32,
+                   tile_batch_size=1):
+    """Inference image with the model tile by tile.
+
+    The input is split into tiles which overlap by ``tile_overlap`` pixels.
+    ``tile_batch_size`` tiles are forwarded at once, and the outputs are
+    blended with feathered windows to hide the seams. The scale factor of
+    the model is inferred from the output of the first batch of tiles, so
+    only the output tiles and one output-sized buffer are kept in memory.
+
+    Args:
+        model (nn.Module): The loaded model.
+        inputs (Tensor): The input images with shape (n, c, h, w).
+        tile_size (int): Size of the tiles.
+        tile_overlap (int): Overlap between adjacent tiles. Default: 32.
+        tile_batch_size (int): Number of tiles forwarded at once. Default: 1.
+
+    Returns:
+        Tensor: The predicted restoration result.
+    """
+    if tile_overlap >= tile_size:
+        raise ValueError('"tile_overlap" must be smaller than "tile_size", '
+                         f'but got {tile_overlap} and {tile_size}.')
+
+    n, _, h, w = inputs.shape
+    tile_h, tile_w = min(tile_size, h), min(tile_size, w)
+    positions = [(y, x) for y in tile_starts(h, tile_h, tile_overlap)
+                 for x in tile_starts(w, tile_w, tile_overlap)]
+
+    output, weight, window, scale = None, None, None, None
+    for i in range(0, len(positions), tile_batch_size):
+        batch_positions = positions[i:i + tile_batch_size]
+        tiles = torch.cat([
+            inputs[..., y:y + tile_h, x:x + tile_w]
+            for (y, x) in batch_positions
+        ])
+        with torch.no_grad():
+            results = model(inputs=tiles, mode='tensor')
+
+        if output is None:
+            scale = results.size(-1) // tile_w
+            if results.size(-1) != tile_w * scale or \
+                    results.size(-2) != tile_h * scale:
+                raise ValueError('Only integer scale factors are supported '
+                                 'in tile inference, but got output size '
+                                 f'{tuple(results.shape[-2:])} for tile size '
+                                 f'{(tile_h, tile_w)}.')
+            output = results.new_zeros(n, results.size(1), h * scale,
+                                       w * scale)
+            weight = results.new_zeros(1, 1, h * scale, w * scale)
+            window = feather_window(tile_h * scale, tile_w * scale,
+                                    tile_overlap * scale,
+                                    results.device).to(results.dtype)
+
+        for j, (y, x) in enumerate(batch_positions):
+            y_slice = slice(y * scale, (y + tile_h) * scale)
+            x_slice = slice(x * scale, (x + tile_w) * scale)
+            output[..., y_slice, x_slice] += \
+                results[j * n:(j + 1) * n] * window
+            weight[..., y_slice, x_slice] += window
+
+    return output / weight
+
+
 try:
     from facexlib.utils.face_restoration_helper import FaceRestoreHelper
     has_facexlib = True
@@ -536,12 +618,34 @@ def pad_sequence(data, window_size):
     return data
 
 
+def padded_frame_index(index, sequence_length, padding):
+    """Map a frame index of the padded sequence to the original sequence.
+
+    This follows the padding of :func:`pad_sequence`, so that frames of a
+    padded sequence can be loaded lazily.
+
+    Args:
+        index (int): Frame index in the padded sequence.
+        sequence_length (int): Length of the original sequence.
+        padding (int): Number of frames padded on each side.
+
+    Returns:
+        int: Frame index in the original sequence.
+    """
+    if index < padding:
+        return 2 * padding - index
+    if index < padding + sequence_length:
+        return index - padding
+    return 2 * sequence_length - index - 2
+
+
 def restoration_video_inference(model,
                                 img_dir,
                                 window_size,
                                 start_idx,
                                 filename_tmpl,
-                                max_seq_len=None):
+                                max_seq_len=None,
+                                num_lookahead=None):
     """Inference image with the model.
 
     Args:
@@ -557,6 +661,12 @@ def restoration_video_inference(model,
             processes. If the sequence length is larger than this number,
             the sequence is split into multiple segments. If it is None,
             the entire sequence is processed at once.
+        num_lookahead (int | None): The number of look-ahead frames of each
+            segment. If it is not None and the generator supports
+            ``forward_streaming``, the hidden states and optical flows are
+            carried across the segments, and the backward-time propagation
+            of each segment is extended by this number of frames.
+            Default: None.
 
     Returns:
         Tensor: The predicted restoration result.
@@ -625,8 +735,22 @@ def restoration_video_inference(model,
                 result.append(model(inputs=data_i, mode='tensor').cpu())
             result = torch.stack(result, dim=1)
         else:  # recurrent framework
+            generator = getattr(model, 'generator', None)
             if max_seq_len is None:
                 result = model(inputs=data.to(device), mode='tensor').cpu()
+            elif num_lookahead is not None and hasattr(generator,
+                                                       'forward_streaming'):
+                result, state = [], None
+                length = data.size(1)
+                for i in range(0, length, max_seq_len):
+                    end = min(i + max_seq_len + num_lookahead, length)
+                    result_i, state = generator.forward_streaming(
+                        data[:, i:end].to(device),
+                        state,
+                        num_outputs=min(max_seq_len, length - i),
+                        end_of_sequence=end == length)
+                    result.append(result_i.cpu())
+                result = torch.cat(result, dim=1)
             else:
                 result = []
                 for i in range(0, data.size(1), max_seq_len):
@@ -23,6 +23,8 @@ class InpaintingInferencer(BaseMMEditInferencer):
         visualize=['result_out_dir'],
         postprocess=[])
 
+    onnx_target = 'generator'
+
     def _init_pipeline(self, cfg) -> Compose:
         """Initialize the test pipeline."""
         return None
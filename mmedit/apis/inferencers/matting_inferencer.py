@@ -23,6 +23,8 @@ class MattingInferencer(BaseMMEditInferencer):
         visualize=['result_out_dir'],
         postprocess=[])
 
+    onnx_target = '_forward'
+
     def preprocess(self, img: InputsType, trimap: InputsType) -> Dict:
         """Process the inputs into a model-feedable format.
 
@@ -27,6 +27,11 @@ class MMEditInferencer:
         device (str, optional): Device to run inference. If None, the best
             device will be automatically used.
         seed (int): The random seed used in inference. Defaults to 2022.
+        backend (str): Backend to run the model, 'pytorch' or 'onnxruntime'.
+            With 'onnxruntime', ``ckpt`` is the path to the exported ONNX
+            model. Defaults to 'pytorch'.
+        backend_cfg (dict, optional): Config of the backend, e.g., the
+            threading settings of ONNX Runtime. Defaults to None.
     """
 
     def __init__(self,
@@ -35,41 +40,46 @@ class MMEditInferencer:
                  ckpt: Optional[str] = None,
                  device: torch.device = None,
                  extra_parameters: Optional[Dict] = None,
-                 seed: int = 2022) -> None:
+                 seed: int = 2022,
+                 backend: str = 'pytorch',
+                 backend_cfg: Optional[Dict] = None) -> None:
         self.task = task
+        kwargs = dict(seed=seed, backend=backend, backend_cfg=backend_cfg)
         if self.task in ['conditional', 'Conditional GANs']:
-            self.inferencer = ConditionalInferencer(
-                config, ckpt, device, extra_parameters, seed=seed)
+            self.inferencer = ConditionalInferencer(config, ckpt, device,
+                                                    extra_parameters, **kwargs)
         elif self.task in ['colorization', 'Colorization']:
-            self.inferencer = ColorizationInferencer(
-                config, ckpt, device, extra_parameters, seed=seed)
+            self.inferencer = ColorizationInferencer(config, ckpt, device,
+                                                     extra_parameters,
+                                                     **kwargs)
         elif self.task in ['unconditional', 'Unconditional GANs']:
-            self.inferencer = UnconditionalInferencer(
-                config, ckpt, device, extra_parameters, seed=seed)
+            self.inferencer = UnconditionalInferencer(config, ckpt, device,
+                                                      extra_parameters,
+                                                      **kwargs)
         elif self.task in ['matting', 'Matting']:
-            self.inferencer = MattingInferencer(
-                config, ckpt, device, extra_parameters, seed=seed)
+            self.inferencer = MattingInferencer(config, ckpt, device,
+                                                extra_parameters, **kwargs)
         elif self.task in ['inpainting', 'Inpainting']:
-            self.inferencer = InpaintingInferencer(
-                config, ckpt, device, extra_parameters, seed=seed)
+            self.inferencer = InpaintingInferencer(config, ckpt, device,
+                                                   extra_parameters, **kwargs)
         elif self.task in ['translation', 'Image2Image Translation']:
-            self.inferencer = TranslationInferencer(
-                config, ckpt, device, extra_parameters, seed=seed)
+            self.inferencer = TranslationInferencer(config, ckpt, device,
+                                                    extra_parameters, **kwargs)
         elif self.task in ['restoration', 'Image Super-Resolution']:
-            self.inferencer = RestorationInferencer(
-                config, ckpt, device, extra_parameters, seed=seed)
+            self.inferencer = RestorationInferencer(config, ckpt, device,
+                                                    extra_parameters, **kwargs)
         elif self.task in ['video_restoration', 'Video Super-Resolution']:
             self.inferencer = VideoRestorationInferencer(
-                config, ckpt, device, extra_parameters, seed=seed)
+                config, ckpt, device, extra_parameters, **kwargs)
         elif self.task in ['video_interpolation', 'Video Interpolation']:
             self.inferencer = VideoInterpolationInferencer(
-                config, ckpt, device, extra_parameters)
+                config, ckpt, device, extra_parameters, **kwargs)
         elif self.task in ['text2image', 'Text2Image']:
-            self.inferencer = Text2ImageInferencer(
-                config, ckpt, device, extra_parameters, seed=seed)
+            self.inferencer = Text2ImageInferencer(config, ckpt, device,
+                                                   extra_parameters, **kwargs)
         elif self.task in ['3D_aware_generation', '3D-aware Generation']:
-            self.inferencer = EG3DInferencer(
-                config, ckpt, device, extra_parameters, seed=seed)
+            self.inferencer = EG3DInferencer(config, ckpt, device,
+                                             extra_parameters, **kwargs)
         else:
             raise ValueError(f'Unknown inferencer task: {self.task}')
 
@@ -0,0 +1,164 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+import torch
+
+# data types of the inputs and outputs supported by the wrapper
+ORT_TYPES = {
+    'tensor(float)': torch.float32,
+    'tensor(float16)': torch.float16,
+    'tensor(double)': torch.float64,
+    'tensor(int64)': torch.int64,
+    'tensor(uint8)': torch.uint8,
+}
+NUMPY_TYPES = {
+    torch.float32: np.float32,
+    torch.float16: np.float16,
+    torch.float64: np.float64,
+    torch.int64: np.int64,
+    torch.uint8: np.uint8,
+}
+
+
+class ORTWrapper:
+    """Run an ONNX model exported by ``tools/model_converters/pytorch2onnx.py``
+    with ONNX Runtime on CPU.
+
+    The wrapper is called with tensors and returns tensors in place of the
+    exported part of the PyTorch model, e.g., the generator of a restorer, so
+    that the pre-processing and post-processing of the model are reused. The
+    spatial axes of inputs are dynamic if the model is exported with
+    ``--dynamic-export``, while the other axes, e.g., the number of frames of
+    recurrent video restorers, are fixed to the shape used in exporting.
+
+    With ``io_binding``, inputs are bound to ONNX Runtime without copying, and
+    the outputs are written into tensors allocated by the wrapper, whose
+    shapes are recorded at the first run of each input shape.
+
+    Args:
+        onnx_file (str): Path to the ONNX model.
+        intra_op_num_threads (int): Number of threads used to run an
+            operator. 0 means the number of physical cores. Defaults to 0.
+        inter_op_num_threads (int): Number of threads used to run operators
+            in parallel, only used in the 'parallel' ``execution_mode``.
+            0 means the number of physical cores. Defaults to 0.
+        execution_mode (str): Whether to run the operators in 'sequential'
+            or in 'parallel'. Defaults to 'sequential'.
+        graph_optimization_level (str): Level of graph optimizations, chosen
+            from 'disable', 'basic', 'extended' and 'all'. Defaults to 'all'.
+        io_binding (bool): Whether to bind the inputs and outputs with IO
+            binding. Defaults to True.
+    """
+
+    def __init__(self,
+                 onnx_file: str,
+                 intra_op_num_threads: int = 0,
+                 inter_op_num_threads: int = 0,
+                 execution_mode: str = 'sequential',
+                 graph_optimization_level: str = 'all',
+                 io_binding: bool = True) -> None:
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise ImportError('Please run "pip install onnxruntime" to run '
+                              'ONNX models with ONNX Runtime')
+        assert execution_mode in [
+            'sequential', 'parallel'
+        ], ('execution_mode should be "sequential" or "parallel", but got '
+            f'{execution_mode}')
+        graph_optimization_levels = dict(
+            disable=ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+            basic=ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+            extended=ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+            all=ort.GraphOptimizationLevel.ORT_ENABLE_ALL)
+        assert graph_optimization_level in graph_optimization_levels, (
+            'graph_optimization_level should be one of '
+            f'{list(graph_optimization_levels)}, but got '
+            f'{graph_optimization_level}')
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_num_threads
+        options.inter_op_num_threads = inter_op_num_threads
+        options.execution_mode = (
+            ort.ExecutionMode.ORT_SEQUENTIAL if execution_mode == 'sequential'
+            else ort.ExecutionMode.ORT_PARALLEL)
+        options.graph_optimization_level = graph_optimization_levels[
+            graph_optimization_level]
+        self.session = ort.InferenceSession(
+            onnx_file, options, providers=['CPUExecutionProvider'])
+
+        self.input_names = [node.name for node in self.session.get_inputs()]
+        self.input_types = [
+            ORT_TYPES[node.type] for node in self.session.get_inputs()
+        ]
+        self.output_names = [node.name for node in self.session.get_outputs()]
+        self.io_binding = io_binding
+        # shapes and data types of the outputs of each input shape
+        self._output_shapes: Dict[Tuple, List[Tuple[Tuple, torch.dtype]]] = {}
+
+    def __call__(self, *inputs: torch.Tensor
+                 ) -> Union[torch.Tensor, Tuple[torch.Tensor, ...]]:
+        """Run the ONNX model.
+
+        Args:
+            inputs (torch.Tensor): Inputs in the order of the inputs of the
+                ONNX model.
+
+        Returns:
+            Tensor | Tuple[Tensor]: The output, or a tuple of outputs if the
+            ONNX model has multiple outputs.
+        """
+        assert len(inputs) == len(self.input_names), (
+            f'The ONNX model takes {len(self.input_names)} inputs, but got '
+            f'{len(inputs)}')
+        inputs = [
+            _input.detach().to('cpu', dtype).contiguous()
+            for _input, dtype in zip(inputs, self.input_types)
+        ]
+
+        if self.io_binding:
+            outputs = self._run_with_io_binding(inputs)
+        else:
+            outputs = self.session.run(
+                self.output_names, {
+                    name: _input.numpy()
+                    for name, _input in zip(self.input_names, inputs)
+                })
+            outputs = [torch.from_numpy(output) for output in outputs]
+
+        if len(outputs) == 1:
+            return outputs[0]
+        return tuple(outputs)
+
+    def _run_with_io_binding(self,
+                             inputs: List[torch.Tensor]) -> List[torch.Tensor]:
+        """Run the ONNX model with inputs and outputs bound to tensors."""
+        binding = self.session.io_binding()
+        for name, _input in zip(self.input_names, inputs):
+            binding.bind_input(name, 'cpu', 0, NUMPY_TYPES[_input.dtype],
+                               tuple(_input.shape), _input.data_ptr())
+
+        key = tuple(tuple(_input.shape) for _input in inputs)
+        output_shapes = self._output_shapes.get(key)
+        if output_shapes is None:
+            # let ONNX Runtime allocate the outputs of an unseen input shape
+            for name in self.output_names:
+                binding.bind_output(name, 'cpu')
+            self.session.run_with_iobinding(binding)
+            outputs = [
+                torch.from_numpy(output)
+                for output in binding.copy_outputs_to_cpu()
+            ]
+            self._output_shapes[key] = [(tuple(output.shape), output.dtype)
+                                        for output in outputs]
+            return outputs
+
+        outputs = [
+            torch.empty(shape, dtype=dtype) for shape, dtype in output_shapes
+        ]
+        for name, output in zip(self.output_names, outputs):
+            binding.bind_output(name, 'cpu', 0, NUMPY_TYPES[output.dtype],
+                                tuple(output.shape), output.data_ptr())
+        self.session.run_with_iobinding(binding)
+        return outputs
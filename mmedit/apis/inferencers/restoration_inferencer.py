@@ -12,10 +12,15 @@ from torch.nn.parallel import scatter
 
 from mmedit.utils import tensor2img
 from .base_mmedit_inferencer import BaseMMEditInferencer, InputsType, PredType
+from .inference_functions import tile_inference
 
 
 class RestorationInferencer(BaseMMEditInferencer):
-    """inferencer that predicts with restoration models."""
+    """inferencer that predicts with restoration models.
+
+    Set ``tile_size`` in ``extra_parameters`` to restore large images tile by
+    tile with :func:`tile_inference`.
+    """
 
     func_kwargs = dict(
         preprocess=['img'],
@@ -23,6 +28,10 @@ class RestorationInferencer(BaseMMEditInferencer):
         visualize=['result_out_dir'],
         postprocess=[])
 
+    onnx_target = 'generator'
+
+    extra_parameters = dict(tile_size=None, tile_overlap=32, tile_batch_size=1)
+
     def preprocess(self, img: InputsType, ref: InputsType = None) -> Dict:
         """Process the inputs into a model-feedable format.
 
@@ -35,7 +44,7 @@ class RestorationInferencer(BaseMMEditInferencer):
             data(Dict): Results of preprocess.
         """
         cfg = self.model.cfg
-        device = next(self.model.parameters()).device  # model device
+        device = self.device  # model device
 
         # select the data pipeline
         if cfg.get('demo_pipeline', None):
@@ -86,8 +95,18 @@ class RestorationInferencer(BaseMMEditInferencer):
 
     def forward(self, inputs: InputsType) -> PredType:
         """Forward the inputs to the model."""
+        tile_size = self.extra_parameters['tile_size']
         with torch.no_grad():
-            result = self.model(mode='tensor', **inputs)
+            # tiling is not applied to reference-based models
+            if tile_size and 'data_samples' not in inputs:
+                result = tile_inference(
+                    self.model,
+                    inputs['inputs'],
+                    tile_size,
+                    tile_overlap=self.extra_parameters['tile_overlap'],
+                    tile_batch_size=self.extra_parameters['tile_batch_size'])
+            else:
+                result = self.model(mode='tensor', **inputs)
         return result
 
     def visualize(self,
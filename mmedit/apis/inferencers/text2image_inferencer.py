@@ -1,6 +1,11 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import os
-from typing import Dict, List
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future
+from typing import Dict, List, Optional
 
 import numpy as np
 from mmengine import mkdir_or_exist
@@ -10,7 +15,15 @@ from .base_mmedit_inferencer import BaseMMEditInferencer, InputsType, PredType
 
 
 class Text2ImageInferencer(BaseMMEditInferencer):
-    """inferencer that predicts with text2image models."""
+    """inferencer that predicts with text2image models.
+
+    For models implementing ``infer_batch`` (e.g., Stable Diffusion), the
+    inferencer can also serve concurrent requests: after
+    :meth:`start_batching`, requests submitted by :meth:`submit` from any
+    thread are collected by a worker thread, and requests with the same
+    resolution, number of inference steps and eta are denoised in one UNet
+    batch.
+    """
 
     func_kwargs = dict(
         preprocess=['text'],
@@ -42,6 +55,138 @@ class Text2ImageInferencer(BaseMMEditInferencer):
         cutn_batches=4,
         seed=2022)
 
+    _worker = None
+
+    def start_batching(self,
+                       max_batch_size: int = 8,
+                       max_wait: float = 0.01) -> None:
+        """Start the worker thread which batches the submitted requests.
+
+        Args:
+            max_batch_size (int): The maximum number of requests in a batch.
+                Defaults to 8.
+            max_wait (float): The maximum time in seconds to wait for more
+                requests after the first request of a batch arrives.
+                Defaults to 0.01.
+        """
+        assert hasattr(self.model, 'infer_batch'), (
+            f'{type(self.model).__name__} does not support batched '
+            'inference.')
+        self.stop_batching()
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._requests = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._batching_loop, daemon=True)
+        self._worker.start()
+
+    def stop_batching(self) -> None:
+        """Stop the worker thread after the submitted requests are done."""
+        if self._worker is not None:
+            self._requests.put(None)
+            self._worker.join()
+            self._worker = None
+
+    def submit(self,
+               prompt: str,
+               height: Optional[int] = None,
+               width: Optional[int] = None,
+               num_inference_steps: int = 50,
+               guidance_scale: float = 7.5,
+               negative_prompt: Optional[str] = None,
+               eta: float = 0.0,
+               seed: Optional[int] = None) -> Future:
+        """Submit a request to the worker thread. The worker is started with
+        the default arguments if :meth:`start_batching` has not been called.
+
+        Args:
+            prompt (str): The prompt to guide the image generation.
+            height (int, optional): The height in pixels of the generated
+                image. Defaults to None.
+            width (int, optional): The width in pixels of the generated
+                image. Defaults to None.
+            num_inference_steps (int): The number of denoising steps.
+                Defaults to 50.
+            guidance_scale (float): The guidance scale. Defaults to 7.5.
+            negative_prompt (str, optional): The prompt not to guide the
+                image generation. Defaults to None.
+            eta (float): Corresponds to parameter eta (η) in the DDIM paper.
+                Defaults to 0.0.
+            seed (int, optional): The seed of the initial latents. Defaults
+                to None.
+
+        Returns:
+            Future: The future of the generated image in shape (3, h, w).
+        """
+        if self._worker is None:
+            self.start_batching()
+        future = Future()
+        self._requests.put((dict(
+            prompt=prompt,
+            height=height,
+            width=width,
+            num_inference_steps=num_inference_steps,
+            guidance_scale=guidance_scale,
+            negative_prompt=negative_prompt,
+            eta=eta,
+            seed=seed), future))
+        return future
+
+    def _batching_loop(self) -> None:
+        """Collect requests until ``max_batch_size`` requests arrive or
+        ``max_wait`` seconds pass, and run them."""
+        stop = False
+        while not stop:
+            request = self._requests.get()
+            if request is None:
+                break
+            requests = [request]
+            deadline = time.monotonic() + self._max_wait
+            while len(requests) < self._max_batch_size:
+                try:
+                    request = self._requests.get(
+                        timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                requests.append(request)
+            self._run_requests(requests)
+
+    def _run_requests(self, requests: List[tuple]) -> None:
+        """Group the requests by resolution, number of inference steps and
+        eta, and run each group in one batch."""
+        groups = defaultdict(list)
+        for request, future in requests:
+            if future.set_running_or_notify_cancel():
+                key = (request['height'], request['width'],
+                       request['num_inference_steps'], request['eta'])
+                groups[key].append((request, future))
+
+        for (height, width, num_inference_steps, eta), group in \
+                groups.items():
+            try:
+                results = self.model.infer_batch(
+                    [request['prompt'] for request, _ in group],
+                    height=height,
+                    width=width,
+                    num_inference_steps=num_inference_steps,
+                    guidance_scale=[
+                        request['guidance_scale'] for request, _ in group
+                    ],
+                    negative_prompts=[
+                        request['negative_prompt'] for request, _ in group
+                    ],
+                    eta=eta,
+                    seeds=[request['seed'] for request, _ in group])
+            except Exception as e:
+                for _, future in group:
+                    future.set_exception(e)
+                continue
+            for (_, future), image in zip(group, results['samples']):
+                future.set_result(image)
+
     def preprocess(self, text: InputsType) -> Dict:
         """Process the inputs into a model-feedable format.
 
@@ -1,5 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import glob
+import math
 import os
 import os.path as osp
 from typing import Dict, List, Optional, Tuple, Union
@@ -10,11 +11,13 @@ import numpy as np
 import torch
 from mmengine.dataset import Compose
 from mmengine.logging import MMLogger
+from mmengine.utils import ProgressBar
 
 from mmedit.utils import tensor2img
 from .base_mmedit_inferencer import (BaseMMEditInferencer, InputsType,
                                      PredType, ResType)
-from .inference_functions import VIDEO_EXTENSIONS, pad_sequence
+from .inference_functions import (VIDEO_EXTENSIONS, pad_sequence,
+                                  padded_frame_index, read_image)
 
 
 class VideoRestorationInferencer(BaseMMEditInferencer):
@@ -22,15 +25,19 @@ class VideoRestorationInferencer(BaseMMEditInferencer):
 
     func_kwargs = dict(
         preprocess=['video'],
-        forward=[],
+        forward=['result_out_dir'],
         visualize=['result_out_dir'],
         postprocess=[])
 
+    onnx_target = 'generator'
+
     extra_parameters = dict(
         start_idx=0,
         filename_tmpl='{:08d}.png',
         window_size=0,
-        max_seq_len=None)
+        max_seq_len=None,
+        streaming=False,
+        num_lookahead=None)
 
     def preprocess(self, video: InputsType) -> Dict:
         """Process the inputs into a model-feedable format.
@@ -49,6 +56,9 @@ class VideoRestorationInferencer(BaseMMEditInferencer):
         else:
             test_pipeline = self.model.cfg.val_pipeline
 
+        if self.extra_parameters['streaming']:
+            return self._preprocess_streaming(video, test_pipeline)
+
         # check if the input is a video
         file_extension = osp.splitext(video)[1]
         if file_extension in VIDEO_EXTENSIONS:
@@ -96,15 +106,63 @@ class VideoRestorationInferencer(BaseMMEditInferencer):
 
         return results
 
-    def forward(self, inputs: InputsType) -> PredType:
+    def _preprocess_streaming(self, video: InputsType,
+                              test_pipeline: List[Dict]) -> Dict:
+        """Prepare a lazy frame source instead of decoding the whole video.
+
+        Args:
+            video (InputsType): Path of the input video or frame directory.
+            test_pipeline (List[Dict]): Config of the test pipeline.
+
+        Returns:
+            Dict: The frame source, the number of frames, whether the source
+                is a video and the key of the input.
+        """
+        # frames are loaded by the inferencer itself
+        tmp_pipeline = []
+        for pipeline in test_pipeline:
+            if pipeline['type'] not in [
+                    'GenerateSegmentIndices', 'LoadImageFromFile'
+            ]:
+                tmp_pipeline.append(pipeline)
+        self.test_pipeline = Compose(tmp_pipeline)
+
+        file_extension = osp.splitext(video)[1]
+        if file_extension in VIDEO_EXTENSIONS:
+            source = mmcv.VideoReader(video)
+            length = source.frame_cnt
+            from_video = True
+        else:
+            # follow the naming used by 'GenerateSegmentIndices'
+            length = len(glob.glob(osp.join(video, '*')))
+            start_idx = self.extra_parameters['start_idx']
+            filename_tmpl = self.extra_parameters['filename_tmpl']
+            source = [
+                osp.join(video, filename_tmpl.format(start_idx + i))
+                for i in range(length)
+            ]
+            from_video = False
+
+        return dict(
+            source=source, length=length, from_video=from_video, key=video)
+
+    def forward(self,
+                inputs: InputsType,
+                result_out_dir: str = '') -> PredType:
         """Forward the inputs to the model.
 
         Args:
             inputs (InputsType): Images array of input video.
+            result_out_dir (str): Output directory of video. Only used in
+                streaming mode, where restored frames are written as soon as
+                they are computed. Defaults to ''.
 
         Returns:
             PredType: Results of forwarding
         """
+        if self.extra_parameters['streaming']:
+            return self._forward_streaming(inputs, result_out_dir)
+
         with torch.no_grad():
             if self.extra_parameters[
                     'window_size'] > 0:  # sliding window framework
@@ -137,6 +195,126 @@ class VideoRestorationInferencer(BaseMMEditInferencer):
                     result = torch.cat(result, dim=1)
         return result
 
+    def _forward_streaming(self, inputs: Dict, result_out_dir: str) -> Dict:
+        """Restore the video chunk by chunk and write the results.
+
+        Only the frames needed by the current chunk are kept in memory, so
+        the peak memory depends on the chunk size rather than the length of
+        the video. Each chunk contains ``max_seq_len`` output frames. For
+        sliding-window models, the chunk is extended by ``window_size // 2``
+        frames on both sides. For recurrent models the chunks do not overlap,
+        which is the same as the non-streaming ``max_seq_len`` path, unless
+        ``num_lookahead`` is set and the generator supports
+        ``forward_streaming``. In that case, the hidden states and optical
+        flows are carried across the chunks, and each chunk is followed by
+        ``num_lookahead`` frames for the backward-time propagation.
+
+        Args:
+            inputs (Dict): Frame source prepared by :meth:`preprocess`.
+            result_out_dir (str): Output video path or output directory.
+
+        Returns:
+            Dict: An empty dict, as the results are written to disk.
+        """
+        source = inputs['source']
+        length = inputs['length']
+        from_video = inputs['from_video']
+        window_size = self.extra_parameters['window_size']
+        max_seq_len = self.extra_parameters['max_seq_len']
+        start_idx = self.extra_parameters['start_idx']
+        filename_tmpl = self.extra_parameters['filename_tmpl']
+        num_lookahead = self.extra_parameters.get('num_lookahead', None)
+        generator = getattr(self.model, 'generator', None)
+        stateful = window_size <= 0 and num_lookahead is not None and \
+            hasattr(generator, 'forward_streaming')
+        state = None
+
+        if max_seq_len is not None:
+            chunk_size = max_seq_len
+        elif window_size > 0:
+            chunk_size = window_size
+        else:
+            chunk_size = length
+        padding = window_size // 2 if window_size > 0 else 0
+
+        to_video = os.path.splitext(result_out_dir)[1] in VIDEO_EXTENSIONS
+        video_writer = None
+        frame_cache = dict()
+
+        prog_bar = ProgressBar(math.ceil(length / chunk_size))
+        for chunk_start in range(0, length, chunk_size):
+            chunk_end = min(chunk_start + chunk_size, length)
+            if window_size > 0:
+                indices = [
+                    padded_frame_index(i, length, padding)
+                    for i in range(chunk_start, chunk_end + 2 * padding)
+                ]
+            elif stateful:
+                indices = list(
+                    range(chunk_start, min(chunk_end + num_lookahead, length)))
+            else:
+                indices = list(range(chunk_start, chunk_end))
+
+            # release the frames that are no longer needed
+            for index in list(frame_cache.keys()):
+                if index not in indices:
+                    frame_cache.pop(index)
+            for index in sorted(set(indices) - set(frame_cache.keys())):
+                if from_video:
+                    frame_cache[index] = np.flip(
+                        source.get_frame(index), axis=2)
+                else:
+                    frame_cache[index] = read_image(source[index])
+
+            data = dict(
+                img=[frame_cache[index] for index in indices],
+                img_path=None,
+                key=inputs['key'])
+            data = self.test_pipeline(data)['inputs'].unsqueeze(0) / 255.0
+
+            with torch.no_grad():
+                if window_size > 0:
+                    result = []
+                    for i in range(chunk_end - chunk_start):
+                        data_i = data[:, i:i + window_size].to(self.device)
+                        result.append(
+                            self.model(inputs=data_i, mode='tensor').cpu())
+                    result = torch.stack(result, dim=1)
+                elif stateful:
+                    result, state = generator.forward_streaming(
+                        data.to(self.device),
+                        state,
+                        num_outputs=chunk_end - chunk_start,
+                        end_of_sequence=indices[-1] == length - 1)
+                    result = result.cpu()
+                else:
+                    result = self.model(
+                        inputs=data.to(self.device), mode='tensor').cpu()
+
+            for i in range(result.size(1)):
+                output_i = tensor2img(result[:, i, :, :, :])
+                if to_video:
+                    if video_writer is None:
+                        h, w = output_i.shape[:2]
+                        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+                        video_writer = cv2.VideoWriter(result_out_dir, fourcc,
+                                                       25, (w, h))
+                    video_writer.write(output_i.astype(np.uint8))
+                else:
+                    frame_idx = start_idx + chunk_start + i
+                    save_path_i = \
+                        f'{result_out_dir}/{filename_tmpl.format(frame_idx)}'
+                    mmcv.imwrite(output_i, save_path_i)
+            prog_bar.update()
+
+        if video_writer is not None:
+            video_writer.release()
+
+        logger: MMLogger = MMLogger.get_current_instance()
+        logger.info(f'Output video is save at {result_out_dir}.')
+
+        return {}
+
     def visualize(self,
                   preds: PredType,
                   result_out_dir: str = '') -> List[np.ndarray]:
@@ -152,6 +330,11 @@ class VideoRestorationInferencer(BaseMMEditInferencer):
         Returns:
             List[np.ndarray]: Result of visualize
         """
+        if self.extra_parameters['streaming']:
+            logger: MMLogger = MMLogger.get_current_instance()
+            logger.info('Visualization is implemented in forward process.')
+            return []
+
         file_extension = os.path.splitext(result_out_dir)[1]
         if file_extension in VIDEO_EXTENSIONS:  # save as video
             h, w = preds.shape[-2:]
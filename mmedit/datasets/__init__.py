@@ -9,11 +9,12 @@ from .imagenet_dataset import ImageNet
 from .mscoco_dataset import MSCoCoDataset
 from .paired_image_dataset import PairedImageDataset
 from .singan_dataset import SinGANDataset
+from .size_bucket_batch_sampler import SizeBucketBatchSampler
 from .unpaired_image_dataset import UnpairedImageDataset
 
 __all__ = [
     'AdobeComp1kDataset', 'BasicImageDataset', 'BasicFramesDataset',
     'BasicConditionalDataset', 'UnpairedImageDataset', 'PairedImageDataset',
     'ImageNet', 'CIFAR10', 'GrowScaleImgDataset', 'SinGANDataset',
-    'MSCoCoDataset'
+    'MSCoCoDataset', 'SizeBucketBatchSampler'
 ]
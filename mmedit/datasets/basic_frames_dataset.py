@@ -1,12 +1,16 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import hashlib
 import os
 import os.path as osp
-from typing import Callable, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Union
 
+from mmengine import print_log
 from mmengine.dataset import BaseDataset
-from mmengine.fileio import get_file_backend, list_from_file
+from mmengine.dist import barrier, is_main_process
+from mmengine.fileio import LocalBackend, get, get_file_backend, list_from_file
 
 from ..registry import DATASETS
+from .frame_index import FrameIndex
 
 
 @DATASETS.register_module()
@@ -65,6 +69,16 @@ class BasicFramesDataset(BaseDataset):
             Default: None.
         load_frames_list (dict): Load frames list for each key.
             Default: dict().
+        frame_index_file (str, optional): Path of the frame index file. If
+            given, the scanned paths and frames are persisted to this file
+            and loaded with memory mapping instead of scanning the folders
+            again, and data infos are only parsed when items are accessed.
+            The index is rebuilt when the annotation file, the arguments, or
+            the manifest (names and modification times of the entries) of the
+            first level of scanned folders change. Changes in deeper folders
+            are not detected, delete the file to rebuild the index in this
+            case. ``serialize_data`` is disabled since the index is already
+            compact and shared by workers. Default: None.
 
     Examples:
 
@@ -141,6 +155,7 @@ class BasicFramesDataset(BaseDataset):
                  num_output_frames: Optional[int] = None,
                  fixed_seq_len: Optional[int] = None,
                  load_frames_list: dict = dict(),
+                 frame_index_file: Optional[str] = None,
                  **kwargs):
 
         for key in data_prefix:
@@ -162,6 +177,9 @@ class BasicFramesDataset(BaseDataset):
         self.num_input_frames = num_input_frames
         self.num_output_frames = num_output_frames
         self.load_frames_list = load_frames_list
+        self.frame_index_file = frame_index_file
+        if frame_index_file is not None:
+            kwargs['serialize_data'] = False
         self.file_backend = get_file_backend(
             uri=data_root, backend_args=backend_args)
 
@@ -174,46 +192,151 @@ class BasicFramesDataset(BaseDataset):
             test_mode=test_mode,
             **kwargs)
 
-    def load_data_list(self) -> List[dict]:
+    def load_data_list(self) -> Union[List[dict], FrameIndex]:
         """Load data list from folder or annotation file.
 
         Returns:
-            list[dict]: A list of annotation.
+            list[dict] | FrameIndex: A list of annotation, or a
+            :class:`FrameIndex` parsing annotations on access if
+            ``frame_index_file`` is given.
         """
 
+        if self.frame_index_file is not None:
+            return self._load_frame_index()
+
         path_list = self._get_path_list()
         self._set_seq_lens()
 
         data_list = []
         for path in path_list:
-            basename, _ = osp.splitext(path)
-            sequence_length = self.seq_lens['fixed_seq_len']
-            if sequence_length is None:
-                sequence_length = self.seq_lens[path.split(os.sep)[0]]
-            data = dict(
-                key=basename,
-                num_input_frames=self.num_input_frames,
-                num_output_frames=self.num_output_frames,
-                sequence_length=sequence_length)
-            for key in self.data_prefix:
-                if key in self.load_frames_list:
-                    folder = osp.join(self.data_prefix[key], path)
-                    data[f'{key}_path'] = self._get_frames_list(key, folder)
-                    # The list of frames has been loaded,
-                    # ``sequence_length`` is useless
-                    # Avoid loading frames by ``sequence_length`` in pipeline
-                    data['sequence_length'] = None
-                    # overwrite ``num_input_frames`` and ``num_output_frames``
-                    if key == 'img':
-                        data['num_input_frames'] = len(data[f'{key}_path'])
-                    elif key == 'gt':
-                        data['num_output_frames'] = len(data[f'{key}_path'])
-                else:
-                    data[f'{key}_path'] = self.data_prefix[key]
-            data_list.append(data)
+            data_list.append(self._parse_data_info(path))
 
         return data_list
 
+    def _parse_data_info(self,
+                         path: str,
+                         frames: Dict[str, List[str]] = dict()) -> dict:
+        """Parse the annotation of a path.
+
+        Args:
+            path (str): The path of the item.
+            frames (dict[str, list[str]]): The names of frames of the keys
+                in ``load_frames_list``, listed when it contains 'all'. If
+                not given, the folder is listed. Default: dict().
+
+        Returns:
+            dict: The annotation.
+        """
+
+        basename, _ = osp.splitext(path)
+        sequence_length = self.seq_lens['fixed_seq_len']
+        if sequence_length is None:
+            sequence_length = self.seq_lens[path.split(os.sep)[0]]
+        data = dict(
+            key=basename,
+            num_input_frames=self.num_input_frames,
+            num_output_frames=self.num_output_frames,
+            sequence_length=sequence_length)
+        for key in self.data_prefix:
+            if key in self.load_frames_list:
+                folder = osp.join(self.data_prefix[key], path)
+                data[f'{key}_path'] = self._get_frames_list(
+                    key, folder, frames.get(key))
+                # The list of frames has been loaded,
+                # ``sequence_length`` is useless
+                # Avoid loading frames by ``sequence_length`` in pipeline
+                data['sequence_length'] = None
+                # overwrite ``num_input_frames`` and ``num_output_frames``
+                if key == 'img':
+                    data['num_input_frames'] = len(data[f'{key}_path'])
+                elif key == 'gt':
+                    data['num_output_frames'] = len(data[f'{key}_path'])
+            else:
+                data[f'{key}_path'] = self.data_prefix[key]
+        return data
+
+    def _get_listed_keys(self) -> List[str]:
+        """Get the keys whose frames are listed from folders."""
+
+        return [
+            key for key in self.data_prefix
+            if 'all' in self.load_frames_list.get(key, [])
+        ]
+
+    def _get_manifest(self) -> str:
+        """Get the hash of the arguments, the annotation file and the first
+        level of scanned folders, which decides whether the frame index is
+        outdated."""
+
+        manifest = [
+            self.ann_file,
+            sorted(self.data_prefix.items()),
+            sorted(self.filename_tmpl.items()), self.search_key, self.depth,
+            self.seq_lens['fixed_seq_len'],
+            sorted(self.load_frames_list.items())
+        ]
+        if self.use_ann_file:
+            manifest.append(
+                hashlib.md5(
+                    get(self.ann_file,
+                        backend_args=self.backend_args)).hexdigest())
+        folders = [self.data_prefix[self.search_key]]
+        folders += [self.data_prefix[key] for key in self._get_listed_keys()]
+        for folder in sorted(set(folders)):
+            entries = sorted(
+                self.file_backend.list_dir_or_file(dir_path=folder))
+            if isinstance(self.file_backend, LocalBackend):
+                entries = [(entry, os.stat(osp.join(folder,
+                                                    entry)).st_mtime_ns)
+                           for entry in entries]
+            manifest.append((folder, entries))
+        return hashlib.md5(repr(manifest).encode('utf-8')).hexdigest()
+
+    def _build_frame_index(self, manifest: str) -> FrameIndex:
+        """Scan folders and build the frame index."""
+
+        path_list = self._get_path_list()
+        self._set_seq_lens()
+        frames = {
+            key: [
+                self._get_frames_files(key,
+                                       osp.join(self.data_prefix[key], path))
+                for path in path_list
+            ]
+            for key in self._get_listed_keys()
+        }
+        seq_lens = {
+            name: seq_len
+            for name, seq_len in self.seq_lens.items()
+            if name != 'fixed_seq_len'
+        }
+        return FrameIndex.from_lists(path_list, seq_lens, frames, manifest)
+
+    def _load_frame_index(self) -> FrameIndex:
+        """Load the frame index from ``frame_index_file``, the index is
+        rebuilt by the main process if it is outdated."""
+
+        manifest = self._get_manifest()
+        frame_index = None
+        if is_main_process():
+            frame_index = FrameIndex.load(self.frame_index_file, manifest)
+            if frame_index is None:
+                print_log(
+                    'Building frame index '
+                    f'\'{self.frame_index_file}\'...', 'current')
+                self._build_frame_index(manifest).save(self.frame_index_file)
+        barrier()
+        if frame_index is None:
+            frame_index = FrameIndex.load(self.frame_index_file, manifest)
+        if frame_index is None:
+            # the index file is not shared by processes
+            frame_index = self._build_frame_index(manifest)
+
+        if self.seq_lens['fixed_seq_len'] is None:
+            self.seq_lens.update(frame_index.seq_lens)
+        frame_index.parse_fn = self._parse_data_info
+        return frame_index
+
     def _get_path_list(self):
         """Get list of paths from annotation file or folder of dataset.
 
@@ -322,24 +445,41 @@ class BasicFramesDataset(BaseDataset):
             num_frames = len(list(self.file_backend.list_dir_or_file(path)))
             self.seq_lens[key] = num_frames
 
-    def _get_frames_list(self, key, folder):
-        """Obtain list of frames.
+    def _get_frames_files(self, key, folder):
+        """Obtain the sorted names of frames.
 
         Args:
             key (str): The key of frames list, e.g. ``img``, ``gt``.
             folder (str): Folder of frames.
 
         Return:
-            list[str]: The paths list of frames.
+            list[str]: The names of frames.
         """
 
         if 'all' in self.load_frames_list[key]:
             # load all
             files = list(self.file_backend.list_dir_or_file(dir_path=folder))
         else:
-            files = self.load_frames_list[key]
+            files = list(self.load_frames_list[key])
 
         files.sort()
+        return files
+
+    def _get_frames_list(self, key, folder, files=None):
+        """Obtain list of frames.
+
+        Args:
+            key (str): The key of frames list, e.g. ``img``, ``gt``.
+            folder (str): Folder of frames.
+            files (list[str], optional): The sorted names of frames. If None,
+                obtained by ``_get_frames_files``. Default: None.
+
+        Return:
+            list[str]: The paths list of frames.
+        """
+
+        if files is None:
+            files = self._get_frames_files(key, folder)
         tmpl = self.filename_tmpl[key]
         files = [tmpl.format(file) for file in files]
         paths = [osp.join(folder, file) for file in files]
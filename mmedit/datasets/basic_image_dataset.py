@@ -6,6 +6,7 @@ from typing import Callable, List, Optional, Tuple, Union
 
 from mmengine.dataset import BaseDataset
 from mmengine.fileio import get_file_backend, list_from_file
+from PIL import Image
 
 from mmedit.registry import DATASETS
 
@@ -255,3 +256,26 @@ class BasicImageDataset(BaseDataset):
                 path_list.append(img_path)
 
         return path_list
+
+    def get_img_size(self,
+                     idx: int,
+                     key: Optional[str] = None) -> Tuple[int, int]:
+        """Get the size of an image of a sample by reading the header of the
+        image file, without decoding the image.
+
+        Args:
+            idx (int): The index of the sample.
+            key (str, optional): The key of the image, e.g., 'img' or 'gt'.
+                If None, use ``search_key``. Defaults to None.
+
+        Returns:
+            Tuple[int, int]: The height and width of the image.
+        """
+
+        if key is None:
+            key = self.search_key
+        path = self.get_data_info(idx)[f'{key}_path']
+        with self.file_backend.get_local_path(path) as local_path, \
+                Image.open(local_path) as img:
+            width, height = img.size
+        return height, width
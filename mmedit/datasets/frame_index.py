@@ -0,0 +1,235 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import json
+import os
+import os.path as osp
+import uuid
+from collections.abc import Sequence
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+_MAGIC = b'MMEDIT_FRAME_INDEX'
+_ALIGN = 64
+
+
+def _encode_strings(strings: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Encode strings to a utf-8 blob and the offsets of each string."""
+    encoded = [string.encode('utf-8') for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return blob, offsets
+
+
+def _decode_strings(blob: np.ndarray, offsets: np.ndarray, start: int,
+                    end: int) -> List[str]:
+    """Decode the ``start``-th to ``end``-th strings."""
+    return [
+        blob[offsets[idx]:offsets[idx + 1]].tobytes().decode('utf-8')
+        for idx in range(start, end)
+    ]
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class FrameIndex(Sequence):
+    """Compact frame index of video datasets, stored in a single file and
+    loaded with memory mapping.
+
+    The index keeps a table of sequences with their numbers of frames, the
+    path of each item, and optionally the names of the frames of each item.
+    Strings are stored as utf-8 blobs with offset arrays instead of Python
+    objects, so the index takes little memory, and the pages are shared by
+    dataloader workers after fork. Items are only parsed to data infos by
+    ``parse_fn`` when they are accessed.
+
+    Args:
+        arrays (Dict[str, np.ndarray]): The arrays of the index.
+        manifest (str): The hash of the manifest of the indexed directories.
+            Defaults to ''.
+        parse_fn (Callable, optional): The function to parse an item to data
+            info, called as ``parse_fn(path, frames)``. If None,
+            ``(path, frames)`` is returned. Defaults to None.
+        indices (np.ndarray, optional): Indices of the items in the subset.
+            If None, all items are used. Defaults to None.
+    """
+
+    def __init__(self,
+                 arrays: Dict[str, np.ndarray],
+                 manifest: str = '',
+                 parse_fn: Optional[Callable] = None,
+                 indices: Optional[np.ndarray] = None) -> None:
+        self.arrays = arrays
+        self.manifest = manifest
+        self.parse_fn = parse_fn
+        self.indices = indices
+        self.frame_keys = sorted(
+            name[len('frames_'):-len('_blob')] for name in arrays
+            if name.startswith('frames_') and name.endswith('_blob'))
+
+    @classmethod
+    def from_lists(cls,
+                   paths: List[str],
+                   seq_lens: Dict[str, int],
+                   frames: Dict[str, List[List[str]]] = dict(),
+                   manifest: str = '') -> 'FrameIndex':
+        """Build the index from Python lists.
+
+        Args:
+            paths (List[str]): The path of each item.
+            seq_lens (Dict[str, int]): The number of frames of each sequence.
+            frames (Dict[str, List[List[str]]]): The names of the frames of
+                each item for each key. Defaults to dict().
+            manifest (str): The hash of the manifest of the indexed
+                directories. Defaults to ''.
+
+        Returns:
+            FrameIndex: The built index.
+        """
+        arrays = dict()
+        arrays['paths_blob'], arrays['paths_offsets'] = _encode_strings(paths)
+        seq_names = list(seq_lens.keys())
+        arrays['seq_names_blob'], arrays['seq_names_offsets'] = \
+            _encode_strings(seq_names)
+        arrays['seq_lens'] = np.array([seq_lens[name] for name in seq_names],
+                                      dtype=np.int64)
+        for key, item_frames in frames.items():
+            assert len(item_frames) == len(paths)
+            arrays[f'frames_{key}_blob'], arrays[f'frames_{key}_offsets'] = \
+                _encode_strings([name for names in item_frames
+                                 for name in names])
+            item_offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+            np.cumsum([len(names) for names in item_frames],
+                      out=item_offsets[1:])
+            arrays[f'frames_{key}_items'] = item_offsets
+        return cls(arrays, manifest)
+
+    @property
+    def seq_lens(self) -> Dict[str, int]:
+        """Dict[str, int]: The number of frames of each sequence."""
+        offsets = self.arrays['seq_names_offsets']
+        names = _decode_strings(self.arrays['seq_names_blob'], offsets, 0,
+                                len(offsets) - 1)
+        return dict(zip(names, self.arrays['seq_lens'].tolist()))
+
+    def __len__(self) -> int:
+        if self.indices is not None:
+            return len(self.indices)
+        return len(self.arrays['paths_offsets']) - 1
+
+    def get_item(self, idx: int) -> Tuple[str, Dict[str, List[str]]]:
+        """Get the path and the names of the frames of an item.
+
+        Args:
+            idx (int): Index of the item.
+
+        Returns:
+            Tuple[str, Dict[str, List[str]]]: The path and the names of the
+            frames for each key.
+        """
+        if self.indices is not None:
+            idx = int(self.indices[idx])
+        elif idx < 0:
+            idx += len(self)
+        path = _decode_strings(self.arrays['paths_blob'],
+                               self.arrays['paths_offsets'], idx, idx + 1)[0]
+        frames = dict()
+        for key in self.frame_keys:
+            item_offsets = self.arrays[f'frames_{key}_items']
+            frames[key] = _decode_strings(self.arrays[f'frames_{key}_blob'],
+                                          self.arrays[f'frames_{key}_offsets'],
+                                          item_offsets[idx],
+                                          item_offsets[idx + 1])
+        return path, frames
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            indices = np.arange(len(self))
+            if self.indices is not None:
+                indices = self.indices
+            return FrameIndex(self.arrays, self.manifest, self.parse_fn,
+                              indices[idx])
+        if not -len(self) <= idx < len(self):
+            raise IndexError(f'Index {idx} out of range.')
+        path, frames = self.get_item(idx)
+        if self.parse_fn is None:
+            return path, frames
+        return self.parse_fn(path, frames)
+
+    def save(self, file_path: str) -> None:
+        """Save the index to a file. The file is written to a temporary file
+        and then renamed, so readers never see a partially written index.
+
+        Args:
+            file_path (str): Path of the index file.
+        """
+        assert self.indices is None, 'Cannot save a subset of the index.'
+        layout, offset = dict(), 0
+        for name, array in self.arrays.items():
+            array = np.ascontiguousarray(array)
+            layout[name] = [offset, array.dtype.str, list(array.shape)]
+            offset = _align(offset + array.nbytes)
+        header = json.dumps(dict(manifest=self.manifest,
+                                 arrays=layout)).encode('utf-8')
+        data_start = _align(len(_MAGIC) + 8 + len(header))
+
+        dir_name = osp.dirname(osp.abspath(file_path))
+        os.makedirs(dir_name, exist_ok=True)
+        tmp_path = f'{file_path}.{uuid.uuid4().hex}.tmp'
+        try:
+            with open(tmp_path, 'wb') as file:
+                file.write(_MAGIC)
+                file.write(np.uint64(len(header)).tobytes())
+                file.write(header)
+                for name, array in self.arrays.items():
+                    file.seek(data_start + layout[name][0])
+                    file.write(np.ascontiguousarray(array).tobytes())
+                file.truncate(data_start + offset)
+            os.replace(tmp_path, file_path)
+        finally:
+            if osp.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def load(cls,
+             file_path: str,
+             manifest: Optional[str] = None) -> Optional['FrameIndex']:
+        """Load the index from a file with memory mapping.
+
+        Args:
+            file_path (str): Path of the index file.
+            manifest (str, optional): The expected hash of the manifest. If
+                given and it does not match the saved one, None is returned.
+                Defaults to None.
+
+        Returns:
+            Optional[FrameIndex]: The loaded index. None if the file does not
+            exist, is invalid or is outdated.
+        """
+        if not osp.isfile(file_path):
+            return None
+        try:
+            buffer = np.memmap(file_path, dtype=np.uint8, mode='r')
+            if buffer[:len(_MAGIC)].tobytes() != _MAGIC:
+                return None
+            header_len = int(buffer[len(_MAGIC):len(_MAGIC) +
+                                    8].view(np.uint64)[0])
+            header_start = len(_MAGIC) + 8
+            header = json.loads(buffer[header_start:header_start +
+                                       header_len].tobytes().decode('utf-8'))
+        except (OSError, ValueError):
+            return None
+        if manifest is not None and header['manifest'] != manifest:
+            return None
+
+        data_start = _align(header_start + header_len)
+        arrays = dict()
+        for name, (offset, dtype, shape) in header['arrays'].items():
+            dtype = np.dtype(dtype)
+            start = data_start + offset
+            nbytes = int(np.prod(shape)) * dtype.itemsize
+            arrays[name] = buffer[start:start +
+                                  nbytes].view(dtype).reshape(shape)
+        return cls(arrays, header['manifest'])
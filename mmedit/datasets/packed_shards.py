@@ -0,0 +1,377 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import json
+import os
+import os.path as osp
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from mmengine.fileio import BaseStorageBackend, register_backend
+
+INDEX_FILE = 'index.jsonl'
+SHARD_TMPL = 'shard-{:05d}.bin'
+_ALIGN = 64
+
+
+def _normalize_key(path: str) -> str:
+    """Normalize a path to a key with '/' separators."""
+    return osp.normpath(path).replace(os.sep, '/')
+
+
+class PackedShardWriter:
+    """Append-only writer of packed shards.
+
+    The items of a sample (e.g., the GT and LQ images of a pair, or all the
+    frames of a clip) are written as a group of contiguous records in one
+    shard file, so they can be fetched with one sequential read. Every record
+    is described by a line of ``index.jsonl`` in the root directory, which
+    maps its key to the shard, offset, length, shape and codec.
+
+    The current shard is kept open, and it is synced to the disk only when it
+    is full or the writer is closed. Records are appended to the index only
+    after their data is synced, so an interrupted conversion can be resumed:
+    the keys which are already in the index are skipped, and the unindexed
+    bytes at the end of the last shard are overwritten.
+
+    .. code-block:: none
+
+        {root}/
+            index.jsonl        # one record per line
+            shard-00000.bin    # records of groups, aligned to 64 bytes
+            shard-00001.bin
+
+    Args:
+        root (str): The root directory of the shards.
+        shard_size (int): The maximum size of a shard in bytes. A group is
+            never split, so a shard can be larger if it contains a single
+            group larger than this. Defaults to 1GB.
+    """
+
+    def __init__(self, root: str, shard_size: int = 2**30) -> None:
+        self.root = root
+        self.shard_size = shard_size
+        os.makedirs(root, exist_ok=True)
+
+        self.keys = set()
+        self.num_groups = 0
+        self.shard_idx, self.shard_end = 0, 0
+        index_path = osp.join(root, INDEX_FILE)
+        if osp.isfile(index_path):
+            for record in _read_index(index_path):
+                self.keys.add(record['key'])
+                self.num_groups = max(self.num_groups, record['group'] + 1)
+                end = record['offset'] + record['length']
+                if (record['shard'], end) > (self.shard_idx, self.shard_end):
+                    self.shard_idx, self.shard_end = record['shard'], end
+        self.index_file = open(index_path, 'a')
+        self.shard_file = None
+        # records whose data is not synced yet
+        self._pending_records: List[dict] = []
+
+    def _open_shard(self) -> None:
+        """Open the current shard and drop the unindexed bytes at the end."""
+        shard_path = osp.join(self.root, SHARD_TMPL.format(self.shard_idx))
+        self.shard_file = open(shard_path,
+                               'r+b' if osp.exists(shard_path) else 'wb')
+        self.shard_file.seek(self.shard_end)
+        self.shard_file.truncate()
+
+    def _sync(self) -> None:
+        """Sync the current shard to the disk and index its records."""
+        if self.shard_file is None:
+            return
+        self.shard_file.flush()
+        os.fsync(self.shard_file.fileno())
+        for record in self._pending_records:
+            self.index_file.write(json.dumps(record) + '\n')
+        self.index_file.flush()
+        self._pending_records = []
+
+    def add(self, items: Sequence[Tuple[str, Union[bytes, np.ndarray],
+                                        str]]) -> bool:
+        """Add a group of items.
+
+        Args:
+            items (Sequence[Tuple[str, bytes | np.ndarray, str]]): The key,
+                data and codec of each item. The data is the encoded bytes of
+                the image, e.g., the content of a png file, or a decoded
+                array whose codec should be 'raw'.
+
+        Returns:
+            bool: Whether the group is written. The items whose keys are in
+            the index or repeated are skipped.
+        """
+        buffers, records, offset = [], [], 0
+        group_keys = set()
+        for key, data, codec in items:
+            key = _normalize_key(key)
+            if key in self.keys or key in group_keys:
+                continue
+            group_keys.add(key)
+            record = dict(key=key, codec=codec)
+            if isinstance(data, np.ndarray):
+                assert codec == 'raw', 'Arrays should be written as raw.'
+                record.update(shape=list(data.shape), dtype=data.dtype.str)
+                data = np.ascontiguousarray(data).tobytes()
+            else:
+                assert codec != 'raw', 'Raw records should be arrays.'
+            padding = (-offset) % _ALIGN
+            buffers.append(b'\0' * padding)
+            offset += padding
+            record.update(offset=offset, length=len(data))
+            buffers.append(data)
+            offset += len(data)
+            records.append(record)
+        if len(records) == 0:
+            return False
+
+        start = (-self.shard_end) % _ALIGN + self.shard_end
+        if self.shard_end > 0 and start + offset > self.shard_size:
+            # roll over to a new shard
+            self._sync()
+            if self.shard_file is not None:
+                self.shard_file.close()
+                self.shard_file = None
+            self.shard_idx, self.shard_end, start = self.shard_idx + 1, 0, 0
+        if self.shard_file is None:
+            self._open_shard()
+        buffers.insert(0, b'\0' * (start - self.shard_end))
+        self.shard_file.write(b''.join(buffers))
+        self.shard_end = start + offset
+
+        for record in records:
+            record.update(
+                offset=start + record['offset'],
+                shard=self.shard_idx,
+                group=self.num_groups)
+            self._pending_records.append(record)
+            self.keys.add(record['key'])
+        self.num_groups += 1
+        return True
+
+    def close(self) -> None:
+        """Sync the current shard and close the files."""
+        self._sync()
+        if self.shard_file is not None:
+            self.shard_file.close()
+            self.shard_file = None
+        self.index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _read_index(index_path: str) -> List[dict]:
+    """Read the records of an index, ignoring a partially written last
+    line."""
+    records = []
+    with open(index_path, 'r') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+    return records
+
+
+class PackedShardBackend(BaseStorageBackend):
+    """Storage backend reading images from packed shards written by
+    :class:`PackedShardWriter`.
+
+    A file path is mapped to the record whose key is the longest suffix of
+    the path, so the paths generated by the dataset can be used as is, no
+    matter where the data root is. Reading several files with
+    :meth:`get_many` coalesces the records which are contiguous in a shard
+    into one read. If the group of a record is not larger than
+    ``group_read_size``, the whole group is read and kept until another group
+    is read, so the other items of the sample (e.g., the LQ image after the
+    GT image) are served without I/O. Raw records are memory-mapped if
+    ``mmap`` is True.
+
+    The group cache is shared by the instances of the same ``db_path`` in a
+    process, e.g., the loading transforms of GT and LQ images.
+
+    Args:
+        db_path (str): The root directory of the shards.
+        mmap (bool): Whether to memory-map the shards for raw records.
+            Defaults to True.
+        group_read_size (int): The maximum size in bytes of a group which is
+            read as a whole. Defaults to 4MB.
+    """
+
+    # db_path -> (pid, group, buffer)
+    _group_caches: Dict[str, tuple] = dict()
+
+    def __init__(self,
+                 db_path: str,
+                 mmap: bool = True,
+                 group_read_size: int = 2**22) -> None:
+        self.db_path = db_path
+        self.mmap = mmap
+        self.group_read_size = group_read_size
+
+        self.records: Dict[str, dict] = dict()
+        self.groups: Dict[int, Tuple[int, int, int]] = dict()
+        for record in _read_index(osp.join(db_path, INDEX_FILE)):
+            self.records[record['key']] = record
+            end = record['offset'] + record['length']
+            shard, start, stop = self.groups.get(record['group'],
+                                                 (record['shard'],
+                                                  record['offset'], end))
+            self.groups[record['group']] = (shard, min(start,
+                                                       record['offset']),
+                                            max(stop, end))
+        self.max_depth = max([key.count('/') + 1 for key in self.records],
+                             default=0)
+
+        # file handles are opened lazily in each worker process
+        self._pid = None
+        self._files = dict()
+        self._mmaps = dict()
+
+    def lookup(self, filepath: str) -> dict:
+        """Find the record of a file path.
+
+        Args:
+            filepath (str): Path of the file.
+
+        Returns:
+            dict: The record.
+        """
+        parts = _normalize_key(str(filepath)).split('/')
+        for start in range(max(0, len(parts) - self.max_depth), len(parts)):
+            key = '/'.join(parts[start:])
+            if key in self.records:
+                return self.records[key]
+        raise FileNotFoundError(f'{filepath} is not found in packed shards '
+                                f'\'{self.db_path}\'.')
+
+    def _check_pid(self) -> None:
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._files, self._mmaps = dict(), dict()
+
+    def _read(self, shard: int, offset: int, length: int) -> bytes:
+        """Read a byte range of a shard."""
+        if shard not in self._files:
+            self._files[shard] = open(
+                osp.join(self.db_path, SHARD_TMPL.format(shard)), 'rb')
+        file = self._files[shard]
+        file.seek(offset)
+        return file.read(length)
+
+    def _get_mmap(self, shard: int) -> np.memmap:
+        if shard not in self._mmaps:
+            self._mmaps[shard] = np.memmap(
+                osp.join(self.db_path, SHARD_TMPL.format(shard)),
+                dtype=np.uint8,
+                mode='r')
+        return self._mmaps[shard]
+
+    def _read_group(self, group: int) -> Optional[memoryview]:
+        """Read a whole group, or return None if it is too large."""
+        pid, cached_group, buffer = self._group_caches.get(
+            self.db_path, (None, None, None))
+        if pid == os.getpid() and cached_group == group:
+            return buffer
+        shard, start, stop = self.groups[group]
+        if stop - start > self.group_read_size:
+            return None
+        buffer = memoryview(self._read(shard, start, stop - start))
+        self._group_caches[self.db_path] = (os.getpid(), group, buffer)
+        return buffer
+
+    @staticmethod
+    def _to_value(record: dict,
+                  buffer: Union[memoryview, np.ndarray],
+                  offset: int = 0) -> Union[bytes, np.ndarray]:
+        """Get the value of a record from a buffer starting at the shard
+        offset ``offset``."""
+        start = record['offset'] - offset
+        value = buffer[start:start + record['length']]
+        if record['codec'] == 'raw':
+            array = np.frombuffer(
+                value, dtype=np.uint8) if isinstance(value,
+                                                     memoryview) else value
+            return array.view(record['dtype']).reshape(record['shape'])
+        return bytes(value)
+
+    def get_many(self,
+                 filepaths: Sequence[str]) -> List[Union[bytes, np.ndarray]]:
+        """Read several files with as few reads as possible.
+
+        Args:
+            filepaths (Sequence[str]): Paths of the files.
+
+        Returns:
+            List[bytes | np.ndarray]: The encoded bytes of each file, or a
+            read-only array if the record is raw.
+        """
+        self._check_pid()
+        records = [self.lookup(filepath) for filepath in filepaths]
+        values: List[Optional[Union[bytes,
+                                    np.ndarray]]] = [None] * len(records)
+
+        pending = []
+        for idx, record in enumerate(records):
+            if record['codec'] == 'raw' and self.mmap:
+                values[idx] = self._to_value(record,
+                                             self._get_mmap(record['shard']))
+                continue
+            buffer = self._read_group(record['group'])
+            if buffer is not None:
+                values[idx] = self._to_value(record, buffer,
+                                             self.groups[record['group']][1])
+            else:
+                pending.append(idx)
+
+        # coalesce the contiguous records of the same shard
+        pending.sort(key=lambda i: (records[i]['shard'], records[i]['offset']))
+        spans: List[List[int]] = []
+        for idx in pending:
+            record = records[idx]
+            if spans:
+                last = records[spans[-1][-1]]
+                gap = record['offset'] - last['offset'] - last['length']
+                if last['shard'] == record['shard'] and 0 <= gap < _ALIGN:
+                    spans[-1].append(idx)
+                    continue
+            spans.append([idx])
+        for span in spans:
+            first, last = records[span[0]], records[span[-1]]
+            start = first['offset']
+            buffer = memoryview(
+                self._read(first['shard'], start,
+                           last['offset'] + last['length'] - start))
+            for idx in span:
+                values[idx] = self._to_value(records[idx], buffer, start)
+        return values
+
+    def get(self, filepath: str) -> Union[bytes, np.ndarray]:
+        """Read a file.
+
+        Args:
+            filepath (str): Path of the file.
+
+        Returns:
+            bytes | np.ndarray: The encoded bytes of the file, or a read-only
+            array if the record is raw.
+        """
+        return self.get_many([filepath])[0]
+
+    def get_text(self, filepath: str, encoding: str = 'utf-8') -> str:
+        """Read a file as text.
+
+        Args:
+            filepath (str): Path of the file.
+            encoding (str): The encoding of the file. Defaults to 'utf-8'.
+
+        Returns:
+            str: The content of the file.
+        """
+        return self.get(filepath).decode(encoding)
+
+
+register_backend('packed', PackedShardBackend)
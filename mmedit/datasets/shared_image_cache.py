@@ -0,0 +1,186 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import hashlib
+import multiprocessing as mp
+import os
+import os.path as osp
+import shutil
+import tempfile
+import uuid
+import weakref
+from typing import Optional, Union
+
+import numpy as np
+
+_STATS = ['hits', 'misses', 'evictions', 'num_entries', 'size']
+
+
+def _remove_cache_dir(cache_dir: str, owner_pid: int) -> None:
+    """Remove the cache directory in the process which created it, not in
+    the forked workers."""
+    if os.getpid() == owner_pid:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+class SharedImageCache:
+    """Image cache shared by the dataloader workers.
+
+    Each entry is a file in a directory of shared memory (``/dev/shm`` by
+    default), so it is written once by any worker and read by all the others
+    without copying it to every process. With ``mode='pixels'``, decoded
+    images are stored as ``.npy`` files and returned as read-only memory-
+    mapped arrays, so neither I/O nor decoding is repeated. With
+    ``mode='bytes'``, the encoded content of files is stored.
+
+    The cache is created in the main process before the workers are started.
+    The directory is removed when the cache is garbage collected in that
+    process. If ``max_size`` is given, the least recently used entries are
+    evicted to keep the total size under it. The counters of hits, misses
+    and evictions are kept in shared memory and summed over the workers, see
+    :meth:`stats`.
+
+    Args:
+        max_size (int, optional): The maximum total size of entries in bytes.
+            If None, the cache is unbounded. Defaults to None.
+        mode (str): What to cache, candidates are 'bytes' and 'pixels'.
+            Defaults to 'pixels'.
+        cache_dir (str, optional): The parent directory of the cache
+            directory. If None, '/dev/shm' is used if it exists, otherwise
+            the temporary directory. Defaults to None.
+    """
+
+    def __init__(self,
+                 max_size: Optional[int] = None,
+                 mode: str = 'pixels',
+                 cache_dir: Optional[str] = None) -> None:
+        assert mode in [
+            'bytes', 'pixels'
+        ], (f'mode should be "bytes" or "pixels", but got {mode}.')
+        self.max_size = max_size
+        self.mode = mode
+        if cache_dir is None:
+            cache_dir = '/dev/shm' if osp.isdir(
+                '/dev/shm') else tempfile.gettempdir()
+        self.cache_dir = tempfile.mkdtemp(
+            prefix='mmedit_image_cache_', dir=cache_dir)
+        weakref.finalize(self, _remove_cache_dir, self.cache_dir, os.getpid())
+
+        self._lock = mp.Lock()
+        self._stats = mp.Array('q', len(_STATS))
+
+    def _path(self, key: str) -> str:
+        suffix = '.npy' if self.mode == 'pixels' else '.bin'
+        return osp.join(self.cache_dir,
+                        hashlib.md5(key.encode('utf-8')).hexdigest() + suffix)
+
+    def _count(self, name: str) -> None:
+        with self._stats.get_lock():
+            self._stats[_STATS.index(name)] += 1
+
+    def get(
+        self,
+        key: str,
+        default: Optional[Union[bytes, np.ndarray]] = None
+    ) -> Optional[Union[bytes, np.ndarray]]:
+        """Get an entry.
+
+        Args:
+            key (str): The key, e.g., the path of the image.
+            default (bytes | np.ndarray, optional): The value returned if the
+                key is missing. Defaults to None.
+
+        Returns:
+            bytes | np.ndarray | None: The encoded content, or a read-only
+            image if ``mode`` is 'pixels'.
+        """
+        path = self._path(key)
+        try:
+            if self.mode == 'pixels':
+                value = np.load(path, mmap_mode='r')
+            else:
+                with open(path, 'rb') as f:
+                    value = f.read()
+            # the modification time is used as the time of the last access
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            self._count('misses')
+            return default
+        self._count('hits')
+        return value
+
+    def __setitem__(self, key: str, value: Union[bytes, np.ndarray]) -> None:
+        """Add an entry. Entries larger than ``max_size`` are skipped."""
+        if self.mode == 'pixels':
+            assert isinstance(
+                value,
+                np.ndarray), ('Only images can be cached with mode "pixels".')
+        path = self._path(key)
+        if osp.exists(path):
+            return
+
+        tmp_path = osp.join(self.cache_dir, f'{uuid.uuid4().hex}.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                if self.mode == 'pixels':
+                    np.save(f, value)
+                else:
+                    f.write(value)
+            size = osp.getsize(tmp_path)
+            if self.max_size is not None and size > self.max_size:
+                return
+            with self._lock:
+                if osp.exists(path):
+                    return
+                if self.max_size is not None and self._stats[_STATS.index(
+                        'size')] + size > self.max_size:
+                    # evict more than needed to amortize the scan of entries
+                    self._evict(int(self.max_size * 0.9) - size)
+                os.replace(tmp_path, path)
+                with self._stats.get_lock():
+                    self._stats[_STATS.index('num_entries')] += 1
+                    self._stats[_STATS.index('size')] += size
+        finally:
+            if osp.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _evict(self, target_size: int) -> None:
+        """Remove the least recently used entries until the total size is
+        not larger than ``target_size``."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith('.tmp'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, entry.path, stat.st_size))
+        entries.sort()
+        total_size = sum(entry[2] for entry in entries)
+        num_evicted = 0
+        for _, path, size in entries:
+            if total_size <= target_size:
+                break
+            # arrays which are memory-mapped by readers stay valid
+            os.remove(path)
+            total_size -= size
+            num_evicted += 1
+        with self._stats.get_lock():
+            self._stats[_STATS.index('evictions')] += num_evicted
+            self._stats[_STATS.index(
+                'num_entries')] = len(entries) - num_evicted
+            self._stats[_STATS.index('size')] = total_size
+
+    def stats(self) -> dict:
+        """Get the counters summed over the processes.
+
+        Returns:
+            dict: The numbers of hits, misses and evictions, and the number
+            and total size in bytes of the entries.
+        """
+        with self._stats.get_lock():
+            return dict(zip(_STATS, self._stats[:]))
+
+    def clear(self) -> None:
+        """Remove all the entries and reset the counters."""
+        with self._lock:
+            for entry in os.scandir(self.cache_dir):
+                if not entry.name.endswith('.tmp'):
+                    os.remove(entry.path)
+            with self._stats.get_lock():
+                self._stats[:] = [0] * len(_STATS)
@@ -0,0 +1,121 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import torch
+from torch.utils.data import BatchSampler, Sampler
+
+from mmedit.registry import DATA_SAMPLERS
+
+
+@DATA_SAMPLERS.register_module()
+class SizeBucketBatchSampler(BatchSampler):
+    """A batch sampler grouping images of similar sizes into a batch.
+
+    Images of a batch are padded to the maximum size of the batch by the data
+    preprocessor, which wastes computation on test sets of images of variable
+    sizes, e.g., Set14 and Urban100. This sampler reads the indices from
+    ``sampler`` in pools of ``pool_size`` batches, sorts the indices of a pool
+    by the orientation, height and width of the images, and splits them into
+    batches, so that images in a batch have similar sizes.
+
+    The sizes of images are read from the headers of image files by
+    ``sampler.dataset.get_img_size``, see
+    :meth:`BasicImageDataset.get_img_size`.
+
+    Args:
+        sampler (Sampler): Base sampler.
+        batch_size (int): Size of mini-batch.
+        drop_last (bool): If ``True``, the sampler will drop the last batch
+            if its size would be less than ``batch_size``. Defaults to False.
+        size_key (str, optional): The key of images whose sizes are used,
+            e.g., 'img' or 'gt'. If None, use the ``search_key`` of the
+            dataset. Defaults to None.
+        pool_size (int, optional): Number of batches sorted together. If
+            None, all the indices of an epoch are sorted together.
+            Defaults to None.
+    """
+
+    def __init__(self,
+                 sampler: Sampler,
+                 batch_size: int,
+                 drop_last: bool = False,
+                 size_key: Optional[str] = None,
+                 pool_size: Optional[int] = None) -> None:
+        if not isinstance(sampler, Sampler):
+            raise TypeError('sampler should be an instance of ``Sampler``, '
+                            f'but got {sampler}')
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError('batch_size should be a positive integer value, '
+                             f'but got batch_size={batch_size}')
+        if pool_size is not None and (not isinstance(pool_size, int)
+                                      or pool_size <= 0):
+            raise ValueError('pool_size should be a positive integer value '
+                             f'or None, but got pool_size={pool_size}')
+        self.sampler = sampler
+        self.batch_size = batch_size
+        self.drop_last = drop_last
+        self.size_key = size_key
+        self.pool_size = pool_size
+        # (height, width) of images read from the dataset
+        self._sizes: Dict[int, Tuple[int, int]] = dict()
+
+    def get_size(self, idx: int) -> Tuple[int, int]:
+        """Get the (height, width) of an image, which is cached.
+
+        Args:
+            idx (int): Index of the sample in the dataset.
+
+        Returns:
+            Tuple[int, int]: The height and width of the image.
+        """
+        if idx not in self._sizes:
+            self._sizes[idx] = self.sampler.dataset.get_img_size(
+                idx, self.size_key)
+        return self._sizes[idx]
+
+    def _sort_key(self, idx: int) -> Tuple[bool, int, int]:
+        h, w = self.get_size(idx)
+        # separate portrait images from landscape ones
+        return h > w, h, w
+
+    def _split_pool(self, pool: List[int],
+                    generator: Optional[torch.Generator]) -> List[List[int]]:
+        pool = sorted(pool, key=self._sort_key)
+        batches = [
+            pool[i:i + self.batch_size]
+            for i in range(0, len(pool), self.batch_size)
+        ]
+        if generator is not None:
+            order = torch.randperm(len(batches), generator=generator)
+            batches = [batches[i] for i in order.tolist()]
+        return batches
+
+    def __iter__(self) -> Iterator[List[int]]:
+        generator = None
+        if getattr(self.sampler, 'shuffle', False):
+            # shuffle the batches as the base sampler, which is deterministic
+            # based on the seed and epoch
+            generator = torch.Generator()
+            generator.manual_seed(
+                getattr(self.sampler, 'seed', 0) +
+                getattr(self.sampler, 'epoch', 0))
+        pool_len = None
+        if self.pool_size is not None:
+            pool_len = self.pool_size * self.batch_size
+
+        pool = []
+        for idx in self.sampler:
+            pool.append(idx)
+            if len(pool) == pool_len:
+                yield from self._split_pool(pool, generator)
+                pool = []
+        if pool:
+            for batch in self._split_pool(pool, generator):
+                if len(batch) == self.batch_size or not self.drop_last:
+                    yield batch
+
+    def __len__(self) -> int:
+        if self.drop_last:
+            return len(self.sampler) // self.batch_size
+        else:
+            return (len(self.sampler) + self.batch_size - 1) // self.batch_size
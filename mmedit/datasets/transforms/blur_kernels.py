@@ -2,9 +2,23 @@
 # Reference: https://github.com/xinntao/BasicSR/blob/master/basicsr/data/degradations.py  # noqa
 # Original licence: Copyright (c) 2020 xinntao, under the Apache 2.0 license.
 
+from functools import lru_cache
+
+import cv2
 import numpy as np
+import torch
+import torch.nn.functional as F
 from scipy import special
 
+try:
+    # ``torch.fft`` is a function instead of a module before PyTorch 1.7,
+    # and the module should be imported explicitly in PyTorch 1.7
+    import torch.fft  # noqa: F401
+except ImportError:
+    pass
+
+HAS_TORCH_FFT = hasattr(torch.fft, 'rfft2')
+
 
 def get_rotated_sigma_matrix(sig_x, sig_y, theta):
     """Calculate the rotated sigma matrix (two dimensional matrix).
@@ -50,6 +64,28 @@ def _mesh_grid(kernel_size):
     return xy_grid, x_grid, y_grid
 
 
+@lru_cache(maxsize=None)
+def _cached_mesh_grid(kernel_size):
+    """Get the read-only mesh grid of x- and y-coordinates, which is cached
+    for each kernel size.
+
+    Args:
+        kernel_size (int): The size of the kernel.
+
+    Returns:
+        x_grid (np.ndarray): x-coordinates with shape
+            (kernel_size, kernel_size).
+        y_grid (np.ndarray): y-coordinates with shape
+            (kernel_size, kernel_size).
+    """
+
+    _, x_grid, y_grid = _mesh_grid(kernel_size)
+    x_grid.flags.writeable = False
+    y_grid.flags.writeable = False
+
+    return x_grid, y_grid
+
+
 def calculate_gaussian_pdf(sigma_matrix, grid):
     """Calculate PDF of the bivariate Gaussian distribution.
 
@@ -208,6 +244,100 @@ def bivariate_plateau(kernel_size,
     return kernel
 
 
+def batched_bivariate_kernels(kernel_size,
+                              sig_x,
+                              sig_y=None,
+                              theta=None,
+                              beta=None,
+                              kernel_type='gaussian'):
+    """Generate a batch of bivariate kernels at once.
+
+    The quadratic form of the inverse sigma matrices is computed in closed
+    form on the cached mesh grid, instead of building and inverting the sigma
+    matrix of each kernel. If ``sig_y`` or ``theta`` is None, the kernels are
+    isotropic.
+
+    Args:
+        kernel_size (int): The size of the kernels.
+        sig_x (np.ndarray): Standard deviations along the horizontal
+            direction, with shape (N, ).
+        sig_y (np.ndarray, optional): Standard deviations along the vertical
+            direction, with shape (N, ). Default: None.
+        theta (np.ndarray, optional): Rotations in radian, with shape (N, ).
+            Default: None.
+        beta (np.ndarray, optional): Shape parameters with shape (N, ). It
+            is required by 'generalized' and 'plateau' kernels.
+            Default: None.
+        kernel_type (str, optional): Type of the kernels, candidates are
+            'gaussian', 'generalized' (generalized Gaussian) and 'plateau'.
+            Default: 'gaussian'.
+
+    Returns:
+        kernels (np.ndarray): Normalized kernels with shape (N, K, K), where
+            K is the kernel size.
+    """
+
+    x_grid, y_grid = _cached_mesh_grid(kernel_size)
+    sig_x = np.asarray(sig_x, dtype=np.float64).reshape(-1, 1, 1)
+    sig_y = sig_x if sig_y is None else np.asarray(
+        sig_y, dtype=np.float64).reshape(-1, 1, 1)
+    theta = 0 if theta is None else np.asarray(
+        theta, dtype=np.float64).reshape(-1, 1, 1)
+
+    # inverse of R diag(sig_x^2, sig_y^2) R^T is R diag(...)^-1 R^T
+    cos, sin = np.cos(theta), np.sin(theta)
+    inv_x, inv_y = 1 / sig_x**2, 1 / sig_y**2
+    quadratic = (cos**2 * inv_x + sin**2 * inv_y) * x_grid**2 + \
+        2 * cos * sin * (inv_x - inv_y) * x_grid * y_grid + \
+        (sin**2 * inv_x + cos**2 * inv_y) * y_grid**2
+
+    if kernel_type == 'gaussian':
+        kernels = np.exp(-0.5 * quadratic)
+    else:
+        beta = np.asarray(beta, dtype=np.float64).reshape(-1, 1, 1)
+        if kernel_type == 'generalized':
+            kernels = np.exp(-0.5 * np.power(quadratic, beta))
+        elif kernel_type == 'plateau':
+            kernels = np.reciprocal(np.power(quadratic, beta) + 1)
+        else:
+            raise ValueError(f'Unsupported kernel type {kernel_type}.')
+
+    return kernels / np.sum(kernels, axis=(1, 2), keepdims=True)
+
+
+def batched_circular_lowpass_kernels(kernel_size, omega, pad_to=0):
+    """Generate a batch of 2D Sinc filters at once.
+
+    Args:
+        kernel_size (int): The size of the kernels. It must be an odd number.
+        omega (np.ndarray): The cutoff frequencies in radian with shape
+            (N, ).
+        pad_to (int, optional): The size of the padded kernels. It must be
+            odd or zero. Default: 0.
+
+    Returns:
+        kernels (np.ndarray): Normalized Sinc kernels with shape (N, K, K),
+            where K is the kernel size or ``pad_to``.
+    """
+
+    assert kernel_size % 2 == 1, 'Kernel size must be an odd number.'
+    x_grid, y_grid = _cached_mesh_grid(kernel_size)
+    omega = np.asarray(omega, dtype=np.float64).reshape(-1, 1, 1)
+    radius = np.sqrt(x_grid**2 + y_grid**2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        kernels = omega * special.j1(omega * radius) / (2 * np.pi * radius)
+    center = (kernel_size - 1) // 2
+    kernels[:, center, center] = omega[:, 0, 0]**2 / (4 * np.pi)
+    kernels = kernels / np.sum(kernels, axis=(1, 2), keepdims=True)
+
+    if pad_to > kernel_size:
+        pad_size = (pad_to - kernel_size) // 2
+        kernels = np.pad(kernels,
+                         ((0, 0), (pad_size, pad_size), (pad_size, pad_size)))
+
+    return kernels
+
+
 def random_bivariate_gaussian_kernel(kernel_size,
                                      sigma_x_range,
                                      sigma_y_range,
@@ -534,3 +664,187 @@ def random_mixed_kernels(kernel_list,
         kernel = random_circular_lowpass_kernel(omega_range, kernel_size)
 
     return kernel
+
+
+def random_mixed_kernels_batch(num_kernels,
+                               kernel_list,
+                               kernel_prob,
+                               kernel_size,
+                               sigma_x_range=[0.6, 5],
+                               sigma_y_range=[0.6, 5],
+                               rotation_range=[-np.pi, np.pi],
+                               beta_gaussian_range=[0.5, 8],
+                               beta_plateau_range=[1, 2],
+                               omega_range=[0, np.pi],
+                               noise_range=None):
+    """Randomly generate a batch of kernels at once.
+
+    Each kernel is sampled independently from the same distribution as
+    :func:`random_mixed_kernels`, but the parameters of all kernels are drawn
+    with vectorized calls and the kernels of each type are generated together.
+
+    Args:
+        num_kernels (int): The number of kernels.
+        kernel_list (list): A list of kernel types. Choices are
+            'iso', 'aniso', 'generalized_iso', 'generalized_aniso',
+            'plateau_iso', 'plateau_aniso', 'sinc'.
+        kernel_prob (list): The probability of choosing of the corresponding
+            kernel.
+        kernel_size (int): The size of the kernel.
+        sigma_x_range (list, optional): The range of the standard deviation
+            along  the horizontal direction. Default: (0.6, 5).
+        sigma_y_range (list, optional): The range of the standard deviation
+            along the vertical direction. Default: (0.6, 5).
+        rotation_range (list, optional): Range of rotation in radian.
+            Default: (-np.pi, np.pi).
+        beta_gaussian_range (list, optional): The range of the shape parameter
+            for generalized Gaussian. Default: (0.5, 8).
+        beta_plateau_range (list, optional): The range of the shape parameter
+            for plateau kernel. Default: (1, 2).
+        omega_range (list, optional): The range of omega used in Sinc kernel.
+            Default: (0, np.pi).
+        noise_range (list, optional): Multiplicative kernel noise. It is not
+            applied to plateau and Sinc kernels. Default: None.
+
+    Returns:
+        kernels (np.ndarray): The kernels with shape (N, K, K), where K is the
+            kernel size.
+    """
+
+    assert kernel_size % 2 == 1, 'Kernel size must be an odd number.'
+    assert sigma_x_range[0] <= sigma_x_range[1], 'Wrong sigma_x_range.'
+    kernel_types = np.random.choice(
+        kernel_list, size=num_kernels, p=kernel_prob)
+    sigma_x = np.random.uniform(sigma_x_range[0], sigma_x_range[1],
+                                num_kernels)
+    sigma_y = np.random.uniform(sigma_y_range[0], sigma_y_range[1],
+                                num_kernels)
+    rotation = np.random.uniform(rotation_range[0], rotation_range[1],
+                                 num_kernels)
+    # the shape parameter is below or above 1 with the same probability
+    below_one = np.random.uniform(size=num_kernels) <= 0.5
+    beta_gaussian = np.where(
+        below_one, np.random.uniform(beta_gaussian_range[0], 1, num_kernels),
+        np.random.uniform(1, beta_gaussian_range[1], num_kernels))
+    beta_plateau = np.where(
+        below_one, np.random.uniform(beta_plateau_range[0], 1, num_kernels),
+        np.random.uniform(1, beta_plateau_range[1], num_kernels))
+    omega = np.random.uniform(omega_range[0], omega_range[-1], num_kernels)
+
+    kernels = np.empty((num_kernels, kernel_size, kernel_size))
+    for kernel_type in set(kernel_types):
+        if kernel_type not in [
+                'iso', 'aniso', 'generalized_iso', 'generalized_aniso',
+                'plateau_iso', 'plateau_aniso', 'sinc'
+        ]:
+            raise ValueError(f'Unsupported kernel type {kernel_type}.')
+        mask = kernel_types == kernel_type
+        if kernel_type == 'sinc':
+            kernels[mask] = batched_circular_lowpass_kernels(
+                kernel_size, omega[mask])
+            continue
+        family, _, isotropy = kernel_type.rpartition('_')
+        family = dict(
+            generalized='generalized',
+            plateau='plateau').get(family, 'gaussian')
+        beta = dict(
+            generalized=beta_gaussian, plateau=beta_plateau).get(family)
+        is_isotropic = isotropy == 'iso'
+        if not is_isotropic:
+            assert sigma_y_range[0] <= sigma_y_range[1], \
+                'Wrong sigma_y_range.'
+            assert rotation_range[0] <= rotation_range[1], \
+                'Wrong rotation_range.'
+        kernels[mask] = batched_bivariate_kernels(
+            kernel_size,
+            sigma_x[mask],
+            None if is_isotropic else sigma_y[mask],
+            None if is_isotropic else rotation[mask],
+            None if beta is None else beta[mask],
+            kernel_type=family)
+
+    # add multiplicative noise
+    if noise_range is not None:
+        assert noise_range[0] <= noise_range[1], 'Wrong noise range.'
+        mask = ~np.char.startswith(kernel_types.astype(str), 'plateau') & (
+            kernel_types != 'sinc')
+        noise = np.random.uniform(
+            noise_range[0], noise_range[1], size=kernels[mask].shape)
+        kernels[mask] = kernels[mask] * noise
+        kernels = kernels / np.sum(kernels, axis=(1, 2), keepdims=True)
+
+    return kernels
+
+
+def _fft_size(size):
+    """Get the smallest size not less than ``size`` whose prime factors are
+    2, 3 and 5, for which FFT is fast."""
+    while True:
+        remainder = size
+        for factor in (2, 3, 5):
+            while remainder % factor == 0:
+                remainder //= factor
+        if remainder == 1:
+            return size
+        size += 1
+
+
+def batched_filter2d(imgs, kernels, fft_min_kernel_size=13):
+    """Filter a batch of images, each with its own kernel.
+
+    This is equivalent to applying ``cv2.filter2D(img, -1, kernel)`` (i.e.,
+    correlation with reflect-101 borders) to each image. Small kernels are
+    applied with ``cv2.filter2D`` directly, which is the fastest. For kernels
+    not smaller than ``fft_min_kernel_size``, for which ``cv2.filter2D``
+    switches to a per-image DFT, the images are filtered together by one
+    batched FFT, unless ``torch.fft.rfft2`` is not available in PyTorch.
+
+    Args:
+        imgs (list[np.ndarray]): Images with the same shape (H, W) or
+            (H, W, C).
+        kernels (np.ndarray): Kernels with shape (N, K, K).
+        fft_min_kernel_size (int, optional): The minimum kernel size of
+            filtering with the batched FFT. Default: 13.
+
+    Returns:
+        list[np.ndarray]: Filtered images with the same dtype as the inputs.
+    """
+
+    kernel_size = kernels.shape[-1]
+    shape = imgs[0].shape
+    pad = kernel_size // 2
+    if not HAS_TORCH_FFT or kernel_size < fft_min_kernel_size or pad >= min(
+            shape[:2]) or any(img.shape != shape for img in imgs):
+        return [
+            cv2.filter2D(img, -1, kernel)
+            for img, kernel in zip(imgs, kernels)
+        ]
+
+    dtype = imgs[0].dtype
+    compute_dtype = torch.float64 if dtype == np.float64 else torch.float32
+    # (N, H, W, C) -> (N, C, H, W)
+    batch = torch.from_numpy(np.stack(imgs)).to(compute_dtype)
+    if batch.ndim == 3:
+        batch = batch[..., None]
+    batch = batch.permute(0, 3, 1, 2)
+    batch = F.pad(batch, (pad, pad, pad, pad), mode='reflect')
+
+    # the convolution with the flipped kernels is the correlation
+    size = (_fft_size(batch.shape[2]), _fft_size(batch.shape[3]))
+    kernels = torch.from_numpy(np.ascontiguousarray(
+        kernels[:, ::-1, ::-1])).to(compute_dtype)
+    spectrum = torch.fft.rfft2(
+        batch, s=size) * torch.fft.rfft2(
+            kernels, s=size)[:, None]
+    output = torch.fft.irfft2(spectrum, s=size)
+    output = output[..., 2 * pad:2 * pad + shape[0],
+                    2 * pad:2 * pad + shape[1]]
+    output = np.ascontiguousarray(output.permute(0, 2, 3, 1).numpy())
+    if len(shape) == 2:
+        output = output[..., 0]
+
+    if np.issubdtype(dtype, np.integer):
+        info = np.iinfo(dtype)
+        output = np.clip(np.rint(output), info.min, info.max)
+
+    return list(output.astype(dtype, copy=False))
@@ -34,11 +34,15 @@ def check_if_image(value: Any) -> bool:
     return is_image
 
 
-def image_to_tensor(img):
+def image_to_tensor(img, channels_last=False):
     """Trans image to tensor.
 
     Args:
         img (np.ndarray): The original image.
+        channels_last (bool): Whether to keep the (H, W, C) memory layout of
+            the image. If True, the output is a (C, H, W) view of the image
+            with channels-last strides, which shares the memory with ``img``
+            if it is contiguous. Defaults to False.
 
     Returns:
         Tensor: The output tensor.
@@ -46,18 +50,53 @@ def image_to_tensor(img):
 
     if len(img.shape) < 3:
         img = np.expand_dims(img, -1)
+    if channels_last:
+        return to_tensor(np.ascontiguousarray(img)).permute(2, 0, 1)
     img = np.ascontiguousarray(img.transpose(2, 0, 1))
     tensor = to_tensor(img)
 
     return tensor
 
 
-def images_to_tensor(value):
+def frames_to_tensor(frames, channels_last=False):
+    """Trans a sequence of frames to tensor.
+
+    The frames are copied into one preallocated (T, C, H, W) buffer, instead
+    of transposing each frame and then stacking the frames.
+
+    Args:
+        frames (list[np.ndarray] | Tuple[np.ndarray]): The frames with the
+            same shape and dtype.
+        channels_last (bool): Whether to keep the (T, H, W, C) memory layout
+            of the frames. If True, the output is a (T, C, H, W) view of the
+            buffer with channels-last strides. Defaults to False.
+
+    Returns:
+        Tensor: The output tensor.
+    """
+
+    frames = [np.expand_dims(v, -1) if len(v.shape) < 3 else v for v in frames]
+    h, w, c = frames[0].shape
+    if channels_last:
+        buffer = np.empty((len(frames), h, w, c), dtype=frames[0].dtype)
+        for i, frame in enumerate(frames):
+            buffer[i] = frame
+        return to_tensor(buffer).permute(0, 3, 1, 2)
+
+    buffer = np.empty((len(frames), c, h, w), dtype=frames[0].dtype)
+    for i, frame in enumerate(frames):
+        buffer[i] = frame.transpose(2, 0, 1)
+    return to_tensor(buffer)
+
+
+def images_to_tensor(value, channels_last=False):
     """Trans image and sequence of frames to tensor.
 
     Args:
         value (np.ndarray | list[np.ndarray] | Tuple[np.ndarray]):
             The original image or list of frames.
+        channels_last (bool): Whether to keep the channels-last memory layout
+            of the images, see :func:`image_to_tensor`. Defaults to False.
 
     Returns:
         Tensor: The output tensor.
@@ -65,10 +104,14 @@ def images_to_tensor(value):
 
     if isinstance(value, (List, Tuple)):
         # sequence of frames
-        frames = [image_to_tensor(v) for v in value]
+        if all(isinstance(v, np.ndarray)
+               for v in value) and len(set(
+                   (v.shape, v.dtype) for v in value)) == 1:
+            return frames_to_tensor(value, channels_last)
+        frames = [image_to_tensor(v, channels_last) for v in value]
         tensor = torch.stack(frames, dim=0)
     elif isinstance(value, np.ndarray):
-        tensor = image_to_tensor(value)
+        tensor = image_to_tensor(value, channels_last)
     else:
         # Maybe the data has been converted to Tensor.
         tensor = to_tensor(value)
@@ -108,13 +151,22 @@ class PackEditInputs(BaseTransform):
         This is useful when keys of the input dict is not fixed.
         Please be careful when using this function, because we do not
         Defaults to False.
+    channels_last (bool): Whether to keep the (H, W, C) memory layout of the
+        images, i.e., the packed (C, H, W) or (T, C, H, W) tensors are views
+        with channels-last strides, which saves the transposing copies.
+        Defaults to False.
+    share_input (bool): Whether ``input`` of EditDataSample references the
+        packed ``inputs`` instead of a copy of it. The model inputs should not
+        be modified in place if True. Defaults to False.
 
     Others will be packed into metainfo field of EditDataSample.
     """
 
     def __init__(self,
                  keys: Tuple[List[str], str, None] = None,
-                 pack_all: bool = False):
+                 pack_all: bool = False,
+                 channels_last: bool = False,
+                 share_input: bool = False):
         if keys is not None:
             if isinstance(keys, list):
                 self.keys = keys
@@ -123,6 +175,8 @@ class PackEditInputs(BaseTransform):
         else:
             self.keys = None
         self.pack_all = pack_all
+        self.channels_last = channels_last
+        self.share_input = share_input
 
     def transform(self, results: dict) -> dict:
         """Method to pack the input data.
@@ -147,18 +201,21 @@ class PackEditInputs(BaseTransform):
             for key in pack_keys:
                 val = results[key]
                 if can_convert_to_image(val):
-                    packed_results['inputs'][key] = images_to_tensor(val)
+                    packed_results['inputs'][key] = images_to_tensor(
+                        val, self.channels_last)
                     results.pop(key)
 
         elif 'img' in results:
             img = results.pop('img')
-            img_tensor = images_to_tensor(img)
+            img_tensor = images_to_tensor(img, self.channels_last)
             packed_results['inputs'] = img_tensor
-            data_sample.input = PixelData(data=img_tensor.clone())
+            if not self.share_input:
+                img_tensor = img_tensor.clone()
+            data_sample.input = PixelData(data=img_tensor)
 
         if 'gt' in results:
             gt = results.pop('gt')
-            gt_tensor = images_to_tensor(gt)
+            gt_tensor = images_to_tensor(gt, self.channels_last)
             if len(gt_tensor.shape) > 3 and gt_tensor.size(0) == 1:
                 gt_tensor.squeeze_(0)
             data_sample.gt_img = PixelData(data=gt_tensor)
@@ -169,79 +226,83 @@ class PackEditInputs(BaseTransform):
 
         if 'img_lq' in results:
             img_lq = results.pop('img_lq')
-            img_lq_tensor = images_to_tensor(img_lq)
+            img_lq_tensor = images_to_tensor(img_lq, self.channels_last)
             data_sample.img_lq = PixelData(data=img_lq_tensor)
 
         if 'ref' in results:
             ref = results.pop('ref')
-            ref_tensor = images_to_tensor(ref)
+            ref_tensor = images_to_tensor(ref, self.channels_last)
             data_sample.ref_img = PixelData(data=ref_tensor)
 
         if 'ref_lq' in results:
             ref_lq = results.pop('ref_lq')
-            ref_lq_tensor = images_to_tensor(ref_lq)
+            ref_lq_tensor = images_to_tensor(ref_lq, self.channels_last)
             data_sample.ref_lq = PixelData(data=ref_lq_tensor)
 
         if 'mask' in results:
             mask = results.pop('mask')
-            mask_tensor = images_to_tensor(mask)
+            mask_tensor = images_to_tensor(mask, self.channels_last)
             data_sample.mask = PixelData(data=mask_tensor)
 
         if 'gt_heatmap' in results:
             gt_heatmap = results.pop('gt_heatmap')
-            gt_heatmap_tensor = images_to_tensor(gt_heatmap)
+            gt_heatmap_tensor = images_to_tensor(gt_heatmap,
+                                                 self.channels_last)
             data_sample.gt_heatmap = PixelData(data=gt_heatmap_tensor)
 
         if 'gt_unsharp' in results:
             gt_unsharp = results.pop('gt_unsharp')
-            gt_unsharp_tensor = images_to_tensor(gt_unsharp)
+            gt_unsharp_tensor = images_to_tensor(gt_unsharp,
+                                                 self.channels_last)
             data_sample.gt_unsharp = PixelData(data=gt_unsharp_tensor)
 
         if 'merged' in results:
             # image in matting annotation is named merged
             img = results.pop('merged')
-            img_tensor = images_to_tensor(img)
+            img_tensor = images_to_tensor(img, self.channels_last)
             # used for model inputs
             packed_results['inputs'] = img_tensor
             # used as ground truth for composition losses
-            data_sample.gt_merged = PixelData(data=img_tensor.clone())
+            if not self.share_input:
+                img_tensor = img_tensor.clone()
+            data_sample.gt_merged = PixelData(data=img_tensor)
 
         if 'trimap' in results:
             trimap = results.pop('trimap')
-            trimap_tensor = images_to_tensor(trimap)
+            trimap_tensor = images_to_tensor(trimap, self.channels_last)
             data_sample.trimap = PixelData(data=trimap_tensor)
 
         if 'alpha' in results:
             # gt_alpha in matting annotation is named alpha
             gt_alpha = results.pop('alpha')
-            gt_alpha_tensor = images_to_tensor(gt_alpha)
+            gt_alpha_tensor = images_to_tensor(gt_alpha, self.channels_last)
             data_sample.gt_alpha = PixelData(data=gt_alpha_tensor)
 
         if 'fg' in results:
             # gt_fg in matting annotation is named fg
             gt_fg = results.pop('fg')
-            gt_fg_tensor = images_to_tensor(gt_fg)
+            gt_fg_tensor = images_to_tensor(gt_fg, self.channels_last)
             data_sample.gt_fg = PixelData(data=gt_fg_tensor)
 
         if 'bg' in results:
             # gt_bg in matting annotation is named bg
             gt_bg = results.pop('bg')
-            gt_bg_tensor = images_to_tensor(gt_bg)
+            gt_bg_tensor = images_to_tensor(gt_bg, self.channels_last)
             data_sample.gt_bg = PixelData(data=gt_bg_tensor)
 
         if 'rgb_img' in results:
             gt_rgb = results.pop('rgb_img')
-            gt_rgb_tensor = images_to_tensor(gt_rgb)
+            gt_rgb_tensor = images_to_tensor(gt_rgb, self.channels_last)
             data_sample.gt_rgb = PixelData(data=gt_rgb_tensor)
 
         if 'gray_img' in results:
             gray = results.pop('gray_img')
-            gray_tensor = images_to_tensor(gray)
+            gray_tensor = images_to_tensor(gray, self.channels_last)
             data_sample.gray = PixelData(data=gray_tensor)
 
         if 'cropped_img' in results:
             cropped_img = results.pop('cropped_img')
-            cropped_img = images_to_tensor(cropped_img)
+            cropped_img = images_to_tensor(cropped_img, self.channels_last)
             data_sample.cropped_img = PixelData(data=cropped_img)
 
         metainfo = dict()
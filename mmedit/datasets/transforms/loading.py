@@ -7,6 +7,8 @@ import numpy as np
 from mmcv.transforms import BaseTransform
 from mmengine.fileio import get_file_backend, list_from_file
 
+from mmedit.datasets.packed_shards import PackedShardBackend
+from mmedit.datasets.shared_image_cache import SharedImageCache
 from mmedit.registry import TRANSFORMS
 from mmedit.utils import (bbox2mask, brush_stroke_mask, get_irregular_mask,
                           random_bbox)
@@ -42,7 +44,16 @@ class LoadImageFromFile(BaseTransform):
             Only support 'rgb2ycbcr' and 'rgb2ycbcr'
             Defaults to False.
         backend_args (dict, optional): Arguments to instantiate the preifx of
-            uri corresponding backend. Defaults to None.
+            uri corresponding backend. With ``dict(backend='packed',
+            db_path=...)``, the images are read from packed shards written by
+            ``tools/dataset_converters/pack_dataset.py``, and all the frames
+            of a sample are fetched together. Defaults to None.
+        cache_cfg (dict, optional): Arguments of :class:`SharedImageCache`,
+            e.g., ``dict(max_size=2**30, mode='pixels')``. If given, the
+            images are cached in shared memory across dataloader workers
+            instead of the bytes in the dict of each process, and the hits
+            and misses are counted by ``self.cache.stats()``.
+            Defaults to None.
     """
 
     def __init__(
@@ -56,6 +67,7 @@ class LoadImageFromFile(BaseTransform):
         to_y_channel: bool = False,
         save_original_img: bool = False,
         backend_args: Optional[dict] = None,
+        cache_cfg: Optional[dict] = None,
     ) -> None:
 
         self.key = key
@@ -73,8 +85,13 @@ class LoadImageFromFile(BaseTransform):
             self.file_backend = get_file_backend(backend_args=backend_args)
 
         # cache
-        self.use_cache = use_cache
-        self.cache = dict()
+        self.cache_cfg = cache_cfg
+        if cache_cfg is None:
+            self.use_cache = use_cache
+            self.cache = dict()
+        else:
+            self.use_cache = True
+            self.cache = SharedImageCache(**cache_cfg)
 
         # convert
         self.to_float32 = to_float32
@@ -103,8 +120,12 @@ class LoadImageFromFile(BaseTransform):
         if self.save_original_img:
             ori_imgs = []
 
-        for filename in filenames:
-            img = self._load_image(filename)
+        if isinstance(self.file_backend, PackedShardBackend):
+            imgs = self._load_packed_images(filenames)
+        else:
+            imgs = [self._load_image(filename) for filename in filenames]
+
+        for img in imgs:
             img = self._convert(img)
             images.append(img)
             shapes.append(img.shape)
@@ -141,19 +162,93 @@ class LoadImageFromFile(BaseTransform):
                 'backend', None) == 'lmdb'):
             filename, _ = osp.splitext(osp.basename(filename))
 
-        if filename in self.cache:
-            img_bytes = self.cache[filename]
-        else:
+        img = self._get_cached(filename)
+        if img is None:
             img_bytes = self.file_backend.get(filename)
-            if self.use_cache:
-                self.cache[filename] = img_bytes
+            img = self._decode(img_bytes)
+            self._put_cached(filename, img_bytes, img)
+
+        return img
+
+    def _load_packed_images(self, filenames: List[str]) -> List[np.ndarray]:
+        """Load images from packed shards with as few reads as possible.
+
+        Args:
+            filenames (list[str]): Paths of image files.
+        Returns:
+            list[np.ndarray]: Images.
+        """
+        imgs = [self._get_cached(filename) for filename in filenames]
+        missing = [
+            filename for filename, img in zip(filenames, imgs) if img is None
+        ]
+        contents = dict(zip(missing, self.file_backend.get_many(missing)))
+        for idx, filename in enumerate(filenames):
+            if imgs[idx] is None:
+                imgs[idx] = self._decode(contents[filename])
+                self._put_cached(filename, contents[filename], imgs[idx])
+        return imgs
+
+    def _get_cached(self, filename: str) -> Optional[np.ndarray]:
+        """Get an image from the cache.
+
+        Args:
+            filename (str): Path of image file.
+        Returns:
+            np.ndarray | None: Image, or None if it is not cached.
+        """
+        if not self.use_cache:
+            return None
+        content = self.cache.get(filename)
+        if content is None:
+            return None
+        if self.cache_cfg is not None and self.cache.mode == 'pixels':
+            # cached images are read-only
+            return content.copy()
+        return self._decode(content)
+
+    def _put_cached(self, filename: str, content, img: np.ndarray) -> None:
+        """Add an image or its content to the cache."""
+        if not self.use_cache:
+            return
+        if self.cache_cfg is not None and self.cache.mode == 'pixels':
+            self.cache[filename] = img
+        elif self.cache_cfg is not None and isinstance(content, np.ndarray):
+            # raw records of packed shards are not encoded bytes, and they
+            # are memory-mapped already
+            return
+        else:
+            self.cache[filename] = content
 
-        img = mmcv.imfrombytes(
-            content=img_bytes,
-            flag=self.color_type,
-            channel_order=self.channel_order,
-            backend=self.imdecode_backend)
+    def _decode(self, content) -> np.ndarray:
+        """Decode an image from bytes, or convert a raw image of packed
+        shards.
 
+        Args:
+            content (bytes | np.ndarray): The content of image file, or a raw
+                image in BGR order.
+        Returns:
+            np.ndarray: Image.
+        """
+        if not isinstance(content, np.ndarray):
+            return mmcv.imfrombytes(
+                content=content,
+                flag=self.color_type,
+                channel_order=self.channel_order,
+                backend=self.imdecode_backend)
+
+        # raw records are stored in BGR order by the converter
+        img = content
+        if self.color_type == 'grayscale' and img.ndim == 3:
+            img = mmcv.bgr2gray(img)
+        elif self.color_type == 'color' and img.ndim == 2:
+            img = mmcv.gray2bgr(img)
+        elif (self.channel_order == 'rgb' and img.ndim == 3
+              and self.color_type != 'unchanged'):
+            img = mmcv.bgr2rgb(img)
+        if img is content:
+            # memory-mapped records are read-only
+            img = img.copy()
         return img
 
     def _convert(self, img: np.ndarray):
@@ -466,6 +561,12 @@ class LoadPairedImageFromFile(LoadImageFromFile):
             Defaults to False.
         backend_args (dict, optional): Arguments to instantiate the preifx of
             uri corresponding backend. Defaults to None.
+        cache_cfg (dict, optional): Arguments of :class:`SharedImageCache`,
+            e.g., ``dict(max_size=2**30, mode='pixels')``. If given, the
+            images are cached in shared memory across dataloader workers
+            instead of the bytes in the dict of each process, and the hits
+            and misses are counted by ``self.cache.stats()``.
+            Defaults to None.
         io_backend (str, optional): io backend where images are store. Defaults
             to None.
     """
@@ -481,10 +582,19 @@ class LoadPairedImageFromFile(LoadImageFromFile):
                  to_float32: bool = False,
                  to_y_channel: bool = False,
                  save_original_img: bool = False,
-                 backend_args: Optional[dict] = None):
-        super().__init__(key, color_type, channel_order, imdecode_backend,
-                         use_cache, to_float32, to_y_channel,
-                         save_original_img, backend_args)
+                 backend_args: Optional[dict] = None,
+                 cache_cfg: Optional[dict] = None):
+        super().__init__(
+            key,
+            color_type=color_type,
+            channel_order=channel_order,
+            imdecode_backend=imdecode_backend,
+            use_cache=use_cache,
+            to_float32=to_float32,
+            to_y_channel=to_y_channel,
+            save_original_img=save_original_img,
+            backend_args=backend_args,
+            cache_cfg=cache_cfg)
         assert isinstance(domain_a, str)
         assert isinstance(domain_b, str)
         self.domain_a = domain_a
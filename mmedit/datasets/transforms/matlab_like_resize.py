@@ -2,6 +2,8 @@
 # Reference:
 # https://github.com/fatheral/matlab_imresize/blob/master/imresize.py
 # Original licence: Copyright (c) 2020 fatheral, under the MIT License.
+from functools import lru_cache
+
 import numpy as np
 from mmcv.transforms import BaseTransform
 
@@ -70,10 +72,14 @@ def _cubic(x):
     return f
 
 
+@lru_cache(maxsize=128)
 def get_weights_indices(input_length, output_length, scale, kernel,
                         kernel_width):
     """Get weights and indices for interpolation.
 
+    The results are cached since (input_length, output_length, scale) rarely
+    change in a pipeline. The returned arrays are read-only.
+
     Args:
         input_length (int): Length of the input sequence.
         output_length (int): Length of the output sequence.
@@ -120,6 +126,8 @@ def get_weights_indices(input_length, output_length, scale, kernel,
     ind2store = np.nonzero(np.any(weights, axis=0))
     weights = weights[:, ind2store]
     indices = indices[:, ind2store]
+    weights.flags.writeable = False
+    indices.flags.writeable = False
 
     return weights, indices
 
@@ -127,6 +135,10 @@ def get_weights_indices(input_length, output_length, scale, kernel,
 def resize_along_dim(img_in, weights, indices, dim):
     """Resize along a specific dimension.
 
+    The taps of all the output pixels are gathered at once and contracted
+    with the weights, so a batch of images can be resized at once by choosing
+    ``dim`` accordingly.
+
     Args:
         img_in (np.ndarray): The input image.
         weights (ndarray): The weights used for interpolation, computed from
@@ -140,29 +152,15 @@ def resize_along_dim(img_in, weights, indices, dim):
     """
 
     img_in = img_in.astype(np.float32)
-    w_shape = weights.shape
-    output_shape = list(img_in.shape)
-    output_shape[dim] = w_shape[0]
-    img_out = np.zeros(output_shape)
-
-    if dim == 0:
-        for i in range(w_shape[0]):
-            w = weights[i, :][np.newaxis, ...]
-            ind = indices[i, :]
-            img_slice = img_in[ind, :]
-            img_out[i] = np.sum(np.squeeze(img_slice, axis=0) * w.T, axis=0)
-    elif dim == 1:
-        for i in range(w_shape[0]):
-            w = weights[i, :][:, :, np.newaxis]
-            ind = indices[i, :]
-            img_slice = img_in[:, ind]
-            img_out[:, i] = np.sum(np.squeeze(img_slice, axis=1) * w.T, axis=1)
-
-    if img_in.dtype == np.uint8:
-        img_out = np.clip(img_out, 0, 255)
-        return np.around(img_out).astype(np.uint8)
-    else:
-        return img_out
+    weights = weights.reshape(weights.shape[0], -1)
+    indices = indices.reshape(indices.shape[0], -1)
+
+    # (..., output_length, taps, ...)
+    img_taps = np.take(img_in, indices, axis=dim)
+    weights = weights.reshape(weights.shape + (1, ) * (img_in.ndim - dim - 1))
+    img_out = np.sum(img_taps * weights.astype(np.float64), axis=dim + 1)
+
+    return img_out
 
 
 @TRANSFORMS.register_module()
@@ -217,42 +215,37 @@ class MATLABLikeResize(BaseTransform):
         """resize an image to the require size.
 
         Args:
-            img (np.ndarray): The original image.
+            img (np.ndarray): The original image, or a batch of images with
+                shape (n, h, w, c).
         Returns:
             output (np.ndarray): The resized image.
         """
-        weights = {}
-        indices = {}
+        is_batch = img.ndim == 4
+        img_shape = img.shape[1:3] if is_batch else img.shape[:2]
 
         # compute scale and output_size
         if self.scale is not None:
             scale = float(self.scale)
             scale = [scale, scale]
-            output_size = get_size_from_scale(img.shape, scale)
+            output_size = get_size_from_scale(img_shape, scale)
         else:
-            scale = get_scale_from_size(img.shape, self.output_shape)
+            scale = get_scale_from_size(img_shape, self.output_shape)
             output_size = list(self.output_shape)
 
-        # apply cubic interpolation along two dimensions
-        order = np.argsort(np.array(scale))
-        for k in range(2):
-            key = (img.shape[k], output_size[k], scale[k], self.kernel_func,
-                   self.kernel_width)
-            weight, index = get_weights_indices(img.shape[k], output_size[k],
-                                                scale[k], self.kernel_func,
-                                                self.kernel_width)
-            weights[key] = weight
-            indices[key] = index
-
-        output = np.copy(img)
+        output = img
         if output.ndim == 2:  # grayscale image
             output = output[:, :, np.newaxis]
 
+        # apply cubic interpolation along two dimensions
+        order = np.argsort(np.array(scale))
         for k in range(2):
             dim = order[k]
-            key = (img.shape[dim], output_size[dim], scale[dim],
-                   self.kernel_func, self.kernel_width)
-            output = resize_along_dim(output, weights[key], indices[key], dim)
+            weight, index = get_weights_indices(img_shape[dim],
+                                                output_size[dim], scale[dim],
+                                                self.kernel_func,
+                                                self.kernel_width)
+            output = resize_along_dim(output, weight, index,
+                                      dim + int(is_batch))
 
         return output
 
@@ -272,7 +265,13 @@ class MATLABLikeResize(BaseTransform):
                 is_single_image = True
                 results[key] = [results[key]]
 
-            results[key] = [self._resize(img) for img in results[key]]
+            imgs = results[key]
+            if len(imgs) > 1 and imgs[0].ndim == 3 and all(
+                    img.shape == imgs[0].shape for img in imgs):
+                # resize frames of the same size as a batch
+                results[key] = list(self._resize(np.stack(imgs)))
+            else:
+                results[key] = [self._resize(img) for img in imgs]
 
             if is_single_image:
                 results[key] = results[key][0]
@@ -35,11 +35,16 @@ class RandomBlur:
     def get_kernel(self, num_kernels: int):
         """This is the function to create kernel.
 
+        The kernel parameters of the images (e.g., the frames of a sequence)
+        start from the same random values and vary by random steps. All the
+        kernels are then generated at once.
+
         Args:
             num_kernels (int): the number of kernels
 
         Returns:
-            _type_: _description_
+            np.ndarray: The kernels with shape (N, K, K), where K is the
+            kernel size.
         """
         kernel_type = np.random.choice(
             self.params['kernel_list'], p=self.params['kernel_prob'])
@@ -75,22 +80,11 @@ class RandomBlur:
                 omega_range = [np.pi / 5., np.pi]
         omega = np.random.uniform(omega_range[0], omega_range[1])
 
-        # determine blurring kernel
-        kernels = []
+        # determine the parameters of each kernel
+        params = []
         for _ in range(0, num_kernels):
-            kernel = blur_kernels.random_mixed_kernels(
-                [kernel_type],
-                [1],
-                kernel_size,
-                [sigma_x, sigma_x],
-                [sigma_y, sigma_y],
-                [rotate_angle, rotate_angle],
-                [beta_gau, beta_gau],
-                [beta_pla, beta_pla],
-                [omega, omega],
-                None,
-            )
-            kernels.append(kernel)
+            params.append(
+                [sigma_x, sigma_y, rotate_angle, beta_gau, beta_pla, omega])
 
             # update kernel parameters
             sigma_x += np.random.uniform(-sigma_x_step, sigma_x_step)
@@ -108,8 +102,30 @@ class RandomBlur:
             beta_gau = np.clip(beta_gau, beta_gau_range[0], beta_gau_range[1])
             beta_pla = np.clip(beta_pla, beta_pla_range[0], beta_pla_range[1])
             omega = np.clip(omega, omega_range[0], omega_range[1])
-
-        return kernels
+        sigma_x, sigma_y, rotate_angle, beta_gau, beta_pla, omega = np.array(
+            params).T
+
+        # determine blurring kernels
+        if kernel_type == 'sinc':
+            return blur_kernels.batched_circular_lowpass_kernels(
+                kernel_size, omega)
+        family, _, isotropy = kernel_type.rpartition('_')
+        if isotropy == 'iso':
+            sigma_y, rotate_angle = None, None
+        beta = dict(generalized=beta_gau, plateau=beta_pla).get(family)
+        if beta is not None:
+            # as in `random_mixed_kernels` with the range of [beta, beta],
+            # the shape parameter is sampled between beta and 1
+            below_one = np.random.uniform(size=num_kernels) <= 0.5
+            beta = np.where(below_one, np.random.uniform(beta, 1),
+                            np.random.uniform(1, beta))
+        return blur_kernels.batched_bivariate_kernels(
+            kernel_size,
+            sigma_x,
+            sigma_y,
+            rotate_angle,
+            beta,
+            kernel_type=family if beta is not None else 'gaussian')
 
     def _apply_random_blur(self, imgs):
         """This is the function to apply blur operation on images.
@@ -125,12 +141,9 @@ class RandomBlur:
             is_single_image = True
             imgs = [imgs]
 
-        # get kernel and blur the input
+        # get kernels and blur the input in a batch
         kernels = self.get_kernel(num_kernels=len(imgs))
-        imgs = [
-            cv2.filter2D(img, -1, kernel)
-            for img, kernel in zip(imgs, kernels)
-        ]
+        imgs = blur_kernels.batched_filter2d(imgs, kernels)
 
         if is_single_image:
             imgs = imgs[0]
@@ -26,6 +26,12 @@ class MMEdit:
         config_dir (str): Path to the directory containing config files.
             Default to 'configs/'.
         device (torch.device): Device to use for inference. Default to 'cuda'.
+        backend (str): Backend to run the model, 'pytorch' or 'onnxruntime'.
+            With 'onnxruntime', ``model_ckpt`` is the path to the ONNX model
+            exported by ``tools/model_converters/pytorch2onnx.py``.
+            Default to 'pytorch'.
+        backend_cfg (dict): Config of the backend, e.g., the threading
+            settings of ONNX Runtime. Default to None.
 
     Examples:
         >>> # inference of a conditional model, biggan for example
@@ -36,6 +42,12 @@ class MMEdit:
         >>> editor = MMEdit(model_name='pix2pix')
         >>> editor.infer(img='./test.jpg', result_out_dir='./pix2pix_res.jpg')
 
+        >>> # inference of an exported ONNX model with ONNX Runtime
+        >>> editor = MMEdit(model_name='esrgan', model_ckpt='esrgan.onnx',
+        ...                 backend='onnxruntime',
+        ...                 backend_cfg=dict(intra_op_num_threads=4))
+        >>> editor.infer(img='./test.jpg', result_out_dir='./esrgan_res.jpg')
+
         >>> # see demo/mmediting_inference_tutorial.ipynb for more examples
     """
     inference_supported_models = [
@@ -86,8 +98,10 @@ class MMEdit:
                  device: torch.device = None,
                  extra_parameters: Dict = None,
                  seed: int = 2022,
+                 backend: str = 'pytorch',
+                 backend_cfg: Dict = None,
                  **kwargs) -> None:
-        register_all_modules(init_default_scope=True)
+        register_all_modules(init_default_scope=True, lazy=True)
         MMEdit.init_inference_supported_models_cfg()
         inferencer_kwargs = {}
         inferencer_kwargs.update(
@@ -95,7 +109,11 @@ class MMEdit:
                                         model_config, model_ckpt,
                                         extra_parameters))
         self.inferencer = MMEditInferencer(
-            device=device, seed=seed, **inferencer_kwargs)
+            device=device,
+            seed=seed,
+            backend=backend,
+            backend_cfg=backend_cfg,
+            **inferencer_kwargs)
 
     def _get_inferencer_kwargs(self, model_name: Optional[str],
                                model_setting: Optional[int],
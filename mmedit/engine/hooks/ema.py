@@ -5,12 +5,15 @@ from functools import partial
 from typing import Optional, Sequence
 
 import torch
+import torch.nn as nn
 from mmengine.hooks import Hook
 from mmengine.model.wrappers import is_model_wrapper
 from mmengine.registry import HOOKS
 from mmengine.runner import Runner
 from mmengine.utils import is_tuple_of
 
+from mmedit.models.utils import MultiTensorEMA
+
 DATA_BATCH = Optional[Sequence[dict]]
 
 
@@ -40,6 +43,14 @@ class ExponentialMovingAverageHook(Hook):
             the same as the original one. Otherwise, its parameters are updated
             as a moving average of the trained weights in the original model.
             Default: 0.
+        flatten (bool, optional): Whether to keep the parameters of the ema
+            model in contiguous buffers, so that they can be updated with a
+            single kernel. Only used when ``interp_mode`` is 'lerp'.
+            Default: False.
+        buffer_interval (int, optional): Interval of updating buffers, in
+            the unit of ``interval``. If 0, buffers are not updated after
+            ``start_iter``. Only used when ``interp_mode`` is 'lerp'.
+            Default: 1.
     """
 
     def __init__(self,
@@ -47,7 +58,9 @@ class ExponentialMovingAverageHook(Hook):
                  interp_mode='lerp',
                  interp_cfg=None,
                  interval=-1,
-                 start_iter=0):
+                 start_iter=0,
+                 flatten=False,
+                 buffer_interval=1):
         super().__init__()
         assert isinstance(module_keys, str) or is_tuple_of(module_keys, str)
         self.module_keys = (module_keys, ) if isinstance(module_keys,
@@ -68,6 +81,12 @@ class ExponentialMovingAverageHook(Hook):
         self.interp_func = partial(
             getattr(self, interp_mode), **self.interp_cfg)
 
+        self.flatten = flatten
+        self.buffer_interval = buffer_interval
+        # update with multi-tensor ops for 'lerp'
+        self.fused = interp_mode == 'lerp'
+        self._ema_engines = dict()
+
     @staticmethod
     def lerp(a, b, momentum=0.001, momentum_nontrainable=1., trainable=True):
         """Does a linear interpolation of two parameters/ buffers.
@@ -86,6 +105,14 @@ class ExponentialMovingAverageHook(Hook):
         Returns:
             torch.Tensor: Interpolation result.
         """
+        ExponentialMovingAverageHook._check_momentum(momentum,
+                                                     momentum_nontrainable)
+        m = momentum if trainable else momentum_nontrainable
+        return b + (a - b) * m
+
+    @staticmethod
+    def _check_momentum(momentum, momentum_nontrainable):
+        """Check the arguments of :meth:`lerp`."""
         assert 0.0 < momentum < 1.0, 'momentum must be in range (0.0, 1.0)'\
                                      f'but got {momentum}'
         assert 0.0 < momentum_nontrainable <= 1.0, (
@@ -97,8 +124,6 @@ class ExponentialMovingAverageHook(Hook):
                 'which is different from the conventional notion of '
                 f'momentum but got {momentum}. Please make sure the '
                 f'value is correct.')
-        m = momentum if trainable else momentum_nontrainable
-        return b + (a - b) * m
 
     def every_n_iters(self, runner: Runner, n: int):
         """This is the function to perform every n iterations.
@@ -135,6 +160,10 @@ class ExponentialMovingAverageHook(Hook):
         model = runner.model.module if is_model_wrapper(
             runner.model) else runner.model
 
+        if self.fused:
+            self._fused_update(runner, model)
+            return
+
         for key in self.module_keys:
             # get current ema states
             ema_net = getattr(model, key)
@@ -151,6 +180,35 @@ class ExponentialMovingAverageHook(Hook):
                         v, states_ema[k], trainable=v.requires_grad).detach()
             ema_net.load_state_dict(states_ema, strict=True)
 
+    def _fused_update(self, runner: Runner, model: nn.Module) -> None:
+        """Update ema models in place with multi-tensor ops.
+
+        Args:
+            runner (Runner): runner used to drive the whole pipeline
+            model (nn.Module): The model contains the ema models.
+        """
+        momentum = self.interp_cfg.get('momentum', 0.001)
+        momentum_nontrainable = self.interp_cfg.get('momentum_nontrainable',
+                                                    1.)
+        self._check_momentum(momentum, momentum_nontrainable)
+        update_buffers = self.buffer_interval > 0 and self.every_n_iters(
+            runner, self.interval * self.buffer_interval)
+        for key in self.module_keys:
+            ema_net = getattr(model, key)
+            net = getattr(model, key[:-4])
+            engine = self._ema_engines.get(key)
+            if engine is None or engine.ema_module is not ema_net or \
+                    engine.src_module is not net:
+                engine = MultiTensorEMA(ema_net, net, flatten=self.flatten)
+                self._ema_engines[key] = engine
+
+            if runner.iter < self.start_iter:
+                engine.copy()
+            else:
+                engine.update_params(momentum, momentum_nontrainable)
+                if update_buffers:
+                    engine.update_buffers(momentum_nontrainable)
+
     def before_run(self, runner: Runner):
         """This is the function perform before each run.
 
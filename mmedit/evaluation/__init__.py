@@ -4,9 +4,10 @@ from .functional import gauss_gradient
 from .metrics import (MAE, MSE, NIQE, PSNR, SAD, SNR, SSIM, ConnectivityError,
                       Equivariance, FrechetInceptionDistance, GradientError,
                       InceptionScore, MattingMSE,
-                      MultiScaleStructureSimilarity, PerceptualPathLength,
-                      PrecisionAndRecall, SlicedWassersteinDistance, TransFID,
-                      TransIS, niqe, psnr, snr, ssim)
+                      MultiScaleStructureSimilarity, PaddingWaste,
+                      PerceptualPathLength, PrecisionAndRecall,
+                      SlicedWassersteinDistance, TransFID, TransIS, niqe, psnr,
+                      snr, ssim)
 
 __all__ = [
     'GenEvaluator',
@@ -29,6 +30,7 @@ __all__ = [
     'FrechetInceptionDistance',
     'InceptionScore',
     'MultiScaleStructureSimilarity',
+    'PaddingWaste',
     'PerceptualPathLength',
     'MultiScaleStructureSimilarity',
     'PrecisionAndRecall',
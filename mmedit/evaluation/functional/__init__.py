@@ -1,4 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+from .feature_cache import FeatureCache, get_dataset_fingerprints
+from .feature_stats import FeatureStats
 from .fid_inception import InceptionV3
 from .gaussian_funcs import gauss_gradient
 from .inception_utils import (disable_gpu_fuser_on_pt19, load_inception,
@@ -6,5 +8,6 @@ from .inception_utils import (disable_gpu_fuser_on_pt19, load_inception,
 
 __all__ = [
     'gauss_gradient', 'InceptionV3', 'disable_gpu_fuser_on_pt19',
-    'load_inception', 'prepare_vgg_feat', 'prepare_inception_feat'
+    'load_inception', 'prepare_vgg_feat', 'prepare_inception_feat',
+    'FeatureStats', 'FeatureCache', 'get_dataset_fingerprints'
 ]
@@ -0,0 +1,367 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import hashlib
+import json
+import os
+import os.path as osp
+import shutil
+import time
+import uuid
+from typing import List, Optional, Sequence
+
+import numpy as np
+from mmengine import print_log
+from torch.utils.data.dataset import Dataset
+
+from mmedit.utils import MMEDIT_CACHE_DIR
+from .feature_stats import FeatureStats
+
+FEAT_CACHE_DIR = osp.join(MMEDIT_CACHE_DIR, 'feat_cache')
+
+
+def get_dataset_fingerprints(dataset: Dataset,
+                             num_items: Optional[int] = None,
+                             indices: Optional[Sequence[int]] = None
+                             ) -> List[str]:
+    """Get the content fingerprint of each item of the dataset.
+
+    The fingerprint of an item is the md5 of the paths, sizes and modification
+    times of the files referred by its data info. If the data info does not
+    refer to any file, the data info itself is hashed. ``sample_idx`` is
+    ignored so that the fingerprints of existing items do not change when new
+    items are inserted into the dataset.
+
+    Args:
+        dataset (Dataset): The dataset, must implement ``get_data_info``.
+        num_items (int, optional): Only fingerprint the first ``num_items``
+            items. If None, all items are used. Defaults to None.
+        indices (Sequence[int], optional): Indices of the items to
+            fingerprint. If given, ``num_items`` is ignored. Defaults to None.
+
+    Returns:
+        List[str]: Fingerprints of the items.
+    """
+    if indices is None:
+        indices = range(len(dataset) if num_items is None else num_items)
+    fingerprints = []
+    for idx in indices:
+        data_info = dataset.get_data_info(idx)
+        files, others = [], []
+        for key in sorted(data_info.keys()):
+            if key == 'sample_idx':
+                continue
+            value = data_info[key]
+            if isinstance(value, str) and osp.isfile(value):
+                stat = os.stat(value)
+                files.append(
+                    (osp.abspath(value), stat.st_size, stat.st_mtime_ns))
+            else:
+                others.append((key, repr(value)))
+        content = files if files else others
+        fingerprints.append(
+            hashlib.md5(repr(content).encode('utf-8')).hexdigest())
+    return fingerprints
+
+
+class FeatureCache:
+    """On-disk cache of the features and feature statistics of real images.
+
+    Entries are keyed by the identity of the feature extractor and the
+    preprocessing (see :meth:`get_key`). Each entry records the fingerprints
+    of the dataset items (see :func:`get_dataset_fingerprints`) it was
+    computed from, therefore an entry can be partially reused when items are
+    added to the dataset and only the new items need to be extracted.
+
+    The layout of an entry is as follows. Every file is written to a
+    temporary file and then renamed, and ``meta.json`` is renamed at last, so
+    readers never see a partially written entry. The files no longer referred
+    by ``meta.json`` after an update are recorded as stale and only removed
+    ``stale_time`` seconds later, so readers which have read the old
+    ``meta.json`` can still load them.
+
+    .. code-block:: none
+
+        {cache_dir}/{key}/
+            meta.json          # fingerprints, extractor info and file names
+            stats-{uid}.npz    # `FeatureStats.state_dict` of all items
+            feat-{uid}.npy     # shards of raw features, loaded with mmap
+
+    Args:
+        cache_dir (str): Root directory of the cache. Defaults to
+            ``FEAT_CACHE_DIR``.
+        max_size (int, optional): Maximum size of the cache in bytes. Least
+            recently used entries are evicted when the cache grows larger. If
+            None, entries are never evicted. Defaults to None.
+        shard_size (int): Maximum number of raw features in each shard.
+            Defaults to 10000.
+        stale_time (float): Seconds to keep the files of an entry after they
+            are replaced by :meth:`save`. Defaults to 3600.
+    """
+
+    def __init__(self,
+                 cache_dir: str = FEAT_CACHE_DIR,
+                 max_size: Optional[int] = None,
+                 shard_size: int = 10000,
+                 stale_time: float = 3600.) -> None:
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.shard_size = shard_size
+        self.stale_time = stale_time
+
+    @staticmethod
+    def get_key(info: dict) -> str:
+        """Get the key of the entry corresponding to the extractor and
+        preprocessing described by ``info``.
+
+        Args:
+            info (dict): Identity of the extractor and the preprocessing.
+
+        Returns:
+            str: The key of the entry.
+        """
+        return hashlib.md5(repr(sorted(
+            info.items())).encode('utf-8')).hexdigest()
+
+    def _entry_dir(self, key: str) -> str:
+        return osp.join(self.cache_dir, key)
+
+    def _read_meta(self, key: str) -> Optional[dict]:
+        meta_path = osp.join(self._entry_dir(key), 'meta.json')
+        try:
+            with open(meta_path, 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _read_feats(self, key: str, meta: dict,
+                    indices: Sequence[int]) -> np.ndarray:
+        """Read raw features of the given items from the memory-mapped
+        shards."""
+        indices = np.asarray(indices, dtype=np.int64)
+        out = None
+        start = 0
+        for shard_name, shard_len in meta['shards']:
+            mask = (indices >= start) & (indices < start + shard_len)
+            if out is None or mask.any():
+                shard = np.load(
+                    osp.join(self._entry_dir(key), shard_name), mmap_mode='r')
+                if out is None:
+                    out = np.empty(
+                        (len(indices), ) + shard.shape[1:], dtype=shard.dtype)
+                out[mask] = shard[indices[mask] - start]
+            start += shard_len
+        return out
+
+    def load(self,
+             key: str,
+             fingerprints: Sequence[str],
+             need_stats: bool = True,
+             need_feats: bool = False) -> Optional[dict]:
+        """Load the cached results of the items with the given fingerprints.
+
+        Args:
+            key (str): Key of the entry.
+            fingerprints (Sequence[str]): Fingerprints of the requested items.
+            need_stats (bool): Whether the feature statistics are needed.
+                Defaults to True.
+            need_feats (bool): Whether the raw features are needed. Defaults
+                to False.
+
+        Returns:
+            Optional[dict]: None if nothing can be reused. Otherwise a dict
+            contains the following keys:
+
+            - found (List[int]): Indices of the requested items which are
+              found in the cache.
+            - missing (List[int]): Indices of the requested items which need
+              to be extracted.
+            - stats (FeatureStats, optional): Statistics of the found items.
+            - feats (np.ndarray, optional): Raw features of the found items.
+        """
+        meta = self._read_meta(key)
+        if meta is None:
+            return None
+        cached_index = {fp: idx for idx, fp in enumerate(meta['fingerprints'])}
+        found, missing, cached_indices = [], [], []
+        for idx, fp in enumerate(fingerprints):
+            if fp in cached_index:
+                found.append(idx)
+                cached_indices.append(cached_index[fp])
+            else:
+                missing.append(idx)
+        if len(found) == 0:
+            return None
+        # the stored statistics can only be reused if all the cached items
+        # are requested, otherwise they are recomputed from raw features
+        use_stored_stats = need_stats and meta['stats'] is not None and sorted(
+            cached_indices) == list(range(len(meta['fingerprints'])))
+        has_feats = len(meta['shards']) > 0
+        if (need_feats or (need_stats and not use_stored_stats)) \
+                and not has_feats:
+            return None
+
+        results = dict(found=found, missing=missing, stats=None, feats=None)
+        if need_feats or (need_stats and not use_stored_stats):
+            results['feats'] = self._read_feats(key, meta, cached_indices)
+        if use_stored_stats:
+            with np.load(osp.join(self._entry_dir(key),
+                                  meta['stats'])) as state_dict:
+                results['stats'] = FeatureStats().load_state_dict(
+                    dict(state_dict))
+        elif need_stats:
+            stats = FeatureStats()
+            for start in range(0, len(found), self.shard_size):
+                stats.append(results['feats'][start:start + self.shard_size])
+            results['stats'] = stats
+        if not need_feats:
+            results['feats'] = None
+
+        # mark as recently used
+        os.utime(osp.join(self._entry_dir(key), 'meta.json'))
+        print_log(
+            f'Reuse {len(found)} cached features from '
+            f'\'{self._entry_dir(key)}\', {len(missing)} items need to be '
+            'extracted.', 'current')
+        return results
+
+    def _atomic_save(self, path: str, save_fn) -> None:
+        """Save with ``save_fn`` to a temporary file and rename it to
+        ``path``."""
+        tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+        try:
+            with open(tmp_path, 'wb') as file:
+                save_fn(file)
+            os.replace(tmp_path, path)
+        finally:
+            if osp.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def save(self,
+             key: str,
+             fingerprints: Sequence[str],
+             stats: Optional[FeatureStats] = None,
+             feats: Optional[np.ndarray] = None,
+             info: Optional[dict] = None) -> None:
+        """Save the results of the items with the given fingerprints. The
+        entry is replaced. Only call this function on the main process.
+
+        If the fingerprints of the old entry are a prefix of ``fingerprints``,
+        the old shards are kept and only the features of the new items are
+        written.
+
+        Args:
+            key (str): Key of the entry.
+            fingerprints (Sequence[str]): Fingerprints of the items.
+            stats (FeatureStats, optional): Statistics of the features of all
+                items. Defaults to None.
+            feats (np.ndarray, optional): Raw features of all items, in the
+                order of ``fingerprints``. Defaults to None.
+            info (dict, optional): Identity of the extractor and the
+                preprocessing, saved for reference. Defaults to None.
+        """
+        assert stats is not None or feats is not None, (
+            'At least one of \'stats\' and \'feats\' should be saved.')
+        fingerprints = list(fingerprints)
+        entry_dir = self._entry_dir(key)
+        os.makedirs(entry_dir, exist_ok=True)
+        old_meta = self._read_meta(key)
+
+        shards, num_saved = [], 0
+        if feats is not None:
+            assert feats.shape[0] == len(fingerprints)
+            if old_meta is not None and len(old_meta['shards']) > 0:
+                num_old = len(old_meta['fingerprints'])
+                if fingerprints[:num_old] == old_meta['fingerprints']:
+                    shards, num_saved = list(old_meta['shards']), num_old
+            for start in range(num_saved, len(fingerprints), self.shard_size):
+                shard = np.ascontiguousarray(feats[start:start +
+                                                   self.shard_size])
+                shard_name = f'feat-{uuid.uuid4().hex}.npy'
+                self._atomic_save(
+                    osp.join(entry_dir, shard_name),
+                    lambda file, shard=shard: np.save(file, shard))
+                shards.append([shard_name, len(shard)])
+
+        stats_name = None
+        if stats is not None:
+            stats_name = f'stats-{uuid.uuid4().hex}.npz'
+            state_dict = stats.state_dict()
+            self._atomic_save(
+                osp.join(entry_dir, stats_name),
+                lambda file: np.savez(file, **state_dict))
+
+        # the files only referred by the old entry may be being read by other
+        # processes, they are removed after `stale_time` by later updates
+        now = time.time()
+        stale, expired = [], []
+        if old_meta is not None:
+            used = {name for name, _ in shards} | {stats_name}
+            old_files = [name for name, _ in old_meta['shards']]
+            old_files.append(old_meta['stats'])
+            stale = [[name, now] for name in old_files
+                     if name is not None and name not in used]
+            for name, stale_since in old_meta.get('stale', []):
+                if now - stale_since < self.stale_time:
+                    stale.append([name, stale_since])
+                else:
+                    expired.append(name)
+
+        meta = dict(
+            fingerprints=fingerprints,
+            shards=shards,
+            stats=stats_name,
+            stale=stale,
+            info=None if info is None else repr(info))
+        self._atomic_save(
+            osp.join(entry_dir, 'meta.json'),
+            lambda file: file.write(json.dumps(meta).encode('utf-8')))
+
+        for name in expired:
+            path = osp.join(entry_dir, name)
+            if osp.exists(path):
+                os.remove(path)
+        print_log(f'Save features to \'{entry_dir}\'.', 'current')
+        self.evict(keep=key)
+
+    def evict(self, keep: Optional[str] = None) -> List[str]:
+        """Remove least recently used entries until the size of the cache is
+        not larger than ``max_size``.
+
+        Args:
+            keep (str, optional): Key of the entry which should not be
+                evicted. Defaults to None.
+
+        Returns:
+            List[str]: Keys of the evicted entries.
+        """
+        if self.max_size is None or not osp.isdir(self.cache_dir):
+            return []
+        entries = []
+        total_size = 0
+        for key in os.listdir(self.cache_dir):
+            entry_dir = self._entry_dir(key)
+            meta_path = osp.join(entry_dir, 'meta.json')
+            if not osp.isfile(meta_path):
+                continue
+            try:
+                size = sum(
+                    osp.getsize(osp.join(entry_dir, name))
+                    for name in os.listdir(entry_dir))
+                entries.append((osp.getmtime(meta_path), key, size))
+            except OSError:
+                # the entry is being modified by another process
+                continue
+            total_size += size
+
+        evicted = []
+        for _, key, size in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+            total_size -= size
+            evicted.append(key)
+        if evicted:
+            print_log(f'Evict {len(evicted)} entries from feature cache.',
+                      'current')
+        return evicted
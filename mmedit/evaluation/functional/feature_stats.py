@@ -0,0 +1,161 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from typing import Optional, Union
+
+import numpy as np
+import torch
+from mmengine.dist import all_reduce, get_comm_device, get_world_size
+from torch import Tensor
+
+
+class FeatureStats:
+    """Online accumulator for the mean and covariance of feature vectors.
+
+    Instead of buffering every feature vector, only the number of items, the
+    running sum and the running sum of outer products are kept (in float64).
+    Memory is therefore O(d^2) regardless of the number of samples, and the
+    states of different ranks can be merged with a single ``all_reduce``.
+
+    Args:
+        max_items (int, optional): Maximum number of items to accumulate.
+            Features appended after the limit is reached are dropped. If None,
+            all appended features are accumulated. Defaults to None.
+    """
+
+    def __init__(self, max_items: Optional[int] = None) -> None:
+        self.max_items = max_items
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear the accumulated states."""
+        self.num_items = 0
+        self.raw_sum = None
+        self.raw_outer = None
+
+    @property
+    def is_full(self) -> bool:
+        """bool: Whether ``max_items`` features have been accumulated."""
+        return self.max_items is not None and self.num_items >= self.max_items
+
+    def append(self, feats: Union[Tensor, np.ndarray]) -> None:
+        """Accumulate a batch of features.
+
+        Args:
+            feats (Union[Tensor, np.ndarray]): Features in shape (n, d).
+                Tensors are accumulated on their own device.
+        """
+        if isinstance(feats, np.ndarray):
+            feats = torch.from_numpy(feats)
+        feats = feats.reshape(feats.shape[0], -1)
+        if self.max_items is not None:
+            feats = feats[:max(self.max_items - self.num_items, 0)]
+        feats = feats.to(torch.float64)
+
+        # init the states even if all features are dropped, so that the rank
+        # can still take part in `all_reduce`
+        if self.raw_sum is None:
+            num_features = feats.shape[1]
+            self.raw_sum = feats.new_zeros(num_features)
+            self.raw_outer = feats.new_zeros(num_features, num_features)
+        if feats.shape[0] == 0:
+            return
+        self.num_items += feats.shape[0]
+        self.raw_sum += feats.sum(dim=0)
+        self.raw_outer += feats.T @ feats
+
+    def all_reduce(self) -> 'FeatureStats':
+        """Sum the states of all ranks in place.
+
+        Ranks without any appended feature, e.g., when there are fewer items
+        than ranks, take part with zero states in the shape of other ranks.
+
+        Returns:
+            FeatureStats: The reduced statistics.
+        """
+        if get_world_size() == 1:
+            return self
+        if self.raw_sum is None:
+            device, num_features = get_comm_device(), 0
+        else:
+            device, num_features = self.raw_sum.device, self.raw_sum.numel()
+        num_features = torch.tensor(
+            num_features, dtype=torch.float64, device=device)
+        all_reduce(num_features, op='max')
+        num_features = int(num_features.item())
+        assert num_features > 0, 'No rank has appended features.'
+        if self.raw_sum is None:
+            self.raw_sum = torch.zeros(
+                num_features, dtype=torch.float64, device=device)
+            self.raw_outer = torch.zeros(
+                num_features, num_features, dtype=torch.float64, device=device)
+
+        num_items = self.raw_sum.new_tensor(self.num_items)
+        all_reduce(num_items)
+        all_reduce(self.raw_sum)
+        all_reduce(self.raw_outer)
+        self.num_items = int(num_items.item())
+        return self
+
+    def merge(self, other: 'FeatureStats') -> 'FeatureStats':
+        """Add the states of another accumulator in place. ``max_items`` is
+        not checked.
+
+        Args:
+            other (FeatureStats): Statistics of another set of features.
+
+        Returns:
+            FeatureStats: The merged statistics.
+        """
+        if other.raw_sum is None:
+            return self
+        if self.raw_sum is None:
+            self.raw_sum = other.raw_sum.clone()
+            self.raw_outer = other.raw_outer.clone()
+        else:
+            self.raw_sum += other.raw_sum.to(self.raw_sum.device)
+            self.raw_outer += other.raw_outer.to(self.raw_outer.device)
+        self.num_items += other.num_items
+        return self
+
+    def state_dict(self) -> dict:
+        """Return the states as numpy arrays.
+
+        Returns:
+            dict: A dict contains 'num_items', 'raw_sum' and 'raw_outer'.
+        """
+        assert self.raw_sum is not None, 'No feature has been accumulated.'
+        return dict(
+            num_items=np.array(self.num_items),
+            raw_sum=self.raw_sum.cpu().numpy(),
+            raw_outer=self.raw_outer.cpu().numpy())
+
+    def load_state_dict(self, state_dict: dict) -> 'FeatureStats':
+        """Load the states returned by :meth:`state_dict`.
+
+        Args:
+            state_dict (dict): The states to load.
+
+        Returns:
+            FeatureStats: The loaded statistics.
+        """
+        self.num_items = int(state_dict['num_items'])
+        self.raw_sum = torch.from_numpy(np.asarray(state_dict['raw_sum'])).to(
+            torch.float64)
+        self.raw_outer = torch.from_numpy(np.asarray(
+            state_dict['raw_outer'])).to(torch.float64)
+        return self
+
+    @property
+    def mean(self) -> np.ndarray:
+        """np.ndarray: Mean of the accumulated features."""
+        assert self.num_items > 0, 'No feature has been accumulated.'
+        return (self.raw_sum / self.num_items).cpu().numpy()
+
+    @property
+    def cov(self) -> np.ndarray:
+        """np.ndarray: Unbiased covariance of the accumulated features, the
+        same as ``np.cov(feats, rowvar=False)``."""
+        assert self.num_items > 1, (
+            'At least two features are needed to compute the covariance.')
+        mean = self.raw_sum / self.num_items
+        cov = self.raw_outer - self.num_items * torch.outer(mean, mean)
+        return (cov / (self.num_items - 1)).cpu().numpy()
@@ -4,9 +4,10 @@ import os
 import os.path as osp
 import pickle
 import sys
+import time
 from contextlib import contextmanager
 from copy import deepcopy
-from typing import Optional, Tuple
+from typing import Callable, Optional, Sequence, Tuple
 
 import mmengine
 import numpy as np
@@ -14,8 +15,9 @@ import torch
 import torch.nn as nn
 from mmengine import is_filepath, print_log
 from mmengine.dataset import BaseDataset, Compose, pseudo_collate
-from mmengine.dist import (all_gather, get_dist_info, get_world_size,
-                           is_main_process)
+from mmengine.dist import (all_gather, all_gather_object,
+                           broadcast_object_list, get_dist_info,
+                           get_world_size, is_main_process)
 from mmengine.evaluator import BaseMetric
 from torch.utils.data.dataloader import DataLoader
 from torch.utils.data.dataset import Dataset
@@ -23,6 +25,8 @@ from torchvision.models.inception import inception_v3
 
 from mmedit.utils import MMEDIT_CACHE_DIR, download_from_url
 from . import InceptionV3
+from .feature_cache import FeatureCache, get_dataset_fingerprints
+from .feature_stats import FeatureStats
 
 ALLOWED_INCEPTION = ['StyleGAN', 'PyTorch']
 TERO_INCEPTION_URL = 'https://nvlabs-fi-cdn.nvidia.com/stylegan2-ada-pytorch/pretrained/metrics/inception-2015-12-05.pt'  # noqa
@@ -273,117 +277,123 @@ def get_vgg_feat_cache_name_and_args(dataloader: DataLoader,
     return cache_tag, args
 
 
-def prepare_inception_feat(dataloader: DataLoader,
-                           metric: BaseMetric,
-                           data_preprocessor: Optional[nn.Module] = None,
-                           capture_mean_cov: bool = False,
-                           capture_all: bool = False) -> dict:
-    """Prepare inception feature for the input metric.
+def _load_remote_pkl(pkl_path: str) -> dict:
+    """Load a pickle file from an online path (e.g. http or s3) with the file
+    backends of MMEngine."""
+    return pickle.loads(mmengine.fileio.get(pkl_path))
+
+
+def _build_feat_cache(metric: BaseMetric) -> FeatureCache:
+    """Build the feature cache with ``metric.feat_cache_cfg``."""
+    cfg = getattr(metric, 'feat_cache_cfg', None)
+    return FeatureCache(**cfg) if isinstance(cfg, dict) else FeatureCache()
 
-    - If `metric.inception_pkl` is an online path, try to download and load
-      it. If cannot download or load, corresponding error will be raised.
-    - If `metric.inception_pkl` is local path and file exists, try to load the
-      file. If cannot load, corresponding error will be raised.
-    - If `metric.inception_pkl` is local path and file not exists, we will
-      extract the inception feature manually and save to 'inception_pkl'.
-    - If `metric.inception_pkl` is not defined, we will extrace the inception
-      feature and save it to default cache dir with default name.
+
+def get_feat_cache_info(dataloader: DataLoader,
+                        metric: BaseMetric,
+                        data_preprocessor: Optional[nn.Module] = None,
+                        **extractor_info) -> dict:
+    """Get the identity of the feature extractor and the preprocessing, which
+    is used as the key of :class:`FeatureCache`.
+
+    Different from :func:`get_inception_feat_cache_name_and_args`, the number
+    of images, the number of GPUs and the captured contents are not included,
+    because they are handled by the fingerprints of the cache entry.
 
     Args:
         datalaoder (Dataloader): The dataloader of real images.
-        metric (BaseMetric): The metric which needs inception features.
+        metric (BaseMetric): The metric which needs the features.
         data_preprocessor (Optional[nn.Module]): Data preprocessor of the
-            module. Used to preprocess the real images. If not passed, real
-            images will automatically normalized to [-1, 1]. Defaults to None.
-        capture_mean_cov (bool): Whether save the mean and covariance of
-            inception feature. Defaults to False.
-        capture_all (bool): Whether save the raw inception feature. If true,
-            it will take a lot of time to save the inception feature. Defaults
-            to False.
+            module. Defaults to None.
+        **extractor_info: Identity of the feature extractor.
 
     Returns:
-        dict: Dict contains inception feature.
+        dict: The identity of the feature extractor and the preprocessing.
     """
-    assert capture_mean_cov or capture_all, (
-        'At least one of \'capture_mean_cov\' and \'capture_all\' is True.')
-    if not hasattr(metric, 'inception_pkl'):
-        return
-    inception_pkl: Optional[str] = metric.inception_pkl
-
-    if isinstance(inception_pkl, str):
-        if is_filepath(inception_pkl) and osp.exists(inception_pkl):
-            with open(inception_pkl, 'rb') as file:
-                inception_state = pickle.load(file)
-            print_log(
-                f'\'{metric.prefix}\' successful load inception feature '
-                f'from \'{inception_pkl}\'', 'current')
-            return inception_state
-        elif inception_pkl.startswith('s3'):
-            try:
-                raise NotImplementedError(
-                    'Not support download from Ceph currently')
-            except Exception as exp:
-                raise exp('Not support download from Ceph currently')
-        elif inception_pkl.startswith('http'):
-            try:
-                raise NotImplementedError(
-                    'Not support download from url currently')
-            except Exception as exp:
-                # cannot download, raise error
-                raise exp('Not support download from url currently')
-
-    # cannot load or download from file, extract manually
-    assert hasattr(metric, 'real_nums'), (
-        f'Metric \'{metric.name}\' must have attribute \'real_nums\'.')
-    real_nums = metric.real_nums
-    if inception_pkl is None:
-        inception_pkl, args = get_inception_feat_cache_name_and_args(
-            dataloader, metric, real_nums, capture_mean_cov, capture_all)
-        inception_pkl = osp.join(MMEDIT_CACHE_DIR, inception_pkl)
-    else:
-        args = dict()
-    if osp.exists(inception_pkl):
-        with open(inception_pkl, 'rb') as file:
-            real_feat = pickle.load(file)
-        print_log(f'load preprocessed feat from {inception_pkl}', 'current')
-        return real_feat
+    dataset = dataloader.dataset
+    mean = getattr(data_preprocessor, 'mean', None)
+    std = getattr(data_preprocessor, 'std', None)
+    real_key = 'img' if metric.real_key is None else metric.real_key
+    return dict(
+        dataset_type=type(dataset).__name__,
+        data_root=deepcopy(getattr(dataset, 'data_root', None)),
+        data_prefix=deepcopy(getattr(dataset, 'data_prefix', None)),
+        pipeline=repr(getattr(dataset, 'pipeline', None)),
+        real_key=real_key,
+        mean=None if mean is None else torch.as_tensor(mean).tolist(),
+        std=None if std is None else torch.as_tensor(std).tolist(),
+        **extractor_info)
+
+
+def extract_real_feat(
+    dataloader: DataLoader,
+    indices: Sequence[int],
+    metric: BaseMetric,
+    extract_fn: Callable[[torch.Tensor], torch.Tensor],
+    data_preprocessor: Optional[nn.Module] = None,
+    capture_mean_cov: bool = False,
+    capture_all: bool = False,
+    description: str = 'Calculate Feature.'
+) -> Tuple[Optional[FeatureStats], Optional[np.ndarray]]:
+    """Extract the features of the given items of the real dataset.
+
+    The items are split among all ranks. The statistics of the features are
+    summed up with ``all_reduce``, and the raw features are gathered only if
+    ``capture_all`` is True.
 
-    assert hasattr(metric, 'inception'), (
-        'Metric must have a inception network to extract inception features.')
+    Args:
+        datalaoder (Dataloader): The dataloader of real images.
+        indices (Sequence[int]): Indices of the items to extract.
+        metric (BaseMetric): The metric which needs the features.
+        extract_fn (Callable): Function to extract features from images in
+            range [-1, 1].
+        data_preprocessor (Optional[nn.Module]): Data preprocessor of the
+            module. Used to preprocess the real images. If not passed, real
+            images will automatically normalized to [-1, 1]. Defaults to None.
+        capture_mean_cov (bool): Whether to accumulate the statistics of the
+            features. Defaults to False.
+        capture_all (bool): Whether to gather the raw features. Defaults to
+            False.
+        description (str): Description shown in the progress bar.
 
-    real_feat = []
+    Returns:
+        Tuple[Optional[FeatureStats], Optional[np.ndarray]]: The statistics
+        and the raw features in the order of ``indices``.
+    """
     mean = getattr(data_preprocessor, 'mean', None)
     std = getattr(data_preprocessor, 'std', None)
 
-    print_log(
-        f'Inception pkl \'{inception_pkl}\' is not found, extract '
-        'manually.', 'current')
-
     import rich.progress
 
     dataset, batch_size = dataloader.dataset, dataloader.batch_size
-    if real_nums == -1:
-        num_items = len(dataset)
-    else:
-        num_items = min(len(dataset), real_nums)
-
+    num_items = len(indices)
     rank, num_gpus = get_dist_info()
-    item_subset = [(i * num_gpus + rank) % num_items
-                   for i in range((num_items - 1) // num_gpus + 1)]
-    inception_dataloader = DataLoader(
+    item_subset = [
+        indices[(i * num_gpus + rank) % num_items]
+        for i in range((num_items - 1) // num_gpus + 1)
+    ]
+    # keep the loading workers of the original dataloader, image decoding
+    # otherwise becomes the bottleneck of the extraction
+    feat_dataloader = DataLoader(
         dataset,
         batch_size=batch_size,
         sampler=item_subset,
+        num_workers=getattr(dataloader, 'num_workers', 0),
         collate_fn=pseudo_collate,
         shuffle=False,
         drop_last=False)
+    start_time = time.perf_counter()
+    # the tail of `item_subset` may wrap around to the head of `indices`,
+    # only the items before the wrap are accumulated
+    real_stats = FeatureStats(max_items=len(range(rank, num_items, num_gpus)))
+    real_feat = []
     # init rich pbar for the main process
     if is_main_process():
         # check the launcher
         slurm_env_name = ['SLURM_PROCID', 'SLURM_NTASKS', 'SLURM_NODELIST']
         if all([n in os.environ for n in slurm_env_name]):
             is_slurm = True
-            pbar = mmengine.ProgressBar(len(inception_dataloader))
+            pbar = mmengine.ProgressBar(len(feat_dataloader))
         else:
             is_slurm = False
             columns = [
@@ -395,12 +405,9 @@ def prepare_inception_feat(dataloader: DataLoader,
             pbar = rich.progress.Progress(*columns)
             pbar.start()
             task = pbar.add_task(
-                'Calculate Inception Feature.',
-                total=len(inception_dataloader),
-                visible=True)
+                description, total=len(feat_dataloader), visible=True)
 
-    for data in inception_dataloader:
-        # inputs, _ = data_preprocessor(data)
+    for data in feat_dataloader:
         data = data_preprocessor(data)
 
         img = data['inputs']
@@ -418,8 +425,11 @@ def prepare_inception_feat(dataloader: DataLoader,
                 f'same time. But receive \'{mean}\' and \'{std}\' '
                 'respectively.')
 
-        real_feat_ = metric.forward_inception(img).cpu()
-        real_feat.append(real_feat_)
+        real_feat_ = extract_fn(img)
+        if capture_mean_cov:
+            real_stats.append(real_feat_)
+        if capture_all:
+            real_feat.append(real_feat_.cpu())
 
         if is_main_process():
             if is_slurm:
@@ -433,31 +443,241 @@ def prepare_inception_feat(dataloader: DataLoader,
             sys.stdout.write('\n')
         else:
             pbar.stop()
+        print_log(
+            f'Extract features of {num_items} items with {num_gpus} ranks '
+            f'in {time.perf_counter() - start_time:.1f} s.', 'current')
+
+    # collect results, statistics are merged with a single all_reduce
+    if capture_mean_cov:
+        real_stats.all_reduce()
+    if capture_all:
+        real_feat = torch.cat(real_feat)
+        # use `all_gather` here, gather tensor is much quicker than gather
+        # object.
+        real_feat = all_gather(real_feat)
+        # the i-th feature of rank r is the (i * num_gpus + r)-th item
+        real_feat = torch.stack(
+            real_feat, dim=1).flatten(0, 1)[:num_items].numpy()
+    return (real_stats if capture_mean_cov else None,
+            real_feat if capture_all else None)
+
+
+def load_or_extract_real_feat(
+    dataloader: DataLoader,
+    metric: BaseMetric,
+    cache_info: dict,
+    extract_fn: Callable[[torch.Tensor], torch.Tensor],
+    data_preprocessor: Optional[nn.Module] = None,
+    num_items: int = -1,
+    capture_mean_cov: bool = False,
+    capture_all: bool = False,
+    auto_save: bool = True,
+    description: str = 'Calculate Feature.'
+) -> Tuple[Optional[FeatureStats], Optional[np.ndarray]]:
+    """Load the features of the real dataset from :class:`FeatureCache` and
+    only extract the features of the items which are not cached.
 
-    # collect results
-    real_feat = torch.cat(real_feat)
-    # use `all_gather` here, gather tensor is much quicker than gather object.
-    real_feat = all_gather(real_feat)
+    Args:
+        datalaoder (Dataloader): The dataloader of real images.
+        metric (BaseMetric): The metric which needs the features. The cache
+            is built with ``metric.feat_cache_cfg`` if it is defined.
+        cache_info (dict): The identity of the feature extractor and the
+            preprocessing. See :func:`get_feat_cache_info`.
+        extract_fn (Callable): Function to extract features from images in
+            range [-1, 1].
+        data_preprocessor (Optional[nn.Module]): Data preprocessor of the
+            module. Defaults to None.
+        num_items (int): Number of items used. If -1, all items of the
+            dataset are used. Defaults to -1.
+        capture_mean_cov (bool): Whether to return the statistics of the
+            features. Defaults to False.
+        capture_all (bool): Whether to return the raw features. Defaults to
+            False.
+        auto_save (bool): Whether to save the results to the cache. Defaults
+            to True.
+        description (str): Description shown in the progress bar.
+
+    Returns:
+        Tuple[Optional[FeatureStats], Optional[np.ndarray]]: The statistics
+        and the raw features of the first ``num_items`` items. Only returned
+        on the main process.
+    """
+    dataset = dataloader.dataset
+    num_items = len(dataset) if num_items == -1 else min(
+        len(dataset), num_items)
+    feat_cache = _build_feat_cache(metric)
+    cache_key = feat_cache.get_key(cache_info)
 
-    # only cat on the main process
+    # each rank fingerprints its own shard of items
+    rank, num_gpus = get_dist_info()
+    fingerprints = [None] * num_items
+    local_fingerprints = get_dataset_fingerprints(
+        dataset, indices=range(rank, num_items, num_gpus))
+    for src, shard in enumerate(all_gather_object(local_fingerprints)):
+        fingerprints[src::num_gpus] = shard
+
+    # only the main process reads the cache, other ranks only need to know
+    # the items to extract
+    cached = None
     if is_main_process():
-        inception_state = dict(**args)
+        cached = feat_cache.load(
+            cache_key,
+            fingerprints,
+            need_stats=capture_mean_cov,
+            need_feats=capture_all)
+    missing = [list(range(num_items)) if cached is None else cached['missing']]
+    broadcast_object_list(missing)
+    missing = missing[0]
+
+    real_stats, real_feat = None, None
+    if len(missing) > 0:
+        real_stats, real_feat = extract_real_feat(dataloader, missing, metric,
+                                                  extract_fn,
+                                                  data_preprocessor,
+                                                  capture_mean_cov,
+                                                  capture_all, description)
+
+    if not is_main_process():
+        return None, None
+
+    if cached is not None:
         if capture_mean_cov:
-            real_feat = torch.cat(real_feat, dim=0)[:num_items].numpy()
-            real_mean = np.mean(real_feat, 0)
-            real_cov = np.cov(real_feat, rowvar=False)
-            inception_state['real_mean'] = real_mean
-            inception_state['real_cov'] = real_cov
+            real_stats = cached['stats'].merge(
+                real_stats) if real_stats is not None else cached['stats']
         if capture_all:
-            inception_state['raw_feature'] = real_feat
-        dir_name = osp.dirname(inception_pkl)
-        os.makedirs(dir_name, exist_ok=True)
+            feats = cached['feats']
+            full_feat = np.empty(
+                (num_items, ) + feats.shape[1:], dtype=feats.dtype)
+            full_feat[cached['found']] = feats
+            if real_feat is not None:
+                full_feat[missing] = real_feat
+            real_feat = full_feat
+    if auto_save and len(missing) > 0:
+        feat_cache.save(cache_key, fingerprints, real_stats, real_feat,
+                        cache_info)
+    return real_stats, real_feat
+
+
+def prepare_inception_feat(dataloader: DataLoader,
+                           metric: BaseMetric,
+                           data_preprocessor: Optional[nn.Module] = None,
+                           capture_mean_cov: bool = False,
+                           capture_all: bool = False) -> dict:
+    """Prepare inception feature for the input metric.
+
+    - If `metric.inception_pkl` is an online path (e.g. http or s3), try to
+      download and load it. If cannot download or load, corresponding error
+      will be raised.
+    - If `metric.inception_pkl` is local path and file exists, try to load the
+      file. If cannot load, corresponding error will be raised.
+    - If `metric.inception_pkl` is local path and file not exists, we will
+      extract the inception feature manually and save to 'inception_pkl'.
+    - If `metric.inception_pkl` is not defined, we will load the inception
+      feature from :class:`FeatureCache` (configured by
+      `metric.feat_cache_cfg`), only the items not in the cache are
+      extracted. Pickle files saved in the default cache dir by previous
+      versions are still loaded.
+
+    Args:
+        datalaoder (Dataloader): The dataloader of real images.
+        metric (BaseMetric): The metric which needs inception features.
+        data_preprocessor (Optional[nn.Module]): Data preprocessor of the
+            module. Used to preprocess the real images. If not passed, real
+            images will automatically normalized to [-1, 1]. Defaults to None.
+        capture_mean_cov (bool): Whether save the mean and covariance of
+            inception feature. Defaults to False.
+        capture_all (bool): Whether save the raw inception feature. If true,
+            it will take a lot of time to save the inception feature. Defaults
+            to False.
+
+    Returns:
+        dict: Dict contains inception feature.
+    """
+    assert capture_mean_cov or capture_all, (
+        'At least one of \'capture_mean_cov\' and \'capture_all\' is True.')
+    if not hasattr(metric, 'inception_pkl'):
+        return
+    inception_pkl: Optional[str] = metric.inception_pkl
+
+    if isinstance(inception_pkl, str):
+        if is_filepath(inception_pkl) and osp.exists(inception_pkl):
+            with open(inception_pkl, 'rb') as file:
+                inception_state = pickle.load(file)
+            print_log(
+                f'\'{metric.prefix}\' successful load inception feature '
+                f'from \'{inception_pkl}\'', 'current')
+            return inception_state
+        elif inception_pkl.startswith(('s3', 'http')):
+            inception_state = _load_remote_pkl(inception_pkl)
+            print_log(
+                f'\'{metric.prefix}\' successful load inception feature '
+                f'from \'{inception_pkl}\'', 'current')
+            return inception_state
+
+    # cannot load or download from file, extract manually
+    assert hasattr(metric, 'real_nums'), (
+        f'Metric \'{metric.name}\' must have attribute \'real_nums\'.')
+    real_nums = metric.real_nums
+    if inception_pkl is None:
+        legacy_pkl, _ = get_inception_feat_cache_name_and_args(
+            dataloader, metric, real_nums, capture_mean_cov, capture_all)
+        legacy_pkl = osp.join(MMEDIT_CACHE_DIR, legacy_pkl)
+        if osp.exists(legacy_pkl):
+            with open(legacy_pkl, 'rb') as file:
+                real_feat = pickle.load(file)
+            print_log(f'load preprocessed feat from {legacy_pkl}', 'current')
+            return real_feat
+
+    assert hasattr(metric, 'inception'), (
+        'Metric must have a inception network to extract inception features.')
+
+    if inception_pkl is None:
+        cache_info = get_feat_cache_info(
+            dataloader,
+            metric,
+            data_preprocessor,
+            extractor='inception',
+            inception_style=metric.inception_style,
+            inception_args=getattr(metric, 'inception_args', None))
+        real_stats, real_feat = load_or_extract_real_feat(
+            dataloader,
+            metric,
+            cache_info,
+            metric.forward_inception,
+            data_preprocessor,
+            num_items=real_nums,
+            capture_mean_cov=capture_mean_cov,
+            capture_all=capture_all,
+            description='Calculate Inception Feature.')
+    else:
         print_log(
-            f'Saving inception pkl to {inception_pkl}. Please be patient.',
-            'current')
-        with open(inception_pkl, 'wb') as file:
-            pickle.dump(inception_state, file)
-        print_log('Inception pkl Finished.', 'current')
+            f'Inception pkl \'{inception_pkl}\' is not found, extract '
+            'manually.', 'current')
+        dataset = dataloader.dataset
+        num_items = len(dataset) if real_nums == -1 else min(
+            len(dataset), real_nums)
+        real_stats, real_feat = extract_real_feat(
+            dataloader, list(range(num_items)), metric,
+            metric.forward_inception, data_preprocessor, capture_mean_cov,
+            capture_all, 'Calculate Inception Feature.')
+
+    # only return on the main process
+    if is_main_process():
+        inception_state = dict()
+        if capture_mean_cov:
+            inception_state['real_mean'] = real_stats.mean
+            inception_state['real_cov'] = real_stats.cov
+        if capture_all:
+            inception_state['raw_feature'] = real_feat
+        if inception_pkl is not None:
+            dir_name = osp.dirname(inception_pkl)
+            os.makedirs(dir_name, exist_ok=True)
+            print_log(
+                f'Saving inception pkl to {inception_pkl}. Please be '
+                'patient.', 'current')
+            with open(inception_pkl, 'wb') as file:
+                pickle.dump(inception_state, file)
+            print_log('Inception pkl Finished.', 'current')
         return inception_state
 
 
@@ -467,14 +687,17 @@ def prepare_vgg_feat(dataloader: DataLoader,
                      auto_save=True) -> np.ndarray:
     """Prepare vgg feature for the input metric.
 
-    - If `metric.vgg_pkl` is an online path, try to download and load
-      it. If cannot download or load, corresponding error will be raised.
+    - If `metric.vgg_pkl` is an online path (e.g. http or s3), try to
+      download and load it. If cannot download or load, corresponding error
+      will be raised.
     - If `metric.vgg_pkl` is local path and file exists, try to load the
       file. If cannot load, corresponding error will be raised.
     - If `metric.vgg_pkl` is local path and file not exists, we will
       extract the vgg feature manually and save to 'vgg_pkl'.
-    - If `metric.vgg_pkl` is not defined, we will extrace the vgg
-      feature and save it to default cache dir with default name.
+    - If `metric.vgg_pkl` is not defined, we will load the vgg feature from
+      :class:`FeatureCache` (configured by `metric.feat_cache_cfg`), only the
+      items not in the cache are extracted. Pickle files saved in the default
+      cache dir by previous versions are still loaded.
 
     Args:
         datalaoder (Dataloader): The dataloader of real images.
@@ -482,6 +705,8 @@ def prepare_vgg_feat(dataloader: DataLoader,
         data_preprocessor (Optional[nn.Module]): Data preprocessor of the
             module. Used to preprocess the real images. If not passed, real
             images will automatically normalized to [-1, 1]. Defaults to None.
+        auto_save (bool): Whether to save the extracted feature. Defaults to
+            True.
         Returns:
             np.ndarray: Loaded vgg feature.
     """
@@ -497,98 +722,60 @@ def prepare_vgg_feat(dataloader: DataLoader,
                 f'\'{metric.prefix}\' successful load VGG feature '
                 f'from \'{vgg_pkl}\'', 'currnet')
             return vgg_state['vgg_feat']
-        elif vgg_pkl.startswith('s3'):
-            try:
-                raise NotImplementedError(
-                    'Not support download from Ceph currently')
-            except Exception as exp:
-                raise exp('Not support download from Ceph currently')
-        elif vgg_pkl.startswith('http'):
-            try:
-                raise NotImplementedError(
-                    'Not support download from url currently')
-            except Exception as exp:
-                # cannot download, raise error
-                raise exp('Not support download from url currently')
+        elif vgg_pkl.startswith(('s3', 'http')):
+            vgg_state = _load_remote_pkl(vgg_pkl)
+            print_log(
+                f'\'{metric.prefix}\' successful load VGG feature '
+                f'from \'{vgg_pkl}\'', 'currnet')
+            return vgg_state['vgg_feat']
 
     # cannot load or download from file, extract manually
     if vgg_pkl is None:
-        vgg_pkl, args = get_vgg_feat_cache_name_and_args(dataloader, metric)
-        vgg_pkl = osp.join(MMEDIT_CACHE_DIR, vgg_pkl)
-    else:
-        args = dict()
-    if osp.exists(vgg_pkl):
-        with open(vgg_pkl, 'rb') as file:
-            real_feat = pickle.load(file)['vgg_feat']
-        print(f'load preprocessed feat from {vgg_pkl}')
-        return real_feat
+        legacy_pkl, _ = get_vgg_feat_cache_name_and_args(dataloader, metric)
+        legacy_pkl = osp.join(MMEDIT_CACHE_DIR, legacy_pkl)
+        if osp.exists(legacy_pkl):
+            with open(legacy_pkl, 'rb') as file:
+                real_feat = pickle.load(file)['vgg_feat']
+            print_log(f'load preprocessed feat from {legacy_pkl}', 'current')
+            return real_feat
 
     assert hasattr(
         metric,
         'vgg16'), ('Metric must have a vgg16 network to extract vgg features.')
 
-    real_feat = []
-    mean = getattr(data_preprocessor, 'mean', None)
-    std = getattr(data_preprocessor, 'std', None)
-
-    print_log(f'Vgg pkl \'{vgg_pkl}\' is not found, extract '
-              'manually.', 'current')
-
-    import rich.progress
-
-    # init rich pbar for the main process
-    if is_main_process():
-        columns = [
-            rich.progress.TextColumn('[bold blue]{task.description}'),
-            rich.progress.BarColumn(bar_width=40),
-            rich.progress.TaskProgressColumn(),
-            rich.progress.TimeRemainingColumn(),
-        ]
-        pbar = rich.progress.Progress(*columns)
-        pbar.start()
-        task = pbar.add_task(
-            'Calculate VGG16 Feature.',
-            total=len(dataloader.dataset),
-            visible=True)
-
-    for data in dataloader:
-        data = data_preprocessor(data)
-        img = data['inputs']
-
-        if isinstance(img, dict):
-            real_key = 'img' if metric.real_key is None else metric.real_key
-            img = img[real_key]
-
-        # make sure the input image is in [-1, 1]
-        if mean is None and std is None:
-            # rescale to [-1, 1]
-            img = img / 127.5 - 1
-        else:
-            assert mean is not None and std is not None, (
-                '\'mean\' and \'std\' must be None or not None at the '
-                f'same time. But receive \'{mean}\' and \'{std}\' '
-                'respectively.')
-
-        real_feat_ = metric.extract_features(img)
-        real_feat.append(real_feat_)
-        # real_feat += torch.tensor_split(real_feat_, real_feat_.shape[0])
-        if is_main_process():
-            pbar.update(task, advance=len(real_feat_) * get_world_size())
-
-    # stop the pbar
-    if is_main_process():
-        pbar.stop()
-
-    # collect results
-    real_feat = torch.cat(real_feat)
-    # use `all_gather` here, gather tensor is much quicker than gather object.
-    real_feat = all_gather(real_feat)
-
-    # only cat on the main process
+    if vgg_pkl is None:
+        cache_info = get_feat_cache_info(
+            dataloader,
+            metric,
+            data_preprocessor,
+            extractor='vgg16',
+            use_tero_scirpt=metric.use_tero_scirpt)
+        _, real_feat = load_or_extract_real_feat(
+            dataloader,
+            metric,
+            cache_info,
+            metric.extract_features,
+            data_preprocessor,
+            capture_all=True,
+            auto_save=auto_save,
+            description='Calculate VGG16 Feature.')
+    else:
+        print_log(f'Vgg pkl \'{vgg_pkl}\' is not found, extract '
+                  'manually.', 'current')
+        _, real_feat = extract_real_feat(
+            dataloader,
+            list(range(len(dataloader.dataset))),
+            metric,
+            metric.extract_features,
+            data_preprocessor,
+            capture_all=True,
+            description='Calculate VGG16 Feature.')
+
+    # only return on the main process
     if is_main_process():
-        real_feat = torch.cat(real_feat, dim=0)[:len(dataloader.dataset)].cpu()
-        if auto_save:
-            vgg_state = dict(vgg_feat=real_feat, **args)
+        real_feat = torch.from_numpy(np.ascontiguousarray(real_feat))
+        if auto_save and vgg_pkl is not None:
+            vgg_state = dict(vgg_feat=real_feat)
             with open(vgg_pkl, 'wb') as file:
                 pickle.dump(vgg_state, file)
         return real_feat
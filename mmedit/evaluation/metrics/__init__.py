@@ -10,6 +10,7 @@ from .matting_mse import MattingMSE
 from .ms_ssim import MultiScaleStructureSimilarity
 from .mse import MSE
 from .niqe import NIQE, niqe
+from .padding_waste import PaddingWaste
 from .ppl import PerceptualPathLength
 from .precision_and_recall import PrecisionAndRecall
 from .psnr import PSNR, psnr
@@ -42,4 +43,5 @@ __all__ = [
     'NIQE',
     'niqe',
     'Equivariance',
+    'PaddingWaste',
 ]
@@ -1,8 +1,10 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 """Evaluation metrics based on each sample."""
 
-from typing import List, Optional, Sequence
+from typing import List, Optional, Sequence, Union
 
+import numpy as np
+import torch
 from mmengine.evaluator import BaseMetric
 
 from mmedit.registry import METRICS
@@ -36,6 +38,8 @@ class BaseSampleWiseMetric(BaseMetric):
     """
 
     metric = None
+    # upper bound of elements per call of ``process_batch``
+    max_batch_elements = 2**24
 
     def __init__(self,
                  gt_key: str = 'gt_img',
@@ -72,6 +76,10 @@ class BaseSampleWiseMetric(BaseMetric):
                 data_samples: Sequence[dict]) -> None:
         """Process one batch of data and predictions.
 
+        Samples sharing the same shape, data type and channel order are
+        stacked and evaluated together by :meth:`process_batch`. The frames
+        of videos are evaluated in the same way.
+
         Args:
             data_batch (Sequence[dict]): A batch of data
                 from the dataloader.
@@ -79,15 +87,16 @@ class BaseSampleWiseMetric(BaseMetric):
                 the model.
         """
 
-        for data in data_samples:
+        groups = dict()
+        for idx, data in enumerate(data_samples):
             prediction = data['output']
 
-            self.channel_order = 'rgb'
+            channel_order = 'rgb'
             metainfo = data
             if 'gt_channel_order' in metainfo:
-                self.channel_order = metainfo['gt_channel_order']
+                channel_order = metainfo['gt_channel_order']
             elif 'img_channel_order' in metainfo:
-                self.channel_order = metainfo['img_channel_order']
+                channel_order = metainfo['img_channel_order']
 
             gt = obtain_data(data, self.gt_key, self.device)
             pred = obtain_data(prediction, self.pred_key, self.device)
@@ -97,15 +106,81 @@ class BaseSampleWiseMetric(BaseMetric):
             else:
                 mask = 1 - pred * 0
 
-            if len(gt.shape) <= 3:
-                result = self.process_image(gt, pred, mask)
-            else:
-                result_sum = 0
-                for i in range(gt.shape[0]):
-                    result_sum += self.process_image(gt[i], pred[i], mask[i])
-                result = result_sum / gt.shape[0]
+            key = (tuple(gt.shape), type(gt), type(pred), type(mask),
+                   channel_order)
+            groups.setdefault(key, []).append((idx, gt, pred, mask))
+
+        results = [None] * len(data_samples)
+        for key, items in groups.items():
+            self.channel_order = key[-1]
+            indices, gts, preds, masks = zip(*items)
+            gt, pred, mask = (_stack(x) for x in (gts, preds, masks))
 
+            if len(gt.shape) <= 4:
+                batch_results = self._process_in_chunks(gt, pred, mask)
+            else:
+                # evaluate the frames of all videos at once
+                num_videos, num_frames = gt.shape[:2]
+                frame_results = self._process_in_chunks(
+                    *(x.reshape((num_videos * num_frames, ) +
+                                tuple(x.shape[2:])) for x in (gt, pred, mask)))
+                batch_results = []
+                for i in range(num_videos):
+                    result_sum = 0
+                    for result in frame_results[i * num_frames:(i + 1) *
+                                                num_frames]:
+                        result_sum += result
+                    batch_results.append(result_sum / num_frames)
+
+            for idx, result in zip(indices, batch_results):
+                results[idx] = result
+
+        for result in results:
             self.results.append({self.metric: result})
 
+    def _process_in_chunks(self, gt, pred, mask) -> List:
+        """Call :meth:`process_batch` on chunks of the batch, so that each
+        chunk contains no more than ``max_batch_elements`` elements."""
+        num_elements = max(int(np.prod(gt.shape[1:])), 1)
+        chunk_size = max(self.max_batch_elements // num_elements, 1)
+        results = []
+        for i in range(0, gt.shape[0], chunk_size):
+            results.extend(
+                self.process_batch(gt[i:i + chunk_size],
+                                   pred[i:i + chunk_size],
+                                   mask[i:i + chunk_size]))
+        return results
+
+    def process_batch(self, gt, pred, mask) -> List:
+        """Process a batch of images.
+
+        The default implementation calls :meth:`process_image` for each
+        image. Subclasses can override it with a vectorized implementation.
+
+        Args:
+            gt (Torch | np.ndarray): GT images stacked along the first
+                dimension.
+            pred (Torch | np.ndarray): Pred images stacked along the first
+                dimension.
+            mask (Torch | np.ndarray): Masks of evaluation stacked along the
+                first dimension.
+
+        Returns:
+            List: The result of each image.
+        """
+        return [
+            self.process_image(gt[i], pred[i], mask[i])
+            for i in range(gt.shape[0])
+        ]
+
     def process_image(self, gt, pred, mask):
         return 0
+
+
+def _stack(data: Sequence) -> Union[torch.Tensor, np.ndarray]:
+    """Stack a sequence of tensors or arrays along a new first dimension."""
+    if len(data) == 1:
+        return data[0][None]
+    if isinstance(data[0], torch.Tensor):
+        return torch.stack(data)
+    return np.stack(data)
@@ -1,17 +1,17 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from typing import List, Optional, Sequence, Tuple
+from typing import List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import torch
 import torch.nn as nn
-from mmengine.dist import is_main_process
+from mmengine.dist import get_dist_info, is_main_process
 from scipy import linalg
 from torch import Tensor
 from torch.utils.data.dataloader import DataLoader
 
 from mmedit.registry import METRICS
-from ..functional import (disable_gpu_fuser_on_pt19, load_inception,
-                          prepare_inception_feat)
+from ..functional import (FeatureStats, disable_gpu_fuser_on_pt19,
+                          load_inception, prepare_inception_feat)
 from .base_gen_metric import GenerativeMetric
 
 
@@ -59,6 +59,15 @@ class FrechetInceptionDistance(GenerativeMetric):
             names to disambiguate homonymous metrics of different evaluators.
             If prefix is not provided in the argument, self.default_prefix
             will be used instead. Defaults to None.
+        sqrt_method (str): Method to compute the trace of the square root of
+            the product of covariances. 'sqrtm' uses `scipy.linalg.sqrtm`.
+            'eigh' only needs symmetric eigendecompositions and matrix
+            multiplications, which are run with PyTorch on the device of the
+            inception network and are much faster. Defaults to 'sqrtm'.
+        feat_cache_cfg (dict, optional): Config of
+            :class:`~mmedit.evaluation.functional.FeatureCache`, which caches
+            the statistics of real images when ``inception_pkl`` is None.
+            If None, the default cache dir is used. Defaults to None.
     """
     name = 'FID'
 
@@ -73,15 +82,44 @@ class FrechetInceptionDistance(GenerativeMetric):
                  need_cond_input: bool = False,
                  sample_model: str = 'orig',
                  collect_device: str = 'cpu',
-                 prefix: Optional[str] = None):
+                 prefix: Optional[str] = None,
+                 sqrt_method: str = 'sqrtm',
+                 feat_cache_cfg: Optional[dict] = None):
         super().__init__(fake_nums, real_nums, fake_key, real_key,
                          need_cond_input, sample_model, collect_device, prefix)
+        assert sqrt_method in [
+            'sqrtm', 'eigh'
+        ], ('Only support \'sqrtm\' and \'eigh\', but receive '
+            f'\'{sqrt_method}\'.')
+        self.sqrt_method = sqrt_method
         self.real_mean = None
         self.real_cov = None
         self.device = 'cpu'
         self.inception, self.inception_style = self._load_inception(
             inception_style, inception_path)
         self.inception_pkl = inception_pkl
+        self.feat_cache_cfg = feat_cache_cfg
+        # accumulate the statistics of fake features instead of buffering
+        # every feature in `self.fake_results`
+        self.fake_stats = FeatureStats()
+
+    @property
+    def fake_nums_per_rank(self) -> int:
+        """Number of fake features accumulated by the current rank. Different
+        from :attr:`fake_nums_per_device`, the numbers of all ranks sum up to
+        exactly :attr:`fake_nums`."""
+        rank, world_size = get_dist_info()
+        return self.fake_nums // world_size + int(
+            rank < self.fake_nums % world_size)
+
+    def _append_fake_feat(self, feat: Tensor) -> None:
+        """Accumulate the inception feature of fake images.
+
+        Args:
+            feat (Tensor): Inception feature of a batch of fake images.
+        """
+        self.fake_stats.max_items = self.fake_nums_per_rank
+        self.fake_stats.append(feat)
 
     def prepare(self, module: nn.Module, dataloader: DataLoader) -> None:
         """Preparing inception feature for the real images.
@@ -142,15 +180,15 @@ class FrechetInceptionDistance(GenerativeMetric):
         return feat
 
     def process(self, data_batch: dict, data_samples: Sequence[dict]) -> None:
-        """Process one batch of data samples and predictions. The processed
-        results should be stored in ``self.fake_results``, which will be used
+        """Process one batch of data samples and predictions. The inception
+        features are accumulated in ``self.fake_stats``, which will be used
         to compute the metrics when all batches have been processed.
 
         Args:
             data_batch (dict): A batch of data from the dataloader.
             data_samples (Sequence[dict]): A batch of outputs from the model.
         """
-        if len(self.fake_results) >= self.fake_nums_per_device:
+        if self.fake_stats.num_items >= self.fake_nums_per_rank:
             return
 
         fake_imgs = []
@@ -169,19 +207,33 @@ class FrechetInceptionDistance(GenerativeMetric):
         fake_imgs = torch.stack(fake_imgs, dim=0)
 
         feat = self.forward_inception(fake_imgs)
-        feat_list = list(torch.split(feat, 1))
-        self.fake_results += feat_list
+        self._append_fake_feat(feat)
 
     @staticmethod
     def _calc_fid(sample_mean: np.ndarray,
                   sample_cov: np.ndarray,
                   real_mean: np.ndarray,
                   real_cov: np.ndarray,
-                  eps: float = 1e-6) -> Tuple[float]:
+                  eps: float = 1e-6,
+                  sqrt_method: str = 'sqrtm',
+                  device: str = 'cpu') -> Tuple[float]:
         """Refer to the implementation from:
 
         https://github.com/rosinality/stylegan2-pytorch/blob/master/fid.py#L34
+
+        If ``sqrt_method`` is 'eigh', the trace of the square root is computed
+        by :meth:`_trace_sqrt_product_eigh` on ``device``.
         """
+        mean_diff = sample_mean - real_mean
+        mean_norm = mean_diff @ mean_diff
+
+        if sqrt_method == 'eigh':
+            trace_sqrt = FrechetInceptionDistance._trace_sqrt_product_eigh(
+                sample_cov, real_cov, device)
+            trace = np.trace(sample_cov) + np.trace(real_cov) - 2 * trace_sqrt
+            fid = mean_norm + trace
+            return float(fid), float(mean_norm), float(trace)
+
         cov_sqrt, _ = linalg.sqrtm(sample_cov @ real_cov, disp=False)
 
         if not np.isfinite(cov_sqrt).all():
@@ -198,9 +250,6 @@ class FrechetInceptionDistance(GenerativeMetric):
 
             cov_sqrt = cov_sqrt.real
 
-        mean_diff = sample_mean - real_mean
-        mean_norm = mean_diff @ mean_diff
-
         trace = np.trace(sample_cov) + np.trace(
             real_cov) - 2 * np.trace(cov_sqrt)
 
@@ -208,23 +257,92 @@ class FrechetInceptionDistance(GenerativeMetric):
 
         return float(fid), float(mean_norm), float(trace)
 
-    def compute_metrics(self, fake_results: list) -> dict:
+    @staticmethod
+    def _trace_sqrt_product_eigh(sample_cov: np.ndarray,
+                                 real_cov: np.ndarray,
+                                 device: str = 'cpu') -> float:
+        """Compute ``trace(sqrtm(sample_cov @ real_cov))`` with symmetric
+        eigendecompositions.
+
+        For PSD covariances, ``sample_cov @ real_cov`` is similar to the
+        symmetric PSD matrix ``S @ real_cov @ S``, where ``S`` is the square
+        root of ``sample_cov``. Therefore the trace equals the sum of square
+        roots of the eigenvalues of ``S @ real_cov @ S``, and only ``eigh``
+        and matrix multiplications are needed.
+
+        Args:
+            sample_cov (np.ndarray): Covariance of the fake features.
+            real_cov (np.ndarray): Covariance of the real features.
+            device (str): Device to run the decompositions on. Defaults to
+                'cpu'.
+
+        Returns:
+            float: The trace of the square root of the product.
+        """
+        sample_cov = torch.as_tensor(
+            sample_cov, dtype=torch.float64, device=device)
+        real_cov = torch.as_tensor(
+            real_cov, dtype=torch.float64, device=device)
+
+        eigval, eigvec = torch.linalg.eigh(sample_cov)
+        # clamp the eigenvalues slightly below zero caused by round-off
+        sample_cov_sqrt = (eigvec * eigval.clamp(min=0).sqrt()) @ eigvec.T
+        product = sample_cov_sqrt @ real_cov @ sample_cov_sqrt
+        eigval = torch.linalg.eigvalsh((product + product.T) / 2)
+        return float(eigval.clamp(min=0).sqrt().sum())
+
+    def _collect_target_results(self, target: str) -> Optional[list]:
+        """Collected results in distributed environments. The statistics of
+        fake features are summed up across ranks instead of gathering every
+        feature.
+
+        Args:
+            target (str): Target results to collect.
+
+        Returns:
+            Optional[list]: The collected results.
+        """
+        if target == 'fake':
+            return self.fake_stats.all_reduce()
+        return super()._collect_target_results(target)
+
+    def evaluate(self) -> dict:
+        """Evaluate FID and reset the accumulated statistics of fake features.
+
+        Returns:
+            dict: Evaluation metrics dict on the val dataset.
+        """
+        metrics = super().evaluate()
+        self.fake_stats.reset()
+        return metrics
+
+    def compute_metrics(self, fake_results: Union[FeatureStats, list]) -> dict:
         """Compulate the result of FID metric.
 
         Args:
-            fake_results (list): List of image feature of fake images.
+            fake_results (Union[FeatureStats, list]): Statistics of the
+                inception feature of fake images, or list of image feature of
+                fake images.
 
         Returns:
             dict: A dict of the computed FID metric and its mean and
                 covariance.
         """
-        fake_feats = torch.cat(fake_results, dim=0)
-        fake_feats_np = fake_feats.cpu().numpy()
-        fake_mean = np.mean(fake_feats_np, 0)
-        fake_cov = np.cov(fake_feats_np, rowvar=False)
-
-        fid, mean, cov = self._calc_fid(fake_mean, fake_cov, self.real_mean,
-                                        self.real_cov)
+        if isinstance(fake_results, FeatureStats):
+            fake_stats = fake_results
+        else:
+            fake_stats = FeatureStats()
+            fake_stats.append(torch.cat(fake_results, dim=0))
+        fake_mean = fake_stats.mean
+        fake_cov = fake_stats.cov
+
+        fid, mean, cov = self._calc_fid(
+            fake_mean,
+            fake_cov,
+            self.real_mean,
+            self.real_cov,
+            sqrt_method=self.sqrt_method,
+            device=self.device)
 
         return {'fid': fid, 'mean': mean, 'cov': cov}
 
@@ -242,12 +360,15 @@ class TransFID(FrechetInceptionDistance):
                  real_key: Optional[str] = 'img',
                  sample_model: str = 'ema',
                  collect_device: str = 'cpu',
-                 prefix: Optional[str] = None):
+                 prefix: Optional[str] = None,
+                 sqrt_method: str = 'sqrtm',
+                 feat_cache_cfg: Optional[dict] = None):
         # NOTE: set `need_cond` as False since we direct return the original
         # dataloader as sampler
         super().__init__(fake_nums, real_nums, inception_style, inception_path,
                          inception_pkl, fake_key, real_key, False,
-                         sample_model, collect_device, prefix)
+                         sample_model, collect_device, prefix, sqrt_method,
+                         feat_cache_cfg)
 
         self.SAMPLER_MODE = 'normal'
 
@@ -266,8 +387,8 @@ class TransFID(FrechetInceptionDistance):
         return dataloader
 
     def process(self, data_batch: dict, data_samples: Sequence[dict]) -> None:
-        """Process one batch of data samples and predictions. The processed
-        results should be stored in ``self.fake_results``, which will be used
+        """Process one batch of data samples and predictions. The inception
+        features are accumulated in ``self.fake_stats``, which will be used
         to compute the metrics when all batches have been processed.
 
         Args:
@@ -288,5 +409,4 @@ class TransFID(FrechetInceptionDistance):
             fake_imgs.append(fake_img_)
         fake_imgs = torch.stack(fake_imgs, dim=0)
         feat = self.forward_inception(fake_imgs)
-        feat_list = list(torch.split(feat, 1))
-        self.fake_results += feat_list
+        self._append_fake_feat(feat)
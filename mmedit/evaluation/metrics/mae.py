@@ -58,3 +58,30 @@ class MAE(BaseSampleWiseMetric):
             result = diff.mean()
 
         return result
+
+    def process_batch(self, gt, pred, mask):
+        """Process a batch of images.
+
+        Args:
+            gt (Tensor | np.ndarray): GT images.
+            pred (Tensor | np.ndarray): Pred images.
+            mask (Tensor | np.ndarray): Masks of evaluation.
+        Returns:
+            List: MAE result of each image.
+        """
+
+        gt = gt / 255.
+        pred = pred / 255.
+
+        diff = gt - pred
+        diff = abs(diff)
+
+        dims = tuple(range(1, len(diff.shape)))
+        if self.mask_key is not None:
+            diff *= mask  # broadcast for channel dimension
+            scale = np.prod(diff.shape[1:]) / np.prod(mask.shape[1:])
+            result = diff.sum(dims) / (mask.sum(dims) * scale + 1e-12)
+        else:
+            result = diff.mean(dims)
+
+        return list(result)
@@ -126,6 +126,69 @@ def img_transform(img,
     return img
 
 
+def batch_img_transform(imgs,
+                        crop_border=0,
+                        input_order='HWC',
+                        convert_to=None,
+                        channel_order='rgb'):
+    """Image transform for a batch of images.
+
+    It is the vectorized version of :func:`img_transform`, but keeps the
+    channel dimension before the spatial dimensions, so that each channel is
+    contiguous in memory.
+
+    Args:
+        imgs (Tensor | np.ndarray): Images with range [0, 255], stacked along
+            the first dimension.
+        crop_border (int): Cropped pixels in each edges of an image. These
+            pixels are not involved in the PSNR calculation. Default: 0.
+        input_order (str): Whether the input order is 'HWC' or 'CHW'.
+            Default: 'HWC'.
+        convert_to (str): Whether to convert the images to other color models.
+            If None, the images are not altered. When computing for 'Y',
+            the images are assumed to be in BGR order. Options are 'Y' and
+            None. Default: None.
+        channel_order (str): The channel order of image. Default: 'rgb'
+
+    Returns:
+        np.ndarray: Transformed images with shape (n, c, h, w).
+    """
+
+    if input_order not in ['HWC', 'CHW']:
+        raise ValueError(
+            f'Wrong input_order {input_order}. Supported input_orders are '
+            '"HWC" and "CHW"')
+
+    if isinstance(imgs, torch.Tensor):
+        imgs = imgs.cpu().numpy()
+    if imgs.ndim == 3:
+        imgs = imgs[:, None]
+    elif input_order == 'HWC':
+        imgs = imgs.transpose(0, 3, 1, 2)
+    imgs = imgs.astype(np.float32)
+
+    if isinstance(convert_to, str) and convert_to.lower() == 'y':
+        # the same as `mmcv.rgb2ycbcr` and `mmcv.bgr2ycbcr` with y_only
+        if channel_order == 'rgb':
+            coeffs = np.array([65.481, 128.553, 24.966])
+        elif channel_order == 'bgr':
+            coeffs = np.array([24.966, 128.553, 65.481])
+        else:
+            raise ValueError(
+                'Only support `rgb2y` and `bgr2`, but the channel_order '
+                f'is {channel_order}')
+        imgs = np.tensordot(coeffs, imgs / 255., axes=([0], [1])) + 16.0
+        imgs = (imgs / 255.).astype(np.float32)[:, None] * 255.
+    elif convert_to is not None:
+        raise ValueError('Wrong color model. Supported values are '
+                         '"Y" and None.')
+
+    if crop_border != 0:
+        imgs = imgs[..., crop_border:-crop_border, crop_border:-crop_border]
+
+    return imgs
+
+
 def obtain_data(data_sample, key, device='cpu'):
     """Obtain data of key from data_sample and converse data to device.
     Args:
@@ -55,3 +55,29 @@ class MSE(BaseSampleWiseMetric):
             result = diff.mean()
 
         return result
+
+    def process_batch(self, gt, pred, mask):
+        """Process a batch of images.
+
+        Args:
+            gt (Torch | np.ndarray): GT images.
+            pred (Torch | np.ndarray): Pred images.
+            mask (Torch | np.ndarray): Masks of evaluation.
+        Returns:
+            List: MSE result of each image.
+        """
+
+        gt = gt / 255.
+        pred = pred / 255.
+
+        diff = gt - pred
+        diff *= diff
+
+        dims = tuple(range(1, len(diff.shape)))
+        if self.mask_key is not None:
+            diff *= mask
+            result = diff.sum(dims) / mask.sum(dims)
+        else:
+            result = diff.mean(dims)
+
+        return list(result)
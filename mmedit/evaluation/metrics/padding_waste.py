@@ -0,0 +1,77 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from typing import List, Optional, Sequence
+
+import numpy as np
+import torch
+from mmengine.evaluator import BaseMetric
+
+from mmedit.registry import METRICS
+
+
+@METRICS.register_module()
+class PaddingWaste(BaseMetric):
+    """Ratio of padded pixels in the batches.
+
+    Images of different sizes are padded to the maximum size of the batch
+    (rounded up to ``pad_size_divisor``) before being stacked by
+    :class:`EditDataPreprocessor`, and the padded pixels are computed by the
+    model in vain. This metric reports the ratio of padded pixels in all the
+    stacked batches, which can be reduced by grouping images of similar sizes
+    into a batch with :class:`SizeBucketBatchSampler`.
+
+    Args:
+        pad_size_divisor (int): The size of padded image should be
+            divisible by ``pad_size_divisor``, the same as the data
+            preprocessor. Defaults to 1.
+        collect_device (str): Device name used for collecting results from
+            different ranks during distributed training. Must be 'cpu' or
+            'gpu'. Defaults to 'cpu'.
+        prefix (str, optional): The prefix that will be added in the metric
+            names to disambiguate homonymous metrics of different evaluators.
+            Default: None.
+    """
+
+    metric = 'PaddingWaste'
+
+    def __init__(self,
+                 pad_size_divisor: int = 1,
+                 collect_device: str = 'cpu',
+                 prefix: Optional[str] = None) -> None:
+        super().__init__(collect_device, prefix)
+        self.pad_size_divisor = pad_size_divisor
+
+    def process(self, data_batch: dict, data_samples: Sequence[dict]) -> None:
+        """Record the number of valid and padded pixels of one batch.
+
+        Args:
+            data_batch (dict): A batch of data from the dataloader, whose
+                ``inputs`` are the images (or frames) before being stacked.
+            data_samples (Sequence[dict]): A batch of outputs from the model.
+        """
+
+        inputs = data_batch['inputs']
+        if isinstance(inputs, torch.Tensor):
+            sizes = [tuple(inputs.shape[-2:])] * inputs.shape[0]
+        else:
+            sizes = [tuple(_input.shape[-2:]) for _input in inputs]
+        sizes = np.array(sizes, dtype=np.int64)
+        divisor = self.pad_size_divisor
+        batch_h, batch_w = -(-sizes.max(axis=0) // divisor) * divisor
+        self.results.append(
+            dict(
+                valid=int(np.prod(sizes, axis=1).sum()),
+                total=int(len(sizes) * batch_h * batch_w)))
+
+    def compute_metrics(self, results: List) -> dict:
+        """Compute the ratio of padded pixels from processed results.
+
+        Args:
+            results (List): The processed results of each batch.
+
+        Returns:
+            dict: The ratio of padded pixels.
+        """
+
+        valid = sum(result['valid'] for result in results)
+        total = sum(result['total'] for result in results)
+        return {self.metric: 1 - valid / total if total else 0.}
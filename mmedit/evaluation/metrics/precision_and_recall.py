@@ -1,6 +1,8 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import os
-from typing import Optional, Sequence, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Optional, Sequence, Tuple
 
 import numpy as np
 import torch
@@ -44,6 +46,75 @@ def compute_pr_distances(row_features,
     return torch.cat(dist_batches, dim=1)[:, :num_cols] if rank == 0 else None
 
 
+def compute_pr_kth_distances(row_features: torch.Tensor,
+                             col_features: torch.Tensor,
+                             k: int,
+                             col_batch_size: int = 10000) -> torch.Tensor:
+    """Compute the distance from each row feature to its kth nearest
+    column feature.
+
+    Instead of building the full distance matrix, the column features are
+    visited block by block and only the running ``k`` smallest distances of
+    each row are kept, therefore the peak memory is
+    O(num_rows * (k + col_batch_size)).
+
+    Args:
+        row_features (torch.Tensor): Row features in shape (n, d).
+        col_features (torch.Tensor): Column features in shape (m, d).
+        k (int): The order of the nearest neighbour, starting from 1.
+        col_batch_size (int): The batch size of column features. Defaults to
+            10000.
+
+    Returns:
+        torch.Tensor: The kth smallest distances in shape (n, ).
+    """
+    assert 0 < k <= col_features.shape[0]
+    topk = None
+    for col_batch in col_features.split(col_batch_size):
+        distance = torch.cdist(
+            row_features.unsqueeze(0),
+            col_batch.unsqueeze(0))[0].to(torch.float32)
+        if topk is not None:
+            distance = torch.cat([topk, distance], dim=1)
+        topk = distance.topk(
+            min(k, distance.shape[1]), dim=1, largest=False).values
+    return topk[:, k - 1]
+
+
+def compute_pr_within_radii(row_features: torch.Tensor,
+                            col_features: torch.Tensor,
+                            radii: torch.Tensor,
+                            col_batch_size: int = 10000) -> torch.Tensor:
+    """Check whether each row feature is within the hypersphere of any
+    column feature.
+
+    The column features are visited block by block, and the rows already
+    found to be inside are skipped in the following blocks.
+
+    Args:
+        row_features (torch.Tensor): Row features in shape (n, d).
+        col_features (torch.Tensor): Column features in shape (m, d).
+        radii (torch.Tensor): Radii of the hyperspheres centered at the
+            column features, in shape (m, ).
+        col_batch_size (int): The batch size of column features. Defaults to
+            10000.
+
+    Returns:
+        torch.Tensor: A bool tensor in shape (n, ).
+    """
+    pred = torch.zeros(
+        row_features.shape[0], dtype=torch.bool, device=row_features.device)
+    for col_batch, radii_batch in zip(
+            col_features.split(col_batch_size), radii.split(col_batch_size)):
+        remain = (~pred).nonzero(as_tuple=True)[0]
+        if remain.numel() == 0:
+            break
+        distance = torch.cdist(row_features[remain].unsqueeze(0),
+                               col_batch.unsqueeze(0))[0]
+        pred[remain] = (distance <= radii_batch).any(dim=1)
+    return pred
+
+
 @METRICS.register_module('PR')
 @METRICS.register_module()
 class PrecisionAndRecall(GenerativeMetric):
@@ -87,7 +158,11 @@ class PrecisionAndRecall(GenerativeMetric):
             row_batch_size (int, optional): The batch size of row data.
                 Defaults to 10000.
             col_batch_size (int, optional): The batch size of col data.
-                Defaults to 10000.
+                The peak memory of computing distances is
+                O(row_batch_size * col_batch_size). Defaults to 10000.
+            num_threads (int, optional): The number of threads to process
+                row batches in parallel. Only recommended when the features
+                are on CPU. Defaults to 1.
             auto_save (bool, optional): Whether save vgg feature automatically.
             need_cond_input (bool): If true, the sampler will return the
                 conditional input randomly sampled from the original dataset.
@@ -98,6 +173,11 @@ class PrecisionAndRecall(GenerativeMetric):
                 results since the conditional inputs are sampled from the dataset
                 distribution; otherwise will be sampled from the uniform
                 distribution. Defaults to False.
+            feat_cache_cfg (dict, optional): Config of
+                :class:`~mmedit.evaluation.functional.FeatureCache`, which
+                caches the vgg features of real images when ``vgg16_pkl`` is
+                None. If None, the default cache dir is used. Defaults to
+                None.
         """
     name = 'PR'
 
@@ -115,18 +195,22 @@ class PrecisionAndRecall(GenerativeMetric):
                  vgg16_pkl=None,
                  row_batch_size=10000,
                  col_batch_size=10000,
-                 auto_save=True):
+                 auto_save=True,
+                 feat_cache_cfg: Optional[dict] = None,
+                 num_threads: int = 1):
         super().__init__(fake_nums, real_nums, fake_key, real_key,
                          need_cond_input, sample_model, collect_device, prefix)
         print_log('loading vgg16 for improved precision and recall...',
                   'current')
         self.vgg16_pkl = vgg16_pkl
+        self.feat_cache_cfg = feat_cache_cfg
         self.vgg16, self.use_tero_scirpt = self._load_vgg(vgg16_script)
         self.k = k
 
         self.auto_save = auto_save
         self.row_batch_size = row_batch_size
         self.col_batch_size = col_batch_size
+        self.num_threads = num_threads
 
     def _load_vgg(self, vgg16_script: Optional[str]) -> Tuple[nn.Module, bool]:
         """Load VGG network from the given path.
@@ -172,6 +256,18 @@ class PrecisionAndRecall(GenerativeMetric):
 
         return feature
 
+    def _map_row_batches(self, func: Callable,
+                         features: torch.Tensor) -> torch.Tensor:
+        """Apply ``func`` to each row batch of ``features`` and concatenate
+        the results. Row batches are processed by ``num_threads`` threads."""
+        batches = features.split(self.row_batch_size)
+        if self.num_threads > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(self.num_threads) as executor:
+                results = list(executor.map(func, batches))
+        else:
+            results = [func(batch) for batch in batches]
+        return torch.cat(results)
+
     @torch.no_grad()
     def compute_metrics(self, results_fake) -> dict:
         """compute_metrics.
@@ -188,25 +284,20 @@ class PrecisionAndRecall(GenerativeMetric):
             ('precision', real_features, gen_features),
             ('recall', gen_features, real_features)
         ]:
-            kth = []
-            for manifold_batch in manifold.split(self.row_batch_size):
-                distance = compute_pr_distances(
-                    row_features=manifold_batch,
+            kth = self._map_row_batches(
+                partial(
+                    compute_pr_kth_distances,
                     col_features=manifold,
-                    col_batch_size=self.col_batch_size)
-                kth.append(
-                    distance.to(torch.float32).kthvalue(self.k + 1).values.to(
-                        torch.float16))
-            kth = torch.cat(kth)
-            pred = []
-            for probes_batch in probes.split(self.row_batch_size):
-                distance = compute_pr_distances(
-                    row_features=probes_batch,
+                    k=self.k + 1,
+                    col_batch_size=self.col_batch_size),
+                manifold).to(torch.float16)
+            pred = self._map_row_batches(
+                partial(
+                    compute_pr_within_radii,
                     col_features=manifold,
-                    col_batch_size=self.col_batch_size)
-                pred.append((distance <= kth).any(dim=1))
-            self._result_dict[name] = float(
-                torch.cat(pred).to(torch.float32).mean())
+                    radii=kth,
+                    col_batch_size=self.col_batch_size), probes)
+            self._result_dict[name] = float(pred.to(torch.float32).mean())
 
         precision = self._result_dict['precision']
         recall = self._result_dict['recall']
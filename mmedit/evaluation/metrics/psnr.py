@@ -5,7 +5,7 @@ import numpy as np
 
 from mmedit.registry import METRICS
 from .base_sample_wise_metric import BaseSampleWiseMetric
-from .metrics_utils import img_transform
+from .metrics_utils import batch_img_transform, img_transform
 
 
 @METRICS.register_module()
@@ -78,6 +78,35 @@ class PSNR(BaseSampleWiseMetric):
             convert_to=self.convert_to,
             channel_order=self.channel_order)
 
+    def process_batch(self, gt, pred, mask):
+        """Process a batch of images.
+
+        Args:
+            gt (Torch | np.ndarray): GT images.
+            pred (Torch | np.ndarray): Pred images.
+            mask (Torch | np.ndarray): Masks of evaluation.
+        Returns:
+            List: PSNR result of each image.
+        """
+
+        img1, img2 = (
+            batch_img_transform(
+                img,
+                crop_border=self.crop_border,
+                input_order=self.input_order,
+                convert_to=self.convert_to,
+                channel_order=self.channel_order) for img in (gt, pred))
+
+        mse_value = ((img1 - img2)**2).mean(axis=(1, 2, 3))
+        results = []
+        for value in mse_value:
+            if value == 0:
+                results.append(float('inf'))
+            else:
+                results.append(20. * np.log10(255. / np.sqrt(value)))
+
+        return results
+
 
 def psnr(img1,
          img2,
@@ -7,7 +7,7 @@ import numpy as np
 from mmedit.registry import METRICS
 from mmedit.utils import to_numpy
 from .base_sample_wise_metric import BaseSampleWiseMetric
-from .metrics_utils import img_transform
+from .metrics_utils import batch_img_transform, img_transform
 
 
 @METRICS.register_module()
@@ -87,6 +87,28 @@ class SSIM(BaseSampleWiseMetric):
             convert_to=self.convert_to,
             channel_order=self.channel_order)
 
+    def process_batch(self, gt, pred, mask):
+        """Process a batch of images.
+
+        Args:
+            gt (Torch | np.ndarray): GT images.
+            pred (Torch | np.ndarray): Pred images.
+            mask (Torch | np.ndarray): Masks of evaluation.
+        Returns:
+            List: SSIM result of each image.
+        """
+
+        img1, img2 = (
+            batch_img_transform(
+                img,
+                crop_border=self.crop_border,
+                input_order=self.input_order,
+                convert_to=self.convert_to,
+                channel_order=self.channel_order).astype(np.float64)
+            for img in (gt, pred))
+
+        return list(_batch_ssim(img1, img2))
+
 
 def _ssim(img1, img2):
     """Calculate SSIM (structural similarity) for one channel images.
@@ -122,6 +144,69 @@ def _ssim(img1, img2):
     return ssim_map.mean()
 
 
+def _filter_valid(imgs, window):
+    """Filter a batch of single-channel images and keep the valid region.
+
+    The images are stacked vertically and filtered by a single call of
+    ``cv2.filter2D``. Rows mixed with adjacent images only appear in the
+    cropped borders, so the result is the same as filtering each image
+    separately.
+
+    Args:
+        imgs (np.ndarray): Images with shape (n, h, w).
+        window (np.ndarray): The 2D kernel with odd size.
+
+    Returns:
+        np.ndarray: Filtered images with shape
+            (n, h - 2 * (size // 2), w - 2 * (size // 2)).
+    """
+    n, h, w = imgs.shape
+    pad = window.shape[0] // 2
+    out = cv2.filter2D(imgs.reshape(n * h, w), -1, window)
+    return out.reshape(n, h, w)[:, pad:-pad, pad:-pad]
+
+
+def _batch_ssim(img1, img2):
+    """Calculate SSIM (structural similarity) for a batch of images.
+
+    It is the vectorized version of func:`_ssim`, and the SSIM of each
+    channel is averaged.
+
+    Args:
+        img1, img2 (np.ndarray): Images with range [0, 255] with order
+            'NCHW'.
+
+    Returns:
+        np.ndarray: SSIM result of each image.
+    """
+
+    C1 = (0.01 * 255)**2
+    C2 = (0.03 * 255)**2
+
+    kernel = cv2.getGaussianKernel(11, 1.5)
+    window = np.outer(kernel, kernel.transpose())
+
+    # filter each channel as a single-channel image
+    n, c, h, w = img1.shape
+    img1 = np.ascontiguousarray(img1).reshape(n * c, h, w)
+    img2 = np.ascontiguousarray(img2).reshape(n * c, h, w)
+
+    mu1 = _filter_valid(img1, window)
+    mu2 = _filter_valid(img2, window)
+    mu1_sq = mu1**2
+    mu2_sq = mu2**2
+    mu1_mu2 = mu1 * mu2
+    sigma1_sq = _filter_valid(img1**2, window) - mu1_sq
+    sigma2_sq = _filter_valid(img2**2, window) - mu2_sq
+    sigma12 = _filter_valid(img1 * img2, window) - mu1_mu2
+
+    ssim_map = ((2 * mu1_mu2 + C1) *
+                (2 * sigma12 + C2)) / ((mu1_sq + mu2_sq + C1) *
+                                       (sigma1_sq + sigma2_sq + C2))
+
+    return ssim_map.reshape(n, c, -1).mean(axis=2).mean(axis=1)
+
+
 def ssim(img1,
          img2,
          crop_border=0,
@@ -1,11 +1,12 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+from typing import Any
+
 from ..registry import BACKBONES, COMPONENTS, LOSSES, MODELS
 from .base_models import (BaseConditionalGAN, BaseEditModel, BaseGAN,
                           BaseMattor, BaseTranslationModel, BasicInterpolator,
                           ExponentialMovingAverage)
 from .data_preprocessors import (EditDataPreprocessor, GenDataPreprocessor,
                                  MattorPreprocessor)
-from .editors import *  # noqa: F401, F403
 from .losses import *  # noqa: F401, F403
 
 __all__ = [
@@ -14,3 +15,13 @@ __all__ = [
     'LOSSES', 'BaseMattor', 'MODELS', 'BasicInterpolator',
     'ExponentialMovingAverage', 'GenDataPreprocessor', 'BaseConditionalGAN'
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # the editors are imported on demand, see `mmedit.models.editors`
+    from . import editors
+    try:
+        return getattr(editors, name)
+    except AttributeError:
+        raise AttributeError(
+            f'module {__name__!r} has no attribute {name!r}') from None
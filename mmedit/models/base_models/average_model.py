@@ -9,12 +9,51 @@ from mmengine.model import BaseAveragedModel
 from torch import Tensor
 
 from mmedit.registry import MODELS
+from ..utils import MultiTensorEMA
 
 # NOTICE: Since mmengine do not support loading ``state_dict`` without wrap
 # ema module with ``BaseAveragedModel`` currently, we rewrite
 # ``ExponentialMovingAverage`` and add ``_load_from_state_dict`` temporarily
 
 
+def _multi_tensor_update(averaged_model: BaseAveragedModel, model: nn.Module,
+                         momentum: float) -> None:
+    """Update the averaged model in place with multi-tensor ops. The
+    behavior is the same as ``BaseAveragedModel.update_parameters``, except
+    that buffers are only updated at the steps which are multiples of
+    ``averaged_model.buffer_interval``.
+
+    Args:
+        averaged_model (BaseAveragedModel): The averaged model with
+            ``flatten`` and ``buffer_interval`` attributes.
+        model (nn.Module): The model whose parameters will be averaged.
+        momentum (float): The momentum of the current step.
+    """
+    engine = getattr(averaged_model, '_ema_engine', None)
+    if engine is None or engine.src_module is not model:
+        engine = MultiTensorEMA(
+            averaged_model.module,
+            model,
+            flatten=averaged_model.flatten,
+            persistent_buffers_only=averaged_model.update_buffers)
+        averaged_model._ema_engine = engine
+
+    steps = int(averaged_model.steps)
+    buffer_interval = averaged_model.buffer_interval
+    update_buffers = buffer_interval > 0 and steps % buffer_interval == 0
+    if steps == 0:
+        engine.copy()
+    elif steps % averaged_model.interval == 0:
+        engine.update_params(momentum)
+        if averaged_model.update_buffers and update_buffers:
+            engine.update_buffers(momentum)
+    if not averaged_model.update_buffers and update_buffers:
+        # If not update the buffers,
+        # keep the buffers in sync with the source model.
+        engine.update_buffers()
+    averaged_model.steps += 1
+
+
 @MODELS.register_module()
 class ExponentialMovingAverage(BaseAveragedModel):
     r"""Implements the exponential moving average (EMA) of the model.
@@ -38,6 +77,12 @@ class ExponentialMovingAverage(BaseAveragedModel):
         update_buffers (bool): if True, it will compute running averages for
             both the parameters and the buffers of the model. Defaults to
             False.
+        flatten (bool): Whether to keep the parameters of the averaged model
+            in contiguous buffers, so that they can be updated with a single
+            kernel. Defaults to False.
+        buffer_interval (int): Interval between two updates of buffers, in
+            the unit of steps. If 0, buffers are not updated after the first
+            step. Defaults to 1.
     """  # noqa: W605
 
     def __init__(self,
@@ -45,8 +90,12 @@ class ExponentialMovingAverage(BaseAveragedModel):
                  momentum: float = 0.0002,
                  interval: int = 1,
                  device: Optional[torch.device] = None,
-                 update_buffers: bool = False) -> None:
+                 update_buffers: bool = False,
+                 flatten: bool = False,
+                 buffer_interval: int = 1) -> None:
         super().__init__(model, interval, device, update_buffers)
+        self.flatten = flatten
+        self.buffer_interval = buffer_interval
         assert 0.0 < momentum < 1.0, 'momentum must be in range (0.0, 1.0)'\
                                      f'but got {momentum}'
         if momentum > 0.5:
@@ -71,6 +120,18 @@ class ExponentialMovingAverage(BaseAveragedModel):
         averaged_param.mul_(1 - self.momentum).add_(
             source_param, alpha=self.momentum)
 
+    def update_parameters(self, model: nn.Module) -> None:
+        """Update the parameters of the model in place with multi-tensor ops.
+        If ``avg_func`` is overridden, fall back to
+        ``BaseAveragedModel.update_parameters``.
+
+        Args:
+            model (nn.Module): The model whose parameters will be averaged.
+        """
+        if type(self).avg_func is not ExponentialMovingAverage.avg_func:
+            return super().update_parameters(model)
+        _multi_tensor_update(self, model, self.momentum)
+
     def _load_from_state_dict(self, state_dict: dict, prefix: str,
                               local_metadata: dict, strict: bool,
                               missing_keys: list, unexpected_keys: list,
@@ -178,6 +239,12 @@ class RampUpEMA(BaseAveragedModel):
         update_buffers (bool): if True, it will compute running averages for
             both the parameters and the buffers of the model. Defaults to
             False.
+        flatten (bool): Whether to keep the parameters of the averaged model
+            in contiguous buffers, so that they can be updated with a single
+            kernel. Defaults to False.
+        buffer_interval (int): Interval between two updates of buffers, in
+            the unit of steps. If 0, buffers are not updated after the first
+            step. Defaults to 1.
     """  # noqa: W605
 
     def __init__(self,
@@ -189,9 +256,13 @@ class RampUpEMA(BaseAveragedModel):
                  eps: float = 1e-8,
                  start_iter: int = 0,
                  device: Optional[torch.device] = None,
-                 update_buffers: bool = False) -> None:
+                 update_buffers: bool = False,
+                 flatten: bool = False,
+                 buffer_interval: int = 1) -> None:
         """_summary_"""
         super().__init__(model, interval, device, update_buffers)
+        self.flatten = flatten
+        self.buffer_interval = buffer_interval
         self.interval = interval
         self.ema_kimg = ema_kimg
         self.ema_rampup = ema_rampup
@@ -243,6 +314,23 @@ class RampUpEMA(BaseAveragedModel):
                           f'but got {momentum}')
         averaged_param.mul_(1 - momentum).add_(source_param, alpha=momentum)
 
+    def update_parameters(self, model: nn.Module) -> None:
+        """Update the parameters of the model in place with multi-tensor ops.
+        If ``avg_func`` is overridden, fall back to
+        ``BaseAveragedModel.update_parameters``.
+
+        Args:
+            model (nn.Module): The model whose parameters will be averaged.
+        """
+        if type(self).avg_func is not RampUpEMA.avg_func:
+            return super().update_parameters(model)
+        momentum = 1. - self.rampup(self.steps, self.ema_kimg, self.ema_rampup,
+                                    self.batch_size, self.eps)
+        if not (0.0 < momentum < 1.0):
+            warnings.warn('RampUp momentum must be in range (0.0, 1.0)'
+                          f'but got {momentum}')
+        _multi_tensor_update(self, model, momentum)
+
     def _load_from_state_dict(self, state_dict: dict, prefix: str,
                               local_metadata: dict, strict: bool,
                               missing_keys: list, unexpected_keys: list,
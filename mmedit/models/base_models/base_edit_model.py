@@ -162,11 +162,14 @@ class BaseEditModel(BaseModel):
 
         feats = self.forward_tensor(inputs, data_samples, **kwargs)
         feats = self.data_preprocessor.destructor(feats)
+        # de-pad each sample of a batch of images with different sizes
+        if hasattr(self.data_preprocessor, 'unpad'):
+            feats = self.data_preprocessor.unpad(feats)
         predictions = []
-        for idx in range(feats.shape[0]):
+        for idx, feat in enumerate(feats):
             predictions.append(
                 EditDataSample(
-                    pred_img=PixelData(data=feats[idx].to('cpu')),
+                    pred_img=PixelData(data=feat.to('cpu')),
                     metainfo=data_samples[idx].metainfo))
 
         return predictions
@@ -40,7 +40,6 @@ def stack_batch(tensor_list: List[torch.Tensor],
     }) == 1, (f'Expected the dimensions of all tensors must be the same, '
               f'but got {[tensor.ndim for tensor in tensor_list]}')
 
-    dim = tensor_list[0].dim()
     num_img = len(tensor_list)
     all_sizes: torch.Tensor = torch.Tensor(
         [tensor.shape for tensor in tensor_list])
@@ -52,19 +51,37 @@ def stack_batch(tensor_list: List[torch.Tensor],
     if padded_sizes.sum() == 0:
         return torch.stack(tensor_list), padded_sizes
 
+    # Allocate the batch once and copy each tensor into its top-left corner
+    # instead of padding each tensor and stacking the padded copies.
+    assert len({
+        tuple(tensor.shape[:-2])
+        for tensor in tensor_list
+    }) == 1, ('Expected the sizes of all tensors except the last two '
+              'dimensions must be the same, but got '
+              f'{[tuple(tensor.shape) for tensor in tensor_list]}')
+    batch_shape = (num_img, ) + tuple(tensor_list[0].shape[:-2]) + tuple(
+        int(size) for size in max_sizes[-2:])
+    batch_tensor = tensor_list[0].new_empty(batch_shape)
+    mode = pad_args.get('mode', 'constant')
+    if mode == 'constant':
+        value = pad_args.get('value', None) or 0
+        for tensor, padded in zip(tensor_list, batch_tensor):
+            h, w = tensor.shape[-2:]
+            padded[..., :h, :w].copy_(tensor)
+            # only fill the padded region
+            padded[..., h:, :].fill_(value)
+            padded[..., :h, w:].fill_(value)
+        return batch_tensor, padded_sizes
+
     # `pad` is the second arguments of `F.pad`. If pad is (1, 2, 3, 4),
     # it means that padding the last dim with 1(left) 2(right), padding the
-    # penultimate dim to 3(top) 4(bottom). The order of `pad` is opposite of
-    # the `padded_sizes`. Therefore, the `padded_sizes` needs to be reversed,
-    # and only odd index of pad should be assigned to keep padding "right" and
-    # "bottom".
-    pad = torch.zeros(num_img, 2 * dim, dtype=torch.int)
-    pad[:, 1::2] = padded_sizes[:, range(dim - 1, -1, -1)]
-    batch_tensor = []
+    # penultimate dim to 3(top) 4(bottom). Only the last two dims are padded
+    # to the "right" and "bottom", which is supported by all padding modes.
     for idx, tensor in enumerate(tensor_list):
-        batch_tensor.append(
-            F.pad(tensor, tuple(pad[idx].tolist()), **pad_args))
-    return torch.stack(batch_tensor), padded_sizes
+        padded_h, padded_w = padded_sizes[idx, -2:].int().tolist()
+        batch_tensor[idx] = F.pad(tensor, (0, padded_w, 0, padded_h),
+                                  **pad_args)
+    return batch_tensor, padded_sizes
 
 
 def split_batch(batch_tensor: torch.Tensor, padded_sizes: torch.Tensor):
@@ -106,9 +123,6 @@ class EditDataPreprocessor(BaseDataPreprocessor):
 
     and post-processing of the output tensor of model.
 
-    TODO: Most editing methods have crop inputs to a same size, batched padding
-        will be faster.
-
     Args:
         mean (Sequence[float or int]): The pixel mean of R, G, B channels.
             Defaults to (0, 0, 0). If ``mean`` and ``std`` are not
@@ -167,6 +181,10 @@ class EditDataPreprocessor(BaseDataPreprocessor):
         self.pad_size_divisor = pad_size_divisor
         self.pad_args = pad_args
         self.padded_sizes = None
+        # (H, W) of the padded batch, to scale the padded sizes to outputs
+        self.padded_input_size = None
+        # padded (H, W) of each output left by `destructor` for `unpad`
+        self.remaining_padded_sizes = None
         self.norm_input_flag = None  # If input is normalized to [0, 1]
 
     def forward(
@@ -204,6 +222,7 @@ class EditDataPreprocessor(BaseDataPreprocessor):
         # Pad and stack Tensor.
         inputs, self.padded_sizes = stack_batch(inputs, self.pad_size_divisor,
                                                 self.pad_args)
+        self.padded_input_size = tuple(inputs.shape[-2:])
 
         if training:
             for data_sample in batch_data_samples:
@@ -229,12 +248,12 @@ class EditDataPreprocessor(BaseDataPreprocessor):
         # De-normalization
         batch_tensor = batch_tensor * self.outputs_std + self.outputs_mean
 
-        # Do not dissolve batch,
-        # all tensor will be de-padded by a same size
-        # De pad by the first sample
-        padded_h, padded_w = self.padded_sizes[0][-2:]
-        padded_h = int(padded_h)
-        padded_w = int(padded_w)
+        # Do not dissolve batch, all tensor will be de-padded by the padded
+        # size shared by all samples, the rest is recorded for `unpad`.
+        padded_sizes = self._output_padded_sizes(batch_tensor)
+        padded_h, padded_w = padded_sizes.min(dim=0)[0].tolist()
+        self.remaining_padded_sizes = padded_sizes - padded_sizes.new_tensor(
+            [padded_h, padded_w])
         h, w = batch_tensor.shape[-2:]
         batch_tensor = batch_tensor[..., :h - padded_h, :w - padded_w]
 
@@ -245,3 +264,43 @@ class EditDataPreprocessor(BaseDataPreprocessor):
         batch_tensor = batch_tensor.clamp_(0, 255)
 
         return batch_tensor
+
+    def unpad(self, batch_tensor: torch.Tensor) -> List[torch.Tensor]:
+        """Dissolve the batch output by :meth:`destructor` and de-pad each
+        sample to its own size, which differs in a batch of images with
+        different sizes.
+
+        Args:
+            batch_tensor (Tensor): Batched output of :meth:`destructor`.
+
+        Returns:
+            List[Tensor]: De-padded outputs of each sample.
+        """
+
+        assert self.remaining_padded_sizes is not None, (
+            'Please kindly run `destructor` before running `unpad`')
+        outputs = []
+        for tensor, (padded_h,
+                     padded_w) in zip(batch_tensor,
+                                      self.remaining_padded_sizes.tolist()):
+            h, w = tensor.shape[-2:]
+            outputs.append(tensor[..., :h - padded_h, :w - padded_w])
+        return outputs
+
+    def _output_padded_sizes(self, batch_tensor: torch.Tensor) -> torch.Tensor:
+        """Scale the padded (H, W) of inputs to the size of outputs, e.g., the
+        padded sizes are multiplied by the scale factor in super-resolution.
+
+        Args:
+            batch_tensor (Tensor): Batched output.
+
+        Returns:
+            Tensor: The padded (H, W) of each output in shape (N, 2).
+        """
+
+        padded_sizes = self.padded_sizes[:, -2:].long()
+        if self.padded_input_size is not None:
+            output_size = padded_sizes.new_tensor(batch_tensor.shape[-2:])
+            input_size = padded_sizes.new_tensor(self.padded_input_size)
+            padded_sizes = padded_sizes * output_size // input_size
+        return padded_sizes
@@ -1,65 +1,89 @@
 # Copyright (c) OpenMMLab. All rights reserved.
-from .aotgan import AOTBlockNeck, AOTEncoderDecoder, AOTInpaintor
-from .arcface import IDLossModel
-from .basicvsr import BasicVSR, BasicVSRNet
-from .basicvsr_plusplus_net import BasicVSRPlusPlusNet
-from .biggan import BigGAN
-from .cain import CAIN, CAINNet
-from .cyclegan import CycleGAN
-from .dcgan import DCGAN
-from .ddim import DDIMScheduler
-from .ddpm import DDPMScheduler, DenoisingUnet
-from .deepfillv1 import (ContextualAttentionModule, ContextualAttentionNeck,
-                         DeepFillDecoder, DeepFillEncoder, DeepFillRefiner,
-                         DeepFillv1Discriminators, DeepFillv1Inpaintor)
-from .deepfillv2 import DeepFillEncoderDecoder
-from .dic import (DIC, DICNet, FeedbackBlock, FeedbackBlockCustom,
-                  FeedbackBlockHeatmapAttention, LightCNN, MaxFeature)
-from .dim import DIM
-from .disco_diffusion import ClipWrapper, DiscoDiffusion
-from .edsr import EDSRNet
-from .edvr import EDVR, EDVRNet
-from .eg3d import EG3D
-from .esrgan import ESRGAN, RRDBNet
-from .fba import FBADecoder, FBAResnetDilated
-from .flavr import FLAVR, FLAVRNet
-from .gca import GCA
-from .ggan import GGAN
-from .glean import GLEANStyleGANv2
-from .global_local import (GLDecoder, GLDilationNeck, GLEncoder,
-                           GLEncoderDecoder)
-from .guided_diffusion import AblatedDiffusionModel
-from .iconvsr import IconVSRNet
-from .indexnet import (DepthwiseIndexBlock, HolisticIndexBlock,
-                       IndexedUpsample, IndexNet, IndexNetDecoder,
-                       IndexNetEncoder)
-from .inst_colorization import InstColorization
-from .liif import LIIF, MLPRefiner
-from .lsgan import LSGAN
-from .mspie import MSPIEStyleGAN2, PESinGAN
-from .nafnet import NAFBaseline, NAFBaselineLocal, NAFNet, NAFNetLocal
-from .pconv import (MaskConvModule, PartialConv2d, PConvDecoder, PConvEncoder,
-                    PConvEncoderDecoder, PConvInpaintor)
-from .pggan import ProgressiveGrowingGAN
-from .pix2pix import Pix2Pix
-from .plain import PlainDecoder, PlainRefiner
-from .rdn import RDNNet
-from .real_basicvsr import RealBasicVSR, RealBasicVSRNet
-from .real_esrgan import RealESRGAN, UNetDiscriminatorWithSpectralNorm
-from .restormer import Restormer
-from .sagan import SAGAN
-from .singan import SinGAN
-from .srcnn import SRCNNNet
-from .srgan import SRGAN, ModifiedVGG, MSRResNet
-from .stable_diffusion import StableDiffusion
-from .stylegan1 import StyleGAN1
-from .stylegan2 import StyleGAN2
-from .stylegan3 import StyleGAN3, StyleGAN3Generator
-from .swinir import SwinIRNet
-from .tdan import TDAN, TDANNet
-from .tof import TOFlowVFINet, TOFlowVSRNet, ToFResBlock
-from .ttsr import LTE, TTSR, SearchTransformer, TTSRDiscriminator, TTSRNet
-from .wgan_gp import WGANGP
+"""Editors in MMEditing.
+
+The sub-packages of the editors are imported on the first access to their
+attributes, e.g., ``from mmedit.models.editors import EDSRNet`` only imports
+``mmedit.models.editors.edsr``. Therefore, heavy editors like Stable
+Diffusion are not imported unless they are used.
+"""
+import importlib
+from typing import Any, List
+
+_import_structure = {
+    'aotgan': ['AOTBlockNeck', 'AOTEncoderDecoder', 'AOTInpaintor'],
+    'arcface': ['IDLossModel'],
+    'basicvsr': ['BasicVSR', 'BasicVSRNet'],
+    'basicvsr_plusplus_net': ['BasicVSRPlusPlusNet'],
+    'biggan': ['BigGAN'],
+    'cain': ['CAIN', 'CAINNet'],
+    'cyclegan': ['CycleGAN'],
+    'dcgan': ['DCGAN'],
+    'ddim': ['DDIMScheduler'],
+    'ddpm': ['DDPMScheduler', 'DenoisingUnet'],
+    'deepfillv1': [
+        'ContextualAttentionModule', 'ContextualAttentionNeck',
+        'DeepFillDecoder', 'DeepFillEncoder', 'DeepFillRefiner',
+        'DeepFillv1Discriminators', 'DeepFillv1Inpaintor'
+    ],
+    'deepfillv2': ['DeepFillEncoderDecoder'],
+    'dic': [
+        'DIC', 'DICNet', 'FeedbackBlock', 'FeedbackBlockCustom',
+        'FeedbackBlockHeatmapAttention', 'LightCNN', 'MaxFeature'
+    ],
+    'dim': ['DIM'],
+    'disco_diffusion': ['ClipWrapper', 'DiscoDiffusion'],
+    'edsr': ['EDSRNet'],
+    'edvr': ['EDVR', 'EDVRNet'],
+    'eg3d': ['EG3D'],
+    'esrgan': ['ESRGAN', 'RRDBNet'],
+    'fba': ['FBADecoder', 'FBAResnetDilated'],
+    'flavr': ['FLAVR', 'FLAVRNet'],
+    'gca': ['GCA'],
+    'ggan': ['GGAN'],
+    'glean': ['GLEANStyleGANv2'],
+    'global_local':
+    ['GLDecoder', 'GLDilationNeck', 'GLEncoder', 'GLEncoderDecoder'],
+    'guided_diffusion': ['AblatedDiffusionModel'],
+    'iconvsr': ['IconVSRNet'],
+    'indexnet': [
+        'DepthwiseIndexBlock', 'HolisticIndexBlock', 'IndexedUpsample',
+        'IndexNet', 'IndexNetDecoder', 'IndexNetEncoder'
+    ],
+    'inst_colorization': ['InstColorization'],
+    'liif': ['LIIF', 'MLPRefiner'],
+    'lsgan': ['LSGAN'],
+    'mspie': ['MSPIEStyleGAN2', 'PESinGAN'],
+    'nafnet': ['NAFBaseline', 'NAFBaselineLocal', 'NAFNet', 'NAFNetLocal'],
+    'pconv': [
+        'MaskConvModule', 'PartialConv2d', 'PConvDecoder', 'PConvEncoder',
+        'PConvEncoderDecoder', 'PConvInpaintor'
+    ],
+    'pggan': ['ProgressiveGrowingGAN'],
+    'pix2pix': ['Pix2Pix'],
+    'plain': ['PlainDecoder', 'PlainRefiner'],
+    'rdn': ['RDNNet'],
+    'real_basicvsr': ['RealBasicVSR', 'RealBasicVSRNet'],
+    'real_esrgan': ['RealESRGAN', 'UNetDiscriminatorWithSpectralNorm'],
+    'restormer': ['Restormer'],
+    'sagan': ['SAGAN'],
+    'singan': ['SinGAN'],
+    'srcnn': ['SRCNNNet'],
+    'srgan': ['SRGAN', 'ModifiedVGG', 'MSRResNet'],
+    'stable_diffusion': ['StableDiffusion'],
+    'stylegan1': ['StyleGAN1'],
+    'stylegan2': ['StyleGAN2'],
+    'stylegan3': ['StyleGAN3', 'StyleGAN3Generator'],
+    'swinir': ['SwinIRNet'],
+    'tdan': ['TDAN', 'TDANNet'],
+    'tof': ['TOFlowVFINet', 'TOFlowVSRNet', 'ToFResBlock'],
+    'ttsr':
+    ['LTE', 'TTSR', 'SearchTransformer', 'TTSRDiscriminator', 'TTSRNet'],
+    'wgan_gp': ['WGANGP'],
+}
+_name_to_package = {
+    name: package
+    for package, names in _import_structure.items() for name in names
+}
 
 __all__ = [
     'AOTEncoderDecoder', 'AOTBlockNeck', 'AOTInpaintor',
@@ -89,3 +113,16 @@ __all__ = [
     'DDPMScheduler', 'DenoisingUnet', 'ClipWrapper', 'EG3D', 'Restormer',
     'SwinIRNet', 'StableDiffusion'
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _name_to_package:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    module = importlib.import_module(f'.{_name_to_package[name]}', __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_name_to_package))
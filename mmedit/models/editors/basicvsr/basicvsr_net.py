@@ -155,18 +155,170 @@ class BasicVSRNet(BaseModule):
             feat_prop = self.forward_resblocks(feat_prop)
 
             # upsampling given the backward and forward features
-            out = torch.cat([outputs[i], feat_prop], dim=1)
-            out = self.lrelu(self.fusion(out))
-            out = self.lrelu(self.upsample1(out))
-            out = self.lrelu(self.upsample2(out))
-            out = self.lrelu(self.conv_hr(out))
-            out = self.conv_last(out)
-            base = self.img_upsample(lr_curr)
-            out += base
-            outputs[i] = out
+            outputs[i] = self.upsample(lr_curr, outputs[i], feat_prop)
 
         return torch.stack(outputs, dim=1)
 
+    def upsample(self, lr_curr, feat_backward, feat_forward):
+        """Compute the output image of a frame given the features.
+
+        Args:
+            lr_curr (Tensor): Input LR frame with shape (n, c, h, w).
+            feat_backward (Tensor): Feature of backward-time propagation.
+            feat_forward (Tensor): Feature of forward-time propagation.
+
+        Returns:
+            Tensor: Output HR frame with shape (n, c, 4h, 4w).
+        """
+        out = torch.cat([feat_backward, feat_forward], dim=1)
+        out = self.lrelu(self.fusion(out))
+        out = self.lrelu(self.upsample1(out))
+        out = self.lrelu(self.upsample2(out))
+        out = self.lrelu(self.conv_hr(out))
+        out = self.conv_last(out)
+        base = self.img_upsample(lr_curr)
+        out += base
+        return out
+
+    def forward_streaming(self,
+                          lrs,
+                          state=None,
+                          num_outputs=None,
+                          end_of_sequence=False):
+        """Forward a chunk of a long sequence, carrying the states across the
+        chunks.
+
+        The chunk consists of the frames to be restored and the following
+        look-ahead frames. The forward-time propagation continues from the
+        hidden state of the previous chunk, so it is the same as processing
+        the whole sequence at once. The backward-time propagation starts from
+        the last look-ahead frame, so it is bounded by the look-ahead window.
+        The optical flows of the look-ahead frames are cached and reused by
+        the next chunk. If the look-ahead frames always reach the end of the
+        sequence, the outputs are the same as :meth:`forward`.
+
+        Args:
+            lrs (Tensor): Input LR chunk with shape (n, t, c, h, w).
+            state (dict, optional): The state returned by the previous
+                chunk. None for the first chunk. Default: None.
+            num_outputs (int, optional): The number of frames to be restored,
+                the remaining frames are look-ahead frames. If None, all the
+                frames are restored. Default: None.
+            end_of_sequence (bool): Whether the last frame of the chunk is
+                the last frame of the sequence. Not used, kept for the same
+                interface as :meth:`IconVSRNet.forward_streaming`.
+                Default: False.
+
+        Returns:
+            tuple[Tensor, dict]: Output HR frames with shape
+                (n, num_outputs, c, 4h, 4w) and the state for the next chunk.
+        """
+        n, t, c, h, w = lrs.size()
+        assert h >= 64 and w >= 64, (
+            'The height and width of inputs should be at least 64, '
+            f'but got {h} and {w}.')
+        num_outputs = t if num_outputs is None else num_outputs
+        assert 0 < num_outputs <= t
+        if state is None:
+            state = dict(start=0, flows=dict())
+        start = state['start']
+
+        flows_forward, flows_backward = compute_flow_streaming(
+            self.spynet, lrs, start, state['flows'], state.get('lr'))
+
+        # backward-time propagation within the chunk
+        feats_backward = [None] * num_outputs
+        feat_prop = lrs.new_zeros(n, self.mid_channels, h, w)
+        for i in range(t - 1, -1, -1):
+            if i < t - 1:
+                flow = flows_backward[:, i, :, :, :]
+                feat_prop = flow_warp(feat_prop, flow.permute(0, 2, 3, 1))
+
+            feat_prop = torch.cat([lrs[:, i, :, :, :], feat_prop], dim=1)
+            feat_prop = self.backward_resblocks(feat_prop)
+            if i < num_outputs:
+                feats_backward[i] = feat_prop
+
+        # forward-time propagation from the previous chunk
+        outputs = []
+        feat_prop = state.get('feat_prop', torch.zeros_like(feat_prop))
+        for i in range(0, num_outputs):
+            lr_curr = lrs[:, i, :, :, :]
+            if start + i > 0:
+                flow = flows_forward[:, i, :, :, :]
+                feat_prop = flow_warp(feat_prop, flow.permute(0, 2, 3, 1))
+
+            feat_prop = torch.cat([lr_curr, feat_prop], dim=1)
+            feat_prop = self.forward_resblocks(feat_prop)
+            outputs.append(
+                self.upsample(lr_curr, feats_backward[i], feat_prop))
+
+        start += num_outputs
+        evict_streaming_cache(state['flows'], start - 1)
+        state = dict(
+            start=start,
+            flows=state['flows'],
+            lr=lrs[:, num_outputs - 1],
+            feat_prop=feat_prop)
+        return torch.stack(outputs, dim=1), state
+
+
+def compute_flow_streaming(spynet, lrs, start, cache, lr_prev=None):
+    """Compute the optical flows of a chunk of a sequence, reusing the flows
+    cached by the previous chunks.
+
+    Args:
+        spynet (nn.Module): The optical flow network.
+        lrs (Tensor): Input LR chunk with shape (n, t, c, h, w), which starts
+            from the ``start``-th frame of the sequence.
+        start (int): Index of the first frame of the chunk in the sequence.
+        cache (dict): Cached flows, the value of key ``i`` is the flows
+            (forward, backward) between the ``i``-th and ``(i+1)``-th frames.
+            The flows computed for the chunk are added in place.
+        lr_prev (Tensor, optional): The ``(start-1)``-th frame with shape
+            (n, c, h, w). Default: None.
+
+    Return:
+        tuple(Tensor): Optical flow. 'flows_forward' with shape
+            (n, t, 2, h, w) corresponds to the flows from each frame to the
+            previous one, the first of which is zero if ``lr_prev`` is None.
+            'flows_backward' with shape (n, t - 1, 2, h, w) corresponds to
+            the flows from each frame to the next one.
+    """
+    n, t, c, h, w = lrs.size()
+    first = start
+    if lr_prev is not None:
+        lrs = torch.cat([lr_prev.unsqueeze(1), lrs], dim=1)
+        first = start - 1
+
+    missing = [i for i in range(first, start + t - 1) if i not in cache]
+    if missing:
+        idx = [i - first for i in missing]
+        lrs_1 = lrs[:, idx, :, :, :].reshape(-1, c, h, w)
+        lrs_2 = lrs[:, [i + 1 for i in idx], :, :, :].reshape(-1, c, h, w)
+        flows_backward = spynet(lrs_1, lrs_2).view(n, -1, 2, h, w)
+        flows_forward = spynet(lrs_2, lrs_1).view(n, -1, 2, h, w)
+        for k, i in enumerate(missing):
+            cache[i] = (flows_forward[:, k], flows_backward[:, k])
+
+    zeros = lrs.new_zeros(n, 2, h, w)
+    flows_forward = torch.stack([
+        cache[i - 1][0] if i > first else zeros
+        for i in range(start, start + t)
+    ],
+                                dim=1)
+    flows_backward = torch.stack(
+        [cache[i][1] for i in range(start, start + t - 1)] + [zeros],
+        dim=1)[:, :-1]
+    return flows_forward, flows_backward
+
+
+def evict_streaming_cache(cache, start):
+    """Remove the entries whose keys are smaller than ``start`` from the cache
+    of :meth:`forward_streaming`."""
+    for key in [key for key in cache if key < start]:
+        cache.pop(key)
+
 
 class ResidualBlocksWithInputConv(BaseModule):
     """Residual blocks with a convolution in front.
@@ -9,7 +9,9 @@ from mmengine.model.weight_init import constant_init
 from mmedit.models.base_archs import PixelShufflePack
 from mmedit.models.utils import flow_warp
 from mmedit.registry import MODELS
-from ..basicvsr.basicvsr_net import ResidualBlocksWithInputConv, SPyNet
+from ..basicvsr.basicvsr_net import (ResidualBlocksWithInputConv, SPyNet,
+                                     compute_flow_streaming,
+                                     evict_streaming_cache)
 
 
 @MODELS.register_module()
@@ -183,48 +185,29 @@ class BasicVSRPlusPlusNet(BaseModule):
             if self.cpu_cache:
                 feat_current = feat_current.cuda()
                 feat_prop = feat_prop.cuda()
-            # second-order deformable alignment
+            flow_n1, feat_n2, flow_n2 = None, None, None
             if i > 0:
                 flow_n1 = flows[:, flow_idx[i], :, :, :]
                 if self.cpu_cache:
                     flow_n1 = flow_n1.cuda()
 
-                cond_n1 = flow_warp(feat_prop, flow_n1.permute(0, 2, 3, 1))
-
-                # initialize second-order features
-                feat_n2 = torch.zeros_like(feat_prop)
-                flow_n2 = torch.zeros_like(flow_n1)
-                cond_n2 = torch.zeros_like(cond_n1)
-
                 if i > 1:  # second-order features
                     feat_n2 = feats[module_name][-2]
-                    if self.cpu_cache:
-                        feat_n2 = feat_n2.cuda()
-
                     flow_n2 = flows[:, flow_idx[i - 1], :, :, :]
                     if self.cpu_cache:
+                        feat_n2 = feat_n2.cuda()
                         flow_n2 = flow_n2.cuda()
 
-                    flow_n2 = flow_n1 + flow_warp(flow_n2,
-                                                  flow_n1.permute(0, 2, 3, 1))
-                    cond_n2 = flow_warp(feat_n2, flow_n2.permute(0, 2, 3, 1))
-
-                # flow-guided deformable convolution
-                cond = torch.cat([cond_n1, feat_current, cond_n2], dim=1)
-                feat_prop = torch.cat([feat_prop, feat_n2], dim=1)
-                feat_prop = self.deform_align[module_name](feat_prop, cond,
-                                                           flow_n1, flow_n2)
-
-            # concatenate and residual blocks
-            feat = [feat_current] + [
-                feats[k][idx]
-                for k in feats if k not in ['spatial', module_name]
-            ] + [feat_prop]
+            feats_other = [
+                feats[k][idx] for k in feats
+                if k not in ['spatial', module_name]
+            ]
             if self.cpu_cache:
-                feat = [f.cuda() for f in feat]
+                feats_other = [f.cuda() for f in feats_other]
 
-            feat = torch.cat(feat, dim=1)
-            feat_prop = feat_prop + self.backbone[module_name](feat)
+            feat_prop = self.propagate_frame(module_name, feat_current,
+                                             feats_other, feat_prop, flow_n1,
+                                             feat_n2, flow_n2)
             feats[module_name].append(feat_prop)
 
             if self.cpu_cache:
@@ -236,6 +219,80 @@ class BasicVSRPlusPlusNet(BaseModule):
 
         return feats
 
+    def propagate_frame(self,
+                        module_name,
+                        feat_current,
+                        feats_other,
+                        feat_prop,
+                        flow_n1=None,
+                        feat_n2=None,
+                        flow_n2=None):
+        """Propagate the latent feature to a frame.
+
+        Args:
+            module_name (str): The name of the propagation branch.
+            feat_current (tensor): Spatial feature of the current frame.
+            feats_other (list[tensor]): Features of the current frame from
+                the previous branches.
+            feat_prop (tensor): Propagated feature of the previous frame.
+            flow_n1 (tensor, optional): Optical flow from the current frame
+                to the previous frame. None for the first frame.
+                Default: None.
+            feat_n2 (tensor, optional): Propagated feature of the
+                second-previous frame. Default: None.
+            flow_n2 (tensor, optional): Optical flow from the previous frame
+                to the second-previous frame. Default: None.
+
+        Return:
+            tensor: The propagated feature of the current frame.
+        """
+        # second-order deformable alignment
+        if flow_n1 is not None:
+            cond_n1 = flow_warp(feat_prop, flow_n1.permute(0, 2, 3, 1))
+
+            # initialize second-order features
+            if feat_n2 is None:
+                feat_n2 = torch.zeros_like(feat_prop)
+                flow_n2 = torch.zeros_like(flow_n1)
+                cond_n2 = torch.zeros_like(cond_n1)
+            else:
+                flow_n2 = flow_n1 + flow_warp(flow_n2,
+                                              flow_n1.permute(0, 2, 3, 1))
+                cond_n2 = flow_warp(feat_n2, flow_n2.permute(0, 2, 3, 1))
+
+            # flow-guided deformable convolution
+            cond = torch.cat([cond_n1, feat_current, cond_n2], dim=1)
+            feat_prop = torch.cat([feat_prop, feat_n2], dim=1)
+            feat_prop = self.deform_align[module_name](feat_prop, cond,
+                                                       flow_n1, flow_n2)
+
+        # concatenate and residual blocks
+        feat = torch.cat([feat_current] + feats_other + [feat_prop], dim=1)
+        return feat_prop + self.backbone[module_name](feat)
+
+    def reconstruct(self, lq, feat):
+        """Compute the output image of a frame given the concatenated
+        features of all the branches.
+
+        Args:
+            lq (tensor): Input low quality (LQ) frame with shape
+                (n, c, h, w).
+            feat (tensor): The concatenated features.
+
+        Returns:
+            Tensor: Output HR frame.
+        """
+        hr = self.reconstruction(feat)
+        hr = self.lrelu(self.upsample1(hr))
+        hr = self.lrelu(self.upsample2(hr))
+        hr = self.lrelu(self.conv_hr(hr))
+        hr = self.conv_last(hr)
+        if self.is_low_res_input:
+            hr += self.img_upsample(lq)
+        else:
+            hr += lq
+        return hr
+
     def upsample(self, lqs, feats):
         """Compute the output image given the features.
 
@@ -261,15 +318,7 @@ class BasicVSRPlusPlusNet(BaseModule):
             if self.cpu_cache:
                 hr = hr.cuda()
 
-            hr = self.reconstruction(hr)
-            hr = self.lrelu(self.upsample1(hr))
-            hr = self.lrelu(self.upsample2(hr))
-            hr = self.lrelu(self.conv_hr(hr))
-            hr = self.conv_last(hr)
-            if self.is_low_res_input:
-                hr += self.img_upsample(lqs[:, i, :, :, :])
-            else:
-                hr += lqs[:, i, :, :, :]
+            hr = self.reconstruct(lqs[:, i, :, :, :], hr)
 
             if self.cpu_cache:
                 hr = hr.cpu()
@@ -349,6 +398,135 @@ class BasicVSRPlusPlusNet(BaseModule):
 
         return self.upsample(lqs, feats)
 
+    def forward_streaming(self,
+                          lqs,
+                          state=None,
+                          num_outputs=None,
+                          end_of_sequence=False):
+        """Forward a chunk of a long sequence, carrying the states across the
+        chunks.
+
+        See :meth:`BasicVSRNet.forward_streaming`. The forward-time branches
+        continue from the last two propagated features of the previous
+        chunk, while the backward-time branches are bounded by the look-ahead
+        frames. The spatial features and optical flows of the look-ahead
+        frames are cached and reused by the next chunk.
+
+        Args:
+            lqs (tensor): Input low quality (LQ) chunk with shape
+                (n, t, c, h, w).
+            state (dict, optional): The state returned by the previous
+                chunk. None for the first chunk. Default: None.
+            num_outputs (int, optional): The number of frames to be restored,
+                the remaining frames are look-ahead frames. If None, all the
+                frames are restored. Default: None.
+            end_of_sequence (bool): Whether the last frame of the chunk is
+                the last frame of the sequence. Not used, kept for the same
+                interface as :meth:`IconVSRNet.forward_streaming`.
+                Default: False.
+
+        Returns:
+            tuple[Tensor, dict]: Output HR frames with shape
+                (n, num_outputs, c, 4h, 4w) and the state for the next chunk.
+        """
+        n, t, c, h, w = lqs.size()
+        num_outputs = t if num_outputs is None else num_outputs
+        assert 0 < num_outputs <= t
+        if state is None:
+            state = dict(start=0, flows=dict(), spatial=dict())
+        start = state['start']
+        # the memory is bounded by the length of the chunk
+        self.cpu_cache = False
+
+        if self.is_low_res_input:
+            lqs_downsample = lqs
+        else:
+            lqs_downsample = F.interpolate(
+                lqs.view(-1, c, h, w), scale_factor=0.25,
+                mode='bicubic').view(n, t, c, h // 4, w // 4)
+        assert lqs_downsample.size(3) >= 64 and lqs_downsample.size(4) >= 64, (
+            'The height and width of low-res inputs must be at least 64, '
+            f'but got {h} and {w}.')
+
+        # compute the spatial features and optical flows of the new frames
+        missing = [i for i in range(t) if start + i not in state['spatial']]
+        if missing:
+            feats_ = self.feat_extract(lqs[:, missing].reshape(-1, c, h, w))
+            feats_ = feats_.view(n, len(missing), *feats_.shape[1:])
+            for k, i in enumerate(missing):
+                state['spatial'][start + i] = feats_[:, k]
+        feats = dict(spatial=[state['spatial'][start + i] for i in range(t)])
+        compute_flow_streaming(self.spynet, lqs_downsample, start,
+                               state['flows'], state.get('lq'))
+        flows = state['flows']
+
+        # feature propagation
+        zeros = feats['spatial'][0].new_zeros(n, self.mid_channels,
+                                              *feats['spatial'][0].shape[2:])
+        new_state = dict()
+        for iter_ in [1, 2]:
+            for direction in ['backward', 'forward']:
+                module = f'{direction}_{iter_}'
+                feats[module] = []
+
+                if direction == 'backward':
+                    feat_prop = zeros
+                    for i in range(t - 1, -1, -1):
+                        flow_n1, feat_n2, flow_n2 = None, None, None
+                        if i < t - 1:
+                            flow_n1 = flows[start + i][1]
+                        if i < t - 2:
+                            feat_n2 = feats[module][-2]
+                            flow_n2 = flows[start + i + 1][1]
+                        feats_other = [
+                            feats[k][i] for k in feats
+                            if k not in ['spatial', module]
+                        ]
+                        feat_prop = self.propagate_frame(
+                            module, feats['spatial'][i], feats_other,
+                            feat_prop, flow_n1, feat_n2, flow_n2)
+                        feats[module].append(feat_prop)
+                    feats[module] = feats[module][::-1]
+                else:
+                    # the last two features of the previous chunk
+                    history = state.get(module, [])
+                    prop = list(history)
+                    # the second branch is only needed by the outputs
+                    length = t if iter_ == 1 else num_outputs
+                    for i in range(length):
+                        flow_n1, feat_n2, flow_n2 = None, None, None
+                        if start + i > 0:
+                            flow_n1 = flows[start + i - 1][0]
+                        if start + i > 1:
+                            feat_n2 = prop[-2]
+                            flow_n2 = flows[start + i - 2][0]
+                        feat_prop = prop[-1] if prop else zeros
+                        feats_other = [
+                            feats[k][i] for k in feats
+                            if k not in ['spatial', module]
+                        ]
+                        prop.append(
+                            self.propagate_frame(module, feats['spatial'][i],
+                                                 feats_other, feat_prop,
+                                                 flow_n1, feat_n2, flow_n2))
+                    feats[module] = prop[len(history):]
+                    new_state[module] = prop[:len(history) + num_outputs][-2:]
+
+        outputs = []
+        for i in range(num_outputs):
+            hr = torch.cat([feats[k][i] for k in feats], dim=1)
+            outputs.append(self.reconstruct(lqs[:, i, :, :, :], hr))
+
+        start += num_outputs
+        evict_streaming_cache(state['flows'], start - 2)
+        evict_streaming_cache(state['spatial'], start)
+        new_state.update(
+            start=start,
+            flows=state['flows'],
+            spatial=state['spatial'],
+            lq=lqs_downsample[:, num_outputs - 1])
+        return torch.stack(outputs, dim=1), new_state
+
 
 class SecondOrderDeformableAlignment(ModulatedDeformConv2d):
     """Second-order deformable alignment module.
@@ -4,7 +4,9 @@ from typing import Union
 import numpy as np
 import torch
 
-from mmedit.models.utils.diffusion_utils import betas_for_alpha_bar
+from mmedit.models.utils.diffusion_utils import (betas_for_alpha_bar,
+                                                 build_coeff_table,
+                                                 gather_coeffs)
 from mmedit.registry import DIFFUSION_SCHEDULERS
 
 
@@ -16,6 +18,13 @@ class DDIMScheduler:
     The code is heavily influenced by https://github.com/huggingface/diffusers/blob/main/src/diffusers/schedulers/scheduling_ddim.py. # noqa
     The difference is that we ensemble gradient-guided sampling in step function.
 
+    All the coefficients used in :meth:`step` and :meth:`add_noise` are
+    precomputed for each timestep in :meth:`set_timesteps` and stacked to a
+    table, which is cast to the device and dtype of the samples once and
+    cached, so a step only gathers a row of the table. ``step`` and
+    ``add_noise`` accept a timestep shared by the batch or a tensor of
+    per-sample timesteps.
+
     Args:
         num_train_timesteps (int, optional): _description_. Defaults to 1000.
         beta_start (float, optional): _description_. Defaults to 0.0001.
@@ -80,15 +89,65 @@ class DDIMScheduler:
         # setable values
         self.num_inference_steps = None
         self.timesteps = np.arange(0, num_train_timesteps)[::-1].copy()
-
-    def set_timesteps(self, num_inference_steps, offset=0):
-        """set time steps."""
+        self._build_coeff_table()
+
+    def _build_coeff_table(self):
+        """Precompute the coefficients of each timestep. The previous
+        timestep depends on ``num_inference_steps``."""
+
+        alphas_cumprod = self.alphas_cumprod.astype(np.float64)
+        step = 1
+        if self.num_inference_steps is not None:
+            step = self.num_train_timesteps // self.num_inference_steps
+        prev_t = np.arange(self.num_train_timesteps) - step
+        alphas_cumprod_prev = np.where(prev_t >= 0,
+                                       alphas_cumprod[np.maximum(prev_t, 0)],
+                                       float(self.final_alpha_cumprod))
+        beta_prod = 1 - alphas_cumprod
+        self._coeff_names, self._coeff_table = build_coeff_table(
+            dict(
+                sqrt_alphas_cumprod=alphas_cumprod**0.5,
+                sqrt_one_minus_alphas_cumprod=beta_prod**0.5,
+                beta_prod_t=beta_prod,
+                sqrt_alphas_cumprod_prev=alphas_cumprod_prev**0.5,
+                one_minus_alphas_cumprod_prev=1 - alphas_cumprod_prev,
+                # see ``_get_variance``
+                variance=(1 - alphas_cumprod_prev) / beta_prod *
+                (1 - alphas_cumprod / alphas_cumprod_prev)))
+        self._coeff_tables = dict()
+
+    def _get_coeffs(self, timesteps, sample: torch.Tensor) -> dict:
+        """Gather the coefficients of the timesteps, on the device and in the
+        dtype of ``sample``."""
+
+        key = (sample.device, sample.dtype)
+        table = self._coeff_tables.get(key)
+        if table is None:
+            table = torch.from_numpy(self._coeff_table).to(
+                device=sample.device, dtype=sample.dtype)
+            self._coeff_tables[key] = table
+        return dict(
+            zip(self._coeff_names, gather_coeffs(table, timesteps,
+                                                 sample.ndim)))
+
+    def set_timesteps(self, num_inference_steps, offset=0, device=None):
+        """set time steps.
+
+        Args:
+            num_inference_steps (int): The number of inference steps.
+            offset (int): The offset added to timesteps. Defaults to 0.
+            device (torch.device, optional): If given, the coefficient table
+                is moved to this device in advance. Defaults to None.
+        """
 
         self.num_inference_steps = num_inference_steps
         self.timesteps = np.arange(
             0, self.num_train_timesteps,
             self.num_train_timesteps // self.num_inference_steps)[::-1].copy()
         self.timesteps += offset
+        self._build_coeff_table()
+        if device is not None:
+            self._get_coeffs(0, torch.empty(0, device=device))
 
     def _get_variance(self, timestep, prev_timestep):
         """get variance."""
@@ -105,7 +164,7 @@ class DDIMScheduler:
     def step(
         self,
         model_output: Union[torch.FloatTensor, np.ndarray],
-        timestep: int,
+        timestep: Union[int, torch.Tensor],
         sample: Union[torch.FloatTensor, np.ndarray],
         cond_fn=None,
         cond_kwargs={},
@@ -113,7 +172,30 @@ class DDIMScheduler:
         use_clipped_model_output: bool = False,
         generator=None,
     ):
-        """step forward."""
+        """step forward.
+
+        Args:
+            model_output (torch.FloatTensor | np.ndarray | dict): The output
+                of the denoising model. If a dict, it should contain 'eps'
+                and 'pred'.
+            timestep (int | torch.Tensor): The current timestep shared by the
+                batch, or the timesteps of each sample in shape (n, ).
+            sample (torch.FloatTensor | np.ndarray): The current sample x_t.
+            cond_fn (Callable, optional): The function to compute the
+                gradient of guidance. Defaults to None.
+            cond_kwargs (dict): The arguments of ``cond_fn``. Defaults to
+                {}.
+            eta (float): The weight of noise, "η" in formula (16) of DDIM.
+                Defaults to 0.0.
+            use_clipped_model_output (bool): Whether to re-derive the noise
+                from the clipped x_0. Defaults to False.
+            generator (torch.Generator, optional): The random generator of
+                noise. Defaults to None.
+
+        Returns:
+            dict: A dict contains 'prev_sample', 'mean', 'sigma',
+            'original_sample' and 'beta_prod_t'.
+        """
 
         output = {}
         if self.num_inference_steps is None:
@@ -121,6 +203,11 @@ class DDIMScheduler:
                     'you need to run 'set_timesteps' '\
                         'after creating the scheduler")
 
+        is_numpy = isinstance(sample, np.ndarray)
+        if is_numpy:
+            sample = torch.from_numpy(sample)
+            model_output = torch.from_numpy(model_output)
+
         pred = None
         if isinstance(model_output, dict):
             pred = model_output['pred']
@@ -143,20 +230,16 @@ class DDIMScheduler:
         # - pred_sample_direction -> "direction pointingc to x_t"
         # - pred_prev_sample -> "x_t-1"
 
-        # 1. get previous step value (=t-1)
-        prev_timestep = (
-            timestep - self.num_train_timesteps // self.num_inference_steps)
-
-        # 2. compute alphas, betas
-        alpha_prod_t = self.alphas_cumprod[timestep]
-        alpha_prod_t_prev = self.alphas_cumprod[
-            prev_timestep] if prev_timestep >= 0 else self.final_alpha_cumprod
-        beta_prod_t = 1 - alpha_prod_t
+        # 1. gather alphas, betas of the current and the previous step
+        coeffs = self._get_coeffs(timestep, sample)
+        sqrt_alpha_prod_t = coeffs['sqrt_alphas_cumprod']
+        sqrt_beta_prod_t = coeffs['sqrt_one_minus_alphas_cumprod']
+        beta_prod_t = coeffs['beta_prod_t']
 
-        # 3. compute predicted original sample from predicted noise also called
+        # 2. compute predicted original sample from predicted noise also called
         # "predicted x_0" of formula (12) from https://arxiv.org/pdf/2010.02502.pdf # noqa
-        pred_original_sample = (sample - (
-            (beta_prod_t)**(0.5)) * model_output) / alpha_prod_t**(0.5)
+        pred_original_sample = (
+            sample - sqrt_beta_prod_t * model_output) / sqrt_alpha_prod_t
         if pred is not None:
             pred_original_sample = pred
 
@@ -165,47 +248,39 @@ class DDIMScheduler:
             gradient = cond_fn(
                 cond_kwargs.pop('unet'), self, sample, timestep, beta_prod_t,
                 cond_kwargs.pop('model_stats'), **cond_kwargs)
-            model_output = model_output - (beta_prod_t**0.5) * gradient
+            model_output = model_output - sqrt_beta_prod_t * gradient
             pred_original_sample = (
-                sample -
-                (beta_prod_t**(0.5)) * model_output) / alpha_prod_t**(0.5)
-        # 4. Clip "predicted x_0"
+                sample - sqrt_beta_prod_t * model_output) / sqrt_alpha_prod_t
+        # 3. Clip "predicted x_0"
         if self.clip_sample:
             pred_original_sample = torch.clamp(pred_original_sample, -1, 1)
 
-        # 5. compute variance: "sigma_t(η)" -> see formula (16)
+        # 4. compute variance: "sigma_t(η)" -> see formula (16)
         # σ_t = sqrt((1 − α_t−1)/(1 − α_t)) * sqrt(1 − α_t/α_t−1)
-        variance = self._get_variance(timestep, prev_timestep)
-        std_dev_t = eta * variance**(0.5)
+        std_dev_t = eta * coeffs['variance']**(0.5)
         output.update(dict(sigma=std_dev_t))
 
         if use_clipped_model_output:
             # the model_output is always
             # re-derived from the clipped x_0 in Glide
-            model_output = (sample - (alpha_prod_t**(0.5)) *
-                            pred_original_sample) / beta_prod_t**(0.5)
+            model_output = (sample - sqrt_alpha_prod_t *
+                            pred_original_sample) / sqrt_beta_prod_t
 
-        # 6. compute "direction pointing to x_t" of formula (12) from https://arxiv.org/pdf/2010.02502.pdf # noqa
-        pred_sample_direction = (1 - alpha_prod_t_prev -
+        # 5. compute "direction pointing to x_t" of formula (12) from https://arxiv.org/pdf/2010.02502.pdf # noqa
+        pred_sample_direction = (coeffs['one_minus_alphas_cumprod_prev'] -
                                  std_dev_t**2)**(0.5) * model_output
 
-        # 7. compute x_t without "random noise" of
+        # 6. compute x_t without "random noise" of
         # formula (12) from https://arxiv.org/pdf/2010.02502.pdf
-        prev_mean = alpha_prod_t_prev**(
-            0.5) * pred_original_sample + pred_sample_direction
+        prev_mean = coeffs['sqrt_alphas_cumprod_prev'] * \
+            pred_original_sample + pred_sample_direction
         output.update(dict(mean=prev_mean, prev_sample=prev_mean))
 
         if eta > 0:
-            device = model_output.device if torch.is_tensor(
-                model_output) else 'cpu'
             noise = torch.randn(
-                model_output.shape, generator=generator).to(device)
-            variance = std_dev_t * noise
-
-            if not torch.is_tensor(model_output):
-                variance = variance.numpy()
-
-            prev_sample = prev_mean + variance
+                model_output.shape,
+                generator=generator).to(model_output.device)
+            prev_sample = prev_mean + std_dev_t * noise
             output.update({'prev_sample': prev_sample})
 
         # NOTE: this x0 is twice computed
@@ -213,16 +288,30 @@ class DDIMScheduler:
             'original_sample': pred_original_sample,
             'beta_prod_t': beta_prod_t
         })
+        if is_numpy:
+            output = {
+                k: v.numpy() if torch.is_tensor(v) else v
+                for k, v in output.items()
+            }
         return output
 
     def add_noise(self, original_samples, noise, timesteps):
-        """add noise."""
+        """add noise.
+
+        Args:
+            original_samples (torch.Tensor): The original samples x_0.
+            noise (torch.Tensor): The noise.
+            timesteps (int | torch.Tensor): The timestep shared by the batch,
+                or the timesteps of each sample in shape (n, ).
+
+        Returns:
+            torch.Tensor: The noisy samples x_t.
+        """
 
-        sqrt_alpha_prod = self.alphas_cumprod[timesteps]**0.5
-        sqrt_one_minus_alpha_prod = (1 - self.alphas_cumprod[timesteps])**0.5
+        coeffs = self._get_coeffs(timesteps, original_samples)
         noisy_samples = (
-            sqrt_alpha_prod * original_samples +
-            sqrt_one_minus_alpha_prod * noise)
+            coeffs['sqrt_alphas_cumprod'] * original_samples +
+            coeffs['sqrt_one_minus_alphas_cumprod'] * noise)
         return noisy_samples
 
     def __len__(self):
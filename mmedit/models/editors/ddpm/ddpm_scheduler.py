@@ -4,7 +4,9 @@ from typing import Optional, Union
 import numpy as np
 import torch
 
-from mmedit.models.utils.diffusion_utils import betas_for_alpha_bar
+from mmedit.models.utils.diffusion_utils import (betas_for_alpha_bar,
+                                                 build_coeff_table,
+                                                 gather_coeffs)
 from mmedit.registry import DIFFUSION_SCHEDULERS
 
 
@@ -44,6 +46,12 @@ class DDPMScheduler:
                 Defaults to 'fixed_small'.
             clip_sample (bool, optional): Whether clip the value of predicted
                 original image (x0) to [-1, 1]. Defaults to True.
+
+        All the coefficients used in :meth:`step` and :meth:`add_noise` are
+        precomputed for each timestep and stacked to a table, which is cast
+        to the device and dtype of the samples once and cached, so a step only
+        gathers a row of the table. ``step`` and ``add_noise`` accept a
+        timestep shared by the batch or a tensor of per-sample timesteps.
         """
         self.num_train_timesteps = num_train_timesteps
         if trained_betas is not None:
@@ -77,8 +85,79 @@ class DDPMScheduler:
         self.variance_type = variance_type
         self.clip_sample = clip_sample
 
-    def set_timesteps(self, num_inference_steps):
-        """set timesteps."""
+        self._build_coeff_table()
+
+    def _build_coeff_table(self):
+        """Precompute the coefficients of each timestep."""
+
+        betas = np.asarray(self.betas, dtype=np.float64).reshape(-1)
+        t = np.arange(len(betas))
+        alphas_cumprod = np.cumprod(1 - betas)
+        alphas_cumprod_prev = np.append(1., alphas_cumprod[:-1])
+        beta_prod = 1 - alphas_cumprod
+        beta_prod_prev = 1 - alphas_cumprod_prev
+
+        nonzero = (t > 0).astype(np.float64)
+
+        # degenerate schedules, e.g., a single timestep, give inf and nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # see ``_get_variance``
+            variance = beta_prod_prev / beta_prod * betas
+            min_log = np.log(variance)
+            if len(betas) > 1:
+                min_log[0] = beta_prod_prev[0] / beta_prod[0] * betas[1]
+            max_log = np.log(betas)
+            if self.variance_type == 'fixed_small':
+                sigma = np.clip(variance, 1e-20, 10000)**0.5
+            elif self.variance_type == 'fixed_small_log':
+                sigma = np.log(np.clip(variance, 1e-20, 10000))**0.5
+            elif self.variance_type == 'fixed_large':
+                sigma = betas**0.5
+            elif self.variance_type == 'fixed_large_log':
+                sigma = np.log(betas)**0.5
+            else:
+                # learned variance, computed in ``step``
+                sigma = np.zeros_like(betas)
+
+            coeffs = dict(
+                sqrt_recip_alphas_cumprod=alphas_cumprod**-0.5,
+                sqrt_recipm1_alphas_cumprod=(beta_prod / alphas_cumprod)**0.5,
+                # see formula (7) from https://arxiv.org/pdf/2006.11239.pdf
+                pred_original_sample_coeff=alphas_cumprod_prev**0.5 * betas /
+                beta_prod,
+                current_sample_coeff=(1 - betas)**0.5 * beta_prod_prev /
+                beta_prod,
+                sigma=sigma * nonzero,
+                min_log=min_log,
+                max_log=max_log,
+                nonzero=nonzero,
+                sqrt_alphas_cumprod=alphas_cumprod**0.5,
+                sqrt_one_minus_alphas_cumprod=beta_prod**0.5)
+        self._coeff_names, self._coeff_table = build_coeff_table(coeffs)
+        self._coeff_tables = dict()
+
+    def _get_coeffs(self, timesteps, sample: torch.Tensor) -> dict:
+        """Gather the coefficients of the timesteps, on the device and in the
+        dtype of ``sample``."""
+
+        key = (sample.device, sample.dtype)
+        table = self._coeff_tables.get(key)
+        if table is None:
+            table = torch.from_numpy(self._coeff_table).to(
+                device=sample.device, dtype=sample.dtype)
+            self._coeff_tables[key] = table
+        return dict(
+            zip(self._coeff_names, gather_coeffs(table, timesteps,
+                                                 sample.ndim)))
+
+    def set_timesteps(self, num_inference_steps, device=None):
+        """set timesteps.
+
+        Args:
+            num_inference_steps (int): The number of inference steps.
+            device (torch.device, optional): If given, the coefficient table
+                is moved to this device in advance. Defaults to None.
+        """
 
         num_inference_steps = min(self.num_train_timesteps,
                                   num_inference_steps)
@@ -86,6 +165,8 @@ class DDPMScheduler:
         self.timesteps = np.arange(
             0, self.num_train_timesteps,
             self.num_train_timesteps // self.num_inference_steps)[::-1].copy()
+        if device is not None:
+            self._get_coeffs(0, torch.empty(0, device=device))
 
     def _get_variance(self, t, predicted_variance=None, variance_type=None):
         """get variance."""
@@ -131,12 +212,25 @@ class DDPMScheduler:
 
     def step(self,
              model_output: torch.FloatTensor,
-             timestep: int,
+             timestep: Union[int, torch.Tensor],
              sample: torch.FloatTensor,
              predict_epsilon=True,
              generator=None):
-        t = timestep
-        """step forward"""
+        """step forward.
+
+        Args:
+            model_output (torch.FloatTensor): The output of the denoising
+                model.
+            timestep (int | torch.Tensor): The current timestep shared by the
+                batch, or the timesteps of each sample in shape (n, ).
+            sample (torch.FloatTensor): The current sample x_t.
+            predict_epsilon (bool): Whether the model predicts the noise.
+                Otherwise it predicts x_0. Defaults to True.
+            generator (torch.Generator, optional): Unused. Defaults to None.
+
+        Returns:
+            dict: A dict contains 'prev_sample', 'mean', 'sigma' and 'noise'.
+        """
 
         if model_output.shape[1] == sample.shape[
                 1] * 2 and self.variance_type in ['learned', 'learned_range']:
@@ -145,44 +239,41 @@ class DDPMScheduler:
         else:
             predicted_variance = None
 
-        # 1. compute alphas, betas
-        alpha_prod_t = self.alphas_cumprod[t]
-        alpha_prod_t_prev = self.alphas_cumprod[t - 1] if t > 0 else self.one
-        beta_prod_t = 1 - alpha_prod_t
-        beta_prod_t_prev = 1 - alpha_prod_t_prev
+        coeffs = self._get_coeffs(timestep, sample)
 
-        # 2. compute predicted original sample from predicted noise also called
+        # 1. compute predicted original sample from predicted noise also called
         # "predicted x_0" of formula (15) from https://arxiv.org/pdf/2006.11239.pdf # noqa
         if predict_epsilon:
             pred_original_sample = (
-                (sample - beta_prod_t**(0.5) * model_output) /
-                alpha_prod_t**(0.5))
+                coeffs['sqrt_recip_alphas_cumprod'] * sample -
+                coeffs['sqrt_recipm1_alphas_cumprod'] * model_output)
         else:
             pred_original_sample = model_output
 
-        # 3. Clip "predicted x_0"
+        # 2. Clip "predicted x_0"
         if self.clip_sample:
             pred_original_sample = torch.clamp(pred_original_sample, -1, 1)
 
-        # 4. Compute coefficients for pred_original_sample x_0 and current sample x_t # noqa
-        # See formula (7) from https://arxiv.org/pdf/2006.11239.pdf
-        pred_original_sample_coeff = (alpha_prod_t_prev**(0.5) *
-                                      self.betas[t]) / beta_prod_t
-        current_sample_coeff = self.alphas[t]**(
-            0.5) * beta_prod_t_prev / beta_prod_t
-
-        # 5. Compute predicted previous sample µ_t
+        # 3. Compute predicted previous sample µ_t
         # See formula (7) from https://arxiv.org/pdf/2006.11239.pdf
         pred_prev_mean = (
-            pred_original_sample_coeff * pred_original_sample +
-            current_sample_coeff * sample)
+            coeffs['pred_original_sample_coeff'] * pred_original_sample +
+            coeffs['current_sample_coeff'] * sample)
 
-        # 6. Add noise
+        # 4. Add noise, no noise is added at t == 0
         noise = torch.randn_like(model_output)
-        sigma = 0
-        if t > 0:
-            sigma = self._get_variance(
-                t, predicted_variance=predicted_variance)**0.5
+        if self.variance_type == 'learned':
+            # mask before the square root, which is nan for negative values
+            sigma = torch.where(coeffs['nonzero'] > 0,
+                                predicted_variance.clamp(min=0)**0.5,
+                                torch.zeros_like(predicted_variance))
+        elif self.variance_type == 'learned_range':
+            frac = (predicted_variance + 1) / 2
+            log_variance = frac * coeffs['max_log'] + (
+                1 - frac) * coeffs['min_log']
+            sigma = torch.exp(0.5 * log_variance) * coeffs['nonzero']
+        else:
+            sigma = coeffs['sigma']
 
         pred_prev_sample = pred_prev_mean + sigma * noise
 
@@ -194,17 +285,22 @@ class DDPMScheduler:
         }
 
     def add_noise(self, original_samples, noise, timesteps):
-        """add noise."""
+        """add noise.
+
+        Args:
+            original_samples (torch.Tensor): The original samples x_0.
+            noise (torch.Tensor): The noise.
+            timesteps (int | torch.Tensor): The timestep shared by the batch,
+                or the timesteps of each sample in shape (n, ).
 
-        sqrt_alpha_prod = self.alphas_cumprod[timesteps]**0.5
-        sqrt_alpha_prod = self.match_shape(sqrt_alpha_prod, original_samples)
-        sqrt_one_minus_alpha_prod = (1 - self.alphas_cumprod[timesteps])**0.5
-        sqrt_one_minus_alpha_prod = self.match_shape(sqrt_one_minus_alpha_prod,
-                                                     original_samples)
+        Returns:
+            torch.Tensor: The noisy samples x_t.
+        """
 
+        coeffs = self._get_coeffs(timesteps, original_samples)
         noisy_samples = (
-            sqrt_alpha_prod * original_samples +
-            sqrt_one_minus_alpha_prod * noise)
+            coeffs['sqrt_alphas_cumprod'] * original_samples +
+            coeffs['sqrt_one_minus_alphas_cumprod'] * noise)
         return noisy_samples
 
     def training_loss(self, model, x_0, t):
@@ -194,11 +194,13 @@ class EG3D(BaseConditionalGAN):
             generator = self.generator_ema
         else:  # sample model is `orig`
             generator = self.generator
-        outputs = generator(noise, label=labels)
+        render_kwargs = sample_kwargs.get('render_kwargs', None)
+        outputs = generator(noise, label=labels, render_kwargs=render_kwargs)
 
         if sample_model == 'ema/orig':
             generator = self.generator
-            outputs_orig = generator(noise, label=labels)
+            outputs_orig = generator(
+                noise, label=labels, render_kwargs=render_kwargs)
 
             outputs = dict(ema=outputs, orig=outputs_orig)
 
@@ -233,7 +235,8 @@ class EG3D(BaseConditionalGAN):
                       num_batches: int = 4,
                       mode: str = 'both',
                       sample_model: str = 'orig',
-                      show_pbar: bool = True) -> List[dict]:
+                      show_pbar: bool = True,
+                      render_kwargs: Optional[dict] = None) -> List[dict]:
         """Interpolation input and return a list of output results. We support
         three kinds of interpolation mode:
 
@@ -257,6 +260,9 @@ class EG3D(BaseConditionalGAN):
                 support 'orig' and 'ema'. Defaults to 'orig'.
             show_pbar (bool, optional): Whether display a progress bar during
                 interpolation. Defaults to True.
+            render_kwargs (Optional[dict], optional): The specific kwargs for
+                rendering, e.g., ``dict(ray_chunk_size='auto')`` to render
+                rays chunk by chunk. Defaults to None.
 
         Returns:
             List[dict]: The list of output dict of each frame.
@@ -320,7 +326,8 @@ class EG3D(BaseConditionalGAN):
                 cond,
                 input_is_latent=True,
                 add_noise=True,
-                randomize_noise=False)  # use fixed noise
+                randomize_noise=False,  # use fixed noise
+                render_kwargs=render_kwargs)
             output_list.append({k: v.cpu() for k, v in output.items()})
 
             if show_pbar:
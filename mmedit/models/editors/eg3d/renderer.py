@@ -44,6 +44,14 @@ class EG3DRenderer(BaseModule):
             render points to plane feature. The usage of this argument please
             refer to :meth:`self.project_onto_planes` and
             https://github.com/NVlabs/eg3d/issues/67. Defaults to 'Official'.
+        ray_chunk_size (Optional[Union[int, str]]): The number of rays
+            rendered at once. The coarse and fine passes are run chunk by
+            chunk, which bounds the memory of the intermediate tensors. If
+            'auto', the chunk size is chosen from ``memory_budget``. If None,
+            all rays are rendered at once. Defaults to None.
+        memory_budget (int): The approximate memory in bytes of the
+            intermediate tensors of a chunk, used when ``ray_chunk_size`` is
+            'auto'. Defaults to 1GB.
     """
 
     def __init__(self,
@@ -56,7 +64,9 @@ class EG3DRenderer(BaseModule):
                  density_noise: float = 0,
                  clamp_mode: str = 'softplus',
                  white_back: bool = True,
-                 projection_mode: str = 'Official'):
+                 projection_mode: str = 'Official',
+                 ray_chunk_size: Optional[Union[int, str]] = None,
+                 memory_budget: int = 2**30):
         super().__init__()
         self.decoder = EG3DDecoder(**decoder_cfg)
 
@@ -70,6 +80,8 @@ class EG3DRenderer(BaseModule):
         self.clamp_mode = clamp_mode
         self.white_back = white_back
         self.projection_mode = projection_mode
+        self.ray_chunk_size = ray_chunk_size
+        self.memory_budget = memory_budget
 
     def get_value(self,
                   target: str,
@@ -119,6 +131,8 @@ class EG3DRenderer(BaseModule):
             'depth_resolution_importance', render_kwargs)
         density_noise = self.get_value('density_noise', render_kwargs)
 
+        ray_chunk_size = self.get_value('ray_chunk_size', render_kwargs)
+
         if ray_start == ray_end == 'auto':
             ray_start, ray_end = get_ray_limits_box(
                 ray_origins, ray_directions, box_side_length=box_warp)
@@ -126,8 +140,6 @@ class EG3DRenderer(BaseModule):
             if torch.any(is_ray_valid).item():
                 ray_start[~is_ray_valid] = ray_start[is_ray_valid].min()
                 ray_end[~is_ray_valid] = ray_start[is_ray_valid].max()
-            depths_coarse = self.sample_stratified(ray_origins, ray_start,
-                                                   ray_end, depth_resolution)
         else:
             assert (isinstance(ray_start, float) and isinstance(
                 ray_end, float)), (
@@ -135,9 +147,127 @@ class EG3DRenderer(BaseModule):
                     f'both \'auto\'. But receive {ray_start} and {ray_end}.')
             assert ray_start < ray_end, (
                 '\'ray_start\' must less than \'ray_end\'.')
-            # Create stratified depth samples
-            depths_coarse = self.sample_stratified(ray_origins, ray_start,
-                                                   ray_end, depth_resolution)
+
+        batch_size, num_rays, _ = ray_origins.shape
+        if ray_chunk_size == 'auto':
+            ray_chunk_size = self.get_ray_chunk_size(
+                planes, batch_size, depth_resolution,
+                depth_resolution_importance,
+                self.get_value('memory_budget', render_kwargs))
+        if ray_chunk_size is None or ray_chunk_size >= num_rays:
+            rgb_final, depth_final, weights, _ = self.render_rays(
+                planes, ray_origins, ray_directions, ray_start, ray_end,
+                depth_resolution, depth_resolution_importance, density_noise,
+                box_warp)
+            return rgb_final, depth_final, weights
+
+        # render rays chunk by chunk, the depths are clamped to the range of
+        # the samples of all rays at last, as the unchunked rendering does
+        results = []
+        for start in range(0, num_rays, ray_chunk_size):
+            chunk = slice(start, start + ray_chunk_size)
+            results.append(
+                self.render_rays(
+                    planes,
+                    ray_origins[:, chunk],
+                    ray_directions[:, chunk],
+                    ray_start[:, chunk]
+                    if isinstance(ray_start, torch.Tensor) else ray_start,
+                    ray_end[:, chunk]
+                    if isinstance(ray_end, torch.Tensor) else ray_end,
+                    depth_resolution,
+                    depth_resolution_importance,
+                    density_noise,
+                    box_warp,
+                    clamp_depth=False))
+        rgb_final, depth_final, weights, depth_ranges = zip(*results)
+        depth_min = min(depth_range[0] for depth_range in depth_ranges)
+        depth_max = max(depth_range[1] for depth_range in depth_ranges)
+        depth_final = torch.clamp(
+            torch.cat(depth_final, dim=1), depth_min, depth_max)
+        return torch.cat(
+            rgb_final, dim=1), depth_final, torch.cat(
+                weights, dim=1)
+
+    def get_ray_chunk_size(self, planes: torch.Tensor, batch_size: int,
+                           depth_resolution: int,
+                           depth_resolution_importance: Optional[int],
+                           memory_budget: int) -> int:
+        """Estimate the number of rays whose intermediate tensors fit in the
+        memory budget. The estimation counts the tensors alive at the peak of
+        the neural rendering of a pass, i.e., the coordinates, the sampled
+        triplane features and the activations of the decoder of each point,
+        and the colors, densities and depths of the samples of each ray kept
+        for volume rendering.
+
+        Args:
+            planes (torch.Tensor): Triplane features, shape like
+                (bz, 3, TriPlane_feat, TriPlane_res, TriPlane_res).
+            batch_size (int): The batch size.
+            depth_resolution (int): Number of coarse samples per ray.
+            depth_resolution_importance (Optional[int]): Number of fine
+                samples per ray.
+            memory_budget (int): The memory budget in bytes.
+
+        Returns:
+            int: The number of rays of a chunk.
+        """
+        n_planes, plane_channels = planes.shape[1:3]
+        hidden_channels = self.decoder.net[0].out_features
+        out_channels = self.decoder.net[-1].out_features
+        # coordinates and projected coordinates, triplane features sampled by
+        # grid_sample and permuted, the hidden features with activation and
+        # the outputs with sigmoid
+        point_numel = (3 + 2 * n_planes + 2 * n_planes * plane_channels +
+                       2 * hidden_channels + 2 * out_channels)
+        num_fine = depth_resolution_importance or 0
+        num_samples = max(depth_resolution, num_fine)
+        # colors, densities and depths of all the samples, doubled by the
+        # sorting in `unify_samples` and the volume rendering
+        sample_numel = 2 * (depth_resolution + num_fine) * (out_channels + 1)
+        ray_bytes = planes.element_size() * batch_size * (
+            num_samples * point_numel + sample_numel)
+        return max(int(memory_budget // ray_bytes), 1)
+
+    def render_rays(self,
+                    planes: torch.Tensor,
+                    ray_origins: torch.Tensor,
+                    ray_directions: torch.Tensor,
+                    ray_start: Union[float, torch.Tensor],
+                    ray_end: Union[float, torch.Tensor],
+                    depth_resolution: int,
+                    depth_resolution_importance: Optional[int],
+                    density_noise: float,
+                    box_warp: float,
+                    clamp_depth: bool = True) -> Tuple[torch.Tensor]:
+        """Run the coarse pass and the fine pass of the given rays.
+
+        Args:
+            planes (torch.Tensor): The triplane features shape like
+                (bz, 3, TriPlane_feat, TriPlane_res, TriPlane_res).
+            ray_origins (torch.Tensor): The original of each ray to render,
+                shape like (bz, N_rays, 3).
+            ray_directions (torch.Tensor): The direction vector of each ray to
+                render, shape like (bz, N_rays, 3).
+            ray_start (Union[float, torch.Tensor]): The start position of
+                rays.
+            ray_end (Union[float, torch.Tensor]): The end position of rays.
+            depth_resolution (int): Number of coarse samples per ray.
+            depth_resolution_importance (Optional[int]): Number of fine
+                samples per ray.
+            density_noise (float): Strength of noise add to the predicted
+                density.
+            box_warp (float): The side length of the cube spanned by the
+                triplanes.
+            clamp_depth (bool): Whether to clamp the weighted depths to the
+                range of the sampled depths. Defaults to True.
+
+        Returns:
+            Tuple[torch.Tensor]: Renderer RGB feature, weighted depths,
+                weights and the range of the sampled depths.
+        """
+        depths_coarse = self.sample_stratified(ray_origins, ray_start, ray_end,
+                                               depth_resolution)
 
         batch_size, num_rays, samples_per_ray, _ = depths_coarse.shape
 
@@ -184,15 +314,17 @@ class EG3DRenderer(BaseModule):
             all_depths, all_colors, all_densities = self.unify_samples(
                 depths_coarse, colors_coarse, densities_coarse, depths_fine,
                 colors_fine, densities_fine)
-
-            # Aggregate
-            rgb_final, depth_final, weights = self.volume_rendering(
-                all_colors, all_densities, all_depths)
         else:
-            rgb_final, depth_final, weights = self.volume_rendering(
-                colors_coarse, densities_coarse, depths_coarse)
+            all_depths, all_colors, all_densities = (depths_coarse,
+                                                     colors_coarse,
+                                                     densities_coarse)
+
+        # Aggregate
+        rgb_final, depth_final, weights = self.volume_rendering(
+            all_colors, all_densities, all_depths, clamp_depth=clamp_depth)
 
-        return rgb_final, depth_final, weights.sum(2)
+        return rgb_final, depth_final, weights.sum(2), (all_depths.min(),
+                                                        all_depths.max())
 
     def sample_stratified(self, ray_origins: torch.Tensor,
                           ray_start: Union[float, torch.Tensor],
@@ -389,8 +521,11 @@ class EG3DRenderer(BaseModule):
 
         return all_depths, all_colors, all_densities
 
-    def volume_rendering(self, colors: torch.Tensor, densities: torch.Tensor,
-                         depths: torch.Tensor) -> Tuple[torch.Tensor]:
+    def volume_rendering(self,
+                         colors: torch.Tensor,
+                         densities: torch.Tensor,
+                         depths: torch.Tensor,
+                         clamp_depth: bool = True) -> Tuple[torch.Tensor]:
         """Volume rendering.
 
         Args:
@@ -400,6 +535,8 @@ class EG3DRenderer(BaseModule):
                 (bz, N_points, N_depth, 1).
             depths (torch.Tensor): Depths for each points. Shape like
                 (bz, N_points, N_depth, 1).
+            clamp_depth (bool): Whether to clamp the weighted depths to the
+                range of ``depths``. Defaults to True.
 
         Returns:
             Tuple[torch.Tensor]: A tuple of color feature
@@ -437,8 +574,9 @@ class EG3DRenderer(BaseModule):
             composite_depth[torch.isnan(composite_depth)] = float('inf')
         else:
             composite_depth = torch.nan_to_num(composite_depth, float('inf'))
-        composite_depth = torch.clamp(composite_depth, torch.min(depths),
-                                      torch.max(depths))
+        if clamp_depth:
+            composite_depth = torch.clamp(composite_depth, torch.min(depths),
+                                          torch.max(depths))
 
         if self.white_back:
             composite_rgb = composite_rgb + 1 - weight_total
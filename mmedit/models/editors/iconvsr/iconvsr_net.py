@@ -10,7 +10,9 @@ from mmengine.runner import load_checkpoint
 from mmedit.models.base_archs import PixelShufflePack, ResidualBlockNoBN
 from mmedit.models.utils import flow_warp, make_layer
 from mmedit.registry import MODELS
-from ..basicvsr.basicvsr_net import ResidualBlocksWithInputConv, SPyNet
+from ..basicvsr.basicvsr_net import (ResidualBlocksWithInputConv, SPyNet,
+                                     compute_flow_streaming,
+                                     evict_streaming_cache)
 from ..edvr.edvr_net import PCDAlignment, TSAFusion
 
 
@@ -243,16 +245,182 @@ class IconVSRNet(BaseModule):
             feat_prop = torch.cat([lr_curr, outputs[i], feat_prop], dim=1)
             feat_prop = self.forward_resblocks(feat_prop)
 
-            out = self.lrelu(self.upsample1(feat_prop))
-            out = self.lrelu(self.upsample2(out))
-            out = self.lrelu(self.conv_hr(out))
-            out = self.conv_last(out)
-            base = self.img_upsample(lr_curr)
-            out += base
-            outputs[i] = out
+            outputs[i] = self.upsample(lr_curr, feat_prop)
 
         return torch.stack(outputs, dim=1)[:, :, :, :4 * h_input, :4 * w_input]
 
+    def upsample(self, lr_curr, feat):
+        """Compute the output image of a frame given the feature.
+
+        Args:
+            lr_curr (Tensor): Input LR frame with shape (n, c, h, w).
+            feat (Tensor): Feature of forward-time propagation.
+
+        Returns:
+            Tensor: Output HR frame with shape (n, c, 4h, 4w).
+        """
+        out = self.lrelu(self.upsample1(feat))
+        out = self.lrelu(self.upsample2(out))
+        out = self.lrelu(self.conv_hr(out))
+        out = self.conv_last(out)
+        base = self.img_upsample(lr_curr)
+        out += base
+        return out
+
+    def compute_refill_features_streaming(self, lrs, offset, keyframe_idx,
+                                          end_of_sequence, cache):
+        """Compute keyframe features for information-refill of a chunk.
+
+        The neighbouring frames are padded in the same way as
+        :meth:`compute_refill_features`. The features of the keyframes whose
+        neighbouring frames are all available are cached.
+
+        Args:
+            lrs (Tensor): Input LR images with shape (n, t, c, h, w), which
+                start from the ``offset``-th frame of the sequence.
+            offset (int): Index of the first frame in the sequence.
+            keyframe_idx (list(int)): The indices of the keyframes in the
+                sequence.
+            end_of_sequence (bool): Whether the last frame of ``lrs`` is the
+                last frame of the sequence.
+            cache (dict): Cached keyframe features, updated in place.
+
+        Return:
+            dict(Tensor): The keyframe features. Each key corresponds to the
+                indices in keyframe_idx.
+        """
+        end = offset + lrs.size(1)
+        feats_refill = {}
+        for i in keyframe_idx:
+            if i in cache:
+                feats_refill[i] = cache[i]
+                continue
+            idx = []
+            for j in range(i - self.padding, i + self.padding + 1):
+                if j < 0:
+                    j = self.padding - j
+                elif j >= end:
+                    j = 2 * end - self.padding - 2 - j
+                assert offset <= j < end, (
+                    'The chunk is too short for information-refill.')
+                idx.append(j - offset)
+            feats_refill[i] = self.edvr(lrs[:, idx].contiguous())
+            if end_of_sequence or i + self.padding < end:
+                cache[i] = feats_refill[i]
+        return feats_refill
+
+    def forward_streaming(self,
+                          lrs,
+                          state=None,
+                          num_outputs=None,
+                          end_of_sequence=False):
+        """Forward a chunk of a long sequence, carrying the states across the
+        chunks.
+
+        See :meth:`BasicVSRNet.forward_streaming`. In addition, the keyframe
+        features of information-refill are cached, and the last frame of each
+        chunk is a keyframe of the backward-time propagation.
+
+        Args:
+            lrs (Tensor): Input LR chunk with shape (n, t, c, h, w).
+            state (dict, optional): The state returned by the previous
+                chunk. None for the first chunk. Default: None.
+            num_outputs (int, optional): The number of frames to be restored,
+                the remaining frames are look-ahead frames. If None, all the
+                frames are restored. Default: None.
+            end_of_sequence (bool): Whether the last frame of the chunk is
+                the last frame of the sequence. Default: False.
+
+        Returns:
+            tuple[Tensor, dict]: Output HR frames with shape
+                (n, num_outputs, c, 4h, 4w) and the state for the next chunk.
+        """
+        n, t, c, h_input, w_input = lrs.size()
+        assert h_input >= 64 and w_input >= 64, (
+            'The height and width of inputs should be at least 64, '
+            f'but got {h_input} and {w_input}.')
+        num_outputs = t if num_outputs is None else num_outputs
+        assert 0 < num_outputs <= t
+        if state is None:
+            state = dict(start=0, flows=dict(), refill=dict())
+        start = state['start']
+        end = start + t
+
+        lrs = self.spatial_padding(lrs)
+        h, w = lrs.size(3), lrs.size(4)
+
+        # get the keyframe indices in the sequence
+        keyframe_idx = [
+            i for i in range(start, end) if i % self.keyframe_stride == 0
+        ]
+        backward_keyframe_idx = keyframe_idx + [end - 1]
+        forward_keyframe_idx = keyframe_idx
+        if end_of_sequence:
+            forward_keyframe_idx = backward_keyframe_idx
+
+        # compute optical flow and compute features for information-refill
+        flows_forward, flows_backward = compute_flow_streaming(
+            self.spynet, lrs, start, state['flows'], state.get('lr'))
+        lrs_ext = lrs
+        if 'history' in state:
+            lrs_ext = torch.cat([state['history'], lrs], dim=1)
+        offset = end - lrs_ext.size(1)
+        feats_refill = self.compute_refill_features_streaming(
+            lrs_ext, offset, sorted(set(backward_keyframe_idx)),
+            end_of_sequence, state['refill'])
+
+        # backward-time propagation within the chunk
+        feats_backward = [None] * num_outputs
+        feat_prop = lrs.new_zeros(n, self.mid_channels, h, w)
+        for i in range(t - 1, -1, -1):
+            lr_curr = lrs[:, i, :, :, :]
+            if i < t - 1:
+                flow = flows_backward[:, i, :, :, :]
+                feat_prop = flow_warp(feat_prop, flow.permute(0, 2, 3, 1))
+            if start + i in backward_keyframe_idx:
+                feat_prop = torch.cat([feat_prop, feats_refill[start + i]],
+                                      dim=1)
+                feat_prop = self.backward_fusion(feat_prop)
+            feat_prop = torch.cat([lr_curr, feat_prop], dim=1)
+            feat_prop = self.backward_resblocks(feat_prop)
+            if i < num_outputs:
+                feats_backward[i] = feat_prop
+
+        # forward-time propagation from the previous chunk
+        outputs = []
+        feat_prop = state.get('feat_prop', torch.zeros_like(feat_prop))
+        for i in range(0, num_outputs):
+            lr_curr = lrs[:, i, :, :, :]
+            if start + i > 0:
+                flow = flows_forward[:, i, :, :, :]
+                feat_prop = flow_warp(feat_prop, flow.permute(0, 2, 3, 1))
+
+            if start + i in forward_keyframe_idx:  # information-refill
+                feat_prop = torch.cat([feat_prop, feats_refill[start + i]],
+                                      dim=1)
+                feat_prop = self.forward_fusion(feat_prop)
+
+            feat_prop = torch.cat([lr_curr, feats_backward[i], feat_prop],
+                                  dim=1)
+            feat_prop = self.forward_resblocks(feat_prop)
+            outputs.append(self.upsample(lr_curr, feat_prop))
+
+        start += num_outputs
+        evict_streaming_cache(state['flows'], start - 1)
+        evict_streaming_cache(state['refill'], start)
+        # the previous frames needed by information-refill
+        state = dict(
+            start=start,
+            flows=state['flows'],
+            refill=state['refill'],
+            lr=lrs[:, num_outputs - 1],
+            history=lrs_ext[:,
+                            max(0, start - self.padding - offset):start -
+                            offset],
+            feat_prop=feat_prop)
+        outputs = torch.stack(outputs, dim=1)
+        return outputs[:, :, :, :4 * h_input, :4 * w_input], state
+
 
 class EDVRFeatureExtractor(BaseModule):
     """EDVR feature extractor for information-refill in IconVSR.
@@ -79,3 +79,33 @@ class LIIF(BaseEditModel):
                     metainfo=data_samples[idx].metainfo))
 
         return predictions
+
+    @torch.no_grad()
+    def zoom(self, inputs, sizes, cache_key=None):
+        """Restore the inputs at several output sizes with one pass of the
+        encoder.
+
+        Args:
+            inputs (torch.Tensor): Input tensor with shape (n, c, h, w),
+                preprocessed by :attr:`data_preprocessor`.
+            sizes (Sequence[float | tuple[int]]): Output scales or output
+                sizes (h, w).
+            cache_key (Hashable, optional): The key of the inputs, used to
+                reuse the encoded feature in the following calls, see
+                :meth:`LIIFNet.encode`. Default: None.
+
+        Returns:
+            List[Tensor]: Outputs with shape (n, c, h', w') of each size.
+        """
+        feature = self.generator.encode(inputs, cache_key=cache_key)
+        ih, iw = inputs.shape[-2:]
+        outputs = []
+        for size in sizes:
+            if not isinstance(size, (tuple, list)):
+                size = (round(ih * size), round(iw * size))
+            feats = self.generator.query_grid(feature, size)
+            feats = self.data_preprocessor.destructor(feats)
+            outputs.append(
+                feats.view(len(inputs), *size, -1).permute(0, 3, 1,
+                                                           2).contiguous())
+        return outputs
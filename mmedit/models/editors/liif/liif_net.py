@@ -1,6 +1,8 @@
 from abc import abstractmethod
+from collections import OrderedDict
 
 import torch
+import torch.nn as nn
 import torch.nn.functional as F
 from mmengine.model import BaseModule
 
@@ -26,6 +28,14 @@ class LIIFNet(BaseModule):
         feat_unfold (bool): Whether to use feature unfold. Default: True.
         cell_decode (bool): Whether to use cell decode. Default: True.
         eval_bsize (int): Size of batched predict. Default: None.
+        eval_memory (int): Memory cap in bytes of the intermediate tensors
+            of each chunk in batched predict. The number of queries in a
+            chunk is estimated from it and overrides `eval_bsize`. If both
+            are None, the queries are not chunked. Default: None.
+        feature_cache_size (int): The maximum number of encoded features
+            kept by :meth:`encode` with a `cache_key`. Default: 4.
+        plan_cache_size (int): The maximum number of query plans of output
+            grids kept by :meth:`query_grid`. Default: 8.
     """
 
     def __init__(self,
@@ -34,13 +44,21 @@ class LIIFNet(BaseModule):
                  local_ensemble=True,
                  feat_unfold=True,
                  cell_decode=True,
-                 eval_bsize=None):
+                 eval_bsize=None,
+                 eval_memory=None,
+                 feature_cache_size=4,
+                 plan_cache_size=8):
         super().__init__()
 
         self.local_ensemble = local_ensemble
         self.feat_unfold = feat_unfold
         self.cell_decode = cell_decode
         self.eval_bsize = eval_bsize
+        self.eval_memory = eval_memory
+        self.feature_cache_size = feature_cache_size
+        self.plan_cache_size = plan_cache_size
+        self._feature_cache = OrderedDict()
+        self._plan_cache = OrderedDict()
 
         # model
         self.encoder = BACKBONES.build(encoder)
@@ -51,8 +69,15 @@ class LIIFNet(BaseModule):
         if self.cell_decode:
             imnet_in_dim += 2
         imnet['in_dim'] = imnet_in_dim
+        self.imnet_in_dim = imnet_in_dim
         self.imnet = COMPONENTS.build(imnet)
 
+    def train(self, mode=True):
+        """Set the module in training or evaluation mode. The cached features
+        are dropped since they are outdated once the weights are updated."""
+        self._feature_cache.clear()
+        return super().train(mode)
+
     def forward(self, x, coord, cell, test_mode=False):
         """Forward function.
 
@@ -67,7 +92,10 @@ class LIIFNet(BaseModule):
         """
 
         feature = self.gen_feature(x)
-        if self.eval_bsize is None or not test_mode:
+        # only chunk the queries when chunking is configured, the dense
+        # lookups of `batched_predict` take more memory in one pass
+        chunked = self.eval_bsize is not None or self.eval_memory is not None
+        if not test_mode or self.imnet is None or not chunked:
             pred = self.query_rgb(feature, coord, cell)
         else:
             pred = self.batched_predict(feature, coord, cell)
@@ -172,6 +200,10 @@ class LIIFNet(BaseModule):
     def batched_predict(self, x, coord, cell):
         """Batched predict.
 
+        Unlike :meth:`query_rgb`, the feature is unfolded once for all the
+        chunks, and the nearest latent codes of the queries are looked up by
+        the indices in a query plan (see :meth:`get_query_plan`).
+
         Args:
             x (Tensor): Input tensor.
             coord (Tensor): coord tensor.
@@ -181,18 +213,202 @@ class LIIFNet(BaseModule):
             pred (Tensor): output of model.
         """
         with torch.no_grad():
-            n = coord.shape[1]
-            left = 0
-            preds = []
-            while left < n:
-                right = min(left + self.eval_bsize, n)
-                pred = self.query_rgb(x, coord[:, left:right, :],
-                                      cell[:, left:right, :])
-                preds.append(pred)
-                left = right
-            pred = torch.cat(preds, dim=1)
+            feature = self.prepare_feature(x)
+            plan = self.get_query_plan(x.shape[-2:], coord, cell)
+            pred = self.query_plan(feature, plan)
         return pred
 
+    def prepare_feature(self, feature):
+        """Unfold the encoded feature and flatten it for the lookups of
+        :meth:`query_plan`.
+
+        Args:
+            feature (Tensor): Encoded feature with shape (n, c, h, w).
+
+        Returns:
+            dict: The prepared feature, contains the following keys:
+
+            - feat (Tensor): Unfolded feature with shape (n * h * w, c'),
+              where c' is c * 9 if `feat_unfold` else c.
+            - batch_size (int): n.
+            - size (tuple[int]): (h, w).
+        """
+        n, c, h, w = feature.shape
+        if self.feat_unfold:
+            feature = F.unfold(feature, 3, padding=1).view(n, c * 9, h, w)
+        feat = feature.permute(0, 2, 3, 1).reshape(n * h * w, -1)
+        return dict(feat=feat, batch_size=n, size=(h, w))
+
+    def encode(self, x, cache_key=None):
+        """Encode images to prepared features, which can be queried at any
+        number of output sizes by :meth:`query_grid`.
+
+        Args:
+            x (Tensor): Input tensor with shape (n, c, h, w).
+            cache_key (Hashable, optional): The key of the input, e.g., the
+                path of the image. If given, the result is cached and reused
+                for the following calls with the same key. The cache is
+                cleared by :meth:`train`. Default: None.
+
+        Returns:
+            dict: The prepared feature, see :meth:`prepare_feature`.
+        """
+        if cache_key is not None and cache_key in self._feature_cache:
+            self._feature_cache.move_to_end(cache_key)
+            return self._feature_cache[cache_key]
+        feature = self.prepare_feature(self.gen_feature(x))
+        if cache_key is not None and self.feature_cache_size > 0:
+            self._feature_cache[cache_key] = feature
+            while len(self._feature_cache) > self.feature_cache_size:
+                self._feature_cache.popitem(last=False)
+        return feature
+
+    def get_query_plan(self, size, coord, cell=None):
+        """Precompute the lookups of the queries, which are shared by all
+        the chunks of the queries and all the images with the same size.
+
+        The local ensemble shifts of each query, the indices of its nearest
+        latent codes (the same as the nearest neighbours found by
+        `grid_sample` in :meth:`query_rgb`), its relative coordinates and
+        cells, and the ensemble weights are computed once.
+
+        Args:
+            size (tuple[int]): Size (h, w) of the feature.
+            coord (Tensor): coord tensor, shape (n, q, 2). n can be 1 if the
+                queries are shared by all the images.
+            cell (Tensor | None): cell tensor, shape (n, q, 2).
+                Default: None.
+
+        Returns:
+            dict: The query plan, contains the following keys:
+
+            - index (Tensor): Indices of the nearest latent codes, shape
+              (e, n, q), where e is the number of ensemble shifts.
+            - inputs (Tensor): Relative coordinates and cells, shape
+              (e, n, q, 2) or (e, n, q, 4).
+            - weight (Tensor): Ensemble weights, shape (e, n, q).
+        """
+        h, w = size
+        if self.local_ensemble:
+            shifts, eps_shift = [(-1, -1), (-1, 1), (1, -1), (1, 1)], 1e-6
+        else:
+            shifts, eps_shift = [(0, 0)], 0
+        # field radius (global: [-1, 1])
+        radius = coord.new_tensor([1 / h, 1 / w])
+        feat_size = coord.new_tensor([h, w])
+        shifts = coord.new_tensor(shifts) * radius + eps_shift
+
+        coord_ = (coord.unsqueeze(0) +
+                  shifts[:, None, None]).clamp_(-1 + 1e-6, 1 - 1e-6)
+        # the same rounding as the nearest mode of `grid_sample`
+        index = torch.round(((coord_ + 1) * feat_size - 1) / 2)
+        index = torch.min(index.clamp_(min=0), feat_size - 1)
+        # the coordinates of latent codes, see `make_coord`
+        query_coord = -1 + radius + (2 * radius) * index
+        rel_coord = (coord.unsqueeze(0) - query_coord) * feat_size
+
+        area = torch.abs(rel_coord[..., 0] * rel_coord[..., 1]) + 1e-9
+        weight = area / area.sum(dim=0)
+        if self.local_ensemble:
+            weight = weight.flip(0)
+
+        inputs = rel_coord
+        if self.cell_decode:
+            rel_cell = (cell * feat_size).unsqueeze(0).expand_as(rel_coord)
+            inputs = torch.cat([rel_coord, rel_cell], dim=-1)
+        index = index.long()
+        index = index[..., 0] * w + index[..., 1]
+        return dict(index=index, inputs=inputs, weight=weight)
+
+    def get_chunk_size(self, batch_size, num_ensembles):
+        """Get the number of queries of each chunk in batched predict.
+
+        Args:
+            batch_size (int): The number of images.
+            num_ensembles (int): The number of ensemble shifts.
+
+        Returns:
+            int | None: The number of queries. None means all of them.
+        """
+        if self.eval_memory is None:
+            return self.eval_bsize
+        in_dim = self.imnet_in_dim
+        hidden_dim = max([
+            m.out_features
+            for m in self.imnet.modules() if isinstance(m, nn.Linear)
+        ] + [in_dim])
+        # the gathered features, the inputs of imnet and two live hidden
+        # activations of each query and ensemble shift, in float32
+        bytes_per_query = num_ensembles * batch_size * 4 * (2 * in_dim +
+                                                            2 * hidden_dim)
+        return max(1, self.eval_memory // bytes_per_query)
+
+    def query_plan(self, feature, plan):
+        """Query the prepared feature with a query plan in chunks.
+
+        Args:
+            feature (dict): The prepared feature, see
+                :meth:`prepare_feature`.
+            plan (dict): The query plan, see :meth:`get_query_plan`.
+
+        Returns:
+            Tensor: Output with shape (n, q, c).
+        """
+        feat = feature['feat']
+        n = feature['batch_size']
+        h, w = feature['size']
+        e, _, q = plan['index'].shape
+        offset = torch.arange(n, device=feat.device).view(1, n, 1) * (h * w)
+        chunk_size = self.get_chunk_size(n, e) or q
+
+        preds = []
+        for left in range(0, q, chunk_size):
+            right = min(left + chunk_size, q)
+            index = plan['index'][:, :, left:right] + offset
+            inputs = plan['inputs'][:, :,
+                                    left:right].expand(e, n, right - left, -1)
+            mid_tensor = torch.cat([
+                feat.index_select(0, index.reshape(-1)),
+                inputs.reshape(index.numel(), -1).to(feat)
+            ],
+                                   dim=-1)
+            # all the ensemble shifts are queried in one pass of imnet
+            pred = self.imnet(mid_tensor).view(e, n, right - left, -1)
+            weight = plan['weight'][:, :, left:right, None].to(pred)
+            preds.append((pred * weight).sum(dim=0))
+        return torch.cat(preds, dim=1)
+
+    def query_grid(self, feature, size):
+        """Query the prepared feature on a regular output grid.
+
+        The query plan of each combination of feature size and output size
+        is cached, so repeated queries of the same size skip the lookups.
+
+        Args:
+            feature (dict): The prepared feature, see :meth:`encode`.
+            size (tuple[int]): Output size (h, w).
+
+        Returns:
+            Tensor: Output with shape (n, h * w, c).
+        """
+        size = tuple(int(s) for s in size)
+        device = feature['feat'].device
+        key = (feature['size'], size, device)
+        if key in self._plan_cache:
+            self._plan_cache.move_to_end(key)
+            plan = self._plan_cache[key]
+        else:
+            coord = make_coord(size).to(device).unsqueeze(0)
+            cell = torch.ones_like(coord)
+            cell[..., 0] *= 2 / size[0]
+            cell[..., 1] *= 2 / size[1]
+            plan = self.get_query_plan(feature['size'], coord, cell)
+            if self.plan_cache_size > 0:
+                self._plan_cache[key] = plan
+                while len(self._plan_cache) > self.plan_cache_size:
+                    self._plan_cache.popitem(last=False)
+        return self.query_plan(feature, plan)
+
     @abstractmethod
     def gen_feature(self, x):
         """Generate feature.
@@ -219,6 +435,12 @@ class LIIFEDSRNet(LIIFNet):
         feat_unfold (bool): Whether to use feature unfold. Default: True.
         cell_decode (bool): Whether to use cell decode. Default: True.
         eval_bsize (int): Size of batched predict. Default: None.
+        eval_memory (int): Memory cap in bytes of each chunk in batched
+            predict. Default: None.
+        feature_cache_size (int): The maximum number of cached encoded
+            features. Default: 4.
+        plan_cache_size (int): The maximum number of cached query plans.
+            Default: 8.
     """
 
     def __init__(self,
@@ -227,14 +449,20 @@ class LIIFEDSRNet(LIIFNet):
                  local_ensemble=True,
                  feat_unfold=True,
                  cell_decode=True,
-                 eval_bsize=None):
+                 eval_bsize=None,
+                 eval_memory=None,
+                 feature_cache_size=4,
+                 plan_cache_size=8):
         super().__init__(
             encoder=encoder,
             imnet=imnet,
             local_ensemble=local_ensemble,
             feat_unfold=feat_unfold,
             cell_decode=cell_decode,
-            eval_bsize=eval_bsize)
+            eval_bsize=eval_bsize,
+            eval_memory=eval_memory,
+            feature_cache_size=feature_cache_size,
+            plan_cache_size=plan_cache_size)
 
         self.conv_first = self.encoder.conv_first
         self.body = self.encoder.body
@@ -273,6 +501,12 @@ class LIIFRDNNet(LIIFNet):
         feat_unfold (bool): Whether to use feat unfold. Default: True.
         cell_decode (bool): Whether to use cell decode. Default: True.
         eval_bsize (int): Size of batched predict. Default: None.
+        eval_memory (int): Memory cap in bytes of each chunk in batched
+            predict. Default: None.
+        feature_cache_size (int): The maximum number of cached encoded
+            features. Default: 4.
+        plan_cache_size (int): The maximum number of cached query plans.
+            Default: 8.
     """
 
     def __init__(self,
@@ -281,14 +515,20 @@ class LIIFRDNNet(LIIFNet):
                  local_ensemble=True,
                  feat_unfold=True,
                  cell_decode=True,
-                 eval_bsize=None):
+                 eval_bsize=None,
+                 eval_memory=None,
+                 feature_cache_size=4,
+                 plan_cache_size=8):
         super().__init__(
             encoder=encoder,
             imnet=imnet,
             local_ensemble=local_ensemble,
             feat_unfold=feat_unfold,
             cell_decode=cell_decode,
-            eval_bsize=eval_bsize)
+            eval_bsize=eval_bsize,
+            eval_memory=eval_memory,
+            feature_cache_size=feature_cache_size,
+            plan_cache_size=plan_cache_size)
 
         self.sfe1 = self.encoder.sfe1
         self.sfe2 = self.encoder.sfe2
@@ -1,7 +1,8 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import inspect
 import os.path as osp
-from typing import Dict, List, Optional, Union
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Union
 
 import torch
 from mmengine.logging import MMLogger
@@ -31,6 +32,11 @@ class StableDiffusion(BaseModel):
         requires_safety_checker(bool):
             whether to run safety checker after image generated.
         unet_sample_size(int): sampel size for unet.
+        prompt_cache_size(int): The maximum number of text embeddings kept
+            in the LRU cache, keyed by tokenized prompt. The embedding of a
+            prompt, including the empty prompt used for classifier free
+            guidance, is only computed by the text encoder once while it
+            stays in the cache. 0 disables the cache. Defaults to 32.
     """
 
     def __init__(self,
@@ -39,6 +45,7 @@ class StableDiffusion(BaseModel):
                  vae,
                  requires_safety_checker=True,
                  unet_sample_size=64,
+                 prompt_cache_size=32,
                  init_cfg=None):
         super().__init__()
 
@@ -61,6 +68,9 @@ class StableDiffusion(BaseModel):
         self.vae = AutoencoderKL(**vae) if isinstance(vae, dict) else vae
         self.vae_scale_factor = 2**(len(self.vae.block_out_channels) - 1)
 
+        self.prompt_cache_size = prompt_cache_size
+        self._prompt_cache = OrderedDict()
+
         self.init_cfg = init_cfg
         self.init_weights()
 
@@ -105,6 +115,7 @@ class StableDiffusion(BaseModel):
             if isinstance(module, torch.nn.Module):
                 module.to(torch_device)
         self.device = torch.device(torch_device)
+        self._prompt_cache.clear()
         return self
 
     @torch.no_grad()
@@ -120,7 +131,8 @@ class StableDiffusion(BaseModel):
               generator: Optional[torch.Generator] = None,
               latents: Optional[torch.FloatTensor] = None,
               show_progress=True,
-              seed=1):
+              seed=1,
+              tiled_vae: bool = False):
         """Function invoked when calling the pipeline for generation.
 
         Args:
@@ -160,6 +172,10 @@ class StableDiffusion(BaseModel):
                 with different prompts.
                 If not provided, a latents tensor will be
                 generated by sampling using the supplied random `generator`.
+            tiled_vae (`bool`, *optional*, defaults to `False`):
+                Whether to decode the latents tile by tile, which bounds the
+                memory of the VAE for high resolution images, see
+                :class:`AutoencoderKL`.
 
         Returns:
             dict:['samples', 'nsfw_content_detected']:
@@ -192,8 +208,7 @@ class StableDiffusion(BaseModel):
                                               negative_prompt)
 
         # 4. Prepare timesteps
-        # self.scheduler.set_timesteps(num_inference_steps, device=device)
-        self.scheduler.set_timesteps(num_inference_steps)
+        self.scheduler.set_timesteps(num_inference_steps, device=device)
         timesteps = self.scheduler.timesteps
 
         # 5. Prepare latent variables
@@ -214,14 +229,156 @@ class StableDiffusion(BaseModel):
         extra_step_kwargs = self.prepare_extra_step_kwargs(generator, eta)
 
         # 7. Denoising loop
+        latents = self._denoise(latents, text_embeddings, timesteps,
+                                guidance_scale, extra_step_kwargs,
+                                show_progress)
+
+        # 8. Post-processing
+        image = self.decode_latents(latents, tiled=tiled_vae)
+
+        # 9. Run safety checker
+        image, has_nsfw_concept = self.run_safety_checker(
+            image, device, text_embeddings.dtype)
+        image = image[0].permute([2, 0, 1])
+
+        return {'samples': image, 'nsfw_content_detected': has_nsfw_concept}
+
+    @torch.no_grad()
+    def infer_batch(self,
+                    prompts: List[str],
+                    height: Optional[int] = None,
+                    width: Optional[int] = None,
+                    num_inference_steps: int = 50,
+                    guidance_scale: Union[float, Sequence[float]] = 7.5,
+                    negative_prompts: Optional[List[Optional[str]]] = None,
+                    eta: float = 0.0,
+                    seeds: Optional[Sequence[Optional[int]]] = None,
+                    show_progress=False,
+                    tiled_vae: bool = False):
+        """Generate images for a batch of independent requests with one UNet
+        batch per denoising step. Unlike :meth:`infer`, each request has its
+        own guidance scale, negative prompt and seed, and all images are
+        returned.
+
+        Args:
+            prompts (List[str]): The prompt of each request.
+            height (int, optional): The height in pixels of the generated
+                images. Defaults to None.
+            width (int, optional): The width in pixels of the generated
+                images. Defaults to None.
+            num_inference_steps (int): The number of denoising steps.
+                Defaults to 50.
+            guidance_scale (float | Sequence[float]): The guidance scale
+                shared by all requests or of each request. Defaults to 7.5.
+            negative_prompts (List[str | None], optional): The negative
+                prompt of each request. None means the empty prompt.
+                Defaults to None.
+            eta (float): Corresponds to parameter eta (η) in the DDIM paper.
+                Defaults to 0.0.
+            seeds (Sequence[int | None], optional): The seed of the initial
+                latents of each request. With the same seed, a request gives
+                the same initial latents no matter how it is batched. None
+                means using the global random state. Defaults to None.
+            show_progress (bool): Whether to show the progress bar. Defaults
+                to False.
+            tiled_vae (bool): Whether to decode the latents tile by tile,
+                see :class:`AutoencoderKL`. Defaults to False.
+
+        Returns:
+            dict:['samples', 'nsfw_content_detected']:
+                'samples': image samples in shape (n, 3, h, w).
+                'nsfw_content_detected': nsfw content flags for image samples.
+        """
+        height = height or self.unet_sample_size * self.vae_scale_factor
+        width = width or self.unet_sample_size * self.vae_scale_factor
+        self.check_inputs(prompts, height, width)
+        batch_size = len(prompts)
+        device = self.device
+
+        if not isinstance(guidance_scale, Sequence):
+            guidance_scale = [guidance_scale] * batch_size
+        if negative_prompts is None:
+            negative_prompts = [None] * batch_size
+        if seeds is None:
+            seeds = [None] * batch_size
+        assert len(guidance_scale) == len(negative_prompts) == len(
+            seeds) == batch_size, (
+                'The numbers of guidance scales, negative prompts and seeds '
+                'should be the same as the number of prompts.')
+
+        text_embeddings = self._encode_text(prompts, device)
+        do_classifier_free_guidance = max(guidance_scale) > 1.0
+        if do_classifier_free_guidance:
+            uncond_embeddings = self._encode_text(
+                ['' if neg is None else neg for neg in negative_prompts],
+                device)
+            text_embeddings = torch.cat([uncond_embeddings, text_embeddings])
+            guidance_scale = torch.tensor(
+                guidance_scale, dtype=text_embeddings.dtype,
+                device=device).view(-1, 1, 1, 1)
+
+        self.scheduler.set_timesteps(num_inference_steps, device=device)
+        timesteps = self.scheduler.timesteps
+
+        num_channels_latents = self.unet.in_channels
+        shape = (num_channels_latents, height // self.vae_scale_factor,
+                 width // self.vae_scale_factor)
+        latents = []
+        for seed in seeds:
+            generator = None
+            if seed is not None:
+                generator = torch.Generator().manual_seed(seed)
+            latents.append(torch.randn(shape, generator=generator))
+        latents = self.prepare_latents(
+            batch_size,
+            num_channels_latents,
+            height,
+            width,
+            text_embeddings.dtype,
+            device,
+            None,
+            torch.stack(latents).to(text_embeddings.dtype),
+        )
+
+        extra_step_kwargs = self.prepare_extra_step_kwargs(None, eta)
+        latents = self._denoise(latents, text_embeddings, timesteps,
+                                guidance_scale, extra_step_kwargs,
+                                show_progress)
+
+        image = self.decode_latents(latents, tiled=tiled_vae)
+        image, has_nsfw_concept = self.run_safety_checker(
+            image, device, text_embeddings.dtype)
+        image = image.permute([0, 3, 1, 2])
+
+        return {'samples': image, 'nsfw_content_detected': has_nsfw_concept}
+
+    def _denoise(self, latents, text_embeddings, timesteps, guidance_scale,
+                 extra_step_kwargs, show_progress):
+        """Run the denoising loop.
+
+        Args:
+            latents (torch.Tensor): The initial latents in shape (n, c, h, w).
+            text_embeddings (torch.Tensor): The text embeddings. If its batch
+                size is twice of the latents, the first half is the
+                unconditional embeddings and classifier free guidance is
+                performed.
+            timesteps (np.ndarray): The timesteps to run.
+            guidance_scale (float | torch.Tensor): The guidance scale, a
+                float or a tensor in shape (n, 1, 1, 1).
+            extra_step_kwargs (dict): Extra kwargs of the scheduler step.
+            show_progress (bool): Whether to show the progress bar.
+
+        Returns:
+            torch.Tensor: The denoised latents.
+        """
+        do_classifier_free_guidance = \
+            text_embeddings.shape[0] == 2 * latents.shape[0]
         if show_progress:
             timesteps = tqdm(timesteps)
-        for i, t in enumerate(timesteps):
+        for t in timesteps:
             # expand the latents if we are doing classifier free guidance
             latent_model_input = torch.cat(
                 [latents] * 2) if do_classifier_free_guidance else latents
-            # latent_model_input = \
-            # self.scheduler.scale_model_input(latent_model_input, t)
 
             # predict the noise residual
             noise_pred = self.unet(
@@ -234,19 +391,84 @@ class StableDiffusion(BaseModel):
                 noise_pred = noise_pred_uncond + guidance_scale * (
                     noise_pred_text - noise_pred_uncond)
 
-                # compute the previous noisy sample x_t -> x_t-1
-                latents = self.scheduler.step(
-                    noise_pred, t, latents, **extra_step_kwargs)['prev_sample']
+            # compute the previous noisy sample x_t -> x_t-1
+            latents = self.scheduler.step(noise_pred, t, latents,
+                                          **extra_step_kwargs)['prev_sample']
+        return latents
 
-        # 8. Post-processing
-        image = self.decode_latents(latents)
+    def _encode_text(self, prompts: List[str],
+                     device: torch.device) -> torch.Tensor:
+        """Encode prompts into text encoder hidden states. Duplicated prompts
+        are encoded once, and the embeddings are looked up in the LRU cache
+        by tokenized prompt, so only prompts not in the cache are passed to
+        the text encoder, in a single batch.
 
-        # 9. Run safety checker
-        image, has_nsfw_concept = self.run_safety_checker(
-            image, device, text_embeddings.dtype)
-        image = image[0].permute([2, 0, 1])
+        Args:
+            prompts (List[str]): The prompts to be encoded.
+            device (torch.device): torch device.
 
-        return {'samples': image, 'nsfw_content_detected': has_nsfw_concept}
+        Returns:
+            torch.Tensor: The text embeddings in shape (n, seq_len, c).
+        """
+        unique_prompts = list(dict.fromkeys(prompts))
+        text_inputs = self.tokenizer(
+            unique_prompts,
+            padding='max_length',
+            max_length=self.tokenizer.model_max_length,
+            truncation=True,
+            return_tensors='pt',
+        )
+        text_input_ids = text_inputs.input_ids
+        keys = [tuple(ids.tolist()) for ids in text_input_ids]
+
+        embeddings = dict()
+        missing = []
+        for idx, key in enumerate(keys):
+            if key in self._prompt_cache:
+                self._prompt_cache.move_to_end(key)
+                embeddings[key] = self._prompt_cache[key]
+            elif key not in embeddings:
+                embeddings[key] = None
+                missing.append(idx)
+
+        if missing:
+            missing_prompts = [unique_prompts[idx] for idx in missing]
+            text_input_ids = text_input_ids[missing]
+            untruncated_ids = self.tokenizer(
+                missing_prompts, padding='max_length',
+                return_tensors='pt').input_ids
+            if not torch.equal(text_input_ids, untruncated_ids):
+                removed_text = self.tokenizer.batch_decode(
+                    untruncated_ids[:, self.tokenizer.model_max_length - 1:-1])
+                logger.warning(
+                    'The following part of your input was truncated because '
+                    'CLIP can only handle sequences up to'
+                    f' {self.tokenizer.model_max_length} tokens: '
+                    f'{removed_text}')
+
+            if hasattr(self.text_encoder.config, 'use_attention_mask'
+                       ) and self.text_encoder.config.use_attention_mask:
+                attention_mask = text_inputs.attention_mask[missing].to(device)
+            else:
+                attention_mask = None
+
+            text_embeddings = self.text_encoder(
+                text_input_ids.to(device),
+                attention_mask=attention_mask,
+            )[0]
+            for idx, embedding in zip(missing, text_embeddings):
+                # clone so that a cached row does not keep the whole batch
+                embeddings[keys[idx]] = embedding.clone()
+
+            if self.prompt_cache_size > 0:
+                for idx in missing:
+                    self._prompt_cache[keys[idx]] = embeddings[keys[idx]]
+                while len(self._prompt_cache) > self.prompt_cache_size:
+                    self._prompt_cache.popitem(last=False)
+
+        key_of_prompt = dict(zip(unique_prompts, keys))
+        return torch.stack(
+            [embeddings[key_of_prompt[prompt]] for prompt in prompts])
 
     def _encode_prompt(self, prompt, device, num_images_per_prompt,
                        do_classifier_free_guidance, negative_prompt):
@@ -272,42 +494,12 @@ class StableDiffusion(BaseModel):
         """
         batch_size = len(prompt) if isinstance(prompt, list) else 1
 
-        text_inputs = self.tokenizer(
-            prompt,
-            padding='max_length',
-            max_length=self.tokenizer.model_max_length,
-            truncation=True,
-            return_tensors='pt',
-        )
-        text_input_ids = text_inputs.input_ids
-        untruncated_ids = self.tokenizer(
-            prompt, padding='max_length', return_tensors='pt').input_ids
-
-        if not torch.equal(text_input_ids, untruncated_ids):
-            removed_text = self.tokenizer.batch_decode(
-                untruncated_ids[:, self.tokenizer.model_max_length - 1:-1])
-            logger.warning(
-                'The following part of your input was truncated because CLIP'
-                ' can only handle sequences up to'
-                f' {self.tokenizer.model_max_length} tokens: {removed_text}')
-
-        if hasattr(self.text_encoder.config, 'use_attention_mask'
-                   ) and self.text_encoder.config.use_attention_mask:
-            attention_mask = text_inputs.attention_mask.to(device)
-        else:
-            attention_mask = None
-
-        text_embeddings = self.text_encoder(
-            text_input_ids.to(device),
-            attention_mask=attention_mask,
-        )
-        text_embeddings = text_embeddings[0]
+        text_embeddings = self._encode_text(
+            prompt if isinstance(prompt, list) else [prompt], device)
 
         # duplicate text embeddings for each generation per prompt,
-        bs_embed, seq_len, _ = text_embeddings.shape
-        text_embeddings = text_embeddings.repeat(1, num_images_per_prompt, 1)
-        text_embeddings = text_embeddings.view(
-            bs_embed * num_images_per_prompt, seq_len, -1)
+        text_embeddings = text_embeddings.repeat_interleave(
+            num_images_per_prompt, dim=0)
 
         # get unconditional embeddings for classifier free guidance
         if do_classifier_free_guidance:
@@ -331,34 +523,12 @@ class StableDiffusion(BaseModel):
             else:
                 uncond_tokens = negative_prompt
 
-            max_length = text_input_ids.shape[-1]
-            uncond_input = self.tokenizer(
-                uncond_tokens,
-                padding='max_length',
-                max_length=max_length,
-                truncation=True,
-                return_tensors='pt',
-            )
-
-            if hasattr(self.text_encoder.config, 'use_attention_mask'
-                       ) and self.text_encoder.config.use_attention_mask:
-                attention_mask = uncond_input.attention_mask.to(device)
-            else:
-                attention_mask = None
-
-            uncond_embeddings = self.text_encoder(
-                uncond_input.input_ids.to(device),
-                attention_mask=attention_mask,
-            )
-            uncond_embeddings = uncond_embeddings[0]
+            uncond_embeddings = self._encode_text(uncond_tokens, device)
 
             # duplicate unconditional embeddings for
-            # each generation per prompt, using mps friendly method
-            seq_len = uncond_embeddings.shape[1]
-            uncond_embeddings = uncond_embeddings.repeat(
-                1, num_images_per_prompt, 1)
-            uncond_embeddings = uncond_embeddings.view(
-                batch_size * num_images_per_prompt, seq_len, -1)
+            # each generation per prompt
+            uncond_embeddings = uncond_embeddings.repeat_interleave(
+                num_images_per_prompt, dim=0)
 
             # For classifier free guidance, we need to do two forward passes.
             # Here we concatenate the unconditional
@@ -395,17 +565,19 @@ class StableDiffusion(BaseModel):
             has_nsfw_concept = None
         return image, has_nsfw_concept
 
-    def decode_latents(self, latents):
+    def decode_latents(self, latents, tiled=False):
         """use vae to decode latents.
 
         Args:
             latents (torch.Tensor): latents to decode.
+            tiled (bool): Whether to decode the latents tile by tile,
+                see :class:`AutoencoderKL`. Defaults to False.
 
         Returns:
             image (numpy.ndarray): image result.
         """
         latents = 1 / 0.18215 * latents
-        image = self.vae.decode(latents).sample
+        image = self.vae.decode(latents, tiled=tiled).sample
         image = (image / 2 + 0.5).clamp(0, 1)
         # we always cast to float32 as this does not cause
         # significant overhead and is compatible with bfloa16
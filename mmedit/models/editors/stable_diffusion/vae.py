@@ -1,6 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import math
-from typing import Optional, Tuple, Union
+from typing import Callable, Optional, Tuple, Union
 
 import mmengine
 import numpy as np
@@ -879,6 +879,16 @@ class AutoencoderKL(nn.Module):
     from the paper Auto-Encoding Variational Bayes by Diederik P. Kingma
     and Max Welling.
 
+    ``encode`` and ``decode`` can run the networks layer by layer and tile by
+    tile with ``tiled=True``. Each convolution computes a tile from the input
+    window it depends on, the statistics of GroupNorm are accumulated over
+    all the tiles before normalizing, and the queries of the attention are
+    chunked by tiles while attending to all the positions. Therefore the
+    outputs are the same as the untiled ones up to floating point errors.
+    The convolution and attention workspaces are bounded by the tile size,
+    while the full-size activations between the layers are kept on the
+    device of the inputs, e.g., on CPU for CPU inputs and a model on GPU.
+
     Args:
         in_channels (int, *optional*, defaults to 3):
             Number of channels in the input image.
@@ -897,6 +907,9 @@ class AutoencoderKL(nn.Module):
             Number of channels in the latent space.
         sample_size (`int`, *optional*, defaults to `32`):
             sample size is now not supported.
+        tile_latent_size (int): Size of the tiles at the resolution of the
+            latents used by tiled encoding and decoding. Tiles at higher
+            resolutions are larger by the same factor. Defaults to 64.
     """
 
     def __init__(
@@ -911,10 +924,12 @@ class AutoencoderKL(nn.Module):
         latent_channels: int = 4,
         norm_num_groups: int = 32,
         sample_size: int = 32,
+        tile_latent_size: int = 64,
     ):
         super().__init__()
 
         self.block_out_channels = block_out_channels
+        self.tile_latent_size = tile_latent_size
 
         # pass init params to Encoder
         self.encoder = Encoder(
@@ -944,10 +959,294 @@ class AutoencoderKL(nn.Module):
         self.post_quant_conv = torch.nn.Conv2d(latent_channels,
                                                latent_channels, 1)
 
-    def encode(self, x: torch.FloatTensor, return_dict: bool = True) -> Dict:
-        """encode input."""
-        h = self.encoder(x)
-        moments = self.quant_conv(h)
+    def _tile_slices(self, h: int, w: int, tile_size: int):
+        """Yield the slices of non-overlapping tiles covering (h, w)."""
+        for y in range(0, h, tile_size):
+            rows = slice(y, min(y + tile_size, h))
+            for x in range(0, w, tile_size):
+                yield ..., rows, slice(x, min(x + tile_size, w))
+
+    def _gather(self,
+                inputs: torch.Tensor,
+                rows: Tuple[int, int],
+                cols: Tuple[int, int],
+                pre: Optional[Callable] = None,
+                upsample: bool = False) -> torch.Tensor:
+        """Gather a window of ``pre(inputs)`` on the device of the model.
+
+        Args:
+            inputs (torch.Tensor): The full-size inputs.
+            rows (Tuple[int, int]): The range of rows of the window, which may
+                exceed the inputs and is filled with zeros there.
+            cols (Tuple[int, int]): The range of columns of the window.
+            pre (Callable, optional): Pointwise function applied to the
+                window. Defaults to None.
+            upsample (bool): Whether the window is taken from the inputs
+                upsampled by 2 with nearest interpolation, and ``rows`` and
+                ``cols`` are in upsampled coordinates. Defaults to False.
+
+        Returns:
+            torch.Tensor: The window.
+        """
+        scale = 2 if upsample else 1
+        h, w = inputs.shape[-2] * scale, inputs.shape[-1] * scale
+        y0, y1 = max(rows[0], 0), min(rows[1], h)
+        x0, x1 = max(cols[0], 0), min(cols[1], w)
+        window = inputs[..., y0 // scale:(y1 - 1) // scale + 1,
+                        x0 // scale:(x1 - 1) // scale + 1]
+        window = window.to(self.quant_conv.weight.device)
+        if pre is not None:
+            window = pre(window)
+        if upsample:
+            window = F.interpolate(window, scale_factor=2.0, mode='nearest')
+            window = window[..., y0 % 2:y0 % 2 + y1 - y0,
+                            x0 % 2:x0 % 2 + x1 - x0]
+        return F.pad(window,
+                     (x0 - cols[0], cols[1] - x1, y0 - rows[0], rows[1] - y1))
+
+    def _tiled_conv(self,
+                    conv: nn.Conv2d,
+                    inputs: torch.Tensor,
+                    tile_size: int,
+                    pre: Optional[Callable] = None,
+                    upsample: bool = False,
+                    pad: Optional[Tuple[int]] = None) -> torch.Tensor:
+        """Apply ``conv`` to ``pre(inputs)`` tile by tile.
+
+        Each output tile is computed from the input window it depends on, so
+        the outputs are the same as the untiled convolution.
+
+        Args:
+            conv (nn.Conv2d): The convolution.
+            inputs (torch.Tensor): The full-size inputs.
+            tile_size (int): Size of the output tiles.
+            pre (Callable, optional): Pointwise function applied to the
+                inputs before the convolution. Defaults to None.
+            upsample (bool): Whether the inputs are upsampled by 2 with
+                nearest interpolation before the convolution, as
+                :class:`Upsample2D` does. Defaults to False.
+            pad (Tuple[int], optional): Zero padding of the inputs in the
+                order of ``F.pad``. If None, ``conv.padding`` is used.
+                Defaults to None.
+
+        Returns:
+            torch.Tensor: The outputs, on the device of ``inputs``.
+        """
+        n, _, h, w = inputs.shape
+        if upsample:
+            h, w = h * 2, w * 2
+        if pad is None:
+            pad = (conv.padding[1], conv.padding[1], conv.padding[0],
+                   conv.padding[0])
+        kernel_h, kernel_w = conv.kernel_size
+        stride_h, stride_w = conv.stride
+        out_h = (h + pad[2] + pad[3] - kernel_h) // stride_h + 1
+        out_w = (w + pad[0] + pad[1] - kernel_w) // stride_w + 1
+
+        output = inputs.new_empty(n, conv.out_channels, out_h, out_w)
+        for slices in self._tile_slices(out_h, out_w, tile_size):
+            y, x = slices[1], slices[2]
+            rows = (y.start * stride_h - pad[2],
+                    (y.stop - 1) * stride_h - pad[2] + kernel_h)
+            cols = (x.start * stride_w - pad[0],
+                    (x.stop - 1) * stride_w - pad[0] + kernel_w)
+            window = self._gather(inputs, rows, cols, pre, upsample)
+            output[slices] = F.conv2d(window, conv.weight, conv.bias,
+                                      conv.stride, 0, conv.dilation,
+                                      conv.groups)
+        return output
+
+    def _tiled_group_norm(self,
+                          norm: nn.GroupNorm,
+                          inputs: torch.Tensor,
+                          tile_size: int,
+                          act: Optional[Callable] = None) -> Callable:
+        """Compute the statistics of ``norm`` over the whole inputs tile by
+        tile, and return a pointwise function that normalizes the tiles with
+        them.
+
+        Args:
+            norm (nn.GroupNorm): The normalization layer.
+            inputs (torch.Tensor): The full-size inputs.
+            tile_size (int): Size of the tiles.
+            act (Callable, optional): Activation applied after the
+                normalization. Defaults to None.
+
+        Returns:
+            Callable: The function applied to tiles of the inputs.
+        """
+        n, c, h, w = inputs.shape
+        groups = norm.num_groups
+        device = self.quant_conv.weight.device
+        raw_sum = torch.zeros(n, groups, dtype=torch.float64, device=device)
+        raw_sq_sum = torch.zeros_like(raw_sum)
+        for slices in self._tile_slices(h, w, tile_size):
+            tile = inputs[slices].to(device=device, dtype=torch.float64)
+            tile = tile.reshape(n, groups, -1)
+            raw_sum += tile.sum(dim=-1)
+            raw_sq_sum += (tile**2).sum(dim=-1)
+        count = c // groups * h * w
+        mean = raw_sum / count
+        var = (raw_sq_sum / count - mean**2).clamp(min=0)
+
+        # fold the statistics and the affine parameters into scale and shift
+        scale = (var + norm.eps).rsqrt().repeat_interleave(c // groups, dim=1)
+        mean = mean.repeat_interleave(c // groups, dim=1)
+        if norm.affine:
+            scale = scale * norm.weight.double()
+            shift = norm.bias.double() - mean * scale
+        else:
+            shift = -mean * scale
+        scale = scale[..., None, None].to(inputs.dtype)
+        shift = shift[..., None, None].to(inputs.dtype)
+
+        def _norm(x):
+            x = x * scale + shift
+            return x if act is None else act(x)
+
+        return _norm
+
+    def _tiled_resnet(self, resnet: ResnetBlock2D, inputs: torch.Tensor,
+                      tile_size: int) -> torch.Tensor:
+        """Forward a :class:`ResnetBlock2D` without time embedding tile by
+        tile."""
+        pre = self._tiled_group_norm(resnet.norm1, inputs, tile_size,
+                                     resnet.nonlinearity)
+        hidden_states = self._tiled_conv(resnet.conv1, inputs, tile_size, pre)
+        pre = self._tiled_group_norm(
+            resnet.norm2, hidden_states, tile_size,
+            lambda x: resnet.dropout(resnet.nonlinearity(x)))
+        hidden_states = self._tiled_conv(resnet.conv2, hidden_states,
+                                         tile_size, pre)
+
+        device = self.quant_conv.weight.device
+        for slices in self._tile_slices(*inputs.shape[-2:], tile_size):
+            input_tensor = inputs[slices].to(device)
+            if resnet.conv_shortcut is not None:
+                input_tensor = resnet.conv_shortcut(input_tensor)
+            output_tensor = input_tensor + hidden_states[slices].to(device)
+            hidden_states[slices] = output_tensor / resnet.output_scale_factor
+        return hidden_states
+
+    def _tiled_attention(self, attn: AttentionBlock, inputs: torch.Tensor,
+                         tile_size: int) -> torch.Tensor:
+        """Forward an :class:`AttentionBlock` with the queries of one tile at
+        a time, each attending to all the positions."""
+        n, c, h, w = inputs.shape
+        norm = self._tiled_group_norm(attn.group_norm, inputs, tile_size)
+        device = self.quant_conv.weight.device
+
+        def _tokens(slices):
+            tile = norm(inputs[slices].to(device))
+            return tile.reshape(n, c, -1).transpose(1, 2)
+
+        keys, values = [], []
+        for slices in self._tile_slices(h, w, tile_size):
+            tokens = _tokens(slices)
+            keys.append(attn.key(tokens))
+            values.append(attn.value(tokens))
+        key_states = torch.cat(keys, dim=1)
+        value_states = torch.cat(values, dim=1)
+        if attn.num_heads > 1:
+            key_states = attn.transpose_for_scores(key_states)
+            value_states = attn.transpose_for_scores(value_states)
+        scale = 1 / math.sqrt(attn.channels / attn.num_heads)
+
+        output = torch.empty_like(inputs)
+        for slices in self._tile_slices(h, w, tile_size):
+            query_states = attn.query(_tokens(slices))
+            if attn.num_heads > 1:
+                query_states = attn.transpose_for_scores(query_states)
+            attention_scores = torch.matmul(
+                query_states, key_states.transpose(-1, -2)) * scale
+            attention_probs = torch.softmax(
+                attention_scores.float(), dim=-1).type(attention_scores.dtype)
+            hidden_states = torch.matmul(attention_probs, value_states)
+            if attn.num_heads > 1:
+                hidden_states = hidden_states.permute(0, 2, 1, 3)
+                hidden_states = hidden_states.reshape(n, -1, c)
+
+            tile_h = slices[1].stop - slices[1].start
+            tile_w = slices[2].stop - slices[2].start
+            hidden_states = attn.proj_attn(hidden_states).transpose(
+                -1, -2).reshape(n, c, tile_h, tile_w)
+            hidden_states = hidden_states + inputs[slices].to(device)
+            output[slices] = hidden_states / attn.rescale_output_factor
+        return output
+
+    def _tiled_mid_block(self, mid_block: UNetMidBlock2D, inputs: torch.Tensor,
+                         tile_size: int) -> torch.Tensor:
+        """Forward a :class:`UNetMidBlock2D` tile by tile."""
+        hidden_states = self._tiled_resnet(mid_block.resnets[0], inputs,
+                                           tile_size)
+        for attn, resnet in zip(mid_block.attentions, mid_block.resnets[1:]):
+            hidden_states = self._tiled_attention(attn, hidden_states,
+                                                  tile_size)
+            hidden_states = self._tiled_resnet(resnet, hidden_states,
+                                               tile_size)
+        return hidden_states
+
+    def _tiled_encode(self, x: torch.Tensor) -> torch.Tensor:
+        """Tiled version of ``self.quant_conv(self.encoder(x))``."""
+        encoder = self.encoder
+        tile_size = self.tile_latent_size * 2**(
+            len(self.block_out_channels) - 1)
+
+        sample = self._tiled_conv(encoder.conv_in, x, tile_size)
+        for down_block in encoder.down_blocks:
+            for resnet in down_block.resnets:
+                sample = self._tiled_resnet(resnet, sample, tile_size)
+            for downsampler in down_block.downsamplers or []:
+                tile_size = max(tile_size // 2, 1)
+                pad = (0, 1, 0, 1) if downsampler.padding == 0 else None
+                sample = self._tiled_conv(
+                    downsampler.conv, sample, tile_size, pad=pad)
+
+        sample = self._tiled_mid_block(encoder.mid_block, sample, tile_size)
+        pre = self._tiled_group_norm(encoder.conv_norm_out, sample, tile_size,
+                                     encoder.conv_act)
+        sample = self._tiled_conv(encoder.conv_out, sample, tile_size, pre)
+        return self._tiled_conv(self.quant_conv, sample, tile_size)
+
+    def _tiled_decode(self, z: torch.Tensor) -> torch.Tensor:
+        """Tiled version of ``self.decoder(self.post_quant_conv(z))``."""
+        decoder = self.decoder
+        tile_size = self.tile_latent_size
+
+        z = self._tiled_conv(self.post_quant_conv, z, tile_size)
+        sample = self._tiled_conv(decoder.conv_in, z, tile_size)
+        sample = self._tiled_mid_block(decoder.mid_block, sample, tile_size)
+        for up_block in decoder.up_blocks:
+            for resnet in up_block.resnets:
+                sample = self._tiled_resnet(resnet, sample, tile_size)
+            for upsampler in up_block.upsamplers or []:
+                tile_size *= 2
+                sample = self._tiled_conv(
+                    upsampler.conv, sample, tile_size, upsample=True)
+
+        pre = self._tiled_group_norm(decoder.conv_norm_out, sample, tile_size,
+                                     decoder.conv_act)
+        return self._tiled_conv(decoder.conv_out, sample, tile_size, pre)
+
+    def encode(self,
+               x: torch.FloatTensor,
+               return_dict: bool = True,
+               tiled: bool = False) -> Dict:
+        """encode input.
+
+        Args:
+            x (torch.FloatTensor): The input images.
+            return_dict (bool): Whether to return a ``Dict``. Defaults to
+                True.
+            tiled (bool): Whether to encode the images tile by tile to
+                bound the memory of high resolution images, see
+                :class:`AutoencoderKL`. Defaults to False.
+        """
+
+        if tiled:
+            moments = self._tiled_encode(x)
+        else:
+            moments = self.quant_conv(self.encoder(x))
         posterior = DiagonalGaussianDistribution(moments)
 
         if not return_dict:
@@ -955,11 +1254,25 @@ class AutoencoderKL(nn.Module):
 
         return Dict(latent_dist=posterior)
 
-    def decode(self, z: torch.FloatTensor, return_dict: bool = True) \
-            -> Union[Dict, torch.FloatTensor]:
-        """decode z."""
-        z = self.post_quant_conv(z)
-        dec = self.decoder(z)
+    def decode(self,
+               z: torch.FloatTensor,
+               return_dict: bool = True,
+               tiled: bool = False) -> Union[Dict, torch.FloatTensor]:
+        """decode z.
+
+        Args:
+            z (torch.FloatTensor): The latents.
+            return_dict (bool): Whether to return a ``Dict``. Defaults to
+                True.
+            tiled (bool): Whether to decode the latents tile by tile to
+                bound the memory of high resolution images, see
+                :class:`AutoencoderKL`. Defaults to False.
+        """
+
+        if tiled:
+            dec = self._tiled_decode(z)
+        else:
+            dec = self.decoder(self.post_quant_conv(z))
 
         if not return_dict:
             return (dec, )
@@ -1,4 +1,6 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+from collections import OrderedDict
+
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
@@ -157,6 +159,12 @@ class SwinIRNet(BaseModule):
             self.layers.append(layer)
         self.norm = norm_layer(self.num_features)
 
+        # share the attention masks of test resolutions among blocks
+        self.attn_mask_cache = OrderedDict()
+        for layer in self.layers:
+            for block in layer.residual_group.blocks:
+                block.mask_cache = self.attn_mask_cache
+
         # build the last conv layer in deep feature extraction
         if resi_connection == '1conv':
             self.conv_after_body = nn.Conv2d(embed_dim, embed_dim, 3, 1, 1)
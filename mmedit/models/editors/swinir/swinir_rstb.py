@@ -1,4 +1,5 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+from collections import OrderedDict
 
 import torch
 import torch.nn as nn
@@ -10,6 +11,18 @@ from .swinir_utils import (drop_path, to_2tuple, window_partition,
                            window_reverse)
 
 
+def _outside_inference_mode():
+    """Context manager to create normal tensors, which can be cached and
+    used out of inference mode.
+
+    ``torch.inference_mode`` is not available before PyTorch 1.9, where the
+    context manager keeps the current grad mode.
+    """
+    if hasattr(torch, 'inference_mode'):
+        return torch.inference_mode(False)
+    return torch.set_grad_enabled(torch.is_grad_enabled())
+
+
 class DropPath(nn.Module):
     """Drop paths (Stochastic Depth) per sample (when applied in main path of
     residual blocks)."""
@@ -93,6 +106,11 @@ class WindowAttention(nn.Module):
         attn_drop (float, optional): Dropout ratio of attention weight.
             Default: 0.0
         proj_drop (float, optional): Dropout ratio of output. Default: 0.0
+
+    When no gradient is required, e.g., in inference, the relative position
+    bias gathered from the table is computed once and reused. It is
+    recomputed when the table is modified in place (e.g., by an optimizer or
+    ``load_state_dict``) or moved.
     """
 
     def __init__(self,
@@ -144,6 +162,36 @@ class WindowAttention(nn.Module):
         trunc_normal_(self.relative_position_bias_table, std=.02)
         self.softmax = nn.Softmax(dim=-1)
 
+        self.cache_bias = True
+        self._bias_cache = (None, None)
+
+    def get_relative_position_bias(self):
+        """Get the relative position bias.
+
+        Returns:
+            Tensor: Relative position bias with shape (nH, Wh*Ww, Wh*Ww).
+        """
+        table = self.relative_position_bias_table
+        use_cache = self.cache_bias and not (torch.is_grad_enabled()
+                                             and table.requires_grad)
+        if use_cache:
+            # the version counter is increased by in-place modifications
+            key = (table._version, table.data_ptr(), table.dtype, table.device)
+            if self._bias_cache[0] == key:
+                return self._bias_cache[1]
+
+        with _outside_inference_mode():
+            relative_position_bias = table[self.relative_position_index.view(
+                -1)].view(self.window_size[0] * self.window_size[1],
+                          self.window_size[0] * self.window_size[1],
+                          -1)  # Wh*Ww,Wh*Ww,nH
+            relative_position_bias = relative_position_bias.permute(
+                2, 0, 1).contiguous()  # nH, Wh*Ww, Wh*Ww
+
+        if use_cache:
+            self._bias_cache = (key, relative_position_bias)
+        return relative_position_bias
+
     def forward(self, x, mask=None):
         """
         Args:
@@ -160,13 +208,7 @@ class WindowAttention(nn.Module):
         q = q * self.scale
         attn = (q @ k.transpose(-2, -1))
 
-        relative_position_bias = self.relative_position_bias_table[
-            self.relative_position_index.view(-1)].view(
-                self.window_size[0] * self.window_size[1],
-                self.window_size[0] * self.window_size[1],
-                -1)  # Wh*Ww,Wh*Ww,nH
-        relative_position_bias = relative_position_bias.permute(
-            2, 0, 1).contiguous()  # nH, Wh*Ww, Wh*Ww
+        relative_position_bias = self.get_relative_position_bias()
         attn = attn + relative_position_bias.unsqueeze(0)
 
         if mask is not None:
@@ -209,8 +251,14 @@ class SwinTransformerBlock(nn.Module):
         act_layer (nn.Module, optional): Activation layer. Default: nn.GELU
         norm_layer (nn.Module, optional): Normalization layer.
             Default: nn.LayerNorm
+
+    The attention masks of resolutions other than ``input_resolution`` are
+    kept in ``mask_cache``, an LRU cache of at most ``mask_cache_size``
+    entries, which is shared by all the blocks of :class:`SwinIRNet`.
     """
 
+    mask_cache_size = 4
+
     def __init__(self,
                  dim,
                  input_resolution,
@@ -266,6 +314,31 @@ class SwinTransformerBlock(nn.Module):
             attn_mask = None
 
         self.register_buffer('attn_mask', attn_mask)
+        self.mask_cache = OrderedDict()
+
+    def get_mask(self, x_size, device):
+        """Get the attention mask of a resolution from the cache, or
+        calculate it.
+
+        Args:
+            x_size (tuple[int]): Resolution of input feature.
+            device (torch.device): Device of the mask.
+
+        Returns:
+            Tensor: Attention mask
+        """
+        key = (tuple(x_size), self.window_size, self.shift_size, device)
+        if key in self.mask_cache:
+            self.mask_cache.move_to_end(key)
+            return self.mask_cache[key]
+
+        with _outside_inference_mode():
+            mask = self.calculate_mask(x_size).to(device)
+        if self.mask_cache_size > 0:
+            self.mask_cache[key] = mask
+            while len(self.mask_cache) > self.mask_cache_size:
+                self.mask_cache.popitem(last=False)
+        return mask
 
     def calculate_mask(self, x_size):
         # calculate attention mask for SW-MSA
@@ -335,13 +408,13 @@ class SwinTransformerBlock(nn.Module):
 
         # W-MSA/SW-MSA (to be compatible for testing on images
         # whose shapes are the multiple of window size
-        if self.input_resolution == x_size:
+        if self.input_resolution == x_size or self.shift_size == 0:
             attn_windows = self.attn(
                 x_windows,
                 mask=self.attn_mask)  # nW*B, window_size*window_size, C
         else:
             attn_windows = self.attn(
-                x_windows, mask=self.calculate_mask(x_size).to(x.device))
+                x_windows, mask=self.get_mask(x_size, x.device))
 
         # merge windows
         attn_windows = attn_windows.view(-1, self.window_size,
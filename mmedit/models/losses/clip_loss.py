@@ -5,9 +5,6 @@ import torch
 import torch.nn as nn
 
 from mmedit.registry import MODULES
-from mmedit.utils import try_import
-
-clip = try_import('clip')
 
 
 class CLIPLossModel(torch.nn.Module):
@@ -1,7 +1,9 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import math
+from typing import Dict, List, Tuple, Union
 
 import numpy as np
+import torch
 
 
 def betas_for_alpha_bar(num_diffusion_timesteps, max_beta=0.999):
@@ -21,3 +23,46 @@ def betas_for_alpha_bar(num_diffusion_timesteps, max_beta=0.999):
         t2 = (i + 1) / num_diffusion_timesteps
         betas.append(min(1 - alpha_bar(t2) / alpha_bar(t1), max_beta))
     return np.array(betas, dtype=np.float64)
+
+
+def build_coeff_table(coeffs: Dict[str, np.ndarray]
+                      ) -> Tuple[List[str], np.ndarray]:
+    """Stack per-timestep coefficients to a table, so that all coefficients of
+    a timestep can be gathered with a single indexing op.
+
+    Args:
+        coeffs (Dict[str, np.ndarray]): Coefficients of each timestep, each
+            in shape (num_timesteps, ).
+
+    Returns:
+        Tuple[List[str], np.ndarray]: The names of the coefficients and the
+        table in shape (num_timesteps, num_coeffs).
+    """
+    names = list(coeffs.keys())
+    table = np.stack([np.asarray(coeffs[name], np.float64) for name in names],
+                     axis=1)
+    return names, table
+
+
+def gather_coeffs(table: torch.Tensor, timesteps: Union[int, np.ndarray,
+                                                        torch.Tensor],
+                  ndim: int) -> Tuple[torch.Tensor, ...]:
+    """Gather the coefficients of the timesteps from a table built by
+    :func:`build_coeff_table`.
+
+    Args:
+        table (torch.Tensor): The table in shape (num_timesteps, num_coeffs).
+        timesteps (int | np.ndarray | torch.Tensor): A timestep shared by
+            all samples, or the timesteps of each sample in shape (n, ).
+        ndim (int): Dimension of the samples.
+
+    Returns:
+        Tuple[torch.Tensor, ...]: The coefficients, each is a scalar tensor or
+        in shape (n, 1, ..., 1) to broadcast with the samples.
+    """
+    timesteps = torch.as_tensor(
+        timesteps, dtype=torch.long, device=table.device)
+    coeffs = table[timesteps]
+    if timesteps.ndim > 0:
+        coeffs = coeffs.reshape(-1, *([1] * (ndim - 1)), table.shape[1])
+    return coeffs.unbind(-1)
@@ -0,0 +1,190 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from collections import defaultdict
+from typing import List, Optional, Tuple
+
+import torch
+import torch.nn as nn
+from torch import Tensor
+
+
+class MultiTensorEMA:
+    """Update the states of an EMA module in place with multi-tensor ops.
+
+    The parameters and persistent buffers (i.e., the entries of
+    ``state_dict``) of the EMA module and the source module are paired once
+    and cached. Each update then interpolates all floating point parameters
+    of the same device and dtype with a single ``torch._foreach_lerp_`` call
+    (a loop of ``lerp_`` in older PyTorch without it), instead of building
+    ``state_dict`` and updating tensors one by one.
+
+    If ``flatten`` is True, the floating point parameters of the EMA module
+    are moved to one contiguous buffer per device and dtype and become views
+    of it, so the interpolation can be done with one kernel when all of them
+    share the same momentum. The source parameters are gathered to another
+    contiguous buffer before the interpolation, which doubles the memory of
+    EMA parameters. This reduces kernel launches on GPU, while
+    ``torch._foreach_lerp_`` is usually faster on CPU.
+
+    Args:
+        ema_module (nn.Module): The EMA module to be updated.
+        src_module (nn.Module): The source module.
+        flatten (bool): Whether to keep the floating point parameters of the
+            EMA module in contiguous buffers. Defaults to False.
+        persistent_buffers_only (bool): Whether to only update the persistent
+            buffers, i.e., the buffers in ``state_dict``. Defaults to True.
+    """
+
+    def __init__(self,
+                 ema_module: nn.Module,
+                 src_module: nn.Module,
+                 flatten: bool = False,
+                 persistent_buffers_only: bool = True) -> None:
+        self.ema_module = ema_module
+        self.src_module = src_module
+        self.flatten = flatten
+
+        ema_params = dict(ema_module.named_parameters())
+        src_params = dict(src_module.named_parameters())
+        assert ema_params.keys() == src_params.keys(), (
+            'The EMA module and the source module should have the same '
+            'parameters.')
+        # parameters are cached as objects, since ``Module.to`` keeps the
+        # ``Parameter`` objects. Buffers are replaced by ``Module.to``,
+        # therefore only their names are cached
+        self.param_names = list(ema_params.keys())
+        self.ema_params = list(ema_params.values())
+        self.src_params = [src_params[name] for name in self.param_names]
+        if persistent_buffers_only:
+            self.buffer_names = [
+                name for name in ema_module.state_dict(keep_vars=True)
+                if name not in ema_params
+            ]
+        else:
+            self.buffer_names = [
+                name for name, _ in ema_module.named_buffers()
+            ]
+        self._flat_groups: List[Tuple[Tensor, Tensor, List[int]]] = []
+        if flatten:
+            self._flatten()
+
+    @staticmethod
+    def _get_buffers(module: nn.Module, names: List[str]) -> List[Tensor]:
+        buffers = []
+        for name in names:
+            # ``Module.get_submodule`` is not available in older PyTorch
+            buffer = module
+            for attr in name.split('.'):
+                buffer = getattr(buffer, attr)
+            buffers.append(buffer)
+        return buffers
+
+    def _flatten(self) -> None:
+        """Move the floating point parameters of the EMA module to contiguous
+        buffers."""
+        groups = defaultdict(list)
+        for idx, param in enumerate(self.ema_params):
+            if param.dtype.is_floating_point:
+                groups[(param.device, param.dtype)].append(idx)
+        self._flat_groups = []
+        for indices in groups.values():
+            params = [self.ema_params[idx] for idx in indices]
+            flat = torch.cat([param.data.reshape(-1) for param in params])
+            offset = 0
+            for param in params:
+                numel = param.numel()
+                param.data = flat[offset:offset + numel].view_as(param)
+                offset += numel
+            # the gathered source parameters, allocated once
+            src_flat = torch.empty_like(flat)
+            self._flat_groups.append((flat, src_flat, indices))
+
+    def _check_flat_groups(self) -> None:
+        """Rebuild the contiguous buffers if the parameters have been moved,
+        e.g., by ``Module.to``."""
+        for flat, _, indices in self._flat_groups:
+            if self.ema_params[indices[0]].data_ptr() != flat.data_ptr():
+                self._flatten()
+                return
+
+    @staticmethod
+    def _lerp_(dst: List[Tensor], src: List[Tensor], weight: float) -> None:
+        """Interpolate ``dst`` towards ``src`` in place, grouped by device and
+        dtype. Non floating point tensors are only copied when ``weight`` is
+        1."""
+        if weight == 1:
+            for d, s in zip(dst, src):
+                d.data.copy_(s.data)
+            return
+        groups = defaultdict(lambda: ([], []))
+        for d, s in zip(dst, src):
+            if d.dtype.is_floating_point:
+                d_group, s_group = groups[(d.device, d.dtype)]
+                d_group.append(d.data)
+                s_group.append(s.data.to(d.device, d.dtype))
+        for d_group, s_group in groups.values():
+            if hasattr(torch, '_foreach_lerp_'):
+                torch._foreach_lerp_(d_group, s_group, weight)
+            else:
+                # multi-tensor lerp is not available in older PyTorch
+                for d, s in zip(d_group, s_group):
+                    d.lerp_(s, weight)
+
+    @torch.no_grad()
+    def copy(self) -> None:
+        """Copy the parameters and buffers of the source module to the EMA
+        module."""
+        for ema_param, src_param in zip(self.ema_params, self.src_params):
+            ema_param.data.copy_(src_param.data)
+        self.update_buffers(1.)
+
+    @torch.no_grad()
+    def update_params(self,
+                      momentum: float,
+                      momentum_nontrainable: Optional[float] = None) -> None:
+        """Interpolate the parameters of the EMA module towards the source
+        module in place, i.e., ``ema = ema + (src - ema) * momentum``.
+
+        Args:
+            momentum (float): The momentum of the parameters which require
+                gradient in the source module.
+            momentum_nontrainable (float, optional): The momentum of the
+                parameters which do not require gradient. If None,
+                ``momentum`` is used. Defaults to None.
+        """
+        if momentum_nontrainable is None:
+            momentum_nontrainable = momentum
+        trainable = [src.requires_grad for src in self.src_params]
+        if self.flatten:
+            self._check_flat_groups()
+        if self.flatten and (all(trainable)
+                             or momentum == momentum_nontrainable):
+            # all the floating point parameters share the same momentum
+            for flat, src_flat, indices in self._flat_groups:
+                torch.cat([
+                    self.src_params[idx].data.reshape(-1).to(
+                        flat.device, flat.dtype) for idx in indices
+                ],
+                          out=src_flat)
+                flat.lerp_(src_flat, momentum)
+            return
+        for weight, flag in [(momentum, True), (momentum_nontrainable, False)]:
+            pairs = [(ema, src) for ema, src, is_trainable in zip(
+                self.ema_params, self.src_params, trainable)
+                     if is_trainable == flag]
+            if pairs:
+                self._lerp_(*zip(*pairs), weight)
+
+    @torch.no_grad()
+    def update_buffers(self, momentum: float = 1.) -> None:
+        """Interpolate the buffers of the EMA module towards the source module
+        in place.
+
+        Args:
+            momentum (float): The momentum of buffers. Defaults to 1., i.e.,
+                copying the buffers.
+        """
+        if self.buffer_names:
+            self._lerp_(
+                self._get_buffers(self.ema_module, self.buffer_names),
+                self._get_buffers(self.src_module, self.buffer_names),
+                momentum)
@@ -0,0 +1,46 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import torch
+
+
+def feather_window(height, width, ramp, device=None):
+    """Get the blending window of a tile.
+
+    The weights increase linearly from the borders of the tile to its inner
+    part within ``ramp`` pixels, and are 1 elsewhere.
+
+    Args:
+        height (int): Height of the tile.
+        width (int): Width of the tile.
+        ramp (int): Length of the linear ramp.
+        device (torch.device | None): Device of the window. Default: None.
+
+    Returns:
+        Tensor: The window with shape (1, 1, height, width).
+    """
+    ramp = max(ramp, 1)
+
+    def _ramp_1d(length):
+        coord = torch.arange(length, dtype=torch.float32, device=device) + 0.5
+        return (torch.minimum(coord, length - coord) / ramp).clamp(max=1)
+
+    window = _ramp_1d(height)[:, None] * _ramp_1d(width)[None, :]
+    return window[None, None]
+
+
+def tile_starts(length, tile, overlap):
+    """Get the start coordinates of tiles along one dimension.
+
+    Args:
+        length (int): Length of the image.
+        tile (int): Length of the tile.
+        overlap (int): Overlap between adjacent tiles.
+
+    Returns:
+        list[int]: The start coordinates. The last tile is aligned to the
+            border of the image.
+    """
+    if length <= tile:
+        return [0]
+    starts = list(range(0, length - tile, tile - overlap))
+    starts.append(length - tile)
+    return starts
@@ -4,64 +4,154 @@
 MMEditing provides 17 registry nodes to support using modules across projects.
 Each node is a child of the root registry in MMEngine.
 
+The registered modules are listed in ``registry_manifest.json`` with the
+modules registering them, so that a module is imported on the first time it is
+looked up in a registry instead of importing all modules beforehand. The
+manifest is generated by ``.dev_scripts/update_registry_manifest.py``.
+
 More details can be found at
 https://mmengine.readthedocs.io/en/latest/tutorials/registry.html.
 """
 
+import json
+import logging
+import os.path as osp
+import sys
+from importlib import import_module
+from typing import Dict, List, Optional, Type, Union
+
 from mmengine import registry
+from mmengine.logging import print_log
 from mmengine.registry import Registry
 
+MANIFEST_FILE = osp.join(osp.dirname(__file__), 'registry_manifest.json')
+
+
+class LazyRegistry(Registry):
+    """A registry importing the registered modules on demand.
+
+    When a key of the scope of the registry is not registered yet, the module
+    where it is registered is looked up in the manifest and imported before
+    getting the key. If the key is not in the manifest either, e.g., the
+    manifest is outdated, all modules are imported by
+    :func:`mmedit.utils.register_all_modules` as a fallback.
+
+    The locations of registered modules are recorded in
+    :attr:`module_locations` to generate the manifest.
+    """
+    _manifest: Optional[Dict[str, Dict[str, str]]] = None
+    _all_imported = False
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.module_locations: Dict[str, str] = dict()
+
+    @classmethod
+    def manifest(cls) -> Dict[str, Dict[str, str]]:
+        """dict: The locations of registered modules in each registry."""
+        if cls._manifest is None:
+            if osp.exists(MANIFEST_FILE):
+                with open(MANIFEST_FILE) as f:
+                    cls._manifest = json.load(f)
+            else:
+                cls._manifest = dict()
+        return cls._manifest
+
+    def import_from_location(self) -> None:
+        """Skip importing all modules, which are imported on demand by
+        :meth:`get` instead."""
+        self._imported = True
+
+    def get(self, key: str) -> Optional[Type]:
+        """Get the registry record and import its module if necessary."""
+        scope, real_key = self.split_scope_key(key)
+        if scope not in (None, self.scope) or real_key in self._module_dict:
+            return super().get(key)
+
+        location = self.manifest().get(self.name, dict()).get(real_key)
+        if location is not None:
+            import_module(location)
+        obj_cls = super().get(key)
+        if obj_cls is None and not LazyRegistry._all_imported:
+            print_log(
+                f'"{real_key}" is not found in the registry manifest, '
+                'fallback to import all modules of mmedit.',
+                logger='current',
+                level=logging.DEBUG)
+            from mmedit.utils import register_all_modules
+            register_all_modules(init_default_scope=False)
+            obj_cls = super().get(key)
+        return obj_cls
+
+    def _register_module(self,
+                         module: Type,
+                         module_name: Optional[Union[str, List[str]]] = None,
+                         force: bool = False) -> None:
+        super()._register_module(module, module_name, force)
+        # the first frame outside the registries is where it is registered
+        frame = sys._getframe(1)
+        internal = ('mmengine.registry', __name__)
+        while frame.f_globals.get('__name__', '').startswith(internal):
+            frame = frame.f_back
+        if module_name is None:
+            module_name = module.__name__
+        if isinstance(module_name, str):
+            module_name = [module_name]
+        for name in module_name:
+            self.module_locations[name] = frame.f_globals['__name__']
+
+
 # manage all kinds of runners like `EpochBasedRunner` and `IterBasedRunner`
-RUNNERS = Registry('runner', parent=registry.RUNNERS)
+RUNNERS = LazyRegistry('runner', parent=registry.RUNNERS)
 # manage runner constructors that define how to initialize runners
-RUNNER_CONSTRUCTORS = Registry(
+RUNNER_CONSTRUCTORS = LazyRegistry(
     'runner constructor', parent=registry.RUNNER_CONSTRUCTORS)
 # manage all kinds of loops like `EpochBasedTrainLoop`
-LOOPS = Registry('loop', parent=registry.LOOPS)
+LOOPS = LazyRegistry('loop', parent=registry.LOOPS)
 # manage all kinds of hooks like `CheckpointHook`
-HOOKS = Registry('hook', parent=registry.HOOKS)
+HOOKS = LazyRegistry('hook', parent=registry.HOOKS)
 
 # manage data-related modules
-DATASETS = Registry('dataset', parent=registry.DATASETS)
-DATA_SAMPLERS = Registry('data sampler', parent=registry.DATA_SAMPLERS)
-TRANSFORMS = Registry('transform', parent=registry.TRANSFORMS)
+DATASETS = LazyRegistry('dataset', parent=registry.DATASETS)
+DATA_SAMPLERS = LazyRegistry('data sampler', parent=registry.DATA_SAMPLERS)
+TRANSFORMS = LazyRegistry('transform', parent=registry.TRANSFORMS)
 
 # manage all kinds of modules inheriting `nn.Module`
-MODELS = Registry('model', parent=registry.MODELS)
+MODELS = LazyRegistry('model', parent=registry.MODELS)
 MODULES = BACKBONES = COMPONENTS = LOSSES = MODELS
 # manage all kinds of model wrappers like 'MMDistributedDataParallel'
-MODEL_WRAPPERS = Registry('model_wrapper', parent=registry.MODEL_WRAPPERS)
+MODEL_WRAPPERS = LazyRegistry('model_wrapper', parent=registry.MODEL_WRAPPERS)
 # manage all kinds of weight initialization modules like `Uniform`
-WEIGHT_INITIALIZERS = Registry(
+WEIGHT_INITIALIZERS = LazyRegistry(
     'weight initializer', parent=registry.WEIGHT_INITIALIZERS)
 
 # manage all kinds of optimizers like `SGD` and `Adam`
-OPTIMIZERS = Registry('optimizer', parent=registry.OPTIMIZERS)
+OPTIMIZERS = LazyRegistry('optimizer', parent=registry.OPTIMIZERS)
 # manage constructors that customize the optimization hyperparameters.
-OPTIM_WRAPPER_CONSTRUCTORS = Registry(
+OPTIM_WRAPPER_CONSTRUCTORS = LazyRegistry(
     'optimizer wrapper constructor',
     parent=registry.OPTIM_WRAPPER_CONSTRUCTORS)
 # manage all kinds of parameter schedulers like `MultiStepLR`
-PARAM_SCHEDULERS = Registry(
+PARAM_SCHEDULERS = LazyRegistry(
     'parameter scheduler', parent=registry.PARAM_SCHEDULERS)
 # manage all kinds of metrics
-METRICS = Registry('metric', parent=registry.METRICS)
+METRICS = LazyRegistry('metric', parent=registry.METRICS)
 # manage all kinds of evaluators
-EVALUATORS = Registry('evaluator', parent=registry.EVALUATOR)
+EVALUATORS = LazyRegistry('evaluator', parent=registry.EVALUATOR)
 
 # manage task-specific modules like anchor generators and box coders
-TASK_UTILS = Registry('task util', parent=registry.TASK_UTILS)
+TASK_UTILS = LazyRegistry('task util', parent=registry.TASK_UTILS)
 
 # manage visualizer
-VISUALIZERS = Registry('visualizer', parent=registry.VISUALIZERS)
+VISUALIZERS = LazyRegistry('visualizer', parent=registry.VISUALIZERS)
 # manage visualizer backend
-VISBACKENDS = Registry('vis_backend', parent=registry.VISBACKENDS)
+VISBACKENDS = LazyRegistry('vis_backend', parent=registry.VISBACKENDS)
 
 # manage logprocessor
-LOG_PROCESSORS = Registry('log_processor', parent=registry.LOG_PROCESSORS)
+LOG_PROCESSORS = LazyRegistry('log_processor', parent=registry.LOG_PROCESSORS)
 
 # manage optimizer wrapper
-OPTIM_WRAPPERS = Registry('optim_wrapper', parent=registry.OPTIM_WRAPPERS)
+OPTIM_WRAPPERS = LazyRegistry('optim_wrapper', parent=registry.OPTIM_WRAPPERS)
 
 # manage diffusion_schedulers
-DIFFUSION_SCHEDULERS = Registry('diffusion scheduler')
+DIFFUSION_SCHEDULERS = LazyRegistry('diffusion scheduler')
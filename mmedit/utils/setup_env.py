@@ -3,12 +3,13 @@ import datetime
 import importlib
 import warnings
 from types import ModuleType
-from typing import Optional
+from typing import Dict, Optional
 
 from mmengine import DefaultScope
 
 
-def register_all_modules(init_default_scope: bool = True) -> None:
+def register_all_modules(init_default_scope: bool = True,
+                         lazy: bool = False) -> None:
     """Register all modules in mmedit into the registries.
 
     Args:
@@ -19,12 +20,24 @@ def register_all_modules(init_default_scope: bool = True) -> None:
             To understand more about the registry, please refer
             to https://github.com/open-mmlab/mmengine/blob/main/docs/en/tutorials/registry.md
             Defaults to True.
+        lazy (bool): Whether to import the modules on demand. If True, no
+            module is imported here and the registries import a module the
+            first time it is looked up according to the registry manifest,
+            which saves the time and memory to import unused modules.
+            Defaults to False.
     """  # noqa
-    import mmedit.datasets  # noqa: F401,F403
-    import mmedit.engine  # noqa: F401,F403
-    import mmedit.evaluation  # noqa: F401,F403
-    import mmedit.models  # noqa: F401,F403
-    import mmedit.visualization  # noqa: F401,F403
+    if not lazy:
+        from mmedit.registry import LazyRegistry
+        LazyRegistry._all_imported = True
+
+        import mmedit.datasets  # noqa: F401,F403
+        import mmedit.engine  # noqa: F401,F403
+        import mmedit.evaluation  # noqa: F401,F403
+        import mmedit.models  # noqa: F401,F403
+        import mmedit.visualization  # noqa: F401,F403
+        from mmedit.models import editors
+        for package in editors._import_structure:
+            importlib.import_module(f'{editors.__name__}.{package}')
 
     if init_default_scope:
         never_created = DefaultScope.get_current_instance() is None \
@@ -58,3 +71,40 @@ def try_import(name: str) -> Optional[ModuleType]:
         return importlib.import_module(name)
     except ImportError:
         return None
+
+
+def generate_registry_manifest() -> Dict[str, Dict[str, str]]:
+    """Generate the manifest of the modules registered in mmedit.
+
+    All modules are imported to be registered, and the manifest records the
+    module where each of them is registered, which is used by the registries
+    to import the modules on demand. The modules of mmedit registered into
+    the registries of MMEngine are recorded in the child registries of
+    mmedit.
+
+    Returns:
+        dict: The locations of registered modules, whose keys are the names of
+        the registries and values are the mappings from the registered names
+        to the modules.
+    """
+    from mmedit import registry
+    register_all_modules(init_default_scope=False)
+    manifest = dict()
+    for node in vars(registry).values():
+        if not isinstance(node, registry.LazyRegistry) or \
+                node.name in manifest:
+            continue
+        # skip the modules registered outside mmedit, e.g., in tests
+        locations = {
+            name: location
+            for name, location in node.module_locations.items()
+            if location.startswith('mmedit.')
+        }
+        # some modules of mmedit are registered into the parent registries
+        if node.parent is not None:
+            for name, module in node.parent.module_dict.items():
+                location = getattr(module, '__module__', '')
+                if location.startswith('mmedit.'):
+                    locations.setdefault(name, location)
+        manifest[node.name] = dict(sorted(locations.items()))
+    return manifest
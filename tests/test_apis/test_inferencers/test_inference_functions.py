@@ -13,7 +13,10 @@ from mmedit.apis import (calculate_grid_size, colorization_inference,
                          restoration_face_inference, restoration_inference,
                          restoration_video_inference, sample_conditional_model,
                          sample_img2img_model, sample_unconditional_model,
-                         set_random_seed, video_interpolation_inference)
+                         set_random_seed, tile_inference,
+                         video_interpolation_inference)
+from mmedit.apis.inferencers.inference_functions import (pad_sequence,
+                                                         padded_frame_index)
 from mmedit.registry import MODELS
 from mmedit.utils import register_all_modules, tensor2img
 
@@ -232,6 +235,32 @@ def test_restoration_inference():
     output = restoration_inference(model, img_path)
     assert output.detach().cpu().numpy().shape == (3, 480, 500)
 
+    output = restoration_inference(
+        model, img_path, tile_size=64, tile_overlap=8, tile_batch_size=2)
+    assert output.detach().cpu().numpy().shape == (3, 480, 500)
+
+
+def test_tile_inference():
+
+    class ToyModel(torch.nn.Module):
+
+        def forward(self, inputs, mode='tensor'):
+            return torch.nn.functional.interpolate(
+                inputs * 2, scale_factor=2, mode='nearest')
+
+    model = ToyModel()
+    inputs = torch.rand(2, 3, 37, 50)
+    target = model(inputs)
+    for tile_size, tile_overlap, tile_batch_size in [(16, 4, 1), (16, 0, 3),
+                                                     (64, 8, 2)]:
+        output = tile_inference(model, inputs, tile_size, tile_overlap,
+                                tile_batch_size)
+        assert output.shape == (2, 3, 74, 100)
+        assert torch.allclose(output, target, atol=1e-5)
+
+    with pytest.raises(ValueError):
+        tile_inference(model, inputs, 16, 16)
+
 
 def test_restoration_video_inference():
     if torch.cuda.is_available():
@@ -259,6 +288,19 @@ def test_restoration_video_inference():
                                          '{:08d}.png')
 
 
+def test_padded_frame_index():
+    for sequence_length in [5, 8]:
+        for window_size in [1, 3, 5]:
+            data = torch.arange(sequence_length).view(1, -1)
+            padded = pad_sequence(data, window_size)[0].tolist()
+            padding = window_size // 2
+            indices = [
+                padded_frame_index(i, sequence_length, padding)
+                for i in range(sequence_length + 2 * padding)
+            ]
+            assert indices == padded
+
+
 def test_translation_inference():
     cfg = osp.join(
         osp.dirname(__file__), '..', '..', '..', 'configs', 'pix2pix',
@@ -0,0 +1,85 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os.path as osp
+
+import pytest
+import torch
+
+from mmedit.apis.inferencers.base_mmedit_inferencer import BaseMMEditInferencer
+from mmedit.apis.inferencers.ort_wrapper import ORTWrapper
+from mmedit.apis.inferencers.restoration_inferencer import \
+    RestorationInferencer
+from mmedit.models.editors import EDSRNet
+from mmedit.utils import register_all_modules
+
+register_all_modules()
+
+
+def export(model, onnx_file):
+    inputs = torch.rand(1, 3, 16, 16)
+    axes = {0: 'batch', 2: 'height', 3: 'width'}
+    with torch.no_grad():
+        torch.onnx.export(
+            model.eval(),
+            inputs,
+            onnx_file,
+            input_names=['input'],
+            output_names=['output'],
+            opset_version=11,
+            dynamic_axes={
+                'input': axes,
+                'output': axes
+            })
+
+
+def test_ort_wrapper(tmp_path):
+    pytest.importorskip('onnxruntime')
+    model = EDSRNet(3, 3, mid_channels=8, num_blocks=2, upscale_factor=2)
+    onnx_file = str(tmp_path / 'edsr.onnx')
+    export(model, onnx_file)
+
+    with pytest.raises(AssertionError):
+        ORTWrapper(onnx_file, execution_mode='async')
+
+    for io_binding in [True, False]:
+        wrapper = ORTWrapper(
+            onnx_file, intra_op_num_threads=1, io_binding=io_binding)
+        # the outputs of the second run of a shape are preallocated
+        for shape in [(1, 3, 16, 16), (2, 3, 20, 12), (2, 3, 20, 12)]:
+            inputs = torch.rand(shape)
+            with torch.no_grad():
+                target = model(inputs)
+            output = wrapper(inputs)
+            assert output.shape == target.shape
+            assert torch.allclose(output, target, atol=1e-4)
+
+        with pytest.raises(AssertionError):
+            wrapper(inputs, inputs)
+
+
+def test_onnxruntime_backend(tmp_path):
+    data_root = osp.join(osp.dirname(__file__), '../../../')
+
+    cfg = data_root + 'configs/sngan_proj/' \
+        'sngan-proj_woReLUinplace_lr2e-4-ndisc5-1xb64_cifar10-32x32.py'
+    with pytest.raises(AssertionError):
+        BaseMMEditInferencer(cfg, None, backend='tensorrt')
+    with pytest.raises(NotImplementedError):
+        BaseMMEditInferencer(cfg, 'model.onnx', backend='onnxruntime')
+
+    pytest.importorskip('onnxruntime')
+    config = data_root + 'configs/edsr/edsr_x2c64b16_1xb16-300k_div2k.py'
+    img_path = data_root + 'tests/data/image/lq/baboon_x4.png'
+    pytorch_inferencer = RestorationInferencer(config, None, device='cpu')
+    onnx_file = str(tmp_path / 'edsr.onnx')
+    export(pytorch_inferencer.model.generator, onnx_file)
+
+    ort_inferencer = RestorationInferencer(
+        config,
+        onnx_file,
+        backend='onnxruntime',
+        backend_cfg=dict(intra_op_num_threads=1))
+    assert isinstance(ort_inferencer.model.generator, ORTWrapper)
+    target = pytorch_inferencer(img=img_path)[1]
+    result = ort_inferencer(img=img_path)[1]
+    assert result.shape == target.shape == (240, 250, 3)
+    assert abs(result.astype(int) - target.astype(int)).max() <= 1
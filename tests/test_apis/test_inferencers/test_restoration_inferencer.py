@@ -30,6 +30,13 @@ def test_restoration_inferencer():
     result_img = inference_result[1]
     assert result_img.shape == (480, 500, 3)
 
+    extra_parameters = dict(tile_size=64, tile_overlap=8, tile_batch_size=2)
+    inference_result = inferencer_instance(
+        img=img_path, extra_parameters=extra_parameters)
+    result_img = inference_result[1]
+    assert result_img.shape == (480, 500, 3)
+    inferencer_instance.extra_parameters['tile_size'] = None
+
 
 if __name__ == '__main__':
     test_restoration_inferencer()
@@ -4,6 +4,7 @@ import unittest
 from unittest import TestCase
 from unittest.mock import patch
 
+import pytest
 import torch
 import torch.nn as nn
 from mmengine.utils import digit_version
@@ -105,3 +106,51 @@ class TestTranslationInferencer(TestCase):
                 text=text, result_out_dir=result_out_dir)
             result_img = inference_result[1]
             assert result_img[0].cpu().numpy().shape == (3, 32, 32)
+
+
+class toy_diffuser:
+
+    def __init__(self):
+        self.num_batches = 0
+
+    def infer_batch(self, prompts, height, width, num_inference_steps,
+                    guidance_scale, negative_prompts, eta, seeds):
+        if 'error' in prompts:
+            raise ValueError('error')
+        self.num_batches += 1
+        samples = torch.stack([
+            torch.full((3, height, width), seed, dtype=torch.float)
+            for seed in seeds
+        ])
+        return dict(samples=samples, nsfw_content_detected=None)
+
+
+def test_text2image_request_batching():
+    cfg = osp.join(
+        osp.dirname(__file__), '..', '..', '..', 'configs', 'stable_diffusion',
+        'stable-diffusion_ddim_denoisingunet.py')
+    with patch.object(Text2ImageInferencer, '_init_model'):
+        inferencer_instance = Text2ImageInferencer(cfg, None, device='cpu')
+    inferencer_instance.model = toy_diffuser()
+    inferencer_instance.start_batching(max_batch_size=4, max_wait=1)
+
+    futures = [
+        inferencer_instance.submit(
+            'a cat', height=8, width=8, num_inference_steps=2, seed=idx)
+        for idx in range(4)
+    ]
+    futures += [
+        inferencer_instance.submit(
+            'a dog', height=16, width=8, num_inference_steps=2, seed=idx)
+        for idx in range(2)
+    ]
+    futures.append(inferencer_instance.submit('error', seed=0))
+    for idx, future in enumerate(futures[:4]):
+        assert torch.equal(future.result(), torch.full((3, 8, 8), idx))
+    for idx, future in enumerate(futures[4:6]):
+        assert future.result().shape == (3, 16, 8)
+    with pytest.raises(ValueError):
+        futures[6].result()
+    inferencer_instance.stop_batching()
+    # one batch of 4 requests, and one batch of 2 requests
+    assert inferencer_instance.model.num_batches == 2
@@ -1,5 +1,9 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import os.path as osp
+from tempfile import TemporaryDirectory
+
+import mmcv
+import numpy as np
 
 from mmedit.apis.inferencers.video_restoration_inferencer import \
     VideoRestorationInferencer
@@ -91,5 +95,76 @@ def test_video_restoration_inferencer_max_seq_len():
     assert inference_result is None
 
 
+def test_video_restoration_inferencer_streaming():
+    cfg = osp.join(
+        osp.dirname(__file__), '..', '..', '..', 'configs', 'basicvsr',
+        'basicvsr_2xb4_reds4.py')
+    data_root = osp.join(osp.dirname(__file__), '../../../')
+    video_path = data_root + 'tests/data/frames/test_inference.mp4'
+
+    inferencer_instance = \
+        VideoRestorationInferencer(
+            cfg,
+            None)
+    for max_seq_len in [None, 3]:
+        with TemporaryDirectory() as tmp_dir:
+            full_out_dir = osp.join(tmp_dir, 'full')
+            stream_out_dir = osp.join(tmp_dir, 'stream')
+            extra_parameters = dict(
+                window_size=0, max_seq_len=max_seq_len, streaming=False)
+            inferencer_instance(
+                video=video_path,
+                result_out_dir=full_out_dir,
+                extra_parameters=extra_parameters)
+            extra_parameters['streaming'] = True
+            inference_result = inferencer_instance(
+                video=video_path,
+                result_out_dir=stream_out_dir,
+                extra_parameters=extra_parameters)
+            assert inference_result is None
+
+            frame_cnt = mmcv.VideoReader(video_path).frame_cnt
+            for i in range(frame_cnt):
+                full = mmcv.imread(osp.join(full_out_dir, f'{i:08d}.png'))
+                stream = mmcv.imread(osp.join(stream_out_dir, f'{i:08d}.png'))
+                np.testing.assert_array_equal(full, stream)
+
+    # stateful streaming, the same as the whole sequence if the look-ahead
+    # reaches the end of the video
+    frame_cnt = mmcv.VideoReader(video_path).frame_cnt
+    with TemporaryDirectory() as tmp_dir:
+        full_out_dir = osp.join(tmp_dir, 'full')
+        stream_out_dir = osp.join(tmp_dir, 'stream')
+        inferencer_instance(
+            video=video_path,
+            result_out_dir=full_out_dir,
+            extra_parameters=dict(
+                window_size=0, max_seq_len=None, streaming=False))
+        inference_result = inferencer_instance(
+            video=video_path,
+            result_out_dir=stream_out_dir,
+            extra_parameters=dict(
+                window_size=0,
+                max_seq_len=2,
+                streaming=True,
+                num_lookahead=frame_cnt))
+        assert inference_result is None
+        for i in range(frame_cnt):
+            full = mmcv.imread(osp.join(full_out_dir, f'{i:08d}.png'))
+            stream = mmcv.imread(osp.join(stream_out_dir, f'{i:08d}.png'))
+            assert np.abs(full.astype(int) - stream).max() <= 1
+    inferencer_instance.extra_parameters['num_lookahead'] = None
+
+    # sliding-window framework
+    with TemporaryDirectory() as tmp_dir:
+        extra_parameters = dict(window_size=3, max_seq_len=2, streaming=True)
+        inference_result = inferencer_instance(
+            video=video_path,
+            result_out_dir=osp.join(tmp_dir, 'result.mp4'),
+            extra_parameters=extra_parameters)
+        assert inference_result is None
+    inferencer_instance.extra_parameters['streaming'] = False
+
+
 if __name__ == '__main__':
     test_video_restoration_inferencer_input_dir()
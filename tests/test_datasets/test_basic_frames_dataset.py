@@ -1,6 +1,8 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import os
+import shutil
 from pathlib import Path
+from unittest.mock import patch
 
 from mmedit.datasets import BasicFramesDataset
 
@@ -698,3 +700,67 @@ class TestFramesDatasets:
                     '00000000.png')
             ],
             sample_idx=1)
+
+    def test_frame_index(self, tmp_path):
+        data_root = tmp_path / 'frames'
+        shutil.copytree(self.data_root / 'sequence', data_root / 'sequence')
+        shutil.copy(self.data_root / 'ann3.txt', data_root / 'ann3.txt')
+        index_file = str(tmp_path / 'frame_index.bin')
+        cfgs = [
+            dict(
+                ann_file='',
+                data_prefix=dict(
+                    img=f'sequence{os.sep}gt', gt=f'sequence{os.sep}gt'),
+                depth=2,
+                num_input_frames=2),
+            dict(
+                ann_file='ann3.txt',
+                data_prefix=dict(img='sequence', gt='sequence'),
+                depth=2,
+                load_frames_list=dict(img=['all'], gt=['00000000.png']))
+        ]
+        for cfg in cfgs:
+            dataset = BasicFramesDataset(
+                data_root=data_root, pipeline=[], **cfg)
+            indexed = BasicFramesDataset(
+                data_root=data_root,
+                pipeline=[],
+                frame_index_file=index_file,
+                **cfg)
+            assert len(indexed) == len(dataset)
+            for idx in range(len(dataset)):
+                assert indexed[idx] == dataset[idx]
+
+            # reuse the index
+            with patch.object(BasicFramesDataset,
+                              '_build_frame_index') as build:
+                reused = BasicFramesDataset(
+                    data_root=data_root,
+                    pipeline=[],
+                    frame_index_file=index_file,
+                    **cfg)
+                build.assert_not_called()
+            assert reused[-1] == dataset[-1]
+
+            # subset
+            subset = BasicFramesDataset(
+                data_root=data_root,
+                pipeline=[],
+                frame_index_file=index_file,
+                indices=[1],
+                **cfg)
+            assert len(subset) == 1
+            assert subset[0]['key'] == dataset[1]['key']
+
+        # rebuild the index when a sequence is added
+        shutil.copytree(data_root / 'sequence' / 'gt' / 'sequence_2',
+                        data_root / 'sequence' / 'gt' / 'sequence_3')
+        cfg = cfgs[0]
+        dataset = BasicFramesDataset(data_root=data_root, pipeline=[], **cfg)
+        indexed = BasicFramesDataset(
+            data_root=data_root,
+            pipeline=[],
+            frame_index_file=index_file,
+            **cfg)
+        assert len(indexed) == len(dataset) == 8
+        assert indexed[-1] == dataset[-1]
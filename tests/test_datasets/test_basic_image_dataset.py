@@ -170,3 +170,12 @@ class TestImageDatasets:
             gt_path=str(self.data_root / 'gt' / 'baboon.png'),
             ref_path=str(self.data_root / 'gt' / 'baboon.png'),
             sample_idx=0)
+
+    def test_get_img_size(self):
+        dataset = BasicImageDataset(
+            data_root=self.data_root,
+            data_prefix=dict(img='lq', gt='gt'),
+            filename_tmpl=dict(img='{}_x4'),
+            pipeline=[])
+        assert dataset.get_img_size(0) == (120, 125)
+        assert dataset.get_img_size(0, 'gt') == (480, 500)
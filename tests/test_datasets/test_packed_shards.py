@@ -0,0 +1,106 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os
+import os.path as osp
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from mmengine.fileio import get_file_backend
+
+from mmedit.datasets.packed_shards import PackedShardBackend, PackedShardWriter
+
+
+def count_reads(backend):
+    reads = []
+    read = backend._read
+
+    def _read(shard, offset, length):
+        reads.append((shard, offset, length))
+        return read(shard, offset, length)
+
+    backend._read = _read
+    return reads
+
+
+def test_packed_shards(tmp_path):
+    root = str(tmp_path / 'packed')
+    items = [[(f'GT/{i:03d}.png', bytes([i]) * (100 + i), 'png'),
+              (f'LQ/{i:03d}.png', bytes([i + 1]) * 30, 'png')]
+             for i in range(4)]
+    with patch('os.fsync', wraps=os.fsync) as fsync:
+        with PackedShardWriter(root, shard_size=400) as writer:
+            for group in items[:3]:
+                assert writer.add(group)
+    # synced once when rolling over to the second shard and once at close
+    assert fsync.call_count == 2
+    # resume and skip the packed keys
+    with PackedShardWriter(root, shard_size=400) as writer:
+        assert not writer.add(items[2])
+        assert writer.add(items[3])
+    assert osp.exists(osp.join(root, 'shard-00001.bin'))
+
+    backend = get_file_backend(
+        backend_args=dict(backend='packed', db_path=root))
+    assert isinstance(backend, PackedShardBackend)
+    for group in items:
+        for key, data, _ in group:
+            # the path is matched by the longest suffix
+            assert backend.get(osp.join('data', 'div2k', key)) == data
+            record = backend.lookup(key)
+            assert record['offset'] % 64 == 0
+    assert backend.get_text('GT/000.png') == (bytes([0]) * 100).decode()
+    with pytest.raises(FileNotFoundError):
+        backend.get('GT/004.png')
+
+    # a group is read once and shared by the backends of the same path
+    reads = count_reads(backend)
+    another = PackedShardBackend(root)
+    another_reads = count_reads(another)
+    assert backend.get('GT/001.png') == items[1][0][1]
+    assert another.get('LQ/001.png') == items[1][1][1]
+    assert len(reads) == 1 and len(another_reads) == 0
+
+    # contiguous records are read at once if groups are not read as a whole
+    PackedShardBackend._group_caches.clear()
+    backend = PackedShardBackend(root, group_read_size=0)
+    reads = count_reads(backend)
+    keys = ['GT/000.png', 'LQ/000.png', 'GT/001.png', 'GT/003.png']
+    values = backend.get_many(keys)
+    assert len(reads) == 2
+    assert values == [
+        items[0][0][1], items[0][1][1], items[1][0][1], items[3][0][1]
+    ]
+
+
+def test_packed_shards_interrupted(tmp_path):
+    root = str(tmp_path / 'packed')
+    writer = PackedShardWriter(root)
+    assert writer.add([('GT/000.png', b'0' * 100, 'png')])
+    # interrupted before the shard is synced, the group is not indexed
+    writer.shard_file.close()
+    writer.index_file.close()
+    with PackedShardWriter(root) as writer:
+        assert writer.add([('GT/000.png', b'1' * 80, 'png')])
+        assert writer.add([('GT/001.png', b'2' * 50, 'png')])
+    assert osp.getsize(osp.join(root, 'shard-00000.bin')) == 128 + 50
+    backend = PackedShardBackend(root)
+    assert backend.get('GT/000.png') == b'1' * 80
+    assert backend.get('GT/001.png') == b'2' * 50
+
+
+def test_packed_shards_raw(tmp_path):
+    root = str(tmp_path / 'packed')
+    frames = [
+        np.random.randint(0, 255, (8, 6, 3), dtype=np.uint8) for _ in range(3)
+    ]
+    with PackedShardWriter(root) as writer:
+        writer.add([(f'clip/{i}.png', frame, 'raw')
+                    for i, frame in enumerate(frames)])
+
+    for mmap in [True, False]:
+        backend = PackedShardBackend(root, mmap=mmap)
+        values = backend.get_many([f'clip/{i}.png' for i in range(3)])
+        for value, frame in zip(values, frames):
+            np.testing.assert_array_equal(value, frame)
+            assert not value.flags.writeable
+        assert isinstance(values[0].base, np.memmap) == mmap
@@ -0,0 +1,111 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import gc
+import multiprocessing as mp
+import os.path as osp
+import platform
+import time
+from pathlib import Path
+
+import mmcv
+import numpy as np
+import pytest
+
+from mmedit.datasets.shared_image_cache import SharedImageCache
+from mmedit.datasets.transforms import LoadImageFromFile
+
+
+def _put(cache, key, value):
+    cache[key] = value
+
+
+def test_shared_image_cache():
+    cache = SharedImageCache(mode='bytes')
+    assert cache.get('a') is None
+    cache['a'] = b'abc'
+    assert cache.get('a') == b'abc'
+    assert cache.stats() == dict(
+        hits=1, misses=1, evictions=0, num_entries=1, size=3)
+    cache.clear()
+    assert cache.get('a') is None
+
+    # lru eviction by the size of entries
+    imgs = [np.full((8, 16), i, dtype=np.uint8) for i in range(4)]
+    cache = SharedImageCache()
+    cache['0'] = imgs[0]
+    entry_size = cache.stats()['size']
+    cache = SharedImageCache(max_size=3 * entry_size + 10)
+    for i in range(3):
+        cache[str(i)] = imgs[i]
+        time.sleep(0.01)
+    img = cache.get('0')
+    np.testing.assert_array_equal(img, imgs[0])
+    assert not img.flags.writeable
+    cache['3'] = imgs[3]
+    assert cache.get('1') is None
+    assert cache.get('0') is not None and cache.get('3') is not None
+    stats = cache.stats()
+    assert stats['evictions'] >= 1
+    assert stats['size'] == stats['num_entries'] * entry_size
+    assert stats['size'] <= 3 * entry_size + 10
+    # too large to be cached
+    cache['4'] = np.zeros((100, 100), dtype=np.uint8)
+    assert cache.get('4') is None
+
+    # the directory is removed with the cache
+    cache_dir = cache.cache_dir
+    del cache, img
+    gc.collect()
+    assert not osp.exists(cache_dir)
+
+
+@pytest.mark.skipif(
+    platform.system() == 'Windows', reason='fork is not available')
+def test_shared_image_cache_processes():
+    cache = SharedImageCache()
+    img = np.random.randint(0, 255, (4, 4, 3), dtype=np.uint8)
+    process = mp.get_context('fork').Process(
+        target=_put, args=(cache, 'img', img))
+    process.start()
+    process.join()
+    np.testing.assert_array_equal(cache.get('img'), img)
+    assert cache.stats()['num_entries'] == 1
+    assert osp.exists(cache.cache_dir)
+
+
+def test_load_image_from_shared_cache():
+    path_baboon = Path(
+        __file__).parent.parent / 'data' / 'image' / 'gt' / 'baboon.png'
+    img_baboon = mmcv.imread(str(path_baboon), channel_order='rgb')
+
+    for mode in ['bytes', 'pixels']:
+        loader = LoadImageFromFile(
+            key='gt', channel_order='rgb', cache_cfg=dict(mode=mode))
+        for _ in range(2):
+            results = loader(dict(gt_path=[path_baboon] * 2))
+            np.testing.assert_array_equal(results['gt'][1], img_baboon)
+            assert results['gt'][0].flags.writeable
+        assert loader.cache.stats()['hits'] == 3
+        assert loader.cache.stats()['misses'] == 1
+
+
+def test_load_packed_raw_from_shared_cache(tmp_path):
+    from mmedit.datasets.packed_shards import PackedShardWriter
+    path_baboon_x4 = Path(
+        __file__).parent.parent / 'data' / 'image' / 'lq' / 'baboon_x4.png'
+    img_baboon_x4 = mmcv.imread(str(path_baboon_x4))
+    db_path = str(tmp_path / 'packed')
+    with PackedShardWriter(db_path) as writer:
+        writer.add([('lq/baboon_x4.png', img_baboon_x4, 'raw')])
+
+    for mode in ['bytes', 'pixels']:
+        loader = LoadImageFromFile(
+            key='img',
+            cache_cfg=dict(mode=mode),
+            backend_args=dict(backend='packed', db_path=db_path))
+        # the same raw record is loaded again in the next epoch
+        for _ in range(2):
+            results = loader(dict(img_path=[path_baboon_x4]))
+            np.testing.assert_array_equal(results['img'][0], img_baboon_x4)
+            assert results['img'][0].flags.writeable
+        # raw records are not stored as bytes
+        assert loader.cache.stats()['num_entries'] == int(mode == 'pixels')
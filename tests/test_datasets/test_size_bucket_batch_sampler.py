@@ -0,0 +1,59 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import pytest
+from mmengine.dataset import DefaultSampler
+from torch.utils.data import Dataset
+
+from mmedit.datasets import SizeBucketBatchSampler
+
+
+class ToyDataset(Dataset):
+
+    def __init__(self, sizes):
+        self.sizes = sizes
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def get_img_size(self, idx, key=None):
+        return self.sizes[idx]
+
+
+class TestSizeBucketBatchSampler:
+
+    sizes = [(64, 48), (32, 32), (48, 64), (30, 32), (64, 40), (32, 30),
+             (50, 64)]
+
+    def test_init(self):
+        sampler = DefaultSampler(ToyDataset(self.sizes), shuffle=False)
+        with pytest.raises(TypeError):
+            SizeBucketBatchSampler([0, 1], batch_size=2)
+        with pytest.raises(ValueError):
+            SizeBucketBatchSampler(sampler, batch_size=0)
+        with pytest.raises(ValueError):
+            SizeBucketBatchSampler(sampler, batch_size=2, pool_size=0)
+
+    def test_iter(self):
+        sampler = DefaultSampler(ToyDataset(self.sizes), shuffle=False)
+        batch_sampler = SizeBucketBatchSampler(sampler, batch_size=2)
+        assert len(batch_sampler) == 4
+        # landscape images are followed by portrait images
+        assert list(batch_sampler) == [[3, 1], [2, 6], [5, 4], [0]]
+
+        batch_sampler = SizeBucketBatchSampler(
+            sampler, batch_size=2, drop_last=True)
+        assert len(batch_sampler) == 3
+        assert list(batch_sampler) == [[3, 1], [2, 6], [5, 4]]
+
+        # sort the indices in each pool
+        batch_sampler = SizeBucketBatchSampler(
+            sampler, batch_size=2, pool_size=1)
+        assert list(batch_sampler) == [[1, 0], [3, 2], [5, 4], [6]]
+
+    def test_shuffle(self):
+        sampler = DefaultSampler(ToyDataset(self.sizes), shuffle=True, seed=0)
+        batch_sampler = SizeBucketBatchSampler(sampler, batch_size=2)
+        batches = list(batch_sampler)
+        assert sorted(sum(batches, [])) == list(range(len(self.sizes)))
+        assert sorted(batches) == sorted([[3, 1], [2, 6], [5, 4], [0]])
+        # deterministic based on the seed and epoch
+        assert list(batch_sampler) == batches
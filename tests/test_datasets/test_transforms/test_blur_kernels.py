@@ -1,4 +1,10 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
 from mmedit.datasets.transforms import blur_kernels
 
 
@@ -10,3 +16,82 @@ def test_blur_kernels():
     for kernel_type in kernels:
         kernel = blur_kernels.random_mixed_kernels([kernel_type], [1], 5)
         assert kernel.shape == (5, 5)
+
+
+def test_batched_blur_kernels():
+    sig_x = np.array([0.5, 1.5, 3.])
+    sig_y = np.array([2., 1., 0.8])
+    theta = np.array([0., 0.7, -2.])
+    beta = np.array([0.6, 1., 1.8])
+    for kernel_type, func in [('gaussian', blur_kernels.bivariate_gaussian),
+                              ('generalized',
+                               blur_kernels.bivariate_generalized_gaussian),
+                              ('plateau', blur_kernels.bivariate_plateau)]:
+        args = [] if kernel_type == 'gaussian' else [beta]
+        kernels = blur_kernels.batched_bivariate_kernels(
+            7, sig_x, sig_y, theta, *args, kernel_type=kernel_type)
+        assert kernels.shape == (3, 7, 7)
+        for i in range(3):
+            kwargs = dict() if kernel_type == 'gaussian' else dict(
+                beta=beta[i])
+            np.testing.assert_allclose(
+                kernels[i],
+                func(
+                    7,
+                    sig_x[i],
+                    sig_y[i],
+                    theta[i],
+                    is_isotropic=False,
+                    **kwargs),
+                rtol=1e-5,
+                atol=1e-7)
+        # isotropic
+        kernels = blur_kernels.batched_bivariate_kernels(
+            7, sig_x, beta=beta, kernel_type=kernel_type)
+        kwargs = dict() if kernel_type == 'gaussian' else dict(beta=beta[1])
+        np.testing.assert_allclose(
+            kernels[1],
+            func(7, sig_x[1], None, None, **kwargs),
+            rtol=1e-5,
+            atol=1e-7)
+
+    omega = np.array([0.5, 2.])
+    kernels = blur_kernels.batched_circular_lowpass_kernels(5, omega, 7)
+    assert kernels.shape == (2, 7, 7)
+    for i in range(2):
+        np.testing.assert_allclose(
+            kernels[i],
+            blur_kernels.random_circular_lowpass_kernel([omega[i]] * 2, 5, 7))
+
+    kernel_list = [
+        'iso', 'aniso', 'generalized_iso', 'generalized_aniso', 'plateau_iso',
+        'plateau_aniso', 'sinc'
+    ]
+    kernels = blur_kernels.random_mixed_kernels_batch(
+        20, kernel_list, [1 / 7] * 7, 9, noise_range=[0.8, 1.2])
+    assert kernels.shape == (20, 9, 9)
+    np.testing.assert_allclose(kernels.sum(axis=(1, 2)), 1)
+    with pytest.raises(ValueError):
+        blur_kernels.random_mixed_kernels_batch(2, ['skew'], [1], 9)
+
+
+def test_batched_filter2d():
+    kernels = blur_kernels.random_mixed_kernels_batch(3, ['aniso'], [1], 15)
+    for shape, dtype in [((20, 24, 3), np.float32), ((20, 24), np.uint8),
+                         ((6, 6, 3), np.float32)]:
+        imgs = [(np.random.rand(*shape) * 255).astype(dtype) for _ in range(3)]
+        outputs = blur_kernels.batched_filter2d(imgs, kernels)
+        for img, kernel, output in zip(imgs, kernels, outputs):
+            target = cv2.filter2D(img, -1, kernel)
+            assert output.dtype == dtype and output.shape == shape
+            np.testing.assert_allclose(
+                output.astype(np.float32), target, atol=1 + 1e-3)
+            if dtype == np.float32:
+                np.testing.assert_allclose(output, target, atol=1e-3)
+
+    # fallback to cv2.filter2D without torch.fft
+    with patch.object(blur_kernels, 'HAS_TORCH_FFT', False):
+        imgs = [np.random.rand(20, 24, 3).astype(np.float32) for _ in range(3)]
+        outputs = blur_kernels.batched_filter2d(imgs, kernels)
+    for img, kernel, output in zip(imgs, kernels, outputs):
+        np.testing.assert_array_equal(output, cv2.filter2D(img, -1, kernel))
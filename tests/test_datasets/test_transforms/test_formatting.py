@@ -32,6 +32,24 @@ def test_images_to_tensor():
     tensor = images_to_tensor(data)
     assert tensor == torch.tensor(1)
 
+    # frames are copied into one buffer
+    data = [np.random.randint(0, 255, (8, 9, 3), dtype=np.uint8)] * 4
+    target = torch.stack([to_tensor(v).permute(2, 0, 1) for v in data])
+    tensor = images_to_tensor(data)
+    assert tensor.is_contiguous() and torch.equal(tensor, target)
+    tensor = images_to_tensor(data, channels_last=True)
+    assert tensor.permute(0, 2, 3, 1).is_contiguous()
+    assert torch.equal(tensor, target)
+    # frames of different shapes fall back to stacking
+    data = [np.random.rand(8, 9), np.random.rand(8, 9, 1)]
+    assert images_to_tensor(data).shape == (2, 1, 8, 9)
+
+    # a view of the image with channels-last strides
+    data = np.random.rand(8, 9, 3)
+    tensor = images_to_tensor(data, channels_last=True)
+    assert tensor.shape == (3, 8, 9)
+    assert tensor.data_ptr() == data.ctypes.data
+
 
 def test_pack_edit_inputs():
 
@@ -130,6 +148,16 @@ def test_pack_edit_inputs():
     ]
     assert all([k in target_keys for k in packed_results['inputs']])
 
+    # test packing without copies
+    frames = [np.random.rand(16, 16, 3) for _ in range(7)]
+    pack_edit_inputs = PackEditInputs(channels_last=True, share_input=True)
+    packed_results = pack_edit_inputs(dict(img=frames, gt=frames))
+    inputs = packed_results['inputs']
+    assert inputs.shape == (7, 3, 16, 16)
+    assert inputs.permute(0, 2, 3, 1).is_contiguous()
+    assert packed_results['data_samples'].input.data is inputs
+    assert torch.equal(inputs, packed_results['data_samples'].gt_img.data)
+
 
 def test_to_tensor():
 
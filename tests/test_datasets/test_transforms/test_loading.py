@@ -7,10 +7,11 @@ import pytest
 from mmengine.fileio.backends import LocalBackend
 
 from mmedit.datasets.transforms import (GetSpatialDiscountMask,
-                                        LoadImageFromFile, LoadMask)
+                                        LoadImageFromFile, LoadMask,
+                                        LoadPairedImageFromFile)
 
 
-def test_load_image_from_file():
+def test_load_image_from_file(tmp_path):
 
     path_baboon = Path(
         __file__).parent.parent.parent / 'data' / 'image' / 'gt' / 'baboon.png'
@@ -145,6 +146,31 @@ def test_load_image_from_file():
     assert results['ori_img_shape'] == (h // 4, w // 4, 3)
     assert results['img_path'] == path_baboon
 
+    # test packed shards
+    from mmedit.datasets.packed_shards import PackedShardWriter
+    db_path = str(tmp_path / 'packed')
+    with PackedShardWriter(db_path) as writer:
+        writer.add([('gt/baboon.png', path_baboon.read_bytes(), 'png'),
+                    ('lq/baboon_x4.png', img_baboon_x4, 'raw')])
+    results = dict(gt_path=path_baboon, img_path=[path_baboon_x4] * 2)
+    for key in ['gt', 'img']:
+        config = dict(
+            key=key,
+            channel_order='rgb',
+            backend_args=dict(backend='packed', db_path=db_path))
+        results = LoadImageFromFile(**config)(results)
+    np.testing.assert_almost_equal(results['gt'], mmcv.bgr2rgb(img_baboon))
+    assert len(results['img']) == 2
+    np.testing.assert_almost_equal(results['img'][1],
+                                   mmcv.bgr2rgb(img_baboon_x4))
+    assert results['img'][0].flags.writeable
+    config = dict(
+        key='img',
+        color_type='grayscale',
+        backend_args=dict(backend='packed', db_path=db_path))
+    results = LoadImageFromFile(**config)(dict(img_path=path_baboon_x4))
+    assert results['img'].shape == (h // 4, w // 4, 1)
+
     # convert to y-channel (ValueError)
     results = dict(gt_path=path_baboon)
     config = dict(key='gt', to_y_channel=True, channel_order='gg')
@@ -171,6 +197,30 @@ def test_load_image_from_file():
         assert results['img'] == 'openmmlab:s3://abcd/efg/'
 
 
+def test_load_paired_image_from_file():
+    path_baboon = Path(
+        __file__).parent.parent.parent / 'data' / 'image' / 'gt' / 'baboon.png'
+    img_baboon = mmcv.imread(str(path_baboon), flag='color')
+    h, w, _ = img_baboon.shape
+
+    # positional arguments keep their order
+    image_loader = LoadImageFromFile('gt', 'color', 'bgr', None, False, True)
+    assert image_loader.to_float32 and image_loader.cache_cfg is None
+
+    for cache_cfg in [None, dict(mode='pixels')]:
+        image_loader = LoadPairedImageFromFile(
+            key='pair', to_float32=True, cache_cfg=cache_cfg)
+        assert image_loader.to_float32
+        for _ in range(2):
+            results = image_loader(dict(pair_path=str(path_baboon)))
+            assert results['pair'].dtype == np.float32
+            np.testing.assert_array_equal(results['img_A'],
+                                          img_baboon[:, :w // 2])
+            np.testing.assert_array_equal(results['img_B'],
+                                          img_baboon[:, w // 2:])
+    assert image_loader.cache.stats()['hits'] == 1
+
+
 def test_dct_mask():
     mask = np.zeros((64, 64, 1))
     mask[20:40, 20:40] = 1.
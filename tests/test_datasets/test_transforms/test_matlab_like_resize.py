@@ -3,6 +3,9 @@ import numpy as np
 import pytest
 
 from mmedit.datasets.transforms import MATLABLikeResize
+from mmedit.datasets.transforms.matlab_like_resize import (_cubic,
+                                                           get_weights_indices,
+                                                           resize_along_dim)
 
 
 def test_matlab_like_resize():
@@ -35,3 +38,42 @@ def test_matlab_like_resize():
     assert repr(imresize) == imresize.__class__.__name__ \
         + "(keys=['lq'], scale=None, output_shape=(6, 6), " \
         + 'kernel=bicubic, kernel_width=4.0)'
+
+
+def test_matlab_like_resize_batch():
+    imgs = [np.random.rand(20, 18, 3) * 255 for _ in range(3)]
+    imresize = MATLABLikeResize(keys=['lq'], scale=0.5)
+
+    # frames of the same size are resized as a batch
+    results = imresize(dict(lq=[img.copy() for img in imgs]))
+    assert len(results['lq']) == 3
+    for img, output in zip(imgs, results['lq']):
+        assert output.shape == (10, 9, 3)
+        np.testing.assert_allclose(
+            output, imresize(dict(lq=img))['lq'], rtol=1e-5, atol=1e-4)
+
+    # weights and indices are cached and read-only
+    get_weights_indices.cache_clear()
+    weights, indices = get_weights_indices(20, 10, 0.5, _cubic, 4.0)
+    assert get_weights_indices(20, 10, 0.5, _cubic, 4.0)[0] is weights
+    assert get_weights_indices.cache_info().hits == 1
+    with pytest.raises(ValueError):
+        weights[0] = 0
+
+
+def test_resize_along_dim():
+    img = np.random.rand(2, 20, 18, 3).astype(np.float32) * 255
+    for dim, input_length in [(1, 20), (2, 18)]:
+        weights, indices = get_weights_indices(input_length, 7, 0.35, _cubic,
+                                               4.0)
+        output = resize_along_dim(img, weights, indices, dim)
+        assert output.dtype == np.float64
+        assert output.shape[dim] == 7
+
+        # compare with the per-output-pixel taps
+        for i in range(7):
+            w = weights[i].ravel().astype(np.float64)
+            taps = np.take(img, indices[i].ravel(), axis=dim)
+            target = np.tensordot(taps, w, axes=([dim], [0]))
+            np.testing.assert_allclose(
+                np.take(output, i, axis=dim), target, rtol=1e-12)
@@ -322,6 +322,30 @@ def test_random_blur():
     results = model(results)
     assert results['lq'].shape == (8, 8, 3)
 
+    # frames are blurred in a batch, with kernels varying by steps
+    model = RandomBlur(
+        params=dict(
+            kernel_size=[7, 21],
+            kernel_list=['generalized_aniso', 'plateau_iso', 'sinc'],
+            kernel_prob=[0.4, 0.3, 0.3],
+            sigma_x=[0.2, 3],
+            sigma_y=[0.2, 3],
+            rotate_angle=[-3.1416, 3.1416],
+            sigma_x_step=0.02,
+            sigma_y_step=0.02,
+            rotate_angle_step=0.31416,
+            beta_gaussian_step=0.05,
+            beta_plateau_step=0.1,
+            omega_step=0.0628),
+        keys=['lq'])
+    for _ in range(5):
+        kernels = model.get_kernel(4)
+        assert kernels.shape[0] == 4 and kernels.shape[1] in [7, 21]
+        np.testing.assert_allclose(kernels.sum(axis=(1, 2)), 1)
+    frames = [np.random.rand(32, 32, 3).astype(np.float32) for _ in range(4)]
+    outputs = model(dict(lq=frames))['lq']
+    assert len(outputs) == 4 and outputs[0].shape == (32, 32, 3)
+
     # skip degradation
     params = dict(
         kernel_size=[15],
@@ -169,6 +169,49 @@ class TestEMA:
                 torch.tensor([0.25, 0.5]),
                 momentum=0.6)
 
+    @torch.no_grad()
+    def test_fused_ema_hook(self):
+        for flatten, buffer_interval in [(False, 1), (True, 1), (True, 2),
+                                         (False, 0)]:
+            cfg_ = deepcopy(self.default_config)
+            cfg_.update(
+                dict(
+                    interp_cfg=dict(momentum=0.3, momentum_nontrainable=0.6),
+                    start_iter=1,
+                    flatten=flatten,
+                    buffer_interval=buffer_interval))
+            ema = ExponentialMovingAverageHook(**cfg_)
+            ref_ema = ExponentialMovingAverageHook(**cfg_)
+            ref_ema.fused = False
+            runner, ref_runner = SimpleRunner(), SimpleRunner()
+            for _ in range(4):
+                for r in [runner, ref_runner]:
+                    r.model.module_a.a.data += 1.
+                    r.model.module_a.b += 1.
+                ema.after_train_iter(runner, 1)
+                ref_ema.after_train_iter(ref_runner, 1)
+                states = runner.model.module_a_ema.state_dict()
+                ref_states = ref_runner.model.module_a_ema.state_dict()
+                assert torch.allclose(states['a'], ref_states['a'])
+                if buffer_interval == 1:
+                    assert torch.allclose(states['b'], ref_states['b'])
+                runner.iter += 1
+                ref_runner.iter += 1
+            if buffer_interval == 0:
+                # buffers are only copied before ``start_iter``
+                assert torch.equal(states['b'], torch.tensor([3., 4.]))
+
+    def test_fused_ema_hook_without_foreach(self):
+        # fallback to ``lerp_`` of each tensor in older PyTorch
+        foreach_lerp = getattr(torch, '_foreach_lerp_', None)
+        if foreach_lerp is not None:
+            del torch._foreach_lerp_
+        try:
+            self.test_fused_ema_hook()
+        finally:
+            if foreach_lerp is not None:
+                torch._foreach_lerp_ = foreach_lerp
+
     @pytest.mark.skipif(not torch.cuda.is_available(), reason='requires cuda')
     def test_ema_hook_cuda(self):
         ema = ExponentialMovingAverageHook(**self.default_config)
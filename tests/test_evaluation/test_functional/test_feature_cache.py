@@ -0,0 +1,251 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import os
+import os.path as osp
+import platform
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pytest
+import torch
+import torch.distributed as torch_dist
+import torch.multiprocessing as mp
+from torch.utils.data import DataLoader, Dataset
+
+from mmedit.evaluation.functional import (FeatureCache, FeatureStats,
+                                          get_dataset_fingerprints,
+                                          prepare_inception_feat,
+                                          prepare_vgg_feat)
+
+
+class ToyDataset(Dataset):
+
+    def __init__(self, data_root, num_items):
+        self.data_root = data_root
+        self.data_prefix = dict(img='')
+        self.metainfo = dict()
+        self.pipeline = 'toy_pipeline'
+        self.paths = []
+        for idx in range(num_items):
+            path = osp.join(data_root, f'{idx:03d}.npy')
+            if not osp.exists(path):
+                np.save(path, np.random.rand(3, 4, 4) * 255)
+            self.paths.append(path)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def get_data_info(self, idx):
+        return dict(img_path=self.paths[idx], sample_idx=idx)
+
+    def __getitem__(self, idx):
+        return dict(inputs=torch.from_numpy(np.load(self.paths[idx])))
+
+
+def toy_preprocessor(data):
+    return dict(inputs=torch.stack(data['inputs']))
+
+
+class ToyMetric:
+
+    def __init__(self, cache_dir, real_nums=-1):
+        self.prefix = 'toy'
+        self.real_key = None
+        self.real_nums = real_nums
+        self.inception_pkl = None
+        self.vgg16_pkl = None
+        self.inception = self.vgg16 = 'toy_extractor'
+        self.inception_style = 'toy'
+        self.use_tero_scirpt = False
+        self.feat_cache_cfg = dict(cache_dir=cache_dir)
+        self.num_extracted = 0
+
+    def forward_inception(self, img):
+        self.num_extracted += img.shape[0]
+        return img.flatten(1)[:, :8] * 10
+
+    extract_features = forward_inception
+
+
+def test_dataset_fingerprints():
+    with TemporaryDirectory() as tmp_dir:
+        dataset = ToyDataset(tmp_dir, 4)
+        fingerprints = get_dataset_fingerprints(dataset)
+        assert len(set(fingerprints)) == 4
+        assert get_dataset_fingerprints(dataset, 2) == fingerprints[:2]
+
+        # sample_idx is ignored
+        dataset.paths = dataset.paths[1:]
+        assert get_dataset_fingerprints(dataset) == fingerprints[1:]
+
+        # modified files get new fingerprints
+        np.save(dataset.paths[0], np.zeros((3, 5, 5)))
+        assert get_dataset_fingerprints(dataset)[0] != fingerprints[1]
+
+
+def test_feature_cache():
+    feats = np.random.rand(10, 4).astype(np.float32)
+    fingerprints = [f'fp{idx}' for idx in range(10)]
+
+    def stats_of(feat):
+        stats = FeatureStats()
+        stats.append(feat)
+        return stats
+
+    with TemporaryDirectory() as tmp_dir:
+        cache = FeatureCache(tmp_dir, shard_size=3)
+        key = cache.get_key(dict(extractor='toy'))
+        assert key == cache.get_key(dict(extractor='toy'))
+        assert cache.load(key, fingerprints) is None
+
+        # save the statistics only
+        cache.save(key, fingerprints[:6], stats=stats_of(feats[:6]))
+        results = cache.load(key, fingerprints)
+        assert results['found'] == list(range(6))
+        assert results['missing'] == list(range(6, 10))
+        np.testing.assert_allclose(results['stats'].mean, feats[:6].mean(0))
+        # raw features are not saved
+        assert cache.load(key, fingerprints, need_feats=True) is None
+        # the statistics can not be computed for a subset of cached items
+        assert cache.load(key, fingerprints[:3]) is None
+
+        # save the raw features
+        cache.save(
+            key, fingerprints[:6], stats=stats_of(feats[:6]), feats=feats[:6])
+        shards = [f for f in os.listdir(osp.join(tmp_dir, key)) if 'feat' in f]
+        assert len(shards) == 2
+        results = cache.load(
+            key, fingerprints[4:0:-1], need_stats=True, need_feats=True)
+        assert results['found'] == [0, 1, 2, 3]
+        np.testing.assert_array_equal(results['feats'], feats[4:0:-1])
+        np.testing.assert_allclose(results['stats'].mean, feats[1:5].mean(0))
+
+        # the dataset grows, old shards are kept
+        cache.save(key, fingerprints, stats=stats_of(feats), feats=feats)
+        files = os.listdir(osp.join(tmp_dir, key))
+        new_shards = [f for f in files if 'feat' in f]
+        assert set(shards) < set(new_shards) and len(new_shards) == 4
+        # the replaced statistics are kept for readers of the old meta
+        assert len([f for f in files if 'stats' in f]) == 3
+        assert not any(f.endswith('.tmp') for f in files)
+        cache.stale_time = 0
+        cache.save(key, fingerprints, stats=stats_of(feats), feats=feats)
+        files = os.listdir(osp.join(tmp_dir, key))
+        assert len([f for f in files if 'stats' in f]) == 2
+        cache.save(key, fingerprints, stats=stats_of(feats), feats=feats)
+        files = os.listdir(osp.join(tmp_dir, key))
+        assert len([f for f in files if 'stats' in f]) == 2
+        assert len([f for f in files if 'feat' in f]) == 4
+        results = cache.load(key, fingerprints, need_feats=True)
+        assert results['missing'] == []
+        np.testing.assert_array_equal(results['feats'], feats)
+        np.testing.assert_allclose(
+            results['stats'].cov, np.cov(feats, rowvar=False), atol=1e-6)
+
+        # evict the least recently used entries
+        cache.max_size = 1
+        other_key = cache.get_key(dict(extractor='other'))
+        cache.save(other_key, fingerprints, feats=feats)
+        assert os.listdir(tmp_dir) == [other_key]
+        assert cache.evict() == [other_key]
+        assert os.listdir(tmp_dir) == []
+
+        with pytest.raises(AssertionError):
+            cache.save(key, fingerprints)
+
+
+def test_prepare_feat_with_cache():
+    with TemporaryDirectory() as data_root, \
+            TemporaryDirectory() as cache_dir:
+        dataset = ToyDataset(data_root, 5)
+        dataloader = DataLoader(dataset, batch_size=2)
+        metric = ToyMetric(cache_dir)
+        target = torch.stack([dataset[i]['inputs']
+                              for i in range(5)]) / 127.5 - 1
+        target = target.flatten(1)[:, :8].double().numpy() * 10
+
+        state = prepare_inception_feat(
+            dataloader, metric, toy_preprocessor, capture_mean_cov=True)
+        assert metric.num_extracted == 5
+        np.testing.assert_allclose(state['real_mean'], target.mean(0))
+        np.testing.assert_allclose(
+            state['real_cov'], np.cov(target, rowvar=False), atol=1e-6)
+
+        # load from the cache
+        state = prepare_inception_feat(
+            dataloader, metric, toy_preprocessor, capture_mean_cov=True)
+        assert metric.num_extracted == 5
+        np.testing.assert_allclose(state['real_mean'], target.mean(0))
+
+        # the dataset grows, only the new items are extracted
+        dataset = ToyDataset(data_root, 7)
+        dataloader = DataLoader(dataset, batch_size=2)
+        target = torch.stack([dataset[i]['inputs']
+                              for i in range(7)]) / 127.5 - 1
+        target = target.flatten(1)[:, :8].double().numpy() * 10
+        state = prepare_inception_feat(
+            dataloader, metric, toy_preprocessor, capture_mean_cov=True)
+        assert metric.num_extracted == 7
+        np.testing.assert_allclose(state['real_mean'], target.mean(0))
+        np.testing.assert_allclose(
+            state['real_cov'], np.cov(target, rowvar=False), atol=1e-6)
+
+        # raw features
+        metric.real_nums = 6
+        state = prepare_inception_feat(
+            dataloader, metric, toy_preprocessor, capture_all=True)
+        assert metric.num_extracted == 13
+        np.testing.assert_allclose(state['raw_feature'], target[:6], rtol=1e-6)
+
+        feat = prepare_vgg_feat(dataloader, metric, toy_preprocessor)
+        assert metric.num_extracted == 20
+        np.testing.assert_allclose(feat.numpy(), target, rtol=1e-6)
+        feat = prepare_vgg_feat(dataloader, metric, toy_preprocessor)
+        assert metric.num_extracted == 20
+        np.testing.assert_allclose(feat.numpy(), target, rtol=1e-6)
+
+
+def _dist_prepare_feat(rank, world_size, data_root, cache_dir):
+    os.environ['MASTER_ADDR'] = '127.0.0.1'
+    os.environ['MASTER_PORT'] = '29515'
+    torch_dist.init_process_group(
+        backend='gloo', rank=rank, world_size=world_size)
+
+    dataset = ToyDataset(data_root, 7)
+    dataloader = DataLoader(dataset, batch_size=2)
+    metric = ToyMetric(cache_dir)
+    target = torch.stack([dataset[i]['inputs'] for i in range(7)]) / 127.5 - 1
+    target = target.flatten(1)[:, :8].double().numpy() * 10
+
+    state = prepare_inception_feat(
+        dataloader,
+        metric,
+        toy_preprocessor,
+        capture_mean_cov=True,
+        capture_all=True)
+    # each rank only extracts its own shard
+    assert metric.num_extracted == 4
+    feat = prepare_vgg_feat(dataloader, metric, toy_preprocessor)
+    assert metric.num_extracted == 8
+    if rank == 0:
+        np.testing.assert_allclose(state['real_mean'], target.mean(0))
+        np.testing.assert_allclose(
+            state['real_cov'], np.cov(target, rowvar=False), atol=1e-6)
+        np.testing.assert_allclose(state['raw_feature'], target, rtol=1e-6)
+        np.testing.assert_allclose(feat.numpy(), target, rtol=1e-6)
+    else:
+        assert state is None and feat is None
+
+    # load from the cache
+    prepare_inception_feat(
+        dataloader, metric, toy_preprocessor, capture_mean_cov=True)
+    assert metric.num_extracted == 8
+    torch_dist.destroy_process_group()
+
+
+@pytest.mark.skipif(
+    platform.system() == 'Windows', reason='gloo is not tested on Windows')
+def test_dist_prepare_feat():
+    with TemporaryDirectory() as data_root, \
+            TemporaryDirectory() as cache_dir:
+        ToyDataset(data_root, 7)
+        mp.spawn(_dist_prepare_feat, args=(2, data_root, cache_dir), nprocs=2)
@@ -0,0 +1,70 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+import torch
+
+from mmedit.evaluation.functional import FeatureStats
+
+
+def test_feature_stats():
+    feats = np.random.rand(37, 16) * 10
+
+    stats = FeatureStats()
+    for feat in np.split(feats, [5, 6, 20]):
+        stats.append(torch.from_numpy(feat).float())
+    assert stats.num_items == 37
+    assert not stats.is_full
+    feats_fp32 = feats.astype(np.float32).astype(np.float64)
+    np.testing.assert_allclose(stats.mean, np.mean(feats_fp32, 0))
+    np.testing.assert_allclose(
+        stats.cov, np.cov(feats_fp32, rowvar=False), atol=1e-10)
+
+    # test max_items and numpy inputs
+    stats = FeatureStats(max_items=10)
+    stats.append(feats[:6])
+    stats.append(feats[6:])
+    assert stats.num_items == 10
+    assert stats.is_full
+    np.testing.assert_allclose(stats.mean, np.mean(feats[:10], 0))
+    np.testing.assert_allclose(
+        stats.cov, np.cov(feats[:10], rowvar=False), atol=1e-10)
+    stats.append(feats)
+    assert stats.num_items == 10
+
+    # all_reduce is a no-op in non-distributed environment
+    assert stats.all_reduce() is stats
+    assert stats.num_items == 10
+
+    stats.reset()
+    assert stats.num_items == 0
+    with pytest.raises(AssertionError):
+        stats.mean
+
+
+def test_feature_stats_all_reduce_empty_rank():
+    # the other rank accumulates all the features
+    other = FeatureStats()
+    other.append(np.random.rand(5, 16))
+    # num_features, num_items, raw_sum and raw_outer of the other rank
+    other_states = [torch.tensor(16.), torch.tensor(5.)]
+    other_states = iter(other_states + [other.raw_sum, other.raw_outer])
+
+    def all_reduce(data, op='sum'):
+        other_data = next(other_states).to(data)
+        if op == 'max':
+            data.copy_(torch.max(data, other_data))
+        else:
+            data.add_(other_data)
+
+    stats = FeatureStats(max_items=0)
+    module = 'mmedit.evaluation.functional.feature_stats'
+    with patch(f'{module}.get_world_size', return_value=2), \
+            patch(f'{module}.get_comm_device',
+                  return_value=torch.device('cpu')), \
+            patch(f'{module}.all_reduce', all_reduce):
+        assert stats.all_reduce() is stats
+    assert stats.num_items == 5
+    np.testing.assert_allclose(stats.mean, other.mean)
+    np.testing.assert_allclose(stats.cov, other.cov)
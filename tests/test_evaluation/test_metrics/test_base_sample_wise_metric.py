@@ -52,3 +52,29 @@ def test_process():
     metric.process(data_batch, predictions)
     assert len(metric.results) == 2
     assert metric.results[0]['metric'] == 0
+
+
+def test_process_batch():
+
+    class ToyMetric(base_sample_wise_metric.BaseSampleWiseMetric):
+        metric = 'metric'
+
+        def process_image(self, gt, pred, mask):
+            return float(abs(gt - pred).mean())
+
+    # images of different sizes, and a video
+    shapes = [(3, 8, 8), (3, 8, 8), (3, 4, 4), (5, 3, 8, 8)]
+    data_samples = []
+    for shape in shapes:
+        gt = np.random.rand(*shape)
+        pred = np.random.rand(*shape)
+        data_samples.append(dict(gt_img=gt, output=dict(pred_img=pred)))
+
+    metric = ToyMetric()
+    metric.max_batch_elements = 3 * 8 * 8 * 2
+    metric.process(None, data_samples)
+    assert len(metric.results) == len(shapes)
+    for data_sample, result in zip(data_samples, metric.results):
+        target = abs(data_sample['gt_img'] -
+                     data_sample['output']['pred_img']).mean()
+        np.testing.assert_almost_equal(result['metric'], target)
@@ -132,9 +132,11 @@ class TestFID(TestCase):
             for i in range(4)
         ]
         fid.process(None, gen_samples)
+        self.assertEqual(fid.fake_stats.num_items, 2)
         fid.process(None, gen_samples)
+        self.assertEqual(fid.fake_stats.num_items, 2)
 
-        fid.fake_results.clear()
+        fid.fake_stats.reset()
         gen_sample = [
             EditDataSample(
                 orig=EditDataSample(fake=PixelData(
@@ -173,6 +175,77 @@ class TestFID(TestCase):
         self.assertTrue('fid' in metric)
         self.assertTrue('mean' in metric)
         self.assertTrue('cov' in metric)
+        self.assertEqual(fid.fake_stats.num_items, 0)
+
+        # test list of features
+        feats = [torch.randn(1, 2048) for _ in range(4)]
+        metric_list = fid.compute_metrics(feats)
+        fid.fake_stats.max_items = None
+        for feat in feats:
+            fid.fake_stats.append(feat)
+        metric_stats = fid.compute_metrics(fid.fake_stats)
+        for key in ['fid', 'mean', 'cov']:
+            self.assertAlmostEqual(metric_list[key], metric_stats[key])
+
+    def test_fewer_fake_nums_than_ranks(self):
+        with patch.object(FrechetInceptionDistance, '_load_inception',
+                          self.mock_inception_stylegan):
+            fid = FrechetInceptionDistance(
+                fake_nums=1,
+                real_nums=2,
+                real_key='real',
+                fake_key='fake',
+                inception_pkl=self.inception_pkl)
+        gen_samples = [
+            EditDataSample(fake=PixelData(
+                data=torch.randn(3, 2, 2))).to_dict()
+        ]
+        # the second rank has no share of `fake_nums`
+        with patch(
+                'mmedit.evaluation.metrics.fid.get_dist_info',
+                return_value=(1, 2)):
+            self.assertEqual(fid.fake_nums_per_rank, 0)
+            fid.process(None, gen_samples)
+        self.assertEqual(fid.fake_stats.num_items, 0)
+
+        def all_reduce(data, op='sum'):
+            # the first rank has accumulated the 2048-d feature of one image
+            if op == 'max':
+                data.fill_(2048)
+            elif data.ndim == 0:
+                data.add_(1)
+
+        module = 'mmedit.evaluation.functional.feature_stats'
+        with patch(f'{module}.get_world_size', return_value=2), \
+                patch(f'{module}.get_comm_device',
+                      return_value=torch.device('cpu')), \
+                patch(f'{module}.all_reduce', all_reduce):
+            fake_stats = fid._collect_target_results('fake')
+        self.assertEqual(fake_stats.num_items, 1)
+        self.assertEqual(fake_stats.raw_outer.shape, (2048, 2048))
+
+    def test_calc_fid_eigh(self):
+        rng = np.random.RandomState(0)
+        feat_fake, feat_real = rng.rand(100, 64), rng.rand(100, 64) + 0.1
+        args = (feat_fake.mean(0), np.cov(feat_fake, rowvar=False),
+                feat_real.mean(0), np.cov(feat_real, rowvar=False))
+        res_sqrtm = FrechetInceptionDistance._calc_fid(*args)
+        res_eigh = FrechetInceptionDistance._calc_fid(
+            *args, sqrt_method='eigh')
+        np.testing.assert_allclose(res_sqrtm, res_eigh, rtol=1e-6)
+
+        # test singular covariance
+        feat_fake = feat_fake[:10]
+        args = (feat_fake.mean(0), np.cov(feat_fake, rowvar=False),
+                feat_real.mean(0), np.cov(feat_real, rowvar=False))
+        res_eigh = FrechetInceptionDistance._calc_fid(
+            *args, sqrt_method='eigh')
+        self.assertTrue(np.isfinite(res_eigh).all())
+
+        with patch.object(FrechetInceptionDistance, '_load_inception',
+                          self.mock_inception_stylegan):
+            with pytest.raises(AssertionError):
+                FrechetInceptionDistance(fake_nums=2, sqrt_method='svd')
 
 
 class TestTransFID:
@@ -257,7 +330,7 @@ class TestTransFID:
             predictions = self.module.test_step(data_batch)
             _data_batch, _predictions = process_fn(data_batch, predictions)
             fid.process(_data_batch, _predictions)
-        fid_res = fid.compute_metrics(fid.fake_results)
+        fid_res = fid.compute_metrics(fid.fake_stats)
         assert fid_res['fid'] >= 0 and fid_res['mean'] >= 0 and fid_res[
             'cov'] >= 0
 
@@ -276,6 +349,6 @@ class TestTransFID:
             predictions = self.module.test_step(data_batch)
             _data_batch, _predictions = process_fn(data_batch, predictions)
             fid.process(_data_batch, _predictions)
-        fid_res = fid.compute_metrics(fid.fake_results)
+        fid_res = fid.compute_metrics(fid.fake_stats)
         assert fid_res['fid'] >= 0 and fid_res['mean'] >= 0 and fid_res[
             'cov'] >= 0
@@ -25,6 +25,24 @@ def test_img_transform():
     assert new_img.shape == (4, 4, 3)
 
 
+def test_batch_img_transform():
+    imgs = np.random.randint(0, 255, size=(2, 8, 8, 3))
+    for convert_to in [None, 'Y']:
+        new_imgs = metrics_utils.batch_img_transform(imgs, 2, 'HWC',
+                                                     convert_to, 'bgr')
+        for img, new_img in zip(imgs, new_imgs):
+            target = metrics_utils.img_transform(img, 2, 'HWC', convert_to,
+                                                 'bgr')
+            np.testing.assert_allclose(
+                new_img.transpose(1, 2, 0), target, rtol=1e-6)
+
+    new_imgs = metrics_utils.batch_img_transform(imgs[..., 0], 0, 'CHW')
+    assert new_imgs.shape == (2, 1, 8, 8)
+
+    with pytest.raises(ValueError):
+        metrics_utils.batch_img_transform(imgs, 0, 'HWC', 'Y', 'abc')
+
+
 def test_obtain_data():
     img = np.random.randint(0, 255, size=(4, 4, 3))
     key = 'img'
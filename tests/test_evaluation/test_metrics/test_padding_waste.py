@@ -0,0 +1,22 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import numpy as np
+import torch
+
+from mmedit.evaluation.metrics import PaddingWaste
+
+
+def test_padding_waste():
+    metric = PaddingWaste()
+    metric.process(
+        dict(inputs=[torch.rand(3, 8, 6),
+                     torch.rand(3, 4, 8)]), [dict(), dict()])
+    metric.process(dict(inputs=torch.rand(2, 3, 4, 4)), [dict(), dict()])
+    result = metric.compute_metrics(metric.results)
+    # (8 * 8 * 2 - 48 - 32) / (8 * 8 * 2 + 32)
+    np.testing.assert_almost_equal(result['PaddingWaste'], 0.3)
+
+    metric = PaddingWaste(pad_size_divisor=8)
+    metric.process(dict(inputs=[torch.rand(3, 4, 4)]), [dict()])
+    result = metric.compute_metrics(metric.results)
+    np.testing.assert_almost_equal(result['PaddingWaste'], 0.75)
+    assert metric.compute_metrics([]) == dict(PaddingWaste=0.)
@@ -9,6 +9,8 @@ from mmengine.runner import Runner
 from mmedit.datasets import BasicImageDataset
 from mmedit.datasets.transforms import PackEditInputs
 from mmedit.evaluation import PrecisionAndRecall
+from mmedit.evaluation.metrics.precision_and_recall import (
+    compute_pr_distances, compute_pr_kth_distances, compute_pr_within_radii)
 from mmedit.models import LSGAN, GenDataPreprocessor
 from mmedit.models.editors.dcgan import DCGANGenerator
 from mmedit.utils import register_all_modules
@@ -96,3 +98,41 @@ class TestPR:
         pr_score = pr.evaluate()
         print(pr_score)
         assert pr_score['precision'] >= 0 and pr_score['recall'] >= 0
+
+    def test_pr_blocked(self):
+        torch.manual_seed(0)
+        real_feats = torch.randn(37, 8)
+        fake_feats = torch.randn(29, 8) * 1.2
+
+        # reference: full distance matrix
+        ref = {}
+        for name, manifold, probes in [('precision', real_feats, fake_feats),
+                                       ('recall', fake_feats, real_feats)]:
+            kth = compute_pr_distances(
+                manifold, manifold).kthvalue(4).values.to(torch.float16)
+            dist = compute_pr_distances(probes, manifold)
+            ref[name] = float((dist <= kth).any(dim=1).float().mean())
+
+            kth_blocked = compute_pr_kth_distances(
+                manifold, manifold, k=4, col_batch_size=3)
+            assert torch.allclose(
+                kth_blocked.to(torch.float16).float(),
+                kth.float(),
+                rtol=0,
+                atol=1e-3)
+            pred = compute_pr_within_radii(
+                probes, manifold, kth, col_batch_size=5)
+            assert (pred == (dist <= kth).any(dim=1)).all()
+
+        for num_threads in [1, 3]:
+            with patch.object(PrecisionAndRecall, '_load_vgg',
+                              self.mock_vgg_pytorch):
+                pr = PrecisionAndRecall(
+                    29,
+                    k=3,
+                    row_batch_size=4,
+                    col_batch_size=6,
+                    num_threads=num_threads)
+            pr.results_real = real_feats
+            pr_score = pr.compute_metrics(list(fake_feats.split(1)))
+            assert pr_score == ref
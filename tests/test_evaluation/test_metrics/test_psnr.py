@@ -86,3 +86,28 @@ def test_psnr():
     img_hw_2 = np.ones((32, 32), dtype=np.uint8) * 255
     psnr_result = psnr(img_hw_1, img_hw_2, crop_border=0)
     assert psnr_result == 0
+
+
+def test_psnr_batch():
+    # images and videos in a batch are evaluated with the vectorized path
+    data_samples = []
+    for shape in [(3, 32, 32), (3, 32, 32), (2, 3, 32, 32)]:
+        gt_img = np.random.randint(0, 256, shape).astype(np.float32)
+        pred_img = np.random.randint(0, 256, shape).astype(np.float32)
+        data_samples.append(
+            dict(
+                gt_img=torch.from_numpy(gt_img),
+                output=dict(pred_img=torch.from_numpy(pred_img))))
+
+    psnr_ = PSNR(crop_border=2, convert_to='Y')
+    psnr_.process(None, data_samples)
+    for data_sample, result in zip(data_samples, psnr_.results):
+        gt_img = data_sample['gt_img'].numpy()
+        pred_img = data_sample['output']['pred_img'].numpy()
+        if gt_img.ndim == 3:
+            gt_img, pred_img = gt_img[None], pred_img[None]
+        target = np.mean([
+            psnr(gt, pred, 2, input_order='CHW', convert_to='Y')
+            for gt, pred in zip(gt_img, pred_img)
+        ])
+        np.testing.assert_almost_equal(result['PSNR'], target)
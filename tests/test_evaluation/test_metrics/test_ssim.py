@@ -74,3 +74,28 @@ def test_calculate_ssim():
     np.testing.assert_almost_equal(ssim_result, 0.9130623)
     ssim_result = ssim(img_hwc_1, img_hwc_2, crop_border=0, convert_to='Y')
     np.testing.assert_almost_equal(ssim_result, 0.9987801)
+
+
+def test_ssim_batch():
+    # images and videos in a batch are evaluated with the vectorized path
+    data_samples = []
+    for shape in [(3, 32, 32), (3, 32, 32), (2, 3, 32, 32)]:
+        gt_img = np.random.randint(0, 256, shape).astype(np.float32)
+        pred_img = np.random.randint(0, 256, shape).astype(np.float32)
+        data_samples.append(
+            dict(
+                gt_img=torch.from_numpy(gt_img),
+                output=dict(pred_img=torch.from_numpy(pred_img))))
+
+    ssim_ = SSIM(crop_border=2, convert_to='Y')
+    ssim_.process(None, data_samples)
+    for data_sample, result in zip(data_samples, ssim_.results):
+        gt_img = data_sample['gt_img'].numpy()
+        pred_img = data_sample['output']['pred_img'].numpy()
+        if gt_img.ndim == 3:
+            gt_img, pred_img = gt_img[None], pred_img[None]
+        target = np.mean([
+            ssim(gt, pred, 2, input_order='CHW', convert_to='Y')
+            for gt, pred in zip(gt_img, pred_img)
+        ])
+        np.testing.assert_almost_equal(result['SSIM'], target)
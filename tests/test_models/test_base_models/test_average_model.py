@@ -5,7 +5,7 @@ from unittest import TestCase
 import pytest
 import torch
 import torch.nn as nn
-from mmengine.model import BaseModel
+from mmengine.model import BaseAveragedModel, BaseModel
 from mmengine.testing import assert_allclose
 
 from mmedit.models.base_models import ExponentialMovingAverage, RampUpEMA
@@ -66,6 +66,43 @@ class ToyModel(BaseModel):
         return
 
 
+def _check_update_parameters(ema_type, cfg):
+    """Check the multi-tensor update against
+    ``BaseAveragedModel.update_parameters``."""
+    for update_buffers, flatten in [(False, False), (True, False),
+                                    (False, True), (True, True)]:
+        torch.manual_seed(0)
+        model = ToyModule()
+        cfg_ = dict(cfg, update_buffers=update_buffers)
+        average_model = ema_type(model, flatten=flatten, **cfg_)
+        ref_model = ema_type(model, **cfg_)
+        for _ in range(4):
+            with torch.no_grad():
+                for param in model.parameters():
+                    param.add_(torch.randn_like(param))
+            model.update_buffer()
+            average_model.update_parameters(model)
+            BaseAveragedModel.update_parameters(ref_model, model)
+            for (name,
+                 state), ref_state in zip(average_model.state_dict().items(),
+                                          ref_model.state_dict().values()):
+                assert_allclose(state, ref_state, msg=name)
+        if flatten:
+            conv = average_model.module.conv
+            assert conv.weight.data_ptr() + conv.weight.numel() * \
+                conv.weight.element_size() == conv.bias.data_ptr()
+
+    # skip buffers
+    model = ToyModule()
+    average_model = ema_type(
+        model, buffer_interval=0, **dict(cfg, update_buffers=True))
+    average_model.update_parameters(model)
+    buffer = model.buffer.clone()
+    model.update_buffer()
+    average_model.update_parameters(model)
+    assert_allclose(average_model.module.buffer, buffer)
+
+
 class TestExponentialMovingAverage(TestCase):
 
     @classmethod
@@ -108,6 +145,11 @@ class TestExponentialMovingAverage(TestCase):
         assert_allclose(tar_tensor,
                         tar_tensor_backup * 0.9999 + src_tensor * 0.0001)
 
+    def test_update_parameters(self):
+        cfg = deepcopy(self.default_cfg)
+        cfg['momentum'] = 0.1
+        _check_update_parameters(ExponentialMovingAverage, cfg)
+
     def test_sync_buffer_and_parameters(self):
         cfg = deepcopy(self.default_cfg)
         model = ToyModule()
@@ -183,6 +225,10 @@ class TestRamUpEMA(TestCase):
             tar_tensor = torch.randn(1, 3, 2, 2)
             average_model.avg_func(tar_tensor, src_tensor, steps=42)
 
+    def test_update_parameters(self):
+        cfg = deepcopy(self.default_cfg)
+        _check_update_parameters(RampUpEMA, cfg)
+
     def test_sync_buffer_and_parameters(self):
         cfg = deepcopy(self.default_cfg)
         model = ToyModule()
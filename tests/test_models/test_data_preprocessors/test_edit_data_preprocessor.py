@@ -101,3 +101,45 @@ def test_batch_process():
         stack_batch([])
     with pytest.raises(AssertionError):
         stack_batch([torch.ones((1, 1, 3)), torch.ones((1, 1, 7, 7))])
+
+    # padding modes other than 'constant'
+    tensor_list = [torch.rand((3, 5, 4)), torch.rand((3, 7, 7))]
+    padded_tensor, _ = stack_batch(
+        tensor_list, pad_size_divisor=8, pad_args=dict(mode='replicate'))
+    assert padded_tensor.shape == (2, 3, 8, 8)
+    for tensor, padded in zip(tensor_list, padded_tensor):
+        h, w = tensor.shape[-2:]
+        assert torch.allclose(
+            padded,
+            torch.nn.functional.pad(
+                tensor[None], (0, 8 - w, 0, 8 - h), mode='replicate')[0])
+
+    # padding value of 'constant' mode
+    padded_tensor, _ = stack_batch(tensor_list, pad_args=dict(value=-1))
+    assert padded_tensor.shape == (2, 3, 7, 7)
+    assert torch.allclose(padded_tensor[1], tensor_list[1])
+    assert (padded_tensor[0, :, 5:] == -1).all()
+    assert (padded_tensor[0, :, :, 4:] == -1).all()
+
+    with pytest.raises(AssertionError):
+        stack_batch([torch.ones((1, 3, 3)), torch.ones((3, 7, 7))])
+
+
+def test_destructor_of_images_with_different_sizes():
+    processor = EditDataPreprocessor(pad_size_divisor=4)
+    inputs = [torch.rand(3, 5, 6) * 255, torch.rand(3, 7, 3) * 255]
+    data = processor(
+        dict(inputs=inputs, data_samples=[EditDataSample(),
+                                          EditDataSample()]))
+    assert data['inputs'].shape == (2, 3, 8, 8)
+
+    # de-pad the padded sizes scaled to outputs, e.g. x2 super-resolution
+    outputs = processor.destructor(
+        torch.nn.functional.interpolate(data['inputs'], scale_factor=2))
+    assert outputs.shape == (2, 3, 14, 12)
+    outputs = processor.unpad(outputs)
+    assert [tuple(output.shape) for output in outputs] == [(3, 10, 12),
+                                                           (3, 14, 6)]
+    for _input, output in zip(inputs, outputs):
+        assert torch.allclose(
+            output[:, ::2, ::2], _input, rtol=1e-4, atol=1e-3)
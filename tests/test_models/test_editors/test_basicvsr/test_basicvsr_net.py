@@ -27,3 +27,41 @@ def test_basicvsr_net():
         # The height and width of inputs should be at least 64
         input_tensor = torch.rand(1, 5, 3, 61, 61)
         basicvsr(input_tensor)
+
+
+def forward_chunks(model, inputs, chunk_size, num_lookahead):
+    """Forward a sequence chunk by chunk with look-ahead frames."""
+    length = inputs.size(1)
+    outputs, state = [], None
+    for start in range(0, length, chunk_size):
+        end = min(start + chunk_size, length)
+        lookahead_end = min(end + num_lookahead, length)
+        output, state = model.forward_streaming(
+            inputs[:, start:lookahead_end],
+            state,
+            num_outputs=end - start,
+            end_of_sequence=lookahead_end == length)
+        outputs.append(output)
+    return torch.cat(outputs, dim=1), state
+
+
+def test_basicvsr_net_streaming():
+    basicvsr = BasicVSRNet(mid_channels=8, num_blocks=1).eval()
+    input_tensor = torch.rand(1, 7, 3, 64, 64)
+    with torch.no_grad():
+        target = basicvsr(input_tensor)
+        # the same as the whole sequence if the look-ahead reaches the end
+        for chunk_size in [7, 2, 3]:
+            output, state = forward_chunks(basicvsr, input_tensor, chunk_size,
+                                           7)
+            assert torch.allclose(output, target, atol=1e-5)
+            assert state['start'] == 7 and len(state['flows']) == 0
+
+        # bounded look-ahead
+        output, state = forward_chunks(basicvsr, input_tensor, 2, 2)
+        assert output.shape == target.shape
+        output, state = basicvsr.forward_streaming(
+            input_tensor[:, :4], num_outputs=2)
+        assert output.shape == (1, 2, 3, 256, 256)
+        # the flows of the look-ahead frames are kept for the next chunk
+        assert sorted(state['flows'].keys()) == [1, 2]
@@ -92,3 +92,28 @@ def test_basicvsr_plusplus_cuda():
         input_tensor = torch.rand(1, 5, 3, 256, 256).cuda()
         output = model(input_tensor)
         assert output.shape == (1, 5, 3, 256, 256)
+
+
+def test_basicvsr_plusplus_streaming():
+    model = BasicVSRPlusPlusNet(mid_channels=8, num_blocks=1).eval()
+    input_tensor = torch.rand(1, 6, 3, 64, 64)
+
+    def forward_chunks(chunk_size, num_lookahead):
+        outputs, state = [], None
+        for start in range(0, 6, chunk_size):
+            end = min(start + chunk_size, 6)
+            output, state = model.forward_streaming(
+                input_tensor[:, start:min(end + num_lookahead, 6)],
+                state,
+                num_outputs=end - start)
+            outputs.append(output)
+        return torch.cat(outputs, dim=1)
+
+    with torch.no_grad():
+        target = model(input_tensor)
+        # the same as the whole sequence if the look-ahead reaches the end
+        for chunk_size in [6, 1, 4]:
+            output = forward_chunks(chunk_size, 6)
+            assert torch.allclose(output, target, atol=1e-5)
+        output = forward_chunks(2, 1)
+        assert output.shape == (1, 6, 3, 256, 256)
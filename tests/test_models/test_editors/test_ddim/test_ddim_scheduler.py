@@ -1,4 +1,5 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import numpy as np
 import pytest
 import torch
 
@@ -48,5 +49,35 @@ def test_ddim_step():
     assert result['prev_sample'].shape == (1, 4, 32, 32)
 
 
+def test_ddim_coeff_table():
+    torch.manual_seed(0)
+    sample = torch.rand((3, 4, 8, 8))
+    eps = torch.rand((3, 4, 8, 8))
+    ddim = DDIMScheduler(num_train_timesteps=1000, clip_sample=False)
+    ddim.set_timesteps(10)
+    for t in [900, 500, 0]:
+        result = ddim.step(eps, t, sample, eta=0.5)
+        alpha_prod = ddim.alphas_cumprod[t]
+        alpha_prod_prev = ddim.alphas_cumprod[
+            t - 100] if t >= 100 else ddim.final_alpha_cumprod
+        x0 = (sample - (1 - alpha_prod)**0.5 * eps) / alpha_prod**0.5
+        std = 0.5 * ddim._get_variance(t, t - 100)**0.5
+        mean = alpha_prod_prev**0.5 * x0 + (1 - alpha_prod_prev -
+                                            std**2)**0.5 * eps
+        assert np.allclose(float(result['sigma']), std, atol=1e-6)
+        assert torch.allclose(result['mean'], mean.float(), atol=1e-5)
+
+    # per-sample timesteps
+    timesteps = torch.tensor([900, 500, 0])
+    result = ddim.step(eps, timesteps, sample)
+    for idx, t in enumerate(timesteps.tolist()):
+        single = ddim.step(eps[idx:idx + 1], t, sample[idx:idx + 1])
+        assert torch.allclose(result['mean'][idx:idx + 1], single['mean'])
+
+    # numpy inputs
+    result = ddim.step(eps.numpy(), 500, sample.numpy())
+    assert isinstance(result['mean'], np.ndarray)
+
+
 if __name__ == '__main__':
     test_ddim_step()
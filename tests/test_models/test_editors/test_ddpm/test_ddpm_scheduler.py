@@ -1,4 +1,5 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import numpy as np
 import pytest
 import torch
 
@@ -40,3 +41,50 @@ def test_ddpm_init():
 
     with pytest.raises(Exception):
         DDPMScheduler(beta_schedule='tem')
+
+
+def test_ddpm_coeff_table():
+    torch.manual_seed(0)
+    sample = torch.rand((3, 4, 8, 8))
+    eps = torch.rand((3, 4, 8, 8))
+    ddpm = DDPMScheduler(num_train_timesteps=1000)
+    for t in [0, 1, 500, 999]:
+        result = ddpm.step(eps, t, sample)
+        alpha_prod = ddpm.alphas_cumprod[t]
+        alpha_prod_prev = ddpm.alphas_cumprod[t - 1] if t > 0 else 1.
+        x0 = ((sample - (1 - alpha_prod)**0.5 * eps) /
+              alpha_prod**0.5).clamp(-1, 1)
+        mean = (alpha_prod_prev**0.5 * ddpm.betas[t] * x0 +
+                ddpm.alphas[t]**0.5 *
+                (1 - alpha_prod_prev) * sample) / (1 - alpha_prod)
+        assert torch.allclose(result['mean'], mean.float(), atol=1e-5)
+        sigma = ddpm._get_variance(t)**0.5 if t > 0 else 0
+        assert np.allclose(float(result['sigma']), sigma, atol=1e-6)
+
+    # per-sample timesteps
+    timesteps = torch.tensor([999, 500, 1])
+    result = ddpm.step(eps, timesteps, sample)
+    for idx, t in enumerate(timesteps.tolist()):
+        single = ddpm.step(eps[idx:idx + 1], t, sample[idx:idx + 1])
+        assert torch.allclose(result['mean'][idx:idx + 1], single['mean'])
+
+    noisy = ddpm.add_noise(sample, eps, timesteps)
+    alpha_prod = torch.from_numpy(ddpm.alphas_cumprod[timesteps.numpy()])
+    alpha_prod = alpha_prod.float().view(-1, 1, 1, 1)
+    target = alpha_prod**0.5 * sample + (1 - alpha_prod)**0.5 * eps
+    assert torch.allclose(noisy, target, atol=1e-6)
+
+
+def test_ddpm_learned_variance():
+    sample = torch.rand((2, 4, 8, 8))
+    # negative variances are predicted by an untrained model
+    modelout = torch.cat([torch.rand_like(sample), -torch.rand_like(sample)],
+                         dim=1)
+    ddpm = DDPMScheduler(num_train_timesteps=1000, variance_type='learned')
+    result = ddpm.step(modelout, 0, sample)
+    assert not torch.isnan(result['prev_sample']).any()
+    assert torch.equal(result['prev_sample'], result['mean'])
+
+    result = ddpm.step(modelout, torch.tensor([0, 10]), sample)
+    assert not torch.isnan(result['prev_sample']).any()
+    assert torch.equal(result['prev_sample'][:1], result['mean'][:1])
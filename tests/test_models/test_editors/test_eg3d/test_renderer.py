@@ -108,3 +108,60 @@ class TestEG3DRenderer(TestCase):
                 ray_origins,
                 ray_directions,
                 render_kwargs=render_kwargs)
+
+    def test_chunked_forward(self):
+        nerf_res = self.nerf_res
+        n_tri, tri_feat, tri_res = self.n_tri, self.tri_feat, self.tri_res
+
+        plane = torch.randn(2, n_tri, tri_feat, tri_res, tri_res)
+        ray_origins = torch.randn(2, nerf_res * nerf_res, 3)
+        ray_directions = torch.randn(2, nerf_res * nerf_res, 3)
+
+        cfg_ = deepcopy(self.renderer_cfg)
+        cfg_['ray_start'] = cfg_['ray_end'] = 'auto'
+        renderer = EG3DRenderer(**cfg_)
+
+        # remove the randomness of sampling to compare the results
+        def fixed_rand(*size, device=None):
+            return torch.full(size, 0.5, device=device)
+
+        with patch('torch.rand_like', torch.zeros_like), \
+                patch('torch.rand', fixed_rand):
+            for render_kwargs in [
+                    dict(),
+                    dict(ray_start=0.1, ray_end=2.6),
+                    dict(depth_resolution_importance=0)
+            ]:
+                target = renderer(
+                    plane,
+                    ray_origins,
+                    ray_directions,
+                    render_kwargs=render_kwargs)
+                render_kwargs['ray_chunk_size'] = 33
+                outputs = renderer(
+                    plane,
+                    ray_origins,
+                    ray_directions,
+                    render_kwargs=render_kwargs)
+                for output, target_ in zip(outputs, target):
+                    self.assertTrue(torch.allclose(output, target_, atol=1e-5))
+
+        # chunk size chosen from the memory budget
+        chunk_size = renderer.get_ray_chunk_size(plane, 2, 5, 10, 2**20)
+        self.assertGreater(chunk_size, 1)
+        self.assertLess(chunk_size, nerf_res * nerf_res)
+        self.assertGreater(
+            renderer.get_ray_chunk_size(plane, 2, 5, 10, 2**21), chunk_size)
+        self.assertEqual(renderer.get_ray_chunk_size(plane, 2, 5, 10, 1), 1)
+
+        renderer.ray_chunk_size = 'auto'
+        renderer.memory_budget = 2**20
+        with patch.object(
+                renderer, 'render_rays',
+                wraps=renderer.render_rays) as mock_render_rays:
+            rgb, depth, weights = renderer(plane, ray_origins, ray_directions)
+            self.assertGreater(mock_render_rays.call_count, 1)
+        self.assertEqual(rgb.shape,
+                         (2, nerf_res * nerf_res, self.decoder_out_channels))
+        self.assertEqual(depth.shape, (2, nerf_res * nerf_res, 1))
+        self.assertEqual(weights.shape, (2, nerf_res * nerf_res, 1))
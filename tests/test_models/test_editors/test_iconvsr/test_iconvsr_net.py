@@ -82,3 +82,30 @@ def test_iconvsr():
                 padding=2,
                 spynet_pretrained=None,
                 edvr_pretrained=123).cuda()
+
+
+def test_iconvsr_streaming():
+    iconvsr = IconVSRNet(
+        mid_channels=64, num_blocks=1, keyframe_stride=3, padding=2).eval()
+    input_tensor = torch.rand(1, 9, 3, 64, 66)
+
+    def forward_chunks(chunk_size, num_lookahead):
+        outputs, state = [], None
+        for start in range(0, 9, chunk_size):
+            end = min(start + chunk_size, 9)
+            lookahead_end = min(end + num_lookahead, 9)
+            output, state = iconvsr.forward_streaming(
+                input_tensor[:, start:lookahead_end],
+                state,
+                num_outputs=end - start,
+                end_of_sequence=lookahead_end == 9)
+            outputs.append(output)
+        return torch.cat(outputs, dim=1)
+
+    with torch.no_grad():
+        target = iconvsr(input_tensor)
+        for chunk_size in [9, 2, 4]:
+            output = forward_chunks(chunk_size, 9)
+            assert torch.allclose(output, target, atol=1e-5)
+        output = forward_chunks(4, 3)
+        assert output.shape == (1, 9, 3, 256, 264)
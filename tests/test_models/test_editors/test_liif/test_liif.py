@@ -68,3 +68,9 @@ def test_liif():
     # feat
     output = model(torch.rand(1, 3, 8, 8), [data_sample], mode='tensor')
     assert output.shape == (1, 256, 3)
+
+    # zoom
+    outputs = model.zoom(inputs, [2, 3, (10, 12)])
+    assert [tuple(output.shape) for output in outputs] == [(1, 3, 16, 16),
+                                                           (1, 3, 24, 24),
+                                                           (1, 3, 10, 12)]
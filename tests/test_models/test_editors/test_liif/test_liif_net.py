@@ -1,10 +1,12 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import platform
+from unittest.mock import patch
 
 import pytest
 import torch
 
 from mmedit.registry import BACKBONES
+from mmedit.utils import make_coord
 
 
 @pytest.mark.skipif(
@@ -113,3 +115,67 @@ def test_liif_rdn_net():
         output = model(inputs, coord, cell, True)
         assert torch.is_tensor(output)
         assert output.shape == targets.shape
+
+
+def test_liif_query_plan():
+
+    model_cfg = dict(
+        type='LIIFEDSRNet',
+        encoder=dict(
+            type='EDSRNet',
+            in_channels=3,
+            out_channels=3,
+            mid_channels=8,
+            num_blocks=2),
+        imnet=dict(
+            type='MLPRefiner', in_dim=64, out_dim=3, hidden_list=[16, 16]),
+        eval_bsize=100)
+
+    for local_ensemble in [True, False]:
+        model_cfg['local_ensemble'] = local_ensemble
+        model = BACKBONES.build(model_cfg).eval()
+        inputs = torch.rand(2, 3, 12, 10)
+        coord = torch.rand(2, 500, 2) * 2 - 1
+        cell = torch.rand(2, 500, 2) * 0.1
+        with torch.no_grad():
+            feature = model.gen_feature(inputs)
+            target = model.query_rgb(feature, coord, cell)
+            output = model(inputs, coord, cell, test_mode=True)
+        assert torch.allclose(output, target, atol=1e-5)
+
+    # the queries are not chunked without `eval_bsize` or `eval_memory`
+    model.eval_bsize = None
+    with patch.object(model, 'batched_predict') as batched_predict:
+        with torch.no_grad():
+            output = model(inputs, coord, cell, test_mode=True)
+    batched_predict.assert_not_called()
+    assert torch.allclose(output, target)
+    model.eval_bsize = 100
+
+    # query on grids, the plans are cached
+    with torch.no_grad():
+        feature = model.encode(inputs)
+        for size in [(24, 20), (24, 20), (36, 30)]:
+            coord = make_coord(size).unsqueeze(0).expand(2, -1, -1)
+            cell = torch.ones_like(coord)
+            cell[..., 0] *= 2 / size[0]
+            cell[..., 1] *= 2 / size[1]
+            target = model.query_rgb(model.gen_feature(inputs), coord, cell)
+            output = model.query_grid(feature, size)
+            assert torch.allclose(output, target, atol=1e-5)
+    assert len(model._plan_cache) == 2
+
+    # chunk size from the memory cap
+    model.eval_memory = 2**20
+    chunk_size = model.get_chunk_size(2, 4)
+    model.eval_memory = 2**22
+    assert model.get_chunk_size(2, 4) > chunk_size > 0
+    with torch.no_grad():
+        output = model.query_grid(feature, (36, 30))
+    assert torch.allclose(output, target, atol=1e-5)
+
+    # cached features
+    feature = model.encode(inputs, cache_key='img')
+    assert model.encode(torch.zeros_like(inputs), cache_key='img') is feature
+    model.train()
+    assert len(model._feature_cache) == 0
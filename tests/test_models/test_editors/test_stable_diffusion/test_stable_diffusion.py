@@ -119,3 +119,134 @@ def test_stable_diffusion():
         num_inference_steps=1)
 
     assert result['samples'].shape == (3, 64, 64)
+
+
+class toy_tokenizer:
+
+    def __init__(self):
+        self.model_max_length = 8
+
+    def __call__(self,
+                 prompt,
+                 padding='max_length',
+                 max_length=None,
+                 truncation=False,
+                 return_tensors='pt'):
+        max_length = max_length or self.model_max_length
+        input_ids = []
+        for text in prompt:
+            ids = [len(word) for word in text.split()]
+            if truncation:
+                ids = ids[:max_length]
+            input_ids.append(ids + [0] * (max_length - len(ids)))
+        text_inputs = Dict()
+        text_inputs['input_ids'] = torch.tensor(input_ids)
+        return text_inputs
+
+
+class toy_text_encoder(torch.nn.Module):
+
+    def __init__(self):
+        super().__init__()
+        self.config = None
+        self.embedding = torch.nn.Embedding(32, 32)
+        self.num_encoded = 0
+
+    def forward(self, x, attention_mask):
+        self.num_encoded += x.shape[0]
+        return [self.embedding(x)]
+
+
+toy_model = dict(
+    type='StableDiffusion',
+    diffusion_scheduler=diffusion_scheduler,
+    unet=dict(
+        type='DenoisingUnet',
+        image_size=64,
+        base_channels=32,
+        channels_cfg=[1, 2],
+        unet_type='stable',
+        act_cfg=dict(type='silu', inplace=False),
+        cross_attention_dim=32,
+        num_heads=2,
+        in_channels=4,
+        layers_per_block=1,
+        down_block_types=['CrossAttnDownBlock2D', 'DownBlock2D'],
+        up_block_types=['UpBlock2D', 'CrossAttnUpBlock2D'],
+        output_cfg=dict(var='fixed')),
+    vae=dict(
+        act_fn='silu',
+        block_out_channels=[32, 32],
+        down_block_types=['DownEncoderBlock2D', 'DownEncoderBlock2D'],
+        in_channels=3,
+        latent_channels=4,
+        layers_per_block=1,
+        norm_num_groups=16,
+        out_channels=3,
+        sample_size=64,
+        up_block_types=['UpDecoderBlock2D', 'UpDecoderBlock2D']),
+    init_cfg=init_cfg,
+    requires_safety_checker=False,
+    prompt_cache_size=3)
+
+
+def test_stable_diffusion_prompt_cache():
+    StableDiffuser = MODELS.build(Config(toy_model))
+    StableDiffuser.tokenizer = toy_tokenizer()
+    text_encoder = toy_text_encoder()
+    StableDiffuser.text_encoder = text_encoder
+
+    embeddings = StableDiffuser._encode_text(['a b', 'aa b', 'a b'], 'cpu')
+    assert embeddings.shape == (3, 8, 32)
+    assert text_encoder.num_encoded == 2
+    assert torch.equal(embeddings[0], embeddings[2])
+    # prompts with the same tokens share the cache entry
+    StableDiffuser._encode_text(['b a', ''], 'cpu')
+    assert text_encoder.num_encoded == 3
+    # 'aa b' is evicted
+    StableDiffuser._encode_text(['abc'], 'cpu')
+    StableDiffuser._encode_text(['a b', 'aa b'], 'cpu')
+    assert text_encoder.num_encoded == 5
+
+    # the unconditional embedding is computed once
+    text_embeddings = StableDiffuser._encode_prompt(['a b', 'ab b'], 'cpu', 2,
+                                                    True, None)
+    assert text_embeddings.shape == (8, 8, 32)
+    num_encoded = text_encoder.num_encoded
+    StableDiffuser._encode_prompt('abc', 'cpu', 1, True, None)
+    assert text_encoder.num_encoded == num_encoded + 1
+
+    StableDiffuser.prompt_cache_size = 0
+    StableDiffuser.to('cpu')
+    StableDiffuser._encode_text(['a b'], 'cpu')
+    StableDiffuser._encode_text(['a b'], 'cpu')
+    assert text_encoder.num_encoded == num_encoded + 3
+    assert len(StableDiffuser._prompt_cache) == 0
+
+
+def test_stable_diffusion_infer_batch():
+    StableDiffuser = MODELS.build(Config(toy_model))
+    StableDiffuser.tokenizer = toy_tokenizer()
+    StableDiffuser.text_encoder = toy_text_encoder()
+
+    results = StableDiffuser.infer_batch(['a b', 'abc d'],
+                                         height=32,
+                                         width=32,
+                                         num_inference_steps=2,
+                                         guidance_scale=[7.5, 1],
+                                         negative_prompts=[None, 'e'],
+                                         seeds=[1, 2])
+    assert results['samples'].shape == (2, 3, 32, 32)
+
+    # a request gives the same image no matter how it is batched
+    result = StableDiffuser.infer_batch(['abc d'],
+                                        height=32,
+                                        width=32,
+                                        num_inference_steps=2,
+                                        guidance_scale=1,
+                                        seeds=[2])
+    assert torch.allclose(
+        results['samples'][1], result['samples'][0], atol=1e-5)
+
+    with pytest.raises(AssertionError):
+        StableDiffuser.infer_batch(['a', 'b'], height=32, width=32, seeds=[1])
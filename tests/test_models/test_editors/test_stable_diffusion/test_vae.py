@@ -13,6 +13,39 @@ def test_vae():
     assert output['sample'].shape == (1, 3, 32, 32)
 
 
+def test_vae_tiled():
+    vae = AutoencoderKL(
+        block_out_channels=(32, 32),
+        down_block_types=('DownEncoderBlock2D', 'DownEncoderBlock2D'),
+        up_block_types=('UpDecoderBlock2D', 'UpDecoderBlock2D'),
+        norm_num_groups=16,
+        tile_latent_size=8)
+    vae.eval()
+
+    with torch.no_grad():
+        # partial tiles at the borders
+        for shape in [(2, 4, 20, 12), (1, 4, 7, 9)]:
+            z = torch.randn(shape)
+            output = vae.decode(z, tiled=True).sample
+            target = vae.decode(z).sample
+            assert output.shape == (shape[0], 3, shape[2] * 2, shape[3] * 2)
+            assert torch.allclose(output, target, atol=1e-4)
+
+        for shape in [(2, 3, 40, 24), (1, 3, 37, 50)]:
+            x = torch.rand(shape) * 2 - 1
+            output = vae.encode(x, tiled=True).latent_dist
+            target = vae.encode(x).latent_dist
+            assert output.mean.shape == target.mean.shape
+            assert torch.allclose(
+                output.parameters, target.parameters, atol=1e-4)
+
+        # multi-head attention with the queries chunked by tiles
+        attention = AttentionBlock(64, num_head_channels=8, norm_num_groups=16)
+        x = torch.randn(2, 64, 11, 7)
+        assert torch.allclose(
+            vae._tiled_attention(attention, x, 4), attention(x), atol=1e-5)
+
+
 def test_resnetblock2d():
     input = torch.rand((1, 64, 16, 16))
     resblock = ResnetBlock2D(in_channels=64, up=True)
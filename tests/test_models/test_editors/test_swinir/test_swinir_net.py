@@ -106,3 +106,31 @@ def test_swinir_cuda():
         output = net(img.cuda())
         assert isinstance(output, torch.Tensor)
         assert output.shape == (1, 3, 64, 64)
+
+
+def test_swinir_attn_mask_cache():
+    net = SwinIRNet(
+        upscale=2,
+        img_size=16,
+        window_size=4,
+        depths=[2, 2],
+        embed_dim=12,
+        num_heads=[2, 2],
+        mlp_ratio=2,
+        upsampler='pixelshuffledirect').eval()
+    blocks = [
+        block for layer in net.layers for block in layer.residual_group.blocks
+    ]
+    assert all(block.mask_cache is net.attn_mask_cache for block in blocks)
+    img = torch.rand(1, 3, 12, 20)
+    with torch.no_grad():
+        output = net(img)
+        # one mask is shared by the shifted blocks
+        assert len(net.attn_mask_cache) == 1
+        # the same outputs without caches
+        net.attn_mask_cache.clear()
+        for block in blocks:
+            block.mask_cache_size = 0
+            block.attn.cache_bias = False
+        assert torch.allclose(net(img), output)
+        assert len(net.attn_mask_cache) == 0
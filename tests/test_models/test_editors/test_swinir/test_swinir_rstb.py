@@ -4,7 +4,7 @@ import platform
 import pytest
 import torch
 
-from mmedit.models.editors.swinir.swinir_rstb import RSTB
+from mmedit.models.editors.swinir.swinir_rstb import RSTB, SwinTransformerBlock
 
 
 @pytest.mark.skipif(
@@ -23,3 +23,40 @@ def test_rstb():
         net = net.cuda()
         output = net(img.cuda(), (8, 8))
         assert output.shape == (1, 64, 6)
+
+
+def test_swin_transformer_block_cache():
+    block = SwinTransformerBlock(
+        dim=6,
+        input_resolution=(8, 8),
+        num_heads=2,
+        window_size=4,
+        shift_size=2)
+    block.eval()
+
+    # attention masks of other resolutions are cached
+    x = torch.randn(2, 12 * 8, 6)
+    with torch.no_grad():
+        output = block(x, (12, 8))
+        assert len(block.mask_cache) == 1
+        assert torch.equal(block(x, (12, 8)), output)
+    mask = next(iter(block.mask_cache.values()))
+    assert torch.equal(mask, block.calculate_mask((12, 8)))
+    block.mask_cache_size = 1
+    block(torch.randn(1, 16 * 8, 6), (16, 8))
+    assert list(block.mask_cache.keys())[0][0] == (16, 8)
+
+    # the relative position bias is reused without gradient
+    attn = block.attn
+    with torch.no_grad():
+        bias = attn.get_relative_position_bias()
+        assert attn.get_relative_position_bias() is bias
+        attn.relative_position_bias_table.add_(1)
+        new_bias = attn.get_relative_position_bias()
+    assert torch.allclose(new_bias, bias + 1)
+    # the bias is gathered again for back propagation
+    assert attn.get_relative_position_bias().requires_grad
+    if hasattr(torch, 'inference_mode'):
+        with torch.inference_mode():
+            bias = attn.get_relative_position_bias()
+        assert not bias.is_inference()
@@ -1,11 +1,48 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import json
+import subprocess
+import sys
+
+from mmedit.registry import MANIFEST_FILE
 from mmedit.utils import register_all_modules, try_import
+from mmedit.utils.setup_env import generate_registry_manifest
 
 
 def test_register_all_modules():
     register_all_modules()
 
 
+def test_register_all_modules_lazy():
+    # run in a new process where no modules of mmedit are imported
+    script = '\n'.join([
+        'import sys',
+        'from mmedit.utils import register_all_modules',
+        'register_all_modules(lazy=True)',
+        'from mmedit.registry import MODELS',
+        "assert 'mmedit.models.editors.edsr' not in sys.modules",
+        "model = MODELS.build(dict(type='EDSRNet', in_channels=3, "
+        'out_channels=3, mid_channels=4, num_blocks=1))',
+        "assert type(model).__name__ == 'EDSRNet'",
+        "assert 'mmedit.models.editors.stable_diffusion' not in sys.modules",
+        "assert 'mmedit.models.editors.eg3d' not in sys.modules",
+        # not in the manifest, fallback to import all modules
+        "assert MODELS.get('NotRegistered') is None",
+        "assert 'mmedit.models.editors.eg3d' in sys.modules",
+    ])
+    subprocess.run([sys.executable, '-c', script], check=True)
+
+
+def test_registry_manifest():
+    with open(MANIFEST_FILE) as f:
+        manifest = json.load(f)
+    # run `python .dev_scripts/update_registry_manifest.py` if failed
+    for registry, locations in generate_registry_manifest().items():
+        assert locations.items() <= manifest[registry].items(), registry
+    assert manifest['model']['EDSRNet'] == \
+        'mmedit.models.editors.edsr.edsr_net'
+    assert manifest['model']['Deconv'] == 'mmedit.models.base_archs.conv'
+
+
 def test_try_import():
     import numpy as np
     assert try_import('numpy') is np
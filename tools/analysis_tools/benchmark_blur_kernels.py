@@ -0,0 +1,87 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from mmedit.datasets.transforms import blur_kernels
+
+KERNEL_LIST = [
+    'iso', 'aniso', 'generalized_iso', 'generalized_aniso', 'plateau_iso',
+    'plateau_aniso', 'sinc'
+]
+# the probabilities of RealBasicVSR
+KERNEL_PROB = [0.405, 0.225, 0.108, 0.027, 0.108, 0.027, 0.1]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the synthesis and application of blur kernels '
+        'in Real-ESRGAN degradations')
+    parser.add_argument(
+        '--num-kernels',
+        type=int,
+        default=30,
+        help='kernels of each batch, e.g., frames of a sequence')
+    parser.add_argument(
+        '--kernel-sizes',
+        type=int,
+        nargs='+',
+        default=[7, 13, 21],
+        help='sizes of the kernels')
+    parser.add_argument(
+        '--size', type=int, default=256, help='size of the blurred images')
+    parser.add_argument(
+        '--repeat', type=int, default=10, help='number of timed batches')
+    args = parser.parse_args()
+    return args
+
+
+def timeit(func, repeat):
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    args = parse_args()
+    n = args.num_kernels
+    split_line = '=' * 66
+    print(f'{n} kernels per batch, images: {args.size}x{args.size}x3 float32')
+    print(split_line)
+    print(f'{"kernel size":<12}{"per-kernel (k/s)":>18}{"batched (k/s)":>16}'
+          f'{"filter2D (ms)":>14}{"batched (ms)":>14}')
+    imgs = [
+        np.random.rand(args.size, args.size, 3).astype(np.float32)
+        for _ in range(n)
+    ]
+    for kernel_size in args.kernel_sizes:
+        per_kernel = timeit(
+            lambda: [
+                blur_kernels.random_mixed_kernels(
+                    KERNEL_LIST, KERNEL_PROB, kernel_size) for _ in range(n)
+            ], args.repeat)
+        batched = timeit(
+            lambda: blur_kernels.random_mixed_kernels_batch(
+                n, KERNEL_LIST, KERNEL_PROB, kernel_size), args.repeat)
+
+        kernels = blur_kernels.random_mixed_kernels_batch(
+            n, KERNEL_LIST, KERNEL_PROB, kernel_size)
+        filter2d = timeit(
+            lambda: [
+                cv2.filter2D(img, -1, kernel)
+                for img, kernel in zip(imgs, kernels)
+            ], args.repeat)
+        batched_filter2d = timeit(
+            lambda: blur_kernels.batched_filter2d(imgs, kernels), args.repeat)
+
+        print(f'{kernel_size:<12}{n / per_kernel:18.0f}{n / batched:16.0f}'
+              f'{filter2d * 1000:14.1f}{batched_filter2d * 1000:14.1f}')
+    print(split_line)
+
+
+if __name__ == '__main__':
+    main()
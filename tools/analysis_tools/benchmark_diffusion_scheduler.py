@@ -0,0 +1,94 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import time
+
+import torch
+
+from mmedit.registry import DIFFUSION_SCHEDULERS
+from mmedit.utils import register_all_modules
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the per-step time of diffusion schedulers')
+    parser.add_argument(
+        '--shape',
+        type=int,
+        nargs='+',
+        default=[8, 4, 64, 64],
+        help='shape of the samples')
+    parser.add_argument(
+        '--device', default='cuda' if torch.cuda.is_available() else 'cpu')
+    parser.add_argument(
+        '--num-inference-steps',
+        type=int,
+        default=50,
+        help='number of inference steps')
+    parser.add_argument(
+        '--repeat', type=int, default=5, help='number of repeated samplings')
+    args = parser.parse_args()
+    return args
+
+
+def timeit(func, timesteps, args):
+    func(timesteps[0])
+    if args.device.startswith('cuda'):
+        torch.cuda.synchronize()
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for t in timesteps:
+            func(t)
+    if args.device.startswith('cuda'):
+        torch.cuda.synchronize()
+    return (time.perf_counter() - start) / args.repeat / len(timesteps) * 1e6
+
+
+def main():
+    args = parse_args()
+    register_all_modules()
+    num_samples = args.shape[0]
+    sample = torch.randn(args.shape, device=args.device)
+    eps = torch.randn(args.shape, device=args.device)
+    eps_var = torch.randn(
+        num_samples, args.shape[1] * 2, *args.shape[2:], device=args.device)
+
+    results = dict()
+    for name, cfg, model_output, kwargs in [
+        ('DDPM', dict(type='DDPMScheduler',
+                      variance_type='learned_range'), eps_var, dict()),
+        ('DDIM', dict(type='DDIMScheduler'), eps, dict(eta=0.5)),
+    ]:
+        scheduler = DIFFUSION_SCHEDULERS.build(cfg)
+        scheduler.set_timesteps(args.num_inference_steps, device=args.device)
+        timesteps = scheduler.timesteps.tolist()
+
+        def step(t):
+            scheduler.step(model_output, t, sample, **kwargs)
+
+        def loop_step(t):
+            # per-sample timesteps, one sample per call
+            for idx in range(num_samples):
+                scheduler.step(model_output[idx:idx + 1], t,
+                               sample[idx:idx + 1], **kwargs)
+
+        def batch_step(t):
+            # per-sample timesteps, all samples in one call
+            scheduler.step(model_output, torch.full((num_samples, ), t),
+                           sample, **kwargs)
+
+        results[f'{name} (shared timestep)'] = timeit(step, timesteps, args)
+        results[f'{name} (per-sample, loop)'] = timeit(loop_step, timesteps,
+                                                       args)
+        results[f'{name} (per-sample, batch)'] = timeit(
+            batch_step, timesteps, args)
+
+    split_line = '=' * 50
+    print(f'samples: {tuple(args.shape)}, device: {args.device}')
+    print(split_line)
+    for name, us in results.items():
+        print(f'{name:<30}{us:10.1f} us/step')
+    print(split_line)
+
+
+if __name__ == '__main__':
+    main()
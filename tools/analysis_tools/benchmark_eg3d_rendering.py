@@ -0,0 +1,112 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import multiprocessing as mp
+import resource
+import time
+from copy import deepcopy
+
+import torch
+from mmengine import Config
+
+from mmedit.models.editors.eg3d.renderer import EG3DRenderer
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the time and peak memory of chunked EG3D '
+        'rendering')
+    parser.add_argument('config', help='config of EG3D')
+    parser.add_argument(
+        '--resolution',
+        type=int,
+        default=128,
+        help='neural rendering resolution')
+    parser.add_argument(
+        '--triplane-resolution',
+        type=int,
+        default=256,
+        help='resolution of the triplanes')
+    parser.add_argument(
+        '--budgets',
+        type=int,
+        nargs='+',
+        default=[128, 512, 2048],
+        help='memory budgets in MB of the chunked rendering')
+    parser.add_argument(
+        '--device', default='cuda' if torch.cuda.is_available() else 'cpu')
+    args = parser.parse_args()
+    return args
+
+
+def build_renderer(args):
+    gen_cfg = Config.fromfile(args.config).model.generator
+    triplane_channels = gen_cfg.get('triplane_channels', 32)
+    renderer_cfg = deepcopy(gen_cfg.renderer_cfg)
+    decoder_cfg = renderer_cfg.get('decoder_cfg', dict())
+    decoder_cfg['in_channels'] = triplane_channels
+    decoder_cfg['out_channels'] = gen_cfg.get('sr_in_channels', 32)
+    renderer_cfg['decoder_cfg'] = decoder_cfg
+    return EG3DRenderer(**renderer_cfg).to(args.device), triplane_channels
+
+
+def render(args, budget, queue):
+    """Render in a new process, so that the peak memory of each run is
+    measured separately."""
+    renderer, triplane_channels = build_renderer(args)
+    torch.manual_seed(0)
+    res = args.triplane_resolution
+    planes = torch.randn(1, 3, triplane_channels, res, res, device=args.device)
+    num_rays = args.resolution**2
+    ray_origins = torch.randn(1, num_rays, 3, device=args.device) * 0.1
+    ray_origins[..., 2] += 2.7
+    ray_directions = torch.randn(1, num_rays, 3, device=args.device) * 0.1
+    ray_directions[..., 2] = -1
+    render_kwargs = dict()
+    if budget is not None:
+        render_kwargs = dict(
+            ray_chunk_size='auto', memory_budget=budget * 2**20)
+
+    if args.device.startswith('cuda'):
+        torch.cuda.reset_peak_memory_stats()
+        base = torch.cuda.memory_allocated()
+    else:
+        base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    start = time.perf_counter()
+    with torch.no_grad():
+        renderer(planes, ray_origins, ray_directions, render_kwargs)
+    if args.device.startswith('cuda'):
+        torch.cuda.synchronize()
+        peak = torch.cuda.max_memory_allocated() - base
+    else:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 - base
+    chunk_size = num_rays
+    if budget is not None:
+        chunk_size = renderer.get_ray_chunk_size(
+            planes, 1, renderer.depth_resolution,
+            renderer.depth_resolution_importance, budget * 2**20)
+    queue.put((time.perf_counter() - start, peak, min(chunk_size, num_rays)))
+
+
+def main():
+    args = parse_args()
+    ctx = mp.get_context('spawn')
+    split_line = '=' * 56
+    print(f'neural rendering resolution: {args.resolution}, '
+          f'device: {args.device}')
+    print(split_line)
+    print(f'{"budget (MB)":<14}{"chunk size":>12}{"time (s)":>12}'
+          f'{"peak (MB)":>12}')
+    for budget in [None] + args.budgets:
+        queue = ctx.Queue()
+        process = ctx.Process(target=render, args=(args, budget, queue))
+        process.start()
+        seconds, peak, chunk_size = queue.get()
+        process.join()
+        name = 'unchunked' if budget is None else str(budget)
+        print(f'{name:<14}{chunk_size:12d}{seconds:12.2f}'
+              f'{peak / 2**20:12.1f}')
+    print(split_line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import time
+from copy import deepcopy
+
+import torch
+import torch.nn as nn
+from mmengine.model import BaseAveragedModel
+
+from mmedit.engine import ExponentialMovingAverageHook
+from mmedit.models.base_models import ExponentialMovingAverage
+from mmedit.models.editors.stylegan2 import StyleGAN2Generator
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the per-iteration time of EMA updates')
+    parser.add_argument(
+        '--out-size', type=int, default=256, help='output size of StyleGAN2')
+    parser.add_argument(
+        '--device', default='cuda' if torch.cuda.is_available() else 'cpu')
+    parser.add_argument(
+        '--iters', type=int, default=50, help='number of timed updates')
+    parser.add_argument(
+        '--warmup', type=int, default=5, help='number of warmup updates')
+    args = parser.parse_args()
+    return args
+
+
+class ToyRunner:
+
+    def __init__(self, model):
+        self.model = model
+        self.iter = 0
+
+
+def timeit(func, args):
+    for _ in range(args.warmup):
+        func()
+    if args.device.startswith('cuda'):
+        torch.cuda.synchronize()
+    start = time.perf_counter()
+    for _ in range(args.iters):
+        func()
+    if args.device.startswith('cuda'):
+        torch.cuda.synchronize()
+    return (time.perf_counter() - start) / args.iters * 1000
+
+
+def main():
+    args = parse_args()
+    generator = StyleGAN2Generator(args.out_size, 512).to(args.device)
+    num_tensors = len(generator.state_dict())
+    num_params = sum(p.numel() for p in generator.parameters())
+    print(f'StyleGAN2 generator ({args.out_size}): {num_tensors} tensors, '
+          f'{num_params / 1e6:.2f}M parameters, device: {args.device}')
+
+    results = dict()
+    # ExponentialMovingAverageHook
+    for name, fused, flatten in [('hook (per tensor)', False, False),
+                                 ('hook (multi-tensor)', True, False),
+                                 ('hook (multi-tensor, flat)', True, True)]:
+        model = nn.Module()
+        model.generator = generator
+        model.generator_ema = deepcopy(generator)
+        runner = ToyRunner(model)
+        hook = ExponentialMovingAverageHook(
+            'generator_ema',
+            interval=1,
+            interp_cfg=dict(momentum=0.001),
+            flatten=flatten)
+        hook.fused = fused
+        results[name] = timeit(lambda: hook.after_train_iter(runner, 0), args)
+
+    # ExponentialMovingAverage
+    for name, fused, flatten in [('model (per tensor)', False, False),
+                                 ('model (multi-tensor)', True, False),
+                                 ('model (multi-tensor, flat)', True, True)]:
+        ema = ExponentialMovingAverage(
+            generator, momentum=0.001, update_buffers=True, flatten=flatten)
+        ema.steps += 1
+        if fused:
+            func = lambda: ema.update_parameters(generator)  # noqa: E731
+        else:
+            func = lambda: BaseAveragedModel.update_parameters(  # noqa: E731
+                ema, generator)
+        results[name] = timeit(func, args)
+
+    split_line = '=' * 50
+    print(split_line)
+    for name, ms in results.items():
+        base = results[name.split(' (')[0] + ' (per tensor)']
+        print(f'{name:<28}{ms:8.3f} ms/iter  {base / ms:5.2f}x')
+    print(split_line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import os
+import tempfile
+import time
+
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+from torch.utils.data import DataLoader, Dataset
+from torchvision.models import resnet18
+
+from mmedit.evaluation.functional import prepare_inception_feat
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the rank-parallel extraction of real features '
+        'with CPU-only processes (gloo)')
+    parser.add_argument(
+        '--world-sizes',
+        type=int,
+        nargs='+',
+        default=[1, 2, 4],
+        help='numbers of processes to benchmark')
+    parser.add_argument(
+        '--num-images', type=int, default=512, help='number of real images')
+    parser.add_argument(
+        '--img-size', type=int, default=128, help='size of the images')
+    parser.add_argument(
+        '--batch-size', type=int, default=16, help='batch size')
+    parser.add_argument(
+        '--capture-all',
+        action='store_true',
+        help='gather raw features besides the statistics')
+    parser.add_argument(
+        '--port', type=int, default=29520, help='port of the master process')
+    args = parser.parse_args()
+    return args
+
+
+class RandomDataset(Dataset):
+    """Random images with a fixed seed."""
+
+    def __init__(self, num_images, img_size):
+        self.data_root = None
+        self.data_prefix = None
+        self.metainfo = dict()
+        self.pipeline = None
+        self.num_images = num_images
+        self.img_size = img_size
+
+    def __len__(self):
+        return self.num_images
+
+    def get_data_info(self, idx):
+        return dict(idx=idx)
+
+    def __getitem__(self, idx):
+        generator = torch.Generator().manual_seed(idx)
+        img = torch.rand(
+            3, self.img_size, self.img_size, generator=generator) * 255
+        return dict(inputs=img)
+
+
+class Extractor:
+    """Metric-like wrapper of a randomly initialized ResNet-18, which stands
+    in for the Inception network."""
+
+    def __init__(self, cache_dir):
+        self.prefix = 'benchmark'
+        self.real_key = None
+        self.real_nums = -1
+        self.inception_pkl = None
+        self.inception_style = 'resnet18'
+        self.feat_cache_cfg = dict(cache_dir=cache_dir)
+        torch.manual_seed(0)
+        self.inception = resnet18(num_classes=512).eval()
+
+    @torch.no_grad()
+    def forward_inception(self, img):
+        return self.inception(img)
+
+
+def preprocessor(data):
+    return dict(inputs=torch.stack(data['inputs']))
+
+
+def run(rank, world_size, args, cache_dir, results):
+    os.environ['MASTER_ADDR'] = '127.0.0.1'
+    os.environ['MASTER_PORT'] = str(args.port + world_size)
+    dist.init_process_group('gloo', rank=rank, world_size=world_size)
+    # avoid oversubscribing the cores
+    torch.set_num_threads(max(1, os.cpu_count() // world_size))
+
+    dataset = RandomDataset(args.num_images, args.img_size)
+    dataloader = DataLoader(dataset, batch_size=args.batch_size)
+    metric = Extractor(cache_dir)
+    dist.barrier()
+    start = time.perf_counter()
+    prepare_inception_feat(
+        dataloader,
+        metric,
+        preprocessor,
+        capture_mean_cov=True,
+        capture_all=args.capture_all)
+    dist.barrier()
+    if rank == 0:
+        results[world_size] = time.perf_counter() - start
+    dist.destroy_process_group()
+
+
+def main():
+    args = parse_args()
+    results = mp.Manager().dict()
+    for world_size in args.world_sizes:
+        # a fresh cache dir so that every run extracts from scratch
+        with tempfile.TemporaryDirectory() as cache_dir:
+            mp.spawn(
+                run,
+                args=(world_size, args, cache_dir, results),
+                nprocs=world_size)
+
+    split_line = '=' * 30
+    print(f'{split_line}\nImages: {args.num_images}, '
+          f'size: {args.img_size}, CPU cores: {os.cpu_count()}')
+    base = results[args.world_sizes[0]]
+    for world_size in args.world_sizes:
+        print(f'World size {world_size}: {results[world_size]:.2f} s, '
+              f'speedup {base / results[world_size]:.2f}x')
+    print(split_line)
+
+
+if __name__ == '__main__':
+    main()
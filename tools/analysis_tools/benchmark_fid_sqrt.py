@@ -0,0 +1,90 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import pickle
+import time
+
+import numpy as np
+
+from mmedit.evaluation.metrics.fid import FrechetInceptionDistance
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Compare the speed and the numeric gap of the matrix '
+        'square root methods of FID')
+    parser.add_argument(
+        '--real-pkl',
+        help='inception pkl of the real images, must contain `real_mean` and '
+        '`real_cov`. If not given, random features are used')
+    parser.add_argument(
+        '--fake-pkl',
+        help='inception pkl used as the fake statistics. If not given, random '
+        'features are used')
+    parser.add_argument(
+        '--num-samples',
+        type=int,
+        default=5000,
+        help='number of random features to build each covariance')
+    parser.add_argument(
+        '--feat-dim', type=int, default=2048, help='dimension of features')
+    parser.add_argument(
+        '--device', default='cpu', help='device used by the eigh method')
+    parser.add_argument(
+        '--repeat', type=int, default=3, help='number of timed calls')
+    args = parser.parse_args()
+    return args
+
+
+def load_stats(pkl_path):
+    with open(pkl_path, 'rb') as file:
+        state = pickle.load(file)
+    return state['real_mean'], state['real_cov']
+
+
+def random_stats(num_samples, feat_dim, seed):
+    rng = np.random.RandomState(seed)
+    # non-negative and correlated like inception features
+    feats = np.maximum(rng.randn(num_samples, feat_dim), 0)
+    feats = feats @ (np.eye(feat_dim) + 0.05 * rng.randn(feat_dim, feat_dim))
+    return np.mean(feats, 0), np.cov(feats, rowvar=False)
+
+
+def main():
+    args = parse_args()
+    if args.real_pkl is not None:
+        real_mean, real_cov = load_stats(args.real_pkl)
+    else:
+        real_mean, real_cov = random_stats(args.num_samples, args.feat_dim, 0)
+    if args.fake_pkl is not None:
+        fake_mean, fake_cov = load_stats(args.fake_pkl)
+    else:
+        fake_mean, fake_cov = random_stats(args.num_samples, real_cov.shape[0],
+                                           1)
+
+    results, times = dict(), dict()
+    for method in ['sqrtm', 'eigh']:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            results[method] = FrechetInceptionDistance._calc_fid(
+                fake_mean,
+                fake_cov,
+                real_mean,
+                real_cov,
+                sqrt_method=method,
+                device=args.device)
+        times[method] = (time.perf_counter() - start) / args.repeat
+
+    fid_sqrtm, fid_eigh = results['sqrtm'][0], results['eigh'][0]
+    gap = abs(fid_sqrtm - fid_eigh)
+    split_line = '=' * 30
+    print(f'{split_line}\nFeature dim: {real_cov.shape[0]}\n'
+          f'sqrtm: FID {fid_sqrtm:.6f}, {times["sqrtm"]:.3f} s\n'
+          f'eigh ({args.device}): FID {fid_eigh:.6f}, '
+          f'{times["eigh"]:.3f} s\n'
+          f'Absolute gap: {gap:.3e}, '
+          f'relative gap: {gap / max(abs(fid_sqrtm), 1e-12):.3e}\n'
+          f'Speedup: {times["sqrtm"] / times["eigh"]:.2f}x\n{split_line}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import os.path as osp
+import tempfile
+import time
+
+import mmcv
+import numpy as np
+from torch.utils.data import DataLoader, Dataset
+
+from mmedit.datasets.transforms import LoadImageFromFile
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the epochs of loading images with the caches '
+        'of LoadImageFromFile')
+    parser.add_argument(
+        '--num-images', type=int, default=100, help='number of images')
+    parser.add_argument(
+        '--size', type=int, default=480, help='size of the images')
+    parser.add_argument(
+        '--epochs', type=int, default=3, help='number of epochs')
+    parser.add_argument(
+        '--workers', type=int, default=2, help='number of workers')
+    args = parser.parse_args()
+    return args
+
+
+class ImageDataset(Dataset):
+
+    def __init__(self, paths, loader):
+        self.paths = paths
+        self.loader = loader
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __getitem__(self, idx):
+        return self.loader(dict(gt_path=self.paths[idx]))['gt'].shape
+
+
+def make_images(root, args):
+    rng = np.random.default_rng(0)
+    paths = []
+    for idx in range(args.num_images):
+        # smooth images compressed like natural images
+        img = rng.integers(0, 255, (args.size // 8, args.size // 8, 3))
+        img = mmcv.imresize(img.astype(np.uint8), (args.size, args.size))
+        paths.append(osp.join(root, f'{idx:04d}.png'))
+        mmcv.imwrite(img, paths[-1])
+    return paths
+
+
+def main():
+    args = parse_args()
+    settings = dict([('no cache', dict()),
+                     ('per-process bytes', dict(use_cache=True)),
+                     ('shared bytes', dict(cache_cfg=dict(mode='bytes'))),
+                     ('shared pixels', dict(cache_cfg=dict(mode='pixels')))])
+    split_line = '=' * 70
+    with tempfile.TemporaryDirectory() as root:
+        paths = make_images(root, args)
+        print(f'{args.num_images} images of {args.size}x{args.size}, '
+              f'{args.workers} workers')
+        print(split_line)
+        print(f'{"cache":<20}{"first (s)":>10}{"others (s)":>12}'
+              f'{"hits":>8}{"misses":>8}{"size (MB)":>12}')
+        for name, kwargs in settings.items():
+            loader = LoadImageFromFile('gt', **kwargs)
+            dataloader = DataLoader(
+                ImageDataset(paths, loader),
+                num_workers=args.workers,
+                persistent_workers=args.workers > 0,
+                shuffle=True)
+            seconds = []
+            for _ in range(args.epochs):
+                start = time.perf_counter()
+                for _ in dataloader:
+                    pass
+                seconds.append(time.perf_counter() - start)
+            stats = dict(hits='-', misses='-', size='-')
+            if 'cache_cfg' in kwargs:
+                stats = loader.cache.stats()
+                stats['size'] = f'{stats["size"] / 2**20:.1f}'
+            print(f'{name:<20}{seconds[0]:10.2f}'
+                  f'{np.mean(seconds[1:]):12.2f}{stats["hits"]:>8}'
+                  f'{stats["misses"]:>8}{stats["size"]:>12}')
+            del dataloader
+        print(split_line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import time
+
+import torch
+from mmengine import Config
+from mmengine.runner import load_checkpoint
+
+from mmedit.registry import MODELS
+from mmedit.utils import make_coord, register_all_modules
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark LIIF inference at several output scales of '
+        'the same image')
+    parser.add_argument('config', help='config of LIIF')
+    parser.add_argument(
+        '--checkpoint',
+        default=None,
+        help='checkpoint of LIIF. Randomly initialized if not given')
+    parser.add_argument(
+        '--size', type=int, default=64, help='size of the input image')
+    parser.add_argument(
+        '--scales',
+        type=float,
+        nargs='+',
+        default=[2, 3, 4],
+        help='output scales')
+    parser.add_argument(
+        '--eval-memory',
+        type=int,
+        default=None,
+        help='memory cap in MB of each chunk. `eval_bsize` of the config is '
+        'used if not given')
+    parser.add_argument(
+        '--device', default='cuda' if torch.cuda.is_available() else 'cpu')
+    args = parser.parse_args()
+    return args
+
+
+def query_per_chunk(generator, inputs, size):
+    """The previous inference: the feature is unfolded and sampled with
+    `grid_sample` again for each chunk."""
+    feature = generator.gen_feature(inputs)
+    coord = make_coord(size).to(inputs).unsqueeze(0)
+    cell = torch.ones_like(coord)
+    cell[..., 0] *= 2 / size[0]
+    cell[..., 1] *= 2 / size[1]
+    n = coord.shape[1]
+    bsize = generator.eval_bsize or n
+    preds = []
+    for left in range(0, n, bsize):
+        right = min(left + bsize, n)
+        preds.append(
+            generator.query_rgb(feature, coord[:, left:right],
+                                cell[:, left:right]))
+    return torch.cat(preds, dim=1)
+
+
+def synchronize(device):
+    if device.startswith('cuda'):
+        torch.cuda.synchronize()
+
+
+def main():
+    args = parse_args()
+    register_all_modules()
+    cfg = Config.fromfile(args.config)
+    model = MODELS.build(cfg.model)
+    if args.checkpoint is not None:
+        load_checkpoint(model, args.checkpoint, map_location='cpu')
+    model = model.to(args.device).eval()
+    generator = model.generator
+    if args.eval_memory is not None:
+        generator.eval_memory = args.eval_memory * 2**20
+
+    torch.manual_seed(0)
+    inputs = torch.rand(1, 3, args.size, args.size, device=args.device)
+    sizes = [(round(args.size * s), round(args.size * s)) for s in args.scales]
+    with torch.no_grad():
+        # warmup
+        generator.query_grid(generator.encode(inputs), sizes[0])
+
+        synchronize(args.device)
+        start = time.perf_counter()
+        references = [query_per_chunk(generator, inputs, s) for s in sizes]
+        synchronize(args.device)
+        per_chunk = time.perf_counter() - start
+
+        generator._plan_cache.clear()
+        start = time.perf_counter()
+        feature = generator.encode(inputs)
+        outputs = [generator.query_grid(feature, s) for s in sizes]
+        synchronize(args.device)
+        planned = time.perf_counter() - start
+
+    split_line = '=' * 50
+    print(f'input: {args.size}x{args.size}, scales: {args.scales}, '
+          f'device: {args.device}')
+    print(split_line)
+    print(f'{"per-chunk query":<24}{per_chunk:10.2f} s')
+    print(f'{"encode once + plans":<24}{planned:10.2f} s  '
+          f'{per_chunk / planned:5.2f}x')
+    error = max(
+        (o - r).abs().max().item() for o, r in zip(outputs, references))
+    print(f'max diff: {error:.2e}')
+    print(split_line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import time
+
+import numpy as np
+
+from mmedit.datasets.transforms import MATLABLikeResize
+from mmedit.datasets.transforms.matlab_like_resize import (_cubic,
+                                                           get_size_from_scale,
+                                                           get_weights_indices)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark MATLABLikeResize on DIV2K-sized crops')
+    parser.add_argument(
+        '--crop-size',
+        type=int,
+        nargs=2,
+        default=[480, 480],
+        help='size of the crops, 480x480 is the size of DIV2K sub-images')
+    parser.add_argument(
+        '--scale', type=float, default=0.25, help='resize factor')
+    parser.add_argument(
+        '--num-frames',
+        type=int,
+        default=1,
+        help='number of images resized in one call, e.g. frames of a clip')
+    parser.add_argument(
+        '--repeat', type=int, default=20, help='number of timed calls')
+    args = parser.parse_args()
+    return args
+
+
+def legacy_resize_along_dim(img_in, weights, indices, dim):
+    """The per-output-pixel loop used before vectorization."""
+    img_in = img_in.astype(np.float32)
+    w_shape = weights.shape
+    output_shape = list(img_in.shape)
+    output_shape[dim] = w_shape[0]
+    img_out = np.zeros(output_shape)
+
+    if dim == 0:
+        for i in range(w_shape[0]):
+            w = weights[i, :][np.newaxis, ...]
+            ind = indices[i, :]
+            img_slice = img_in[ind, :]
+            img_out[i] = np.sum(np.squeeze(img_slice, axis=0) * w.T, axis=0)
+    elif dim == 1:
+        for i in range(w_shape[0]):
+            w = weights[i, :][:, :, np.newaxis]
+            ind = indices[i, :]
+            img_slice = img_in[:, ind]
+            img_out[:, i] = np.sum(np.squeeze(img_slice, axis=1) * w.T, axis=1)
+
+    return img_out
+
+
+def legacy_resize(img, scale):
+    """The uncached, loop-based resize used before vectorization."""
+    scale = [scale, scale]
+    output_size = get_size_from_scale(img.shape, scale)
+    output = img
+    for dim in np.argsort(np.array(scale)):
+        weight, index = get_weights_indices.__wrapped__(
+            img.shape[dim], output_size[dim], scale[dim], _cubic, 4.0)
+        output = legacy_resize_along_dim(output, weight, index, dim)
+    return output
+
+
+def timeit(func, repeat):
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    args = parse_args()
+    h, w = args.crop_size
+    imgs = [
+        np.random.randint(0, 256, (h, w, 3), dtype=np.uint8)
+        for _ in range(args.num_frames)
+    ]
+    resize = MATLABLikeResize(keys=['img'], scale=args.scale)
+
+    legacy_time = timeit(
+        lambda: [legacy_resize(img, args.scale) for img in imgs], args.repeat)
+    current_time = timeit(lambda: resize(dict(img=list(imgs))), args.repeat)
+
+    num_imgs = args.num_frames
+    split_line = '=' * 30
+    print(f'{split_line}\nCrop size: {h}x{w}, scale: {args.scale}, '
+          f'frames per call: {num_imgs}\n'
+          f'Legacy: {legacy_time / num_imgs * 1000:.2f} ms/img\n'
+          f'Current: {current_time / num_imgs * 1000:.2f} ms/img\n'
+          f'Speedup: {legacy_time / current_time:.2f}x\n'
+          f'Cache: {get_weights_indices.cache_info()}\n{split_line}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import os.path as osp
+import tempfile
+import time
+
+import torch
+
+from mmedit.apis.inferencers.ort_wrapper import ORTWrapper
+from mmedit.models.editors import BasicVSRNet, EDSRNet, RRDBNet
+from mmedit.registry import MODELS
+from mmedit.utils import register_all_modules
+
+# ONNX does not support spectral norm, which is disabled as in
+# tools/model_converters/pytorch2onnx.py
+GCA_BACKBONE = dict(
+    type='SimpleEncoderDecoder',
+    encoder=dict(
+        type='ResGCAEncoder',
+        block='BasicBlock',
+        layers=[3, 4, 4, 2],
+        in_channels=6,
+        with_spectral_norm=False),
+    decoder=dict(
+        type='ResGCADecoder',
+        block='BasicBlockDec',
+        layers=[2, 3, 3, 2],
+        with_spectral_norm=False))
+
+MODELS_TO_TEST = dict(
+    edsr=lambda: EDSRNet(3, 3, mid_channels=64, num_blocks=16),
+    esrgan=lambda: RRDBNet(3, 3, mid_channels=64, num_blocks=23),
+    basicvsr=lambda: BasicVSRNet(mid_channels=64, num_blocks=30),
+    gca=lambda: MODELS.build(GCA_BACKBONE))
+
+# shapes of the inputs without the batch axis
+INPUT_SHAPES = dict(
+    edsr=lambda size: (3, size, size),
+    esrgan=lambda size: (3, size, size),
+    basicvsr=lambda size: (5, 3, size, size),
+    gca=lambda size: (6, size * 4, size * 4))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the latency and throughput of PyTorch eager '
+        'and ONNX Runtime on CPU')
+    parser.add_argument(
+        '--models',
+        nargs='+',
+        choices=list(MODELS_TO_TEST.keys()),
+        default=list(MODELS_TO_TEST.keys()))
+    parser.add_argument(
+        '--size',
+        type=int,
+        default=64,
+        help='size of the LR images, the merged images of GCA are 4 times '
+        'larger')
+    parser.add_argument(
+        '--batch-size', type=int, default=1, help='batch size of the inputs')
+    parser.add_argument(
+        '--threads', type=int, default=4, help='number of CPU threads')
+    parser.add_argument(
+        '--iters', type=int, default=10, help='iterations to be timed')
+    parser.add_argument(
+        '--warmup', type=int, default=2, help='iterations before timing')
+    parser.add_argument(
+        '--opset-version',
+        type=int,
+        default=16,
+        help='opset of the exported models, BasicVSR requires 16 for '
+        'grid_sample')
+    args = parser.parse_args()
+    return args
+
+
+def export(model, inputs, output_file, opset_version):
+    """Export the model with dynamic batch and spatial axes as
+    ``tools/model_converters/pytorch2onnx.py`` does."""
+    axes = {0: 'batch', inputs.dim() - 2: 'height', inputs.dim() - 1: 'width'}
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            inputs,
+            output_file,
+            input_names=['input'],
+            output_names=['output'],
+            opset_version=opset_version,
+            dynamic_axes={
+                'input': axes,
+                'output': axes
+            })
+
+
+def measure(runner, inputs, args):
+    with torch.no_grad():
+        for _ in range(args.warmup):
+            output = runner(inputs)
+        start = time.perf_counter()
+        for _ in range(args.iters):
+            runner(inputs)
+        seconds = (time.perf_counter() - start) / args.iters
+    return seconds, output
+
+
+def main():
+    args = parse_args()
+    register_all_modules()
+    torch.set_num_threads(args.threads)
+    backend_cfg = dict(intra_op_num_threads=args.threads)
+
+    split_line = '=' * 70
+    print(f'size: {args.size}, batch size: {args.batch_size}, '
+          f'threads: {args.threads}, opset: {args.opset_version}')
+    print(split_line)
+    print(f'{"model":<10}{"backend":<16}{"ms/batch":>12}{"imgs/s":>10}'
+          f'{"speedup":>10}{"max diff":>12}')
+    for name in args.models:
+        torch.manual_seed(0)
+        model = MODELS_TO_TEST[name]().eval()
+        inputs = torch.rand(args.batch_size, *INPUT_SHAPES[name](args.size))
+        # frames of videos are counted as images
+        num_imgs = inputs.shape[:-3].numel()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            onnx_file = osp.join(tmp_dir, f'{name}.onnx')
+            export(model, inputs, onnx_file, args.opset_version)
+            runners = dict(
+                pytorch=model,
+                ort=ORTWrapper(onnx_file, io_binding=False, **backend_cfg),
+                ort_io_binding=ORTWrapper(
+                    onnx_file, io_binding=True, **backend_cfg))
+
+            reference, eager_seconds = None, None
+            for backend, runner in runners.items():
+                seconds, output = measure(runner, inputs, args)
+                diff = '-'
+                if reference is None:
+                    reference, eager_seconds = output, seconds
+                else:
+                    diff = f'{(output - reference).abs().max():.5f}'
+                print(f'{name:<10}{backend:<16}{seconds * 1000:12.1f}'
+                      f'{num_imgs / seconds:10.1f}'
+                      f'{eager_seconds / seconds:10.2f}x{diff:>11}')
+    print(split_line)
+
+
+if __name__ == '__main__':
+    main()
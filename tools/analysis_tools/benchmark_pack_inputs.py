@@ -0,0 +1,126 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from mmedit.datasets.transforms import PackEditInputs
+from mmedit.structures import PixelData
+
+MODES = dict([('copy', dict()), ('share_input', dict(share_input=True)),
+              ('share_input+channels_last',
+               dict(share_input=True, channels_last=True))])
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the time and memory of PackEditInputs on '
+        'video clips')
+    parser.add_argument(
+        '--num-frames',
+        type=int,
+        nargs='+',
+        default=[7, 30],
+        help='number of frames of the clips')
+    parser.add_argument(
+        '--size', type=int, default=64, help='size of the lq frames')
+    parser.add_argument(
+        '--scale', type=int, default=4, help='scale of the gt frames')
+    parser.add_argument(
+        '--repeat', type=int, default=50, help='number of packed clips')
+    parser.add_argument(
+        '--modes',
+        nargs='+',
+        default=list(MODES),
+        choices=list(MODES),
+        help='modes of packing')
+    # measure the peak memory in a new process, used internally
+    parser.add_argument('--peak-memory-of', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    return args
+
+
+def make_clip(num_frames, args):
+    rng = np.random.default_rng(0)
+    lq_shape = (args.size, args.size, 3)
+    gt_shape = (args.size * args.scale, args.size * args.scale, 3)
+    return dict(
+        img=[rng.random(lq_shape, np.float32) for _ in range(num_frames)],
+        gt=[rng.random(gt_shape, np.float32) for _ in range(num_frames)])
+
+
+def read_memory(key):
+    """Read the memory in MB from /proc/self/status, only on Linux."""
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(key):
+                return int(line.split()[1]) / 1024
+
+
+def shared_size(packed):
+    """The size in MB of the storages sent from dataloader workers."""
+    tensors = [packed['inputs']]
+    for value in packed['data_samples'].values():
+        if isinstance(value, PixelData):
+            tensors.extend(value.values())
+    storages = {
+        t.untyped_storage().data_ptr(): t.untyped_storage().nbytes()
+        for t in tensors
+    }
+    return sum(storages.values()) / 2**20
+
+
+def peak_memory(num_frames, mode, args):
+    clip = make_clip(num_frames, args)
+    transform = PackEditInputs(**MODES[mode])
+    # reset the peak resident set size
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+    rss = read_memory('VmRSS')
+    transform(dict(clip))
+    return read_memory('VmHWM') - rss
+
+
+def main():
+    args = parse_args()
+    if args.peak_memory_of is not None:
+        num_frames, mode = args.peak_memory_of.split(',')
+        print(peak_memory(int(num_frames), mode, args))
+        return
+
+    split_line = '=' * 80
+    print(f'lq: {args.size}x{args.size}x3, gt: x{args.scale}, float32')
+    print(split_line)
+    print(f'{"frames":<8}{"mode":<28}{"ms / clip":>12}{"peak (MB)":>16}'
+          f'{"shared (MB)":>16}')
+    for num_frames in args.num_frames:
+        clip = make_clip(num_frames, args)
+        for mode in args.modes:
+            transform = PackEditInputs(**MODES[mode])
+            packed = transform(dict(clip))
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                transform(dict(clip))
+            seconds = (time.perf_counter() - start) / args.repeat
+
+            cmd = [
+                sys.executable, __file__, '--peak-memory-of',
+                f'{num_frames},{mode}', '--size',
+                str(args.size), '--scale',
+                str(args.scale)
+            ]
+            peak = float(
+                subprocess.run(
+                    cmd,
+                    check=True,
+                    stdout=subprocess.PIPE,
+                    universal_newlines=True).stdout.strip().splitlines()[-1])
+            print(f'{num_frames:<8}{mode:<28}{seconds * 1000:12.2f}'
+                  f'{peak:16.1f}{shared_size(packed):16.1f}')
+    print(split_line)
+
+
+if __name__ == '__main__':
+    main()
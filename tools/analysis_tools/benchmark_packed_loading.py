@@ -0,0 +1,123 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import os
+import os.path as osp
+import tempfile
+import time
+
+import mmcv
+import numpy as np
+
+from mmedit.datasets.packed_shards import PackedShardBackend, PackedShardWriter
+from mmedit.datasets.transforms import LoadImageFromFile
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark loading frame windows from per-file images '
+        'and packed shards')
+    parser.add_argument('--clips', type=int, default=8, help='number of clips')
+    parser.add_argument(
+        '--frames', type=int, default=30, help='frames of each clip')
+    parser.add_argument(
+        '--window', type=int, default=7, help='frames of each sample')
+    parser.add_argument(
+        '--size', type=int, default=64, help='size of the LQ frames')
+    parser.add_argument(
+        '--scale', type=int, default=4, help='scale of the GT frames')
+    parser.add_argument(
+        '--samples', type=int, default=200, help='number of loaded samples')
+    args = parser.parse_args()
+    return args
+
+
+def make_clips(root, args):
+    rng = np.random.default_rng(0)
+    for key, size in [('lq', args.size), ('gt', args.size * args.scale)]:
+        for clip in range(args.clips):
+            folder = osp.join(root, key, f'{clip:03d}')
+            os.makedirs(folder)
+            for frame in range(args.frames):
+                img = rng.integers(0, 255, (size, size, 3), dtype=np.uint8)
+                mmcv.imwrite(img, osp.join(folder, f'{frame:08d}.png'))
+
+
+def pack(root, db_path, codec, args):
+    with PackedShardWriter(db_path) as writer:
+        for clip in range(args.clips):
+            items = []
+            for key in ['lq', 'gt']:
+                for frame in range(args.frames):
+                    path = f'{key}/{clip:03d}/{frame:08d}.png'
+                    with open(osp.join(root, path), 'rb') as f:
+                        content = f.read()
+                    if codec == 'raw':
+                        items.append((path, mmcv.imfrombytes(content), 'raw'))
+                    else:
+                        items.append((path, content, 'png'))
+            writer.add(items)
+
+
+def count_reads(backend, reads):
+    read = backend._read
+
+    def _read(*args):
+        reads.append(args)
+        return read(*args)
+
+    backend._read = _read
+
+
+def load(root, samples, backend_args):
+    loaders = [
+        LoadImageFromFile(key, backend_args=backend_args)
+        for key in ['img', 'gt']
+    ]
+    reads = []
+    for loader in loaders:
+        if isinstance(loader.file_backend, PackedShardBackend):
+            count_reads(loader.file_backend, reads)
+    start = time.perf_counter()
+    for clip, frame, window in samples:
+        results = dict()
+        for key, prefix in [('img', 'lq'), ('gt', 'gt')]:
+            results[f'{key}_path'] = [
+                osp.join(root, prefix, f'{clip:03d}', f'{i:08d}.png')
+                for i in range(frame, frame + window)
+            ]
+        for loader in loaders:
+            results = loader(results)
+    seconds = time.perf_counter() - start
+    if backend_args is None:
+        reads = [None] * 2 * sum(sample[2] for sample in samples)
+    return seconds, len(reads)
+
+
+def main():
+    args = parse_args()
+    rng = np.random.default_rng(0)
+    samples = [(rng.integers(args.clips),
+                rng.integers(args.frames - args.window + 1), args.window)
+               for _ in range(args.samples)]
+    split_line = '=' * 50
+    with tempfile.TemporaryDirectory() as root:
+        make_clips(root, args)
+        results = dict(files=load(root, samples, None))
+        for codec in ['png', 'raw']:
+            db_path = osp.join(root, f'packed_{codec}')
+            pack(root, db_path, codec, args)
+            results[f'packed ({codec})'] = load(
+                root, samples, dict(backend='packed', db_path=db_path))
+
+    print(f'{args.samples} samples of {args.window} LQ and GT frames, '
+          f'LQ size: {args.size}, scale: {args.scale}')
+    print(split_line)
+    print(f'{"source":<16}{"ms/sample":>12}{"reads/sample":>14}')
+    for name, (seconds, reads) in results.items():
+        print(f'{name:<16}{seconds / args.samples * 1000:12.2f}'
+              f'{reads / args.samples:14.2f}')
+    print(split_line)
+
+
+if __name__ == '__main__':
+    main()
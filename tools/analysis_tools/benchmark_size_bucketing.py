@@ -0,0 +1,143 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import os.path as osp
+import tempfile
+import time
+
+import mmcv
+import numpy as np
+import torch
+from mmengine.dataset import DefaultSampler, pseudo_collate
+from torch.utils.data import BatchSampler, DataLoader
+
+from mmedit.datasets import BasicImageDataset, SizeBucketBatchSampler
+from mmedit.evaluation import PaddingWaste
+from mmedit.registry import MODELS
+from mmedit.utils import register_all_modules
+
+# (height, width) of high-resolution images in Set14
+SIZES = [(480, 500), (576, 720), (512, 512), (288, 352), (361, 250),
+         (276, 276), (362, 500), (288, 352), (512, 512), (512, 512),
+         (512, 768), (512, 512), (656, 529), (391, 586)]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the inference of a super-resolution model on '
+        'images of variable sizes with and without the size bucketing')
+    parser.add_argument(
+        '--batch-size', type=int, default=4, help='batch size of inference')
+    parser.add_argument(
+        '--scale',
+        type=float,
+        default=0.25,
+        help='scale of the sizes of Set14 images')
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=2,
+        help='number of repeats of the sizes of Set14 images, which are '
+        'jittered by up to 10%%')
+    parser.add_argument(
+        '--pad-size-divisor',
+        type=int,
+        default=1,
+        help='pad size divisor of the data preprocessor')
+    args = parser.parse_args()
+    return args
+
+
+def build_model(args):
+    return MODELS.build(
+        dict(
+            type='BaseEditModel',
+            generator=dict(
+                type='EDSRNet',
+                in_channels=3,
+                out_channels=3,
+                mid_channels=64,
+                num_blocks=16,
+                upscale_factor=4),
+            pixel_loss=dict(type='L1Loss'),
+            data_preprocessor=dict(
+                type='EditDataPreprocessor',
+                mean=[0., 0., 0.],
+                std=[255., 255., 255.],
+                pad_size_divisor=args.pad_size_divisor))).eval()
+
+
+def build_dataloader(data_root, batch_size, bucketing):
+    dataset = BasicImageDataset(
+        data_root=data_root,
+        data_prefix=dict(img=''),
+        pipeline=[
+            dict(type='LoadImageFromFile', key='img'),
+            dict(type='PackEditInputs')
+        ])
+    sampler = DefaultSampler(dataset, shuffle=False)
+    if bucketing:
+        batch_sampler = SizeBucketBatchSampler(sampler, batch_size)
+    else:
+        batch_sampler = BatchSampler(sampler, batch_size, drop_last=False)
+    return DataLoader(
+        dataset, batch_sampler=batch_sampler, collate_fn=pseudo_collate)
+
+
+def run(model, dataloader, args):
+    metric = PaddingWaste(pad_size_divisor=args.pad_size_divisor)
+    start = time.perf_counter()
+    with torch.no_grad():
+        for data_batch in dataloader:
+            outputs = model.test_step(data_batch)
+            metric.process(data_batch, outputs)
+            for _input, output in zip(data_batch['inputs'], outputs):
+                # each output is de-padded to the size of its input
+                assert output.output.pred_img.shape[-2:] == tuple(
+                    size * 4 for size in _input.shape[-2:])
+    seconds = time.perf_counter() - start
+    waste = metric.compute_metrics(metric.results)['PaddingWaste']
+    return seconds, waste
+
+
+def main():
+    args = parse_args()
+    register_all_modules()
+    torch.manual_seed(0)
+    model = build_model(args)
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as data_root:
+        num_images = 0
+        for _ in range(args.repeat):
+            for h, w in SIZES:
+                # jitter the sizes of the repeated images
+                jitter = rng.uniform(0.9, 1.1, size=2)
+                size = (int(h * args.scale * jitter[0]),
+                        int(w * args.scale * jitter[1]), 3)
+                mmcv.imwrite(
+                    rng.integers(0, 256, size, dtype=np.uint8),
+                    osp.join(data_root, f'{num_images:04d}.png'))
+                num_images += 1
+
+        split_line = '=' * 70
+        print(f'{num_images} images of Set14 sizes x {args.scale}, '
+              f'EDSR x4, pad_size_divisor: {args.pad_size_divisor}')
+        print(split_line)
+        print(f'{"batching":<25}{"s / epoch":>15}{"padding waste":>15}'
+              f'{"speedup":>15}')
+        baseline = None
+        for name, batch_size, bucketing in [
+            ('batch 1', 1, False),
+            (f'batch {args.batch_size}', args.batch_size, False),
+            (f'batch {args.batch_size} + bucketing', args.batch_size, True)
+        ]:
+            dataloader = build_dataloader(data_root, batch_size, bucketing)
+            seconds, waste = run(model, dataloader, args)
+            baseline = baseline or seconds
+            print(f'{name:<25}{seconds:15.2f}{waste:15.3f}'
+                  f'{baseline / seconds:15.2f}')
+        print(split_line)
+
+
+if __name__ == '__main__':
+    main()
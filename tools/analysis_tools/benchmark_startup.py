@@ -0,0 +1,76 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import json
+import subprocess
+import sys
+
+import numpy as np
+
+# run in a new process to measure the cold start
+SCRIPT = """
+import json
+import resource
+import time
+
+start = time.perf_counter()
+from mmedit.utils import register_all_modules
+register_all_modules(lazy={lazy})
+import_time = time.perf_counter() - start
+
+from mmedit.registry import MODELS
+start = time.perf_counter()
+MODELS.build({model})
+build_time = time.perf_counter() - start
+
+# the maximum resident set size in KB on Linux
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps(dict(import_time=import_time, build_time=build_time,
+                      rss=rss)))
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the time and memory to start up mmedit with '
+        'the eager or lazy registration of modules')
+    parser.add_argument(
+        '--model',
+        default="dict(type='EDSRNet', in_channels=3, out_channels=3)",
+        help='the config of the model built after the registration')
+    parser.add_argument(
+        '--repeat', type=int, default=5, help='number of started processes')
+    args = parser.parse_args()
+    return args
+
+
+def main():
+    args = parse_args()
+    split_line = '=' * 60
+    print(f'model: {args.model}')
+    print(split_line)
+    print(f'{"registration":<15}{"import (s)":>15}{"build (s)":>15}'
+          f'{"RSS (MB)":>15}')
+    for lazy in [False, True]:
+        cmd = [
+            sys.executable, '-c',
+            SCRIPT.format(lazy=lazy, model=args.model)
+        ]
+        results = []
+        for _ in range(args.repeat):
+            output = subprocess.run(
+                cmd,
+                check=True,
+                stdout=subprocess.PIPE,
+                universal_newlines=True).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+        name = 'lazy' if lazy else 'eager'
+        import_time, build_time, rss = (
+            np.median([result[key] for result in results])
+            for key in ['import_time', 'build_time', 'rss'])
+        print(f'{name:<15}{import_time:15.2f}{build_time:15.2f}'
+              f'{rss:15.0f}')
+    print(split_line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import time
+
+import torch
+
+from mmedit.models.editors.swinir.swinir_net import SwinIRNet
+from mmedit.models.editors.swinir.swinir_rstb import SwinTransformerBlock
+
+# sizes of low-resolution images in Set14 and Urban100 (x4)
+SIZES = [(128, 128), (120, 125), (72, 90), (64, 64), (96, 128), (128, 84),
+         (122, 128), (96, 96)]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the inference of SwinIR on images of variable '
+        'sizes with and without the caches of attention')
+    parser.add_argument(
+        '--embed-dim', type=int, default=60, help='embedding dimension')
+    parser.add_argument(
+        '--depths',
+        type=int,
+        nargs='+',
+        default=[6, 6, 6, 6],
+        help='depths of the residual swin transformer blocks')
+    parser.add_argument(
+        '--scale', type=float, default=0.5, help='scale of the image sizes')
+    parser.add_argument(
+        '--rounds', type=int, default=2, help='rounds over the image sizes')
+    args = parser.parse_args()
+    return args
+
+
+def set_cache(model, enabled):
+    model.attn_mask_cache.clear()
+    for module in model.modules():
+        if isinstance(module, SwinTransformerBlock):
+            module.mask_cache_size = 4 if enabled else 0
+            module.attn.cache_bias = enabled
+            module.attn._bias_cache = (None, None)
+
+
+def main():
+    args = parse_args()
+    model = SwinIRNet(
+        upscale=4,
+        img_size=48,
+        window_size=8,
+        img_range=1.,
+        depths=args.depths,
+        embed_dim=args.embed_dim,
+        num_heads=[6] * len(args.depths),
+        mlp_ratio=2,
+        upsampler='pixelshuffledirect').eval()
+    inputs = [
+        torch.rand(1, 3, int(h * args.scale), int(w * args.scale))
+        for h, w in SIZES
+    ]
+
+    split_line = '=' * 50
+    print(f'{len(inputs)} sizes x {args.rounds} rounds, '
+          f'depths: {args.depths}, embed_dim: {args.embed_dim}')
+    print(split_line)
+    print(f'{"caches":<20}{"ms / image":>15}{"speedup":>15}')
+    results = dict()
+    with torch.no_grad():
+        for name, enabled in [('disabled', False), ('enabled', True)]:
+            set_cache(model, enabled)
+            outputs = [model(img) for img in inputs[:1]]
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                outputs = [model(img) for img in inputs]
+            seconds = time.perf_counter() - start
+            results[name] = (seconds / (args.rounds * len(inputs)), outputs)
+            speedup = results['disabled'][0] / results[name][0]
+            print(f'{name:<20}{results[name][0] * 1000:15.1f}'
+                  f'{speedup:15.2f}')
+    print(split_line)
+    for out, ref in zip(results['enabled'][1], results['disabled'][1]):
+        assert torch.allclose(out, ref, atol=1e-5)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import threading
+import time
+
+import torch
+
+from mmedit.apis.inferencers.text2image_inferencer import Text2ImageInferencer
+from mmedit.utils import register_all_modules
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the throughput of text2image requests against '
+        'request concurrency, with and without request batching')
+    parser.add_argument('config', help='config of a text2image model')
+    parser.add_argument('--checkpoint', default=None, help='checkpoint file')
+    parser.add_argument(
+        '--device', default='cuda' if torch.cuda.is_available() else 'cpu')
+    parser.add_argument('--height', type=int, default=512)
+    parser.add_argument('--width', type=int, default=512)
+    parser.add_argument(
+        '--num-inference-steps',
+        type=int,
+        default=20,
+        help='number of inference steps')
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        nargs='+',
+        default=[1, 2, 4, 8],
+        help='numbers of concurrent clients')
+    parser.add_argument(
+        '--requests-per-client',
+        type=int,
+        default=2,
+        help='number of requests sent by each client')
+    parser.add_argument(
+        '--max-batch-size',
+        type=int,
+        default=8,
+        help='maximum number of requests in a batch')
+    parser.add_argument(
+        '--max-wait',
+        type=float,
+        default=0.01,
+        help='maximum seconds to wait for more requests')
+    args = parser.parse_args()
+    return args
+
+
+def run_clients(request_fn, concurrency, requests_per_client):
+    """Run closed-loop clients, each sends a request after the previous one
+    is done, and return the throughput in images/sec."""
+
+    def client(client_idx):
+        for idx in range(requests_per_client):
+            request_fn(f'a photo of object {client_idx} in style {idx}',
+                       client_idx * requests_per_client + idx)
+
+    threads = [
+        threading.Thread(target=client, args=(idx, ))
+        for idx in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return concurrency * requests_per_client / (time.perf_counter() - start)
+
+
+def benchmark(inferencer, args):
+    model = inferencer.model
+    kwargs = dict(
+        height=args.height,
+        width=args.width,
+        num_inference_steps=args.num_inference_steps)
+    lock = threading.Lock()
+
+    def unbatched(prompt, seed):
+        # requests are served one by one by ``infer``
+        with lock:
+            model.infer(prompt, seed=seed, show_progress=False, **kwargs)
+
+    def batched(prompt, seed):
+        inferencer.submit(prompt, seed=seed, **kwargs).result()
+
+    inferencer.start_batching(args.max_batch_size, args.max_wait)
+    # warmup
+    run_clients(batched, 1, 1)
+    results = []
+    for concurrency in args.concurrency:
+        results.append(
+            (concurrency,
+             run_clients(unbatched, concurrency, args.requests_per_client),
+             run_clients(batched, concurrency, args.requests_per_client)))
+    inferencer.stop_batching()
+    return results
+
+
+def main():
+    args = parse_args()
+    register_all_modules()
+    inferencer = Text2ImageInferencer(
+        args.config, args.checkpoint, device=args.device)
+    results = benchmark(inferencer, args)
+
+    split_line = '=' * 50
+    print(f'{args.height}x{args.width}, {args.num_inference_steps} steps, '
+          f'device: {args.device}')
+    print(split_line)
+    print(f'{"concurrency":<12}{"unbatched":>12}{"batched":>12}  images/sec')
+    for concurrency, unbatched, batched in results:
+        print(f'{concurrency:<12}{unbatched:12.2f}{batched:12.2f}  '
+              f'{batched / unbatched:5.2f}x')
+    print(split_line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import multiprocessing as mp
+import resource
+import time
+
+import torch
+from mmengine import Config
+from mmengine.runner.checkpoint import _load_checkpoint
+
+from mmedit.models.editors.stable_diffusion.vae import AutoencoderKL
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the time and peak memory of tiled VAE '
+        'decoding against resolution')
+    parser.add_argument('config', help='config of Stable Diffusion')
+    parser.add_argument(
+        '--checkpoint',
+        default=None,
+        help='checkpoint of the VAE, e.g., vae/diffusion_pytorch_model.bin. '
+        'Randomly initialized if not given')
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[512, 1024, 2048],
+        help='resolutions of the decoded images')
+    parser.add_argument(
+        '--tile-latent-size',
+        type=int,
+        default=64,
+        help='size of the latent tiles')
+    parser.add_argument(
+        '--skip-untiled-above',
+        type=int,
+        default=1024,
+        help='skip the untiled decoding above this resolution')
+    parser.add_argument(
+        '--offload',
+        action='store_true',
+        help='keep the latents of tiled decoding on CPU, so that the '
+        'full-size activations between the layers are kept on CPU')
+    parser.add_argument(
+        '--device', default='cuda' if torch.cuda.is_available() else 'cpu')
+    args = parser.parse_args()
+    return args
+
+
+def build_vae(args):
+    cfg = Config.fromfile(args.config)
+    vae = AutoencoderKL(**cfg.vae, tile_latent_size=args.tile_latent_size)
+    if args.checkpoint is not None:
+        vae.load_state_dict(_load_checkpoint(args.checkpoint, 'cpu'))
+    return vae.to(args.device).eval()
+
+
+def decode(args, size, tiled, queue):
+    """Decode in a new process, so that the peak memory of each run is
+    measured separately."""
+    # seed before building the VAE, so that the random weights are the same
+    # in all the runs
+    torch.manual_seed(0)
+    vae = build_vae(args)
+    latents = torch.randn(1, 4, size // 8, size // 8, device=args.device)
+    if tiled and args.offload:
+        latents = latents.cpu()
+    if args.device.startswith('cuda'):
+        torch.cuda.reset_peak_memory_stats()
+        base = torch.cuda.memory_allocated()
+    else:
+        base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    start = time.perf_counter()
+    with torch.no_grad():
+        image = vae.decode(latents, tiled=tiled).sample
+    if args.device.startswith('cuda'):
+        torch.cuda.synchronize()
+        peak = torch.cuda.max_memory_allocated() - base
+    else:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 - base
+    queue.put((time.perf_counter() - start, peak, image.cpu()))
+
+
+def run(args, size, tiled):
+    ctx = mp.get_context('spawn')
+    queue = ctx.Queue()
+    process = ctx.Process(target=decode, args=(args, size, tiled, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    args = parse_args()
+    split_line = '=' * 66
+    print(f'tile latent size: {args.tile_latent_size}, '
+          f'device: {args.device}')
+    print(split_line)
+    print(f'{"size":<8}{"mode":<10}{"time (s)":>10}{"peak (MB)":>12}'
+          f'{"mean diff":>12}{"max diff":>12}')
+    for size in args.sizes:
+        reference = None
+        for tiled in [False, True]:
+            if not tiled and size > args.skip_untiled_above:
+                continue
+            seconds, peak, image = run(args, size, tiled)
+            diff = ['-', '-']
+            if reference is None:
+                reference = image
+            else:
+                error = (image - reference).abs()
+                diff = [f'{error.mean():.4f}', f'{error.max():.4f}']
+            mode = 'tiled' if tiled else 'untiled'
+            print(f'{size:<8}{mode:<10}{seconds:10.2f}{peak / 2**20:12.1f}'
+                  f'{diff[0]:>12}{diff[1]:>12}')
+    print(split_line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import multiprocessing as mp
+import resource
+import time
+
+import torch
+
+from mmedit.models.editors import BasicVSRNet, BasicVSRPlusPlusNet, IconVSRNet
+
+MODELS = dict(
+    basicvsr=lambda: BasicVSRNet(mid_channels=64, num_blocks=30),
+    iconvsr=lambda: IconVSRNet(mid_channels=64, num_blocks=30),
+    basicvsr_plusplus=lambda: BasicVSRPlusPlusNet(
+        mid_channels=64, num_blocks=7))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the per-frame latency and peak memory of '
+        'recurrent VSR against sequence length')
+    parser.add_argument(
+        '--model', choices=list(MODELS.keys()), default='basicvsr')
+    parser.add_argument(
+        '--lengths',
+        type=int,
+        nargs='+',
+        default=[10, 20, 40],
+        help='lengths of the sequences')
+    parser.add_argument(
+        '--size', type=int, default=64, help='size of the LR frames')
+    parser.add_argument(
+        '--max-seq-len', type=int, default=5, help='frames of each chunk')
+    parser.add_argument(
+        '--num-lookahead',
+        type=int,
+        default=5,
+        help='look-ahead frames of each chunk')
+    parser.add_argument(
+        '--device', default='cuda' if torch.cuda.is_available() else 'cpu')
+    args = parser.parse_args()
+    return args
+
+
+def restore(model, lrs, mode, args):
+    length = lrs.size(1)
+    if mode == 'whole':
+        return model(lrs)
+    outputs, state = [], None
+    for start in range(0, length, args.max_seq_len):
+        end = min(start + args.max_seq_len, length)
+        if mode == 'chunks':
+            outputs.append(model(lrs[:, start:end]))
+            continue
+        lookahead_end = min(end + args.num_lookahead, length)
+        output, state = model.forward_streaming(
+            lrs[:, start:lookahead_end],
+            state,
+            num_outputs=end - start,
+            end_of_sequence=lookahead_end == length)
+        outputs.append(output)
+    return torch.cat(outputs, dim=1)
+
+
+def run_once(args, length, mode, queue):
+    """Restore in a new process, so that the peak memory of each run is
+    measured separately."""
+    torch.manual_seed(0)
+    model = MODELS[args.model]().to(args.device).eval()
+    lrs = torch.rand(1, length, 3, args.size, args.size, device=args.device)
+    if args.device.startswith('cuda'):
+        torch.cuda.reset_peak_memory_stats()
+        base = torch.cuda.memory_allocated()
+    else:
+        base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    start = time.perf_counter()
+    with torch.no_grad():
+        output = restore(model, lrs, mode, args)
+    if args.device.startswith('cuda'):
+        torch.cuda.synchronize()
+        peak = torch.cuda.max_memory_allocated() - base
+    else:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 - base
+    queue.put((time.perf_counter() - start, peak, output.cpu()))
+
+
+def run(args, length, mode):
+    ctx = mp.get_context('spawn')
+    queue = ctx.Queue()
+    process = ctx.Process(target=run_once, args=(args, length, mode, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    args = parse_args()
+    split_line = '=' * 70
+    print(f'model: {args.model}, frame size: {args.size}, '
+          f'chunk: {args.max_seq_len}, look-ahead: {args.num_lookahead}, '
+          f'device: {args.device}')
+    print(split_line)
+    print(f'{"frames":<8}{"mode":<12}{"ms/frame":>10}{"peak (MB)":>12}'
+          f'{"mean diff":>12}{"max diff":>12}')
+    for length in args.lengths:
+        reference = None
+        for mode in ['whole', 'chunks', 'streaming']:
+            seconds, peak, output = run(args, length, mode)
+            diff = ['-', '-']
+            if reference is None:
+                reference = output
+            else:
+                error = (output - reference).abs()
+                diff = [f'{error.mean():.5f}', f'{error.max():.5f}']
+            print(f'{length:<8}{mode:<12}{seconds / length * 1000:10.1f}'
+                  f'{peak / 2**20:12.1f}{diff[0]:>12}{diff[1]:>12}')
+    print(split_line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# Copyright (c) OpenMMLab. All rights reserved.
+import argparse
+import os
+import os.path as osp
+from concurrent.futures import ThreadPoolExecutor
+
+import mmcv
+import mmengine
+from mmengine import Config
+
+from mmedit.datasets.packed_shards import PackedShardWriter
+from mmedit.registry import DATASETS
+from mmedit.utils import register_all_modules
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Pack the images of a BasicImageDataset or '
+        'BasicFramesDataset into append-only shards, which are read by '
+        '`LoadImageFromFile` with `backend_args=dict(backend=\'packed\', '
+        'db_path=OUT_DIR)`',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('config', help='config of the dataset')
+    parser.add_argument('out_dir', help='directory of the shards')
+    parser.add_argument(
+        '--split',
+        default='train',
+        help='the dataset is `{split}_dataloader.dataset` of the config')
+    parser.add_argument(
+        '--keys',
+        nargs='+',
+        default=None,
+        help='keys of the images, e.g., gt and img. All the keys of '
+        '`data_prefix` by default')
+    parser.add_argument(
+        '--codec',
+        choices=['keep', 'raw'],
+        default='keep',
+        help='keep the encoded files, or store decoded arrays which are '
+        'memory-mapped by the loader')
+    parser.add_argument(
+        '--flag',
+        default='color',
+        help='flag of `mmcv.imfrombytes` to decode images with `--codec raw`')
+    parser.add_argument(
+        '--shard-size', type=int, default=1024, help='size of shards in MB')
+    parser.add_argument(
+        '--n-thread', type=int, default=8, help='threads to read files')
+    args = parser.parse_args()
+    return args
+
+
+def build_dataset(cfg, split):
+    """Build the dataset without pipeline, unwrapping dataset wrappers."""
+    dataset_cfg = cfg[f'{split}_dataloader']['dataset']
+    while 'dataset' in dataset_cfg:
+        dataset_cfg = dataset_cfg['dataset']
+    dataset_cfg = dataset_cfg.copy()
+    dataset_cfg['pipeline'] = []
+    return DATASETS.build(dataset_cfg)
+
+
+def list_files(data_info, keys):
+    """List the image files of a sample.
+
+    ``{key}_path`` is a list of frames, a file, or a folder whose frames are
+    selected in the pipeline, e.g., by ``GenerateFrameIndices``. In the last
+    case, all the frames of the clip of the sample are listed.
+    """
+    files = []
+    for key in keys:
+        paths = data_info[f'{key}_path']
+        if isinstance(paths, (list, tuple)):
+            files.extend(paths)
+        elif osp.isfile(paths):
+            files.append(paths)
+        else:
+            for folder in [data_info['key'], osp.dirname(data_info['key'])]:
+                folder = osp.join(paths, folder)
+                if folder != paths and osp.isdir(folder):
+                    files.extend(
+                        osp.join(folder, name)
+                        for name in sorted(os.listdir(folder))
+                        if osp.isfile(osp.join(folder, name)))
+                    break
+    return [str(file) for file in files]
+
+
+def read_file(path, codec, flag):
+    with open(path, 'rb') as f:
+        content = f.read()
+    if codec == 'raw':
+        return mmcv.imfrombytes(content, flag=flag), 'raw'
+    return content, osp.splitext(path)[1].lstrip('.').lower()
+
+
+def main():
+    args = parse_args()
+    register_all_modules()
+    cfg = Config.fromfile(args.config)
+    dataset = build_dataset(cfg, args.split)
+    keys = args.keys or list(dataset.data_prefix.keys())
+    data_root = dataset.data_root or ''
+
+    with PackedShardWriter(args.out_dir, args.shard_size * 2**20) as writer, \
+            ThreadPoolExecutor(args.n_thread) as executor:
+        prog_bar = mmengine.ProgressBar(len(dataset))
+        for idx in range(len(dataset)):
+            files = [
+                file for file in dict.fromkeys(
+                    list_files(dataset.get_data_info(idx), keys))
+                if osp.relpath(file, data_root) not in writer.keys
+            ]
+            items = executor.map(
+                lambda file: read_file(file, args.codec, args.flag), files)
+            writer.add([(osp.relpath(file, data_root), data, codec)
+                        for file, (data, codec) in zip(files, items)])
+            prog_bar.update()
+    print(f'\n{len(writer.keys)} files are packed in {args.out_dir}')
+
+
+if __name__ == '__main__':
+    main()
@@ -58,7 +58,13 @@ def pytorch2onnx(model,
     elif model_type == 'inpainting':
         masks = input['data_samples'].mask.data.unsqueeze(0)
         img = input['inputs'].unsqueeze(0)
-        data = torch.cat((img, masks), dim=1)
+        if getattr(model, 'input_with_ones', False):
+            data = torch.cat((img, torch.ones_like(masks), masks), dim=1)
+        else:
+            data = torch.cat((img, masks), dim=1)
+        # export the generator, since the composition of the result and the
+        # masked image takes the masks, which are not inputs of the graph
+        model = model.generator
     elif model_type == 'video_restorer':
         data = input['inputs'].unsqueeze(0).float()
     data = data.to(device)
@@ -68,18 +74,9 @@ def pytorch2onnx(model,
     register_extra_symbolics(opset_version)
     dynamic_axes = None
     if dynamic_export:
-        dynamic_axes = {
-            'input': {
-                0: 'batch',
-                2: 'height',
-                3: 'width'
-            },
-            'output': {
-                0: 'batch',
-                2: 'height',
-                3: 'width'
-            }
-        }
+        # the spatial axes are the last two axes of both images and videos
+        axes = {0: 'batch', data.dim() - 2: 'height', data.dim() - 1: 'width'}
+        dynamic_axes = {'input': axes, 'output': axes}
     with torch.no_grad():
         torch.onnx.export(
             model,
@@ -100,7 +97,9 @@ def pytorch2onnx(model,
 
         if dynamic_export:
             # scale image for dynamic shape test
-            data = torch.nn.functional.interpolate(data, scale_factor=1.1)
+            frames = torch.nn.functional.interpolate(
+                data.flatten(0, -4), scale_factor=1.1)
+            data = frames.view(*data.shape[:-3], *frames.shape[-3:])
 
             # concate flip image for batch test
             flip_data = data.flip(-1)
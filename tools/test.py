@@ -45,9 +45,9 @@ def parse_args():
 def main():
     args = parse_args()
 
-    # register all modules in mmedit into the registries
+    # register all modules in mmedit into the registries on demand
     # do not init the default scope here because it will be init in the runner
-    register_all_modules(init_default_scope=False)
+    register_all_modules(init_default_scope=False, lazy=True)
 
     # load config
     cfg = Config.fromfile(args.config)